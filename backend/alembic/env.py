@@ -18,6 +18,10 @@ from app.models.genome import Genome
 from app.models.analysis import Analysis
 from app.models.result import Result
 from app.models.validation import Validation
+from app.models.gene import Gene
+from app.models.result_cache import ResultCacheEntry
+from app.models.batch import Batch
+from app.models.stage_timing import StageTiming
 
 # this is the Alembic Config object
 config = context.config
@@ -1,8 +1,22 @@
 """Base analyzer class for genome analysis."""
 
+import importlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, List, Any, Optional, Tuple, Type, Union
 from pathlib import Path
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.replicon_runner import RepliconRunner
+
+
+# Modules whose analyzers make up a complete analysis; importing a module
+# registers its analyzers
+BUILTIN_ANALYZERS = (
+    "app.analyzers.codon_analyzer",
+    "app.analyzers.gene_analyzer",
+    "app.analyzers.genome_analyzer",
+    "app.analyzers.orf_analyzer",
+    "app.analyzers.kmer_analyzer"
+)
 
 
 class BaseAnalyzer(ABC):
@@ -10,26 +24,171 @@ class BaseAnalyzer(ABC):
     Abstract base class for genome analyzers.
     
     All analyzers should inherit from this class and implement
-    the analyze method.
+    the analyze_record method, which works on an already parsed
+    GenomeContext. The path-based analyze method is a thin wrapper
+    that parses the file and delegates to analyze_record.
+    
+    Multi-record genomes are analyzed one replicon at a time:
+    analyze_replicon produces a partial result per record and
+    merge_results combines them into genome-level totals plus a
+    per-replicon breakdown.
+    
+    Large array outputs (e.g. every codon position) do not belong in the
+    JSON results; analyzers put them in self.artifacts, keyed by artifact
+    name, and the analysis task saves them with the ArtifactStore.
+    
+    Subclasses that set name are registered in BaseAnalyzer.registry and
+    run by the analysis task under that name. They declare the artifacts
+    they produce in outputs and the analyzers whose artifacts they read
+    in requires; before an analyzer runs on a replicon, the artifacts of
+    its requirements for that replicon are put in self.inputs. Analyzers
+    that do not depend on each other run concurrently.
+    
+    Results are cached per genome file content and analyzer version, so
+    an analyzer whose results change (new fields, fixed calculations)
+    must bump its version; results of the other analyzers stay cached.
+    
+    Attributes:
+        name: Registry and result name, or None for unregistered analyzers
+        version: Result version, part of the result cache key
+        requires: Names of the analyzers whose artifacts are inputs
+        outputs: Names of the artifacts the analyzer produces
     """
     
+    name: Optional[str] = None
+    version: str = "1"
+    requires: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    registry: Dict[str, Type["BaseAnalyzer"]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """Register subclasses that declare a name."""
+        super().__init_subclass__(**kwargs)
+        if "name" not in cls.__dict__ or cls.name is None:
+            return
+        
+        # Re-importing a module registers the same class again, which is fine
+        registered = BaseAnalyzer.registry.get(cls.name)
+        same_class = registered is not None and (
+            registered.__module__ == cls.__module__ and registered.__qualname__ == cls.__qualname__
+        )
+        if registered is not None and not same_class:
+            raise ValueError(f"Analyzer name {cls.name} is already registered by {registered.__qualname__}")
+        BaseAnalyzer.registry[cls.name] = cls
+    
+    @classmethod
+    def registered(cls) -> Dict[str, Type["BaseAnalyzer"]]:
+        """
+        Get every registered analyzer class, built-in ones included.
+        
+        Returns:
+            Analyzer classes keyed by name
+        """
+        for module in BUILTIN_ANALYZERS:
+            importlib.import_module(module)
+        return dict(BaseAnalyzer.registry)
+    
+    @classmethod
+    def versions(cls) -> Dict[str, str]:
+        """
+        Get the version of every registered analyzer.
+        
+        Returns:
+            Analyzer versions keyed by name
+        """
+        return {name: analyzer_class.version for name, analyzer_class in cls.registered().items()}
+    
+    @classmethod
+    def create_all(cls) -> Dict[str, "BaseAnalyzer"]:
+        """
+        Create one instance of every registered analyzer.
+        
+        Returns:
+            Analyzer instances keyed by name, ready for a RepliconRunner
+        """
+        return {name: analyzer_class() for name, analyzer_class in cls.registered().items()}
+    
     def __init__(self):
         """Initialize the analyzer."""
         self.results = {}
+        self.artifacts = {}
+        self.inputs: Dict[str, Dict[str, Any]] = {}
     
-    @abstractmethod
     def analyze(self, genbank_file: str) -> Dict[str, Any]:
         """
-        Analyze a GenBank file.
+        Analyze a GenBank file with one or more records.
         
         Args:
             genbank_file: Path to GenBank file
             
+        Returns:
+            Dictionary with analysis results
+        """
+        if not self.validate_file(genbank_file):
+            raise FileNotFoundError(f"GenBank file not found: {genbank_file}")
+        
+        return RepliconRunner({"result": self}).run(genbank_file)["result"]
+    
+    @abstractmethod
+    def analyze_record(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Analyze an already parsed genome.
+        
+        Args:
+            context: Parsed genome context
+            
         Returns:
             Dictionary with analysis results
         """
         pass
     
+    def analyze_replicon(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Analyze one record of a multi-record genome.
+        
+        Analyzers whose results cannot be combined from their final
+        output (e.g. medians) override this to return the data
+        merge_results needs instead.
+        
+        Args:
+            context: Parsed genome context of a single replicon
+            
+        Returns:
+            Partial result for the replicon
+        """
+        return self.analyze_record(context)
+    
+    def merge_results(self, partials: List[Dict[str, Any]], accessions: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-replicon partial results into genome-level results.
+        
+        Args:
+            partials: Results of analyze_replicon, in record order
+            accessions: Accession of each replicon, in record order
+            
+        Returns:
+            Dictionary with genome-level results and a "replicons" breakdown
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support multi-record genomes")
+    
+    def load_context(self, source: Union[str, Path, GenomeContext]) -> GenomeContext:
+        """
+        Get a parsed genome context for a GenBank file.
+        
+        Args:
+            source: Path to GenBank file, or an already parsed GenomeContext
+            
+        Returns:
+            GenomeContext for the source
+        """
+        if isinstance(source, GenomeContext):
+            return source
+        
+        if not self.validate_file(source):
+            raise FileNotFoundError(f"GenBank file not found: {source}")
+        
+        return GenomeContext.load(source)
+    
     def validate_file(self, genbank_file: str) -> bool:
         """
         Validate that the GenBank file exists.
@@ -0,0 +1,145 @@
+"""Map functions over the chunks of one genome on a process pool."""
+
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from app.analyzers.sequence_chunks import MIN_CHUNK_SIZE, SequenceChunk, chunk_size_for_budget
+
+
+# Chunks handed to each worker, so that uneven chunks still balance out
+CHUNKS_PER_WORKER = 4
+
+# Shared memory blocks attached by a worker process, by block name
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a shared sequence block once per worker process (PRIVATE)."""
+    block = _attached.get(name)
+    if block is None:
+        # Pool workers share the resource tracker of the process that created
+        # the block, so attaching does not hand them its cleanup
+        block = shared_memory.SharedMemory(name=name)
+        _attached[name] = block
+    return block
+
+
+def _map_chunk(name: str, length: int, start: int, end: int, overlap: int,
+               function: Callable[..., Any], args: Sequence[Any]) -> Any:
+    """Run a map function on one chunk read from shared memory (PRIVATE)."""
+    block = _attach(name)
+    sequence = bytes(block.buf[start:min(end + overlap, length)])
+    return function(SequenceChunk(start, end, sequence), *args)
+
+
+def _map_local_chunk(context: Any, length: int, start: int, end: int, overlap: int,
+                     function: Callable[..., Any], args: Sequence[Any]) -> Any:
+    """Run a map function on one chunk fetched from the context, in a thread (PRIVATE)."""
+    sequence = context.fetch(start, min(end + overlap, length))
+    return function(SequenceChunk(start, end, sequence), *args)
+
+
+class ChunkPool:
+    """
+    Process pool that maps functions over the chunks of one genome.
+    
+    The upper-cased sequence is copied once into a shared memory block
+    that every worker attaches to by name, so a chunk task carries only
+    its coordinates, the function and its arguments. Workers copy just
+    their own chunk (plus overlap) out of the block. Functions must be
+    defined at module level so they can be sent to the workers, and
+    must depend on nothing but the chunk and their arguments.
+    
+    Processes cannot be started from a daemonic process, such as a
+    Celery prefork worker. With threads set, the pool maps on threads
+    instead, reading chunks straight from the context; scans then run in
+    parallel wherever NumPy releases the GIL.
+    
+    Use as a context manager; the block and the workers are released on
+    exit. While open, setting a GenomeContext's chunk_pool makes its
+    map_chunks run here.
+    """
+    
+    def __init__(self, context: Any, workers: int, memory_budget_mb: float,
+                 chunk_size: Optional[int] = None, threads: bool = False):
+        """
+        Initialize the pool.
+        
+        Args:
+            context: GenomeContext whose sequence is shared
+            workers: Worker processes
+            memory_budget_mb: Chunk working memory shared by the workers
+            chunk_size: Optional bases per chunk; by default the genome is
+                split into CHUNKS_PER_WORKER chunks per worker, within the
+                budget and no smaller than MIN_CHUNK_SIZE
+            threads: Map on threads instead of worker processes
+        """
+        self.context = context
+        self.workers = workers
+        self.threads = threads
+        if chunk_size is None:
+            chunk_size = max(
+                min(chunk_size_for_budget(memory_budget_mb / workers),
+                    math.ceil(len(context) / (workers * CHUNKS_PER_WORKER))),
+                min(MIN_CHUNK_SIZE, len(context)),
+                1
+            )
+        self.chunk_size = chunk_size
+        self._block = None
+        self._executor = None
+    
+    def __enter__(self) -> "ChunkPool":
+        if self.threads:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self
+        
+        length = len(self.context)
+        self._block = shared_memory.SharedMemory(create=True, size=max(length, 1))
+        try:
+            # Copy chunk by chunk so a store-backed genome is never decoded whole
+            for start, sequence in self.context.iter_chunks(self.chunk_size):
+                self._block.buf[start:start + len(sequence)] = sequence
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        except BaseException:
+            self.close()
+            raise
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def map(self, function: Callable[..., Any], args: Sequence[Any] = (), overlap: int = 0) -> List[Any]:
+        """
+        Run a function on every chunk of the genome.
+        
+        Args:
+            function: Module-level callable (chunk, *args) -> partial result
+            args: Extra arguments passed to every call
+            overlap: Bases of look-ahead past the end of each chunk
+            
+        Returns:
+            Partial results in chunk order
+        """
+        length = len(self.context)
+        if self.threads:
+            target, source = _map_local_chunk, self.context
+        else:
+            target, source = _map_chunk, self._block.name
+        futures = [
+            self._executor.submit(
+                target, source, length, start, min(start + self.chunk_size, length), overlap, function, tuple(args)
+            )
+            for start in range(0, length, self.chunk_size)
+        ]
+        return [future.result() for future in futures]
+    
+    def close(self):
+        """Stop the workers and free the shared sequence."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
@@ -1,9 +1,13 @@
 """Codon analyzer for identifying start and stop codons in genomes."""
 
-import re
-from typing import Dict, List, Any
-from Bio import SeqIO
+from typing import Dict, List, Any, Union
 from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.codon_engine import (
+    CODON_OVERLAP, codon_count_table, codon_counts_from_table, codon_total, count_codons,
+    merge_codon_scans, scan_chunk_codons
+)
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.sequence_encoding import encode_sequence
 from app.core.logging import logger
 
 
@@ -15,43 +19,65 @@ class CodonAnalyzer(BaseAnalyzer):
     - Start codons (ATG)
     - Stop codons (TAA, TAG, TGA)
     - Codon frequencies and distributions
+    
+    All counts come from a single vectorized pass that tallies the 64
+    codons in the three reading frames of both strands; the start and
+    stop codon summaries are the forward-strand totals over all frames.
+    The pass runs chunk by chunk (see GenomeContext.map_chunks), so very
+    large genomes are counted in bounded memory, or on several cores,
+    with the same results.
+    
+    The positions of every start and stop codon on both strands are kept
+    in the "codon_positions" artifact, keyed "<accession>/<codon><strand>",
+    rather than in the JSON results.
     """
     
+    name = "codon_analysis"
+    version = "1"
+    outputs = ("codon_positions",)
+    
     def __init__(self):
         """Initialize the codon analyzer."""
         super().__init__()
         self.start_codon = "ATG"
         self.stop_codons = ["TAA", "TAG", "TGA"]
     
-    def analyze(self, genbank_file: str) -> Dict[str, Any]:
+    def analyze_record(self, context: GenomeContext) -> Dict[str, Any]:
         """
-        Analyze codons in a GenBank file.
+        Analyze codons in a parsed genome.
         
         Args:
-            genbank_file: Path to GenBank file
+            context: Parsed genome context
             
         Returns:
             Dictionary with codon analysis results
         """
-        if not self.validate_file(genbank_file):
-            raise FileNotFoundError(f"GenBank file not found: {genbank_file}")
-        
-        logger.info(f"Starting codon analysis for {genbank_file}")
-        
-        # Read GenBank file
-        record = SeqIO.read(genbank_file, "genbank")
-        sequence = str(record.seq).upper()
-        
-        # Analyze start codons
-        start_codon_results = self.count_start_codons(sequence)
+        logger.info(f"Starting codon analysis for {context.accession}")
         
-        # Analyze stop codons
-        stop_codon_results = self.count_stop_codons(sequence)
+        codons = [self.start_codon] + self.stop_codons
+        counts, positions = merge_codon_scans(
+            context.map_chunks(scan_chunk_codons, codons, overlap=CODON_OVERLAP), len(context), codons
+        )
         
         results = {
-            "start_codons": start_codon_results,
-            "stop_codons": stop_codon_results,
-            "genome_length": len(sequence)
+            "start_codons": self._summarize_start_codons(
+                codon_total(counts, self.start_codon),
+                positions[f"{self.start_codon}+"][:100].tolist(),
+                len(context)
+            ),
+            "stop_codons": self._summarize_stop_codons(
+                {codon: codon_total(counts, codon) for codon in self.stop_codons},
+                len(context)
+            ),
+            "genome_length": len(context),
+            "codon_counts": codon_count_table(counts)
+        }
+        
+        self.artifacts = {
+            "codon_positions": {
+                f"{context.accession}/{key}": array
+                for key, array in positions.items()
+            }
         }
         
         logger.info("Codon analysis completed")
@@ -67,12 +93,24 @@ class CodonAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with start codon counts and statistics
         """
-        # Find all ATG positions
-        atg_pattern = re.compile(self.start_codon)
-        positions = [m.start() for m in atg_pattern.finditer(sequence)]
+        counts = count_codons(encode_sequence(sequence))
+        positions = self._find_positions(sequence, self.start_codon)
+        
+        return self._summarize_start_codons(codon_total(counts, self.start_codon), positions, len(sequence))
+    
+    def _summarize_start_codons(self, total_count: int, positions: List[int], length: int) -> Dict[str, Any]:
+        """
+        Build the start codon result from a count.
         
-        total_count = len(positions)
-        density_per_kb = (total_count / len(sequence)) * 1000 if len(sequence) > 0 else 0
+        Args:
+            total_count: Number of ATG codons
+            positions: ATG positions (only the first 100 are kept)
+            length: Sequence length
+            
+        Returns:
+            Dictionary with start codon counts and statistics
+        """
+        density_per_kb = (total_count / length) * 1000 if length > 0 else 0
         
         return {
             "codon": self.start_codon,
@@ -92,16 +130,45 @@ class CodonAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with stop codon counts and frequencies
         """
-        codon_counts = {}
-        total_stops = 0
+        counts = count_codons(encode_sequence(sequence))
+        codon_counts = {codon: codon_total(counts, codon) for codon in self.stop_codons}
+        
+        return self._summarize_stop_codons(codon_counts, len(sequence))
+    
+    def _find_positions(self, sequence: Union[str, bytes], codon: str, limit: int = 100) -> List[int]:
+        """
+        Find the first positions of a codon in any frame of the forward strand.
+        
+        Args:
+            sequence: DNA sequence string or bytes
+            codon: Codon to look for
+            limit: Maximum number of positions to return
+            
+        Returns:
+            List of 0-based positions
+        """
+        if isinstance(sequence, (bytes, bytearray)):
+            codon = codon.encode("ascii")
+        
+        positions = []
+        position = sequence.find(codon)
+        while position != -1 and len(positions) < limit:
+            positions.append(position)
+            position = sequence.find(codon, position + len(codon))
+        return positions
+    
+    def _summarize_stop_codons(self, codon_counts: Dict[str, int], length: int) -> Dict[str, Any]:
+        """
+        Build the stop codon result from per-codon counts.
         
-        # Count each stop codon
-        for codon in self.stop_codons:
-            pattern = re.compile(codon)
-            matches = pattern.findall(sequence)
-            count = len(matches)
-            codon_counts[codon] = count
-            total_stops += count
+        Args:
+            codon_counts: Count of each stop codon
+            length: Sequence length
+            
+        Returns:
+            Dictionary with stop codon counts and frequencies
+        """
+        total_stops = sum(codon_counts.values())
         
         # Calculate frequencies
         codon_frequencies = {}
@@ -115,10 +182,53 @@ class CodonAnalyzer(BaseAnalyzer):
         return {
             "codons": codon_frequencies,
             "total_stop_codons": total_stops,
-            "density_per_kb": round((total_stops / len(sequence)) * 1000, 2) if len(sequence) > 0 else 0,
+            "density_per_kb": round((total_stops / length) * 1000, 2) if length > 0 else 0,
             "note": "TAA, TAG, and TGA are stop codons for translation"
         }
     
+    def merge_results(self, partials: List[Dict[str, Any]], accessions: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-replicon codon counts into genome-level totals.
+        
+        Start codon positions are those of the first replicon, in its own
+        coordinates; per-replicon counts are listed under "replicons".
+        
+        Args:
+            partials: Codon results of each replicon, in record order
+            accessions: Accession of each replicon, in record order
+            
+        Returns:
+            Dictionary with codon analysis results
+        """
+        genome_length = sum(p["genome_length"] for p in partials)
+        start_count = sum(p["start_codons"]["total_count"] for p in partials)
+        stop_counts = {
+            codon: sum(p["stop_codons"]["codons"][codon]["count"] for p in partials)
+            for codon in self.stop_codons
+        }
+        
+        replicons = [
+            {
+                "accession": accession,
+                "genome_length": p["genome_length"],
+                "start_codon_count": p["start_codons"]["total_count"],
+                "stop_codon_count": p["stop_codons"]["total_stop_codons"]
+            }
+            for accession, p in zip(accessions, partials)
+        ]
+        
+        return {
+            "start_codons": self._summarize_start_codons(
+                start_count, partials[0]["start_codons"]["positions"], genome_length
+            ),
+            "stop_codons": self._summarize_stop_codons(stop_counts, genome_length),
+            "genome_length": genome_length,
+            "codon_counts": codon_count_table(
+                sum(codon_counts_from_table(p["codon_counts"]) for p in partials)
+            ),
+            "replicons": replicons
+        }
+    
     def compare_with_genes(self, start_codon_count: int, gene_count: int) -> Dict[str, Any]:
         """
         Compare start codon count with annotated gene count.
@@ -0,0 +1,265 @@
+"""Single-pass codon counting over all reading frames of both strands."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.analyzers.sequence_encoding import BASES, INVALID_CODE
+
+
+# All 64 codons in index order: index = 16 * first + 4 * second + third
+CODONS = [first + second + third for first in BASES for second in BASES for third in BASES]
+CODON_INDEX = {codon: index for index, codon in enumerate(CODONS)}
+
+# Codons are first indexed in base 5 so that codons containing a non-ACGT
+# symbol (code 4) get bins of their own without any masking
+_RADIX = INVALID_CODE + 1
+_RADIX_BINS = _RADIX ** 3
+_VALID_BINS = np.array(
+    [_RADIX * _RADIX * (index >> 4) + _RADIX * ((index >> 2) & 3) + (index & 3) for index in range(64)],
+    dtype=np.intp
+)
+
+# Codon index -> index of its reverse complement (complement of code c is 3 - c)
+_REVERSE_COMPLEMENT = np.array(
+    [63 - (((index & 3) << 4) | (index & 12) | (index >> 4)) for index in range(64)],
+    dtype=np.intp
+)
+
+STRANDS = ("+", "-")
+FRAMES = 3
+
+# Look-ahead a chunk needs so that codons starting in it can be read
+CODON_OVERLAP = 2
+
+
+def codon_keys(codes: np.ndarray) -> np.ndarray:
+    """
+    Compute a base-5 codon key for every position of an encoded sequence.
+    
+    The three bases of each codon are read through shifted views of the
+    same buffer, so the sequence is never copied per frame.
+    
+    Args:
+        codes: Encoded sequence from encode_sequence
+        
+    Returns:
+        Array of len(codes) - 2 keys in 0..124; keys of ACGT codons map
+        to codon indices through _VALID_BINS
+    """
+    if len(codes) < 3:
+        return np.zeros(0, dtype=np.uint8)
+    
+    keys = codes[:-2] * np.uint8(_RADIX * _RADIX)
+    keys += codes[1:-1] * np.uint8(_RADIX)
+    keys += codes[2:]
+    return keys
+
+
+def count_codons(codes: np.ndarray) -> np.ndarray:
+    """
+    Count all 64 codons in every reading frame of both strands.
+    
+    Forward frame f holds the codons starting at 0-based positions
+    congruent to f modulo 3. Reverse frame f holds the codons of the
+    reverse complement read from its own offset f. Reverse-strand counts
+    are derived from the forward codon keys (a reverse frame is a
+    forward frame with every codon replaced by its reverse complement),
+    so the sequence is scanned once.
+    
+    Args:
+        codes: Encoded sequence from encode_sequence
+        
+    Returns:
+        Integer array of shape (2, 3, 64) indexed by strand (0 = "+",
+        1 = "-"), frame and codon index
+    """
+    return codon_counts_from_forward(forward_codon_counts(codes), len(codes))
+
+
+def forward_codon_counts(codes: np.ndarray, start: int = 0, windows: Optional[int] = None) -> np.ndarray:
+    """
+    Count the 64 codons in the three forward reading frames.
+    
+    Frames are numbered from the start of the whole sequence, so counts
+    of consecutive chunks can be summed.
+    
+    Args:
+        codes: Encoded sequence from encode_sequence
+        start: Sequence position of codes[0]
+        windows: Only count codons starting in the first windows positions
+            (the bases owned by a chunk); defaults to all
+            
+    Returns:
+        Integer array of shape (3, 64) indexed by frame and codon index
+    """
+    counts = np.zeros((FRAMES, len(CODONS)), dtype=np.int64)
+    keys = codon_keys(codes)[:windows]
+    
+    for offset in range(FRAMES):
+        frame = (start + offset) % FRAMES
+        counts[frame] = np.bincount(keys[offset::FRAMES], minlength=_RADIX_BINS)[_VALID_BINS]
+    
+    return counts
+
+
+def codon_counts_from_forward(forward: np.ndarray, length: int) -> np.ndarray:
+    """
+    Derive the reverse-strand frames from forward codon counts.
+    
+    Args:
+        forward: Forward counts from forward_codon_counts, summed over
+            the whole sequence
+        length: Sequence length
+        
+    Returns:
+        Integer array of shape (2, 3, 64) as returned by count_codons
+    """
+    counts = np.zeros((len(STRANDS), FRAMES, len(CODONS)), dtype=np.int64)
+    counts[0] = forward
+    for frame in range(FRAMES):
+        counts[1, frame] = forward[(length - 3 - frame) % FRAMES][_REVERSE_COMPLEMENT]
+    return counts
+
+
+def codon_total(counts: np.ndarray, codon: str, strand: Optional[int] = 0) -> int:
+    """
+    Sum the counts of one codon over all frames.
+    
+    Args:
+        counts: Codon count matrix from count_codons
+        codon: Upper-cased codon
+        strand: 0 for "+", 1 for "-", or None for both strands
+        
+    Returns:
+        Number of occurrences of the codon
+    """
+    selected = counts[:, :, CODON_INDEX[codon]] if strand is None else counts[strand, :, CODON_INDEX[codon]]
+    return int(selected.sum())
+
+
+def codon_count_table(counts: np.ndarray) -> Dict[str, List[int]]:
+    """
+    Convert a codon count matrix into a JSON serializable table.
+    
+    Args:
+        counts: Codon count matrix from count_codons
+        
+    Returns:
+        Dictionary with the codon order under "codons" and one list of 64
+        counts per frame, keyed "+1".."+3" and "-1".."-3"
+    """
+    table = {"codons": list(CODONS)}
+    for strand_index, strand in enumerate(STRANDS):
+        for frame in range(FRAMES):
+            table[f"{strand}{frame + 1}"] = counts[strand_index, frame].tolist()
+    return table
+
+
+def codon_counts_from_table(table: Dict[str, List[int]]) -> np.ndarray:
+    """
+    Rebuild a codon count matrix from codon_count_table output.
+    
+    Args:
+        table: Table produced by codon_count_table
+        
+    Returns:
+        Integer array of shape (2, 3, 64)
+    """
+    return np.array(
+        [[table[f"{strand}{frame + 1}"] for frame in range(FRAMES)] for strand in STRANDS],
+        dtype=np.int64
+    )
+
+
+def codon_positions(codes: np.ndarray, codons: List[str], start: int = 0,
+                    windows: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Find every occurrence of some codons on both strands.
+    
+    A codon on the "-" strand is reported at the forward coordinate of its
+    leftmost base, i.e. it occupies [position, position + 3) and reads as
+    the reverse complement on the forward strand.
+    
+    Args:
+        codes: Encoded sequence from encode_sequence
+        codons: Upper-cased codons to locate
+        start: Sequence position of codes[0], added to every position
+        windows: Only report codons starting in the first windows
+            positions; defaults to all
+            
+    Returns:
+        Dictionary of sorted int64 position arrays keyed "<codon><strand>",
+        e.g. "ATG+" and "ATG-"
+    """
+    keys = codon_keys(codes)[:windows]
+    positions = {}
+    
+    for codon in codons:
+        forward = CODON_INDEX[codon]
+        for strand, index in zip(STRANDS, (forward, _REVERSE_COMPLEMENT[forward])):
+            positions[f"{codon}{strand}"] = np.flatnonzero(keys == _VALID_BINS[index]).astype(np.int64) + start
+    
+    return positions
+
+
+def scan_chunk_codons(chunk, codons: List[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Count the codons starting in one chunk and locate some of them.
+    
+    This is the map step of scan_codons.
+    
+    Args:
+        chunk: SequenceChunk with at least CODON_OVERLAP bases of overlap
+        codons: Upper-cased codons to locate
+        
+    Returns:
+        Tuple of (forward counts as returned by forward_codon_counts,
+        positions as returned by codon_positions)
+    """
+    return (
+        forward_codon_counts(chunk.codes, chunk.start, chunk.owned),
+        codon_positions(chunk.codes, codons, chunk.start, chunk.owned)
+    )
+
+
+def merge_codon_scans(parts: List[Tuple[np.ndarray, Dict[str, np.ndarray]]], length: int,
+                      codons: List[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Combine per-chunk codon scans (the reduce step of scan_codons).
+    
+    Args:
+        parts: Results of scan_chunk_codons, in chunk order
+        length: Sequence length
+        codons: Codons located by the scans
+        
+    Returns:
+        Tuple of (count matrix as returned by count_codons, positions as
+        returned by codon_positions)
+    """
+    forward = np.zeros((FRAMES, len(CODONS)), dtype=np.int64)
+    for counts, _ in parts:
+        forward += counts
+    
+    positions = {
+        f"{codon}{strand}": np.concatenate(
+            [part[f"{codon}{strand}"] for _, part in parts] or [np.zeros(0, dtype=np.int64)]
+        )
+        for codon in codons for strand in STRANDS
+    }
+    return codon_counts_from_forward(forward, length), positions
+
+
+def scan_codons(chunks: Iterable, length: int, codons: List[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Count all codons and locate some of them in one pass over chunks.
+    
+    Args:
+        chunks: SequenceChunks covering the sequence in order, with at
+            least CODON_OVERLAP bases of overlap
+        length: Sequence length
+        codons: Upper-cased codons to locate
+        
+    Returns:
+        Tuple of (count matrix as returned by count_codons, positions as
+        returned by codon_positions)
+    """
+    return merge_codon_scans([scan_chunk_codons(chunk, codons) for chunk in chunks], length, codons)
@@ -0,0 +1,265 @@
+"""Sorted-interval index of the CDS features of a genome."""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.core.logging import logger
+
+
+INDEX_VERSION = 1
+
+# Columns of the per-gene string table, in storage order
+_TEXT_FIELDS = ("gene_name", "locus_tag", "product", "location")
+
+
+def feature_index_path(genbank_file: str) -> Path:
+    """
+    Get the path of the feature index that sits next to a GenBank file.
+    
+    Args:
+        genbank_file: Path to GenBank file
+        
+    Returns:
+        Path of the index file
+    """
+    return Path(genbank_file).with_suffix(".genes.npz")
+
+
+@lru_cache(maxsize=16)
+def _load_index(path: str, mtime_ns: int) -> "FeatureIndex":
+    """Load an index file; cached per file version (PRIVATE)."""
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files if key != "meta"}
+        meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+    if meta.get("version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported feature index version in {path}")
+    return FeatureIndex(arrays, meta["records"], meta["genes"])
+
+
+class FeatureIndex:
+    """
+    Interval index answering which genes overlap a region.
+    
+    Every part of every CDS (a joined CDS has one part per exon, an
+    origin-spanning CDS one part per side of the origin) is an interval.
+    Intervals are sorted by start within each record, next to the running
+    maximum of their ends. For a query [start, end), one binary search on
+    the starts bounds the intervals starting before end, and one on the
+    running maximum skips every interval that ends before start, so only
+    the overlapping intervals and a few near misses are scanned.
+    
+    The index is built once per genome with the same gene extraction as
+    GeneAnalyzer and saved as ``<accession>.genes.npz`` next to the
+    GenBank file.
+    """
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], records: List[str], genes: List[List[str]]):
+        """
+        Initialize the index from its stored arrays.
+        
+        Args:
+            arrays: Interval and gene arrays (see build)
+            records: Record accessions, in file order
+            genes: Per-gene text fields, in _TEXT_FIELDS order
+        """
+        self.arrays = arrays
+        self.records = records
+        self.genes = genes
+        self._record_index = {accession: index for index, accession in enumerate(records)}
+    
+    @classmethod
+    def exists(cls, genbank_file: str) -> bool:
+        """
+        Check whether an up-to-date index exists for a GenBank file.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            True if the index exists and is newer than the GenBank file
+        """
+        source = Path(genbank_file)
+        path = feature_index_path(genbank_file)
+        return source.exists() and path.exists() and path.stat().st_mtime >= source.stat().st_mtime
+    
+    @classmethod
+    def build(cls, genbank_file: str) -> "FeatureIndex":
+        """
+        Extract the genes of every record and write the index.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            Loaded FeatureIndex
+        """
+        logger.info(f"Building feature index for {genbank_file}")
+        analyzer = GeneAnalyzer()
+        
+        records, text = [], []
+        record_offsets = [0]
+        part_starts, part_ends, part_genes = [], [], []
+        gene_columns = {"starts": [], "ends": [], "lengths": [], "gc_content": [], "strands": []}
+        
+        for index, offset in enumerate(GenomeContext.record_offsets(genbank_file)):
+            with GenomeContext.load_record(genbank_file, index, offset) as context:
+                records.append(context.accession)
+                features = analyzer.cds_features(context)
+                genes = analyzer.extract_genes(context)
+            
+            for feature, gene in zip(features, genes):
+                gene_id = len(text)
+                text.append([gene[field] for field in _TEXT_FIELDS])
+                gene_columns["starts"].append(gene["start"])
+                gene_columns["ends"].append(gene["end"])
+                gene_columns["lengths"].append(gene["length"])
+                gene_columns["gc_content"].append(gene["gc_content"])
+                gene_columns["strands"].append(1 if gene["strand"] == "+" else -1)
+                for part_start, part_end, _ in feature.parts:
+                    part_starts.append(part_start)
+                    part_ends.append(part_end)
+                    part_genes.append(gene_id)
+            record_offsets.append(len(part_starts))
+        
+        starts = np.array(part_starts, dtype=np.int64)
+        ends = np.array(part_ends, dtype=np.int64)
+        genes_of_parts = np.array(part_genes, dtype=np.int64)
+        max_ends = np.empty_like(ends)
+        
+        # Sort intervals by start and take running maxima within each record
+        for first, last in zip(record_offsets[:-1], record_offsets[1:]):
+            order = first + np.argsort(starts[first:last], kind="stable")
+            starts[first:last] = starts[order]
+            ends[first:last] = ends[order]
+            genes_of_parts[first:last] = genes_of_parts[order]
+            max_ends[first:last] = np.maximum.accumulate(ends[first:last]) if last > first else ends[first:last]
+        
+        arrays = {
+            "record_offsets": np.array(record_offsets, dtype=np.int64),
+            "part_starts": starts,
+            "part_ends": ends,
+            "part_max_ends": max_ends,
+            "part_genes": genes_of_parts,
+            "gene_starts": np.array(gene_columns["starts"], dtype=np.int64),
+            "gene_ends": np.array(gene_columns["ends"], dtype=np.int64),
+            "gene_lengths": np.array(gene_columns["lengths"], dtype=np.int64),
+            "gene_gc_content": np.array(gene_columns["gc_content"], dtype=np.float64),
+            "gene_strands": np.array(gene_columns["strands"], dtype=np.int8),
+        }
+        meta = {"version": INDEX_VERSION, "records": records, "genes": text}
+        
+        path = feature_index_path(genbank_file)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as handle:
+            np.savez(handle, meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8), **arrays)
+        os.replace(temp_path, path)
+        
+        logger.info(f"Feature index written to {path} ({len(text)} genes, {len(starts)} intervals)")
+        return cls.load(genbank_file)
+    
+    @classmethod
+    def load(cls, genbank_file: str) -> "FeatureIndex":
+        """
+        Load the index of a GenBank file.
+        
+        Loaded indexes are cached until the file changes, so repeated
+        region queries only pay for the binary searches.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            Loaded FeatureIndex
+        """
+        path = feature_index_path(genbank_file)
+        return _load_index(str(path), path.stat().st_mtime_ns)
+    
+    @classmethod
+    def open_or_build(cls, genbank_file: str) -> "FeatureIndex":
+        """
+        Load the index of a GenBank file, building it if missing or stale.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            Loaded FeatureIndex
+        """
+        if cls.exists(genbank_file):
+            return cls.load(genbank_file)
+        return cls.build(genbank_file)
+    
+    def query(self, accession: str, start: int, end: int, strand: Optional[str] = None,
+              limit: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find the genes overlapping a region of one record.
+        
+        Args:
+            accession: Record accession
+            start: Region start (0-based, inclusive)
+            end: Region end (exclusive)
+            strand: Optional strand filter, "+" or "-"
+            
+        Returns:
+            Overlapping genes sorted by start, as dictionaries with the
+            fields of GeneAnalyzer.extract_genes plus "replicon"
+            
+        Raises:
+            KeyError: If the record is not in the index
+        """
+        record = self._record_index[accession]
+        gene_ids = self.overlapping(record, start, end)
+        
+        if strand is not None:
+            strands = self.arrays["gene_strands"][gene_ids]
+            gene_ids = gene_ids[strands == (1 if strand == "+" else -1)]
+        
+        total = len(gene_ids)
+        if limit is not None:
+            gene_ids = gene_ids[:limit]
+        return total, [self._gene(gene_id, accession) for gene_id in gene_ids.tolist()]
+    
+    def overlapping(self, record: int, start: int, end: int) -> np.ndarray:
+        """
+        Find the IDs of the genes with a part overlapping [start, end).
+        
+        Args:
+            record: Record index
+            start: Region start (0-based, inclusive)
+            end: Region end (exclusive)
+            
+        Returns:
+            Gene IDs sorted by gene start
+        """
+        first, last = self.arrays["record_offsets"][record:record + 2]
+        starts = self.arrays["part_starts"][first:last]
+        
+        hi = int(np.searchsorted(starts, end, side="left"))
+        lo = int(np.searchsorted(self.arrays["part_max_ends"][first:last], start, side="right"))
+        if lo >= hi:
+            return np.zeros(0, dtype=np.int64)
+        
+        hits = lo + np.flatnonzero(self.arrays["part_ends"][first + lo:first + hi] > start)
+        gene_ids = np.unique(self.arrays["part_genes"][first + hits])
+        return gene_ids[np.argsort(self.arrays["gene_starts"][gene_ids], kind="stable")]
+    
+    def _gene(self, gene_id: int, accession: str) -> Dict[str, Any]:
+        """Build the dictionary of one gene (PRIVATE)."""
+        gene = dict(zip(_TEXT_FIELDS, self.genes[gene_id]))
+        gene.update({
+            "start": int(self.arrays["gene_starts"][gene_id]),
+            "end": int(self.arrays["gene_ends"][gene_id]),
+            "length": int(self.arrays["gene_lengths"][gene_id]),
+            "gc_content": float(self.arrays["gene_gc_content"][gene_id]),
+            "strand": "+" if self.arrays["gene_strands"][gene_id] == 1 else "-",
+            "replicon": accession
+        })
+        return gene
+    
+    def __repr__(self):
+        return f"<FeatureIndex(records={len(self.records)}, genes={len(self.genes)})>"
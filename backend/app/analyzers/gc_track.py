@@ -0,0 +1,188 @@
+"""Multi-resolution GC content track built from cumulative base counts."""
+
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.sequence_chunks import add_binned_counts, chunk_binned_counts
+from app.analyzers.sequence_encoding import INVALID_CODE
+
+
+# Bin sizes of the zoom pyramid, finest first
+GC_TRACK_BIN_SIZES = (100, 1000, 10000, 100000)
+
+# Bins returned for a region when no bin size is requested
+DEFAULT_MAX_BINS = 2000
+
+# Byte value -> 0 for strong bases (G, C, S), 1 for weak bases (A, T, W),
+# INVALID_CODE for anything else
+_STRONG_WEAK_TABLE = bytes(
+    0 if chr(value) in "GCS" else 1 if chr(value) in "ATW" else INVALID_CODE
+    for value in range(256)
+)
+
+
+def _narrowest(counts: np.ndarray, bin_size: int) -> np.ndarray:
+    """Cast per-bin counts to the smallest unsigned dtype that holds bin_size (PRIVATE)."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if bin_size <= np.iinfo(dtype).max:
+            return counts.astype(dtype)
+    return counts.astype(np.uint64)
+
+
+def group_counts(counts: np.ndarray, group: int) -> np.ndarray:
+    """
+    Sum per-bin counts over consecutive groups of bins.
+    
+    Args:
+        counts: Count per bin
+        group: Bins per group; the last group may be shorter
+        
+    Returns:
+        Count per group
+    """
+    if len(counts) == 0:
+        return counts
+    return np.add.reduceat(counts, np.arange(0, len(counts), group))
+
+
+def build_gc_pyramid(context: GenomeContext, bin_sizes=GC_TRACK_BIN_SIZES) -> Dict[str, np.ndarray]:
+    """
+    Compute binned GC counts of a genome at every zoom level.
+    
+    The finest level is counted in one chunked pass over the sequence,
+    run in parallel when the context has a chunk pool, and every coarser
+    level is summed from it (see gc_pyramid).
+    
+    Args:
+        context: Parsed genome context
+        bin_sizes: Bin sizes of the levels, each a multiple of the finest
+        
+    Returns:
+        Arrays keyed as described in gc_pyramid
+        
+    Raises:
+        ValueError: If a bin size is not a multiple of the finest one
+    """
+    finest = min(bin_sizes)
+    counts = add_binned_counts(
+        context.map_chunks(chunk_binned_counts, finest, _STRONG_WEAK_TABLE), len(context), finest
+    )
+    return gc_pyramid(context.accession, len(context), counts[:, 0], counts[:, 0] + counts[:, 1], finest, bin_sizes)
+
+
+def gc_pyramid(accession: str, length: int, strong: np.ndarray, unambiguous: np.ndarray, bin_size: int,
+               bin_sizes=GC_TRACK_BIN_SIZES) -> Dict[str, np.ndarray]:
+    """
+    Build the zoom levels of a GC track from counts already binned.
+    
+    Every level is an exact sum of the given bins, so callers that count
+    the sequence for other purposes build the track without another pass.
+    Counts rather than percentages are kept, so any coarser view is an
+    exact sum too.
+    
+    Args:
+        accession: Replicon accession
+        length: Sequence length
+        strong: G, C and S bases per bin
+        unambiguous: Bases counted by gc_fraction (A, T, G, C, S and W)
+            per bin
+        bin_size: Bases per given bin
+        bin_sizes: Bin sizes of the levels, each a multiple of bin_size
+        
+    Returns:
+        Arrays keyed "<accession>/length", "<accession>/<bin size>/gc"
+        (G, C and S bases) and "<accession>/<bin size>/total" (bases
+        counted by gc_fraction)
+        
+    Raises:
+        ValueError: If a bin size is not a multiple of bin_size
+    """
+    if any(size % bin_size for size in bin_sizes):
+        raise ValueError(f"Bin sizes {bin_sizes} are not multiples of {bin_size}")
+    
+    arrays = {f"{accession}/length": np.array([length], dtype=np.int64)}
+    for size in bin_sizes:
+        group = size // bin_size
+        arrays[f"{accession}/{size}/gc"] = _narrowest(group_counts(strong, group), size)
+        arrays[f"{accession}/{size}/total"] = _narrowest(group_counts(unambiguous, group), size)
+    return arrays
+
+
+def track_accessions(arrays: Dict[str, np.ndarray]) -> List[str]:
+    """
+    List the replicons of a GC track artifact.
+    
+    Args:
+        arrays: Arrays from build_gc_pyramid
+        
+    Returns:
+        Accessions in storage order
+    """
+    return [key[:-len("/length")] for key in arrays if key.endswith("/length")]
+
+
+def track_bin_sizes(arrays: Dict[str, np.ndarray], accession: str) -> List[int]:
+    """
+    List the zoom levels stored for a replicon.
+    
+    Args:
+        arrays: Arrays from build_gc_pyramid
+        accession: Replicon accession
+        
+    Returns:
+        Bin sizes, finest first
+    """
+    prefix = f"{accession}/"
+    return sorted(
+        int(key[len(prefix):-len("/gc")])
+        for key in arrays if key.startswith(prefix) and key.endswith("/gc")
+    )
+
+
+def gc_track_region(arrays: Dict[str, np.ndarray], accession: str, start: int, end: int,
+                    bin_size: Optional[int] = None, max_bins: int = DEFAULT_MAX_BINS) -> Dict[str, Any]:
+    """
+    Read the GC content of a region at one zoom level.
+    
+    Args:
+        arrays: Arrays from build_gc_pyramid
+        accession: Replicon accession
+        start: Region start (0-based, inclusive)
+        end: Region end (exclusive, clipped to the replicon)
+        bin_size: Zoom level; defaults to the finest level that covers
+            the region in at most max_bins bins
+        max_bins: Bin budget used to pick the default level
+        
+    Returns:
+        Dictionary with the bin size, the bin-aligned region and the GC
+        percentage of each bin (None for bins without A, C, G or T)
+        
+    Raises:
+        KeyError: If the replicon or the bin size is not stored
+    """
+    if f"{accession}/length" not in arrays:
+        raise KeyError(f"Replicon {accession} not stored")
+    
+    levels = track_bin_sizes(arrays, accession)
+    if bin_size is None:
+        bin_size = next((size for size in levels if (end - start) / size <= max_bins), levels[-1])
+    elif bin_size not in levels:
+        raise KeyError(f"Bin size {bin_size} not stored")
+    
+    length = int(arrays[f"{accession}/length"][0])
+    end = min(end, length)
+    first = start // bin_size
+    last = max(-(-end // bin_size), first)
+    
+    gc = arrays[f"{accession}/{bin_size}/gc"][first:last].astype(np.float64)
+    total = arrays[f"{accession}/{bin_size}/total"][first:last].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.round(gc / total * 100, 2)
+    
+    return {
+        "bin_size": bin_size,
+        "start": first * bin_size,
+        "end": min(last * bin_size, length),
+        "gc_content": [None if count == 0 else value for count, value in zip(total.tolist(), percent.tolist())],
+        "bin_sizes": levels
+    }
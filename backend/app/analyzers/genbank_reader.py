@@ -0,0 +1,480 @@
+"""Streaming GenBank reader that avoids building BioPython objects."""
+
+import mmap
+import os
+import re
+from typing import Dict, List, Iterator, NamedTuple, Optional, Tuple
+from app.core.logging import logger
+
+
+# Bytes read per block while streaming the ORIGIN section
+ORIGIN_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Fold case while deleting line numbers and whitespace in a single pass
+_SEQUENCE_TABLE = bytes.maketrans(
+    b"abcdefghijklmnopqrstuvwxyz", b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+_SEQUENCE_DELETE = b"0123456789 \t\r\n"
+
+_PLAIN_RANGE = re.compile(r"^(complement\()?(\d+)\.\.(\d+)(?(1)\))$")
+_SIMPLE_LOCATION = re.compile(r"^([<>]?)(\d+)(?:(\.\.|\^)([<>]?)(\d+))?$")
+_LOCUS_LINE = re.compile(rb"^LOCUS", re.MULTILINE)
+
+# (start, end, strand) using 0-based, end-exclusive coordinates
+LocationPart = Tuple[int, int, int]
+
+
+class GenBankFeature(NamedTuple):
+    """
+    Compact feature table entry.
+    
+    Attributes:
+        type: Feature key (CDS, gene, source, ...)
+        location: Raw GenBank location string
+        parts: Location parts as (start, end, strand) tuples in biological
+            order, or None if the location could not be resolved
+        qualifiers: Qualifier values keyed by qualifier name
+    """
+    
+    type: str
+    location: str
+    parts: Optional[Tuple[LocationPart, ...]]
+    qualifiers: Dict[str, List[str]]
+    
+    @property
+    def start(self) -> int:
+        """Leftmost 0-based coordinate of the feature."""
+        return min(part[0] for part in self.parts)
+    
+    @property
+    def end(self) -> int:
+        """Rightmost end-exclusive coordinate of the feature."""
+        return max(part[1] for part in self.parts)
+    
+    @property
+    def strand(self) -> Optional[int]:
+        """Strand of the feature, or None when parts disagree."""
+        strands = {part[2] for part in self.parts}
+        return strands.pop() if len(strands) == 1 else None
+    
+    @property
+    def length(self) -> int:
+        """Number of bases covered by the joined feature parts."""
+        return sum(end - start for start, end, _ in self.parts)
+    
+    def location_string(self, sequence_length: int = None, circular: bool = False) -> str:
+        """
+        Format the location the way BioPython prints SeqFeature locations.
+        
+        Args:
+            sequence_length: Length of the record (for origin-spanning parts)
+            circular: Whether the record topology is circular
+            
+        Returns:
+            Location string such as "[189:255](+)" or "join{[0:10](-), ...}"
+        """
+        # Fast path for plain ranges, whose parts are already resolved
+        if self.parts is not None and len(self.parts) == 1 and _PLAIN_RANGE.match(self.location):
+            start, end, strand = self.parts[0]
+            return f"[{start}:{end}]({'+' if strand == 1 else '-'})"
+        
+        operator, parts = _parse_location(self.location.replace(" ", ""), sequence_length, circular)
+        formatted = [
+            f"[{start_mark}{start}:{end_mark}{end}]({'+' if strand == 1 else '-'})"
+            for start, end, strand, start_mark, end_mark in parts
+        ]
+        if len(formatted) == 1:
+            return formatted[0]
+        return f"{operator}{{{', '.join(formatted)}}}"
+
+
+class GenBankRecord:
+    """
+    GenBank record with an upper-cased byte sequence.
+    
+    Attributes:
+        name: LOCUS name
+        id: Accession with version (falls back to accession or LOCUS name)
+        description: DEFINITION line without the trailing period
+        circular: Whether the LOCUS line declares a circular topology
+        sequence: Upper-cased sequence bytes
+        features: Compact feature table
+    """
+    
+    def __init__(self, name: str, id: str, description: str, circular: bool,
+                 sequence: bytearray, features: List[GenBankFeature]):
+        """Initialize the record."""
+        self.name = name
+        self.id = id
+        self.description = description
+        self.circular = circular
+        self.sequence = sequence
+        self.features = features
+    
+    def __len__(self) -> int:
+        """Return the sequence length in base pairs."""
+        return len(self.sequence)
+    
+    def __repr__(self):
+        return f"<GenBankRecord(id='{self.id}', length={len(self)})>"
+
+
+def parse_location(text: str, sequence_length: int = None,
+                   circular: bool = False) -> Optional[Tuple[LocationPart, ...]]:
+    """
+    Resolve a GenBank location string into (start, end, strand) parts.
+    
+    Follows BioPython's conventions: 0-based end-exclusive coordinates,
+    complement(join(...)) parts listed in biological order, and
+    origin-spanning ranges split in two on circular records.
+    
+    Args:
+        text: GenBank location string
+        sequence_length: Length of the record
+        circular: Whether the record topology is circular
+        
+    Returns:
+        Tuple of location parts, or None for unsupported locations
+        (remote references, nested operators, malformed ranges)
+    """
+    # Fast path for the plain ranges that make up most feature tables
+    match = _PLAIN_RANGE.match(text)
+    if match is not None:
+        start, end = int(match.group(2)) - 1, int(match.group(3))
+        if start <= end:
+            return ((start, end, -1 if match.group(1) else 1),)
+    
+    try:
+        _, parts = _parse_location(text.replace(" ", ""), sequence_length, circular)
+    except ValueError:
+        return None
+    return tuple((start, end, strand) for start, end, strand, _, _ in parts)
+
+
+def _parse_location(text: str, sequence_length: Optional[int], circular: bool):
+    """Parse a location into (operator, parts with fuzzy markers) (PRIVATE)."""
+    if text.startswith("complement(") and text.endswith(")"):
+        operator, parts = _parse_location(text[11:-1], sequence_length, circular)
+        if any(part[2] == -1 for part in parts):
+            raise ValueError(f"double complement in '{text}'")
+        return operator, [
+            (start, end, -1, start_mark, end_mark)
+            for start, end, _, start_mark, end_mark in reversed(parts)
+        ]
+    
+    for operator in ("join", "order"):
+        if text.startswith(operator + "(") and text.endswith(")"):
+            parts = []
+            for piece in _split_top_level(text[len(operator) + 1:-1]):
+                if piece.startswith(("join(", "order(")):
+                    raise ValueError(f"nested operators in '{text}'")
+                parts.extend(_parse_location(piece, sequence_length, circular)[1])
+            return operator, parts
+    
+    match = _SIMPLE_LOCATION.match(text)
+    if match is None:
+        raise ValueError(f"unsupported feature location '{text}'")
+    
+    start_mark, first, separator, end_mark, last = match.groups()
+    if separator is None:
+        return "join", [(int(first) - 1, int(first), 1, start_mark, "")]
+    
+    start, end = int(first), int(last)
+    if separator == "^":
+        if not (start + 1 == end or (start == sequence_length and end == 1)):
+            raise ValueError(f"invalid feature location '{text}'")
+        return "join", [(start, start, 1, "", "")]
+    
+    start -= 1
+    if start > end:
+        if not circular or sequence_length is None:
+            raise ValueError(f"feature '{text}' spans the origin of a linear record")
+        return "join", [
+            (start, sequence_length, 1, start_mark, ""),
+            (0, end, 1, "", end_mark),
+        ]
+    
+    return "join", [(start, end, 1, start_mark, end_mark)]
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split a comma separated location list, ignoring nested commas (PRIVATE)."""
+    pieces = []
+    depth = 0
+    begin = 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            pieces.append(text[begin:i])
+            begin = i + 1
+    pieces.append(text[begin:])
+    return pieces
+
+
+class GenBankReader:
+    """
+    Streaming reader for GenBank flat files.
+    
+    The ORIGIN block is read in large binary blocks and folded to upper
+    case straight into a buffer preallocated from the LOCUS length, so the
+    genome is never held as intermediate Python strings. The FEATURES
+    table is parsed into compact GenBankFeature tuples instead of
+    BioPython SeqFeature objects. Protein translations are skipped since
+    no analyzer needs them.
+    """
+    
+    def __init__(self, genbank_file: str):
+        """
+        Initialize the reader.
+        
+        Args:
+            genbank_file: Path to GenBank file
+        """
+        self.genbank_file = str(genbank_file)
+    
+    def __iter__(self) -> Iterator[GenBankRecord]:
+        """Yield the records of the file one at a time."""
+        with open(self.genbank_file, "rb") as handle:
+            while True:
+                line = handle.readline()
+                if not line:
+                    return
+                if line.startswith(b"LOCUS"):
+                    yield self._read_record(handle, line.decode("latin-1"))
+    
+    def read(self) -> GenBankRecord:
+        """
+        Read a file that must contain exactly one record.
+        
+        Returns:
+            The single GenBankRecord of the file
+        """
+        records = iter(self)
+        try:
+            record = next(records)
+        except StopIteration:
+            raise ValueError(f"No records found in {self.genbank_file}")
+        if next(records, None) is not None:
+            raise ValueError(f"More than one record found in {self.genbank_file}")
+        return record
+    
+    def record_offsets(self) -> List[int]:
+        """
+        Find the byte offset of every LOCUS line without parsing the records.
+        
+        Returns:
+            Byte offsets of the records, in file order
+        """
+        if os.path.getsize(self.genbank_file) == 0:
+            return []
+        
+        with open(self.genbank_file, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return [match.start() for match in _LOCUS_LINE.finditer(mapped)]
+    
+    def read_at(self, offset: int) -> GenBankRecord:
+        """
+        Read the single record whose LOCUS line starts at a byte offset.
+        
+        Args:
+            offset: Byte offset returned by record_offsets
+            
+        Returns:
+            Parsed GenBankRecord
+        """
+        with open(self.genbank_file, "rb") as handle:
+            handle.seek(offset)
+            line = handle.readline()
+            if not line.startswith(b"LOCUS"):
+                raise ValueError(f"No LOCUS line at offset {offset} of {self.genbank_file}")
+            return self._read_record(handle, line.decode("latin-1"))
+    
+    def _read_record(self, handle, locus_line: str) -> GenBankRecord:
+        """Read one record starting after its LOCUS line (PRIVATE)."""
+        locus_fields = locus_line.split()
+        name = locus_fields[1] if len(locus_fields) > 1 else ""
+        expected_length = 0
+        if len(locus_fields) > 2 and locus_fields[2].isdigit():
+            expected_length = int(locus_fields[2])
+        circular = "circular" in locus_line[:80].lower()
+        
+        header = {}
+        current_key = None
+        features: List[GenBankFeature] = []
+        sequence = bytearray()
+        
+        while True:
+            raw = handle.readline()
+            if not raw:
+                logger.warning(f"Premature end of file in {self.genbank_file}")
+                break
+            line = raw.decode("latin-1").rstrip("\r\n")
+            
+            if line.startswith("//"):
+                break
+            if line.startswith("FEATURES"):
+                line = self._read_features(handle, features, expected_length, circular)
+                if line is None or line.startswith("//"):
+                    break
+            if line.startswith("ORIGIN"):
+                sequence = self._read_origin(handle, expected_length)
+                break
+            
+            if line[:1] not in ("", " "):
+                current_key = line[:12].strip()
+                header[current_key] = line[12:].strip()
+            elif current_key and line.startswith(" " * 12):
+                header[current_key] += " " + line.strip()
+        
+        accession = header.get("ACCESSION", "").split()
+        version = header.get("VERSION", "").split()
+        record_id = version[0] if version else (accession[0] if accession else name)
+        description = header.get("DEFINITION", "")
+        if description.endswith("."):
+            description = description[:-1]
+        
+        if expected_length and expected_length != len(sequence):
+            logger.warning(
+                f"Expected sequence length {expected_length}, found {len(sequence)} ({record_id})"
+            )
+        
+        return GenBankRecord(name, record_id, description, circular, sequence, features)
+    
+    def _read_features(self, handle, features: List[GenBankFeature],
+                       sequence_length: int, circular: bool) -> Optional[str]:
+        """
+        Parse the feature table into features (PRIVATE).
+        
+        Returns:
+            The first line after the feature table, or None at end of file
+        """
+        key = None
+        lines: List[str] = []
+        
+        while True:
+            raw = handle.readline()
+            if not raw:
+                line = None
+                break
+            line = raw.decode("latin-1").rstrip("\r\n")
+            if line[:1] not in ("", " "):
+                break
+            if line[5:6] != " " and line[:5] == "     ":
+                if key is not None:
+                    features.append(self._build_feature(key, lines, sequence_length, circular))
+                key = line[5:21].strip()
+                lines = [line[21:].strip()]
+            elif key is not None and line.strip():
+                lines.append(line[21:].strip())
+        
+        if key is not None:
+            features.append(self._build_feature(key, lines, sequence_length, circular))
+        return line
+    
+    def _build_feature(self, key: str, lines: List[str], sequence_length: int,
+                       circular: bool) -> GenBankFeature:
+        """Build a compact feature from its location and qualifier lines (PRIVATE)."""
+        location = lines[0]
+        index = 1
+        while index < len(lines) and not lines[index].startswith("/") and (
+            location.endswith(",") or location.count("(") > location.count(")")
+            or lines[index].startswith(")")
+        ):
+            location += lines[index]
+            index += 1
+        
+        qualifiers: Dict[str, List[str]] = {}
+        name = None
+        value = None
+        for line in lines[index:]:
+            if line.startswith("/") and (value is None or _is_closed(value)):
+                if name is not None:
+                    _add_qualifier(qualifiers, name, value)
+                qualifier, equals, value = line[1:].partition("=")
+                name = qualifier
+                if not equals:
+                    value = None
+            elif name is not None and value is not None:
+                value += "\n" + line
+        if name is not None:
+            _add_qualifier(qualifiers, name, value)
+        
+        parts = parse_location(location, sequence_length or None, circular)
+        if parts is None:
+            logger.warning(f"Unsupported feature location '{location}'; location ignored")
+        return GenBankFeature(key, location, parts, qualifiers)
+    
+    def _read_origin(self, handle, expected_length: int) -> bytearray:
+        """Stream the ORIGIN block into an upper-cased byte buffer (PRIVATE)."""
+        sequence = bytearray(expected_length)
+        position = 0
+        previous = b"\n"
+        
+        while True:
+            block = handle.read(ORIGIN_BLOCK_SIZE)
+            if not block:
+                logger.warning(f"Premature end of file in sequence data of {self.genbank_file}")
+                break
+            
+            # The terminator may straddle blocks: look behind by two bytes
+            terminator = (previous + block).find(b"\n//")
+            if terminator >= 0:
+                # Offset of its first slash in the block; -1 if that slash
+                # ended the previous block and was already copied
+                terminator += 1 - len(previous)
+                if terminator < 0:
+                    position -= 1
+                    terminator = 0
+            data = block if terminator < 0 else block[:terminator]
+            chunk = data.translate(_SEQUENCE_TABLE, _SEQUENCE_DELETE)
+            sequence[position:position + len(chunk)] = chunk
+            position += len(chunk)
+            
+            if terminator >= 0:
+                # Rewind to the line following the // terminator
+                line_end = block.find(b"\n", terminator)
+                if line_end < 0:
+                    handle.readline()
+                else:
+                    handle.seek(line_end + 1 - len(block), os.SEEK_CUR)
+                break
+            previous = (previous + block)[-2:]
+        
+        del sequence[position:]
+        return sequence
+
+
+def _is_closed(value: str) -> bool:
+    """Check whether a qualifier value has its closing quote (PRIVATE)."""
+    if not value.startswith('"'):
+        return True
+    return len(value) > 1 and value.endswith('"') and (len(value) - len(value.rstrip('"'))) % 2 == 1
+
+
+def _add_qualifier(qualifiers: Dict[str, List[str]], name: str, value: Optional[str]):
+    """Store a qualifier value the way BioPython does (PRIVATE)."""
+    if name == "translation":
+        return
+    if value is None:
+        qualifiers.setdefault(name, [""])
+        return
+    value = value.replace("\n", " ")
+    if len(value) > 1 and value[0] == '"' and value[-1] == '"':
+        value = value[1:-1]
+    qualifiers.setdefault(name, []).append(value.replace('""', '"'))
+
+
+def read_genbank(genbank_file: str) -> GenBankRecord:
+    """
+    Read a single-record GenBank file.
+    
+    Args:
+        genbank_file: Path to GenBank file
+        
+    Returns:
+        Parsed GenBankRecord
+    """
+    return GenBankReader(genbank_file).read()
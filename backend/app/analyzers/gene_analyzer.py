@@ -1,10 +1,12 @@
 """Gene analyzer for extracting and analyzing genes from GenBank files."""
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import statistics
-from Bio import SeqIO
-from Bio.SeqUtils import gc_fraction
+import numpy as np
 from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.genbank_reader import GenBankFeature
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.sequence_chunks import range_symbol_counts
 from app.core.logging import logger
 
 
@@ -17,25 +19,36 @@ class GeneAnalyzer(BaseAnalyzer):
     - Gene lengths
     - GC content per gene
     - Gene statistics (mean, median, etc.)
+    
+    Results keep only the first 50 genes; the full gene list of the last
+    analysis is kept on the genes attribute for the gene table.
     """
     
-    def analyze(self, genbank_file: str) -> Dict[str, Any]:
+    name = "gene_stats"
+    version = "1"
+    
+    def __init__(self):
+        """Initialize gene analyzer."""
+        super().__init__()
+        self.genes: List[Dict[str, Any]] = []
+    
+    def analyze_record(self, context: GenomeContext) -> Dict[str, Any]:
         """
-        Analyze genes in a GenBank file.
+        Analyze genes in a parsed genome.
         
         Args:
-            genbank_file: Path to GenBank file
+            context: Parsed genome context
             
         Returns:
             Dictionary with gene analysis results
         """
-        if not self.validate_file(genbank_file):
-            raise FileNotFoundError(f"GenBank file not found: {genbank_file}")
-        
-        logger.info(f"Starting gene analysis for {genbank_file}")
+        logger.info(f"Starting gene analysis for {context.accession}")
         
         # Extract genes
-        genes = self.extract_genes(genbank_file)
+        genes = self.extract_genes(context)
+        for gene in genes:
+            gene["replicon"] = context.accession
+        self.genes = genes
         
         # Calculate statistics
         stats = self.calculate_gene_statistics(genes)
@@ -49,43 +62,143 @@ class GeneAnalyzer(BaseAnalyzer):
         logger.info(f"Gene analysis completed. Found {len(genes)} genes")
         return results
     
-    def extract_genes(self, genbank_file: str) -> List[Dict[str, Any]]:
+    def analyze_replicon(self, context: GenomeContext) -> Dict[str, Any]:
         """
-        Extract all genes from GenBank file.
+        Extract all genes of one replicon.
+        
+        Gene statistics include medians, which cannot be merged from
+        per-replicon statistics, so the full gene list is returned.
         
         Args:
-            genbank_file: Path to GenBank file
+            context: Parsed genome context of a single replicon
             
         Returns:
-            List of gene dictionaries
+            Dictionary with the replicon's genes
+        """
+        return {"genes": self.extract_genes(context)}
+    
+    def merge_results(self, partials: List[Dict[str, Any]], accessions: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-replicon gene lists into genome-level statistics.
+        
+        Args:
+            partials: Results of analyze_replicon, in record order
+            accessions: Accession of each replicon, in record order
+            
+        Returns:
+            Dictionary with gene analysis results
         """
-        record = SeqIO.read(genbank_file, "genbank")
         genes = []
+        replicons = []
+        
+        for accession, partial in zip(accessions, partials):
+            replicon_genes = partial["genes"]
+            for gene in replicon_genes:
+                gene["replicon"] = accession
+            
+            replicons.append({
+                "accession": accession,
+                "total_genes": len(replicon_genes),
+                "statistics": self.calculate_gene_statistics(replicon_genes)
+            })
+            genes.extend(replicon_genes)
+        
+        self.genes = genes
+        return {
+            "genes": genes[:50],  # Store first 50 genes to avoid huge data
+            "total_genes": len(genes),
+            "statistics": self.calculate_gene_statistics(genes),
+            "replicons": replicons
+        }
+    
+    def cds_features(self, context: GenomeContext) -> List[GenBankFeature]:
+        """
+        Select the CDS features that extract_genes reports, in the same order.
         
-        for feature in record.features:
+        Args:
+            context: Parsed genome context
+            
+        Returns:
+            CDS features with a supported location
+        """
+        cds_features = []
+        for feature in context.features:
             if feature.type == "CDS":  # Coding DNA Sequence
-                try:
-                    # Extract sequence
-                    sequence = feature.extract(record.seq)
-                    
-                    # Get gene information
-                    gene_info = {
-                        "gene_name": feature.qualifiers.get("gene", ["Unknown"])[0],
-                        "locus_tag": feature.qualifiers.get("locus_tag", [""])[0],
-                        "product": feature.qualifiers.get("product", ["Unknown protein"])[0],
-                        "location": str(feature.location),
-                        "start": int(feature.location.start),
-                        "end": int(feature.location.end),
-                        "length": len(sequence),
-                        "gc_content": round(gc_fraction(sequence) * 100, 2),
-                        "strand": "+" if feature.location.strand == 1 else "-"
-                    }
-                    
-                    genes.append(gene_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Error extracting gene: {e}")
+                if feature.parts is None:
+                    logger.warning(f"Error extracting gene: unsupported location '{feature.location}'")
                     continue
+                cds_features.append(feature)
+        return cds_features
+    
+    def extract_genes(self, source: Union[str, GenomeContext]) -> List[Dict[str, Any]]:
+        """
+        Extract all genes from a genome.
+        
+        Lengths and GC content of every CDS, including joined and
+        reverse-strand locations, are computed in one batch from
+        cumulative G+C counts without copying gene sequences. The
+        cumulative counts are cached on the context (see
+        GenomeContext.cumulative_counts); in chunked mode they are built
+        per chunk instead.
+        
+        Args:
+            source: Path to GenBank file or parsed genome context
+            
+        Returns:
+            List of gene dictionaries
+        """
+        if not isinstance(source, GenomeContext):
+            with self.load_context(source) as context:
+                return self.extract_genes(context)
+        
+        context = source
+        cds_features = self.cds_features(context)
+        
+        if not cds_features:
+            return []
+        
+        # Flatten the parts of every CDS; strand does not change length or GC
+        length = len(context)
+        parts = np.array([part for f in cds_features for part in f.parts], dtype=np.int64).reshape(-1, 3)
+        owners = np.repeat(np.arange(len(cds_features)), [len(f.parts) for f in cds_features])
+        part_starts = np.clip(parts[:, 0], 0, length)
+        part_ends = np.maximum(np.clip(parts[:, 1], 0, length), part_starts)
+        
+        # Same counts as gc_fraction: G, C, S over A, T, G, C, S, W
+        symbol_sets = ("GCS", "ATGCSW")
+        if context.chunked:
+            # Prefix sums per chunk, never a genome-length array
+            strong, unambiguous = range_symbol_counts(context.chunks(), part_starts, part_ends, symbol_sets)
+        else:
+            strong, unambiguous = (
+                np.asarray(counts[part_ends], dtype=np.int64) - counts[part_starts]
+                for counts in map(context.cumulative_counts, symbol_sets)
+            )
+        
+        def per_gene(values: np.ndarray) -> List[int]:
+            return np.bincount(owners, weights=values, minlength=len(cds_features)).astype(np.int64).tolist()
+        
+        gene_lengths = np.bincount(
+            owners, weights=part_ends - part_starts, minlength=len(cds_features)
+        ).astype(np.int64).tolist()
+        gc_counts = per_gene(strong)
+        gc_totals = per_gene(unambiguous)
+        
+        genes = []
+        for feature, gene_length, gc_count, gc_total in zip(cds_features, gene_lengths, gc_counts, gc_totals):
+            gc = gc_count / gc_total if gc_total else 0
+            
+            genes.append({
+                "gene_name": feature.qualifiers.get("gene", ["Unknown"])[0],
+                "locus_tag": feature.qualifiers.get("locus_tag", [""])[0],
+                "product": feature.qualifiers.get("product", ["Unknown protein"])[0],
+                "location": feature.location_string(length, context.circular),
+                "start": feature.start,
+                "end": feature.end,
+                "length": gene_length,
+                "gc_content": round(gc * 100, 2),
+                "strand": "+" if feature.strand == 1 else "-"
+            })
         
         return genes
     
@@ -1,12 +1,93 @@
 """Genome analyzer for calculating genome-wide statistics."""
 
-from typing import Dict, Any
-from Bio import SeqIO
-from Bio.SeqUtils import gc_fraction
+import math
+import re
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union
+import numpy as np
 from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.gc_track import GC_TRACK_BIN_SIZES, gc_pyramid, group_counts
+from app.analyzers.intervals import covered_length
+from app.analyzers.sequence_chunks import SequenceChunk, add_binned_counts, chunk_binned_counts
+from app.analyzers.sequence_encoding import IUPAC_SYMBOLS, symbol_counts
+from app.analyzers.genome_context import GenomeContext
 from app.core.logging import logger
 
 
+# End of a run of N (assembly gap)
+_GAP_END = re.compile(rb"[^N]")
+
+# Maximum number of gap runs listed in the composition
+GAP_RUN_LIMIT = 1000
+
+# Byte value -> 1 for upper-case G and C, 0 otherwise
+_GC_TABLE = bytes(1 if chr(value) in "GC" else 0 for value in range(256))
+
+# Symbols counted per bin by GenomeAnalyzer.scan: the bases (skew) plus S
+# and W, which gc_fraction also counts (GC track)
+BINNED_SYMBOLS = "ACGTSW"
+
+# Symbols classified by the scan; N is only totalled, to find gaps
+_SCAN_SYMBOLS = BINNED_SYMBOLS + "N"
+_SCAN_CODES = np.frombuffer(_SCAN_SYMBOLS.encode(), dtype=np.uint8)
+_SCAN_TABLE = bytes(
+    _SCAN_SYMBOLS.index(chr(value)) if chr(value) in _SCAN_SYMBOLS else len(_SCAN_SYMBOLS)
+    for value in range(256)
+)
+
+
+def _skew(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Skew (first - second) / (first + second), 0 where both are 0 (PRIVATE)."""
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    total = first + second
+    return np.divide(first - second, total, out=np.zeros_like(total), where=total > 0)
+
+
+def _gap_runs(sequence: Union[bytes, bytearray]) -> List[Tuple[int, int]]:
+    """Find runs of N with memchr-backed searches instead of a regex scan (PRIVATE)."""
+    runs = []
+    start = sequence.find(b"N")
+    while start != -1:
+        match = _GAP_END.search(sequence, start)
+        end = match.start() if match else len(sequence)
+        runs.append((start, end))
+        start = sequence.find(b"N", end)
+    return runs
+
+
+def chunk_genome_counts(chunk: SequenceChunk, bin_size: int) -> Tuple[int, np.ndarray, np.ndarray, List[Tuple[int, int]]]:
+    """
+    Count the symbols of one chunk per bin and find its runs of N.
+    
+    This is the map step of GenomeAnalyzer.scan. Symbols are counted in
+    one binned pass; every byte value is counted separately only when
+    the chunk holds symbols other than A, C, G, T, S, W and N, and runs
+    of N are searched only when the counts show N is present.
+    
+    Args:
+        chunk: Chunk to count, without overlap
+        bin_size: Bases per bin
+        
+    Returns:
+        Tuple of (index of the first bin touched, A, C, G, T, S and W
+        counts of shape (bins, 6), count of each byte value, N runs as
+        (start, end) in sequence coordinates)
+    """
+    first, binned = chunk_binned_counts(chunk, bin_size, _SCAN_TABLE, len(_SCAN_SYMBOLS))
+    totals = binned.sum(axis=0)
+    
+    if totals.sum() < chunk.owned:
+        counts = symbol_counts(chunk.sequence)
+    else:
+        counts = np.zeros(256, dtype=np.int64)
+        counts[_SCAN_CODES] = totals
+    
+    runs = []
+    if totals[_SCAN_SYMBOLS.index("N")]:
+        runs = [(start + chunk.start, end + chunk.start) for start, end in _gap_runs(chunk.sequence)]
+    return first, binned[:, :len(BINNED_SYMBOLS)], counts, runs
+
+
 class GenomeAnalyzer(BaseAnalyzer):
     """
     Analyzer for genome-wide statistics.
@@ -14,96 +95,425 @@ class GenomeAnalyzer(BaseAnalyzer):
     Analyzes:
     - Genome size
     - GC content
-    - Nucleotide composition
-    - Coding density
+    - Nucleotide composition, including IUPAC ambiguity codes and gaps
+    - Coding length and non-redundant coding coverage, per strand
+    - GC content track (binned at several zoom levels, saved as the
+      "gc_track" artifact)
+    - GC and AT skew, cumulative GC skew and the predicted replication
+      origin and terminus
+    
+    The composition, the skew windows and the GC track all come from the
+    same binned symbol counts (see scan), so the sequence is read once.
     """
     
-    def analyze(self, genbank_file: str) -> Dict[str, Any]:
+    name = "genome_stats"
+    version = "1"
+    outputs = ("gc_track",)
+    
+    def __init__(self, skew_window_size: int = 1000, skew_track_points: int = 500, acgt_only: bool = False):
         """
-        Analyze genome-wide statistics.
+        Initialize the genome analyzer.
         
         Args:
-            genbank_file: Path to GenBank file
+            skew_window_size: Window size of the skew calculation in bp
+            skew_track_points: Maximum number of points of the skew track
+            acgt_only: Express A, C, G and T percentages over A+C+G+T
+                instead of the full sequence length
+        """
+        super().__init__()
+        self.acgt_only = acgt_only
+        self.skew_window_size = skew_window_size
+        self.skew_track_points = skew_track_points
+    
+    def analyze_record(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Analyze genome-wide statistics of a parsed genome.
+        
+        Args:
+            context: Parsed genome context
             
         Returns:
             Dictionary with genome statistics
         """
-        if not self.validate_file(genbank_file):
-            raise FileNotFoundError(f"GenBank file not found: {genbank_file}")
-        
-        logger.info(f"Starting genome analysis for {genbank_file}")
-        
-        # Read GenBank file
-        record = SeqIO.read(genbank_file, "genbank")
+        logger.info(f"Starting genome analysis for {context.accession}")
         
         # Calculate statistics
-        stats = self.calculate_genome_stats(record)
+        scan = self.scan(context)
+        stats = self.calculate_genome_stats(context, scan)
+        
+        # GC track for every zoom level, served by the GC track endpoint
+        counts = scan["counts"]
+        strong = counts[:, 1] + counts[:, 2] + counts[:, 4]
+        self.artifacts = {
+            "gc_track": gc_pyramid(context.accession, len(context), strong, counts.sum(axis=1), scan["bin_size"])
+        }
         
         logger.info("Genome analysis completed")
         return stats
     
-    def calculate_genome_stats(self, record) -> Dict[str, Any]:
+    def scan(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Count the symbols of a genome in one chunked pass.
+        
+        Bins are the largest size dividing both the skew window and the
+        finest GC track level, so both are exact sums of them.
+        
+        Args:
+            context: Parsed genome context
+            
+        Returns:
+            Dictionary with the "bin_size", the "counts" of A, C, G, T, S
+            and W per bin (shape (bins, 6)) and the nucleotide
+            "composition"
+        """
+        bin_size = math.gcd(self.skew_window_size, min(GC_TRACK_BIN_SIZES))
+        partials = context.map_chunks(chunk_genome_counts, bin_size)
+        
+        return {
+            "bin_size": bin_size,
+            "counts": add_binned_counts(
+                ((first, binned) for first, binned, _, _ in partials), len(context), bin_size,
+                classes=len(BINNED_SYMBOLS)
+            ),
+            "composition": self._composition_from_partials(
+                ((counts, runs) for _, _, counts, runs in partials), len(context)
+            )
+        }
+    
+    def calculate_genome_stats(self, context: GenomeContext, scan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Calculate comprehensive genome statistics.
         
         Args:
-            record: BioPython SeqRecord object
+            context: Parsed genome context
+            scan: Symbol counts of the genome from scan, counted here if
+                not given
             
         Returns:
             Dictionary with genome statistics
         """
-        sequence = str(record.seq).upper()
+        scan = scan or self.scan(context)
         
         # Basic stats
-        genome_size = len(sequence)
-        gc_content = gc_fraction(record.seq) * 100
+        genome_size = len(context)
+        
+        # Nucleotide composition, from the binned counting pass
+        composition = scan["composition"]
         
-        # Nucleotide composition
-        composition = self._calculate_composition(sequence)
+        # Same definition as gc_fraction: G, C, S over A, T, G, C, S, W
+        strong, weak = self._strong_weak_counts(composition)
+        gc_content = (strong / (strong + weak) * 100) if strong + weak > 0 else 0
         
         # Count genes
-        gene_count = sum(1 for f in record.features if f.type == "CDS")
+        gene_count = sum(1 for f in context.features if f.type == "CDS")
         
-        # Calculate coding length
-        coding_length = sum(
-            len(f.extract(record.seq)) 
-            for f in record.features 
-            if f.type == "CDS"
-        )
+        # Summed CDS length and non-redundant coverage, from coordinates only
+        coverage = self.calculate_coding_coverage(context)
+        coding_length = coverage["summed_length"]["total"]
         
-        # Coding density
-        coding_density = (coding_length / genome_size * 100) if genome_size > 0 else 0
+        # Coding density over bases covered by at least one CDS, so
+        # overlapping genes are not counted twice
+        coding_density = (coverage["covered_length"]["total"] / genome_size * 100) if genome_size > 0 else 0
         
         stats = {
-            "organism": record.description,
-            "accession": record.id,
+            "organism": context.description,
+            "accession": context.accession,
             "genome_size": genome_size,
             "gc_content": round(gc_content, 2),
             "nucleotide_composition": composition,
             "gene_count": gene_count,
             "coding_length": coding_length,
+            "coding_coverage": coverage,
             "coding_density": round(coding_density, 2),
-            "average_gene_length": round(coding_length / gene_count, 2) if gene_count > 0 else 0
+            "average_gene_length": round(coding_length / gene_count, 2) if gene_count > 0 else 0,
+            "skew": self.calculate_skew(context, scan)
         }
         
         return stats
     
-    def _calculate_composition(self, sequence: str) -> Dict[str, Any]:
+    def analyze_replicon(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Analyze one replicon, keeping the base counts behind its GC content.
+        
+        Args:
+            context: Parsed genome context of a single replicon
+            
+        Returns:
+            Dictionary with the replicon statistics and its strong (G, C, S)
+            and weak (A, T, W) base counts
+        """
+        stats = self.analyze_record(context)
+        strong, weak = self._strong_weak_counts(stats["nucleotide_composition"])
+        
+        return {
+            "stats": stats,
+            "strong_count": strong,
+            "weak_count": weak
+        }
+    
+    def merge_results(self, partials: List[Dict[str, Any]], accessions: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-replicon statistics into genome-level totals.
+        
+        Args:
+            partials: Results of analyze_replicon, in record order
+            accessions: Accession of each replicon, in record order
+            
+        Returns:
+            Dictionary with genome statistics and a per-replicon breakdown
+        """
+        replicon_stats = [p["stats"] for p in partials]
+        
+        genome_size = sum(s["genome_size"] for s in replicon_stats)
+        gene_count = sum(s["gene_count"] for s in replicon_stats)
+        coding_length = sum(s["coding_length"] for s in replicon_stats)
+        coverage = {
+            key: {
+                strand: sum(s["coding_coverage"][key][strand] for s in replicon_stats)
+                for strand in ("total", "+", "-")
+            }
+            for key in ("summed_length", "covered_length")
+        }
+        coverage["overlap_length"] = sum(s["coding_coverage"]["overlap_length"] for s in replicon_stats)
+        
+        # Same definition as gc_fraction, over all replicons together
+        strong = sum(p["strong_count"] for p in partials)
+        gc_bases = strong + sum(p["weak_count"] for p in partials)
+        gc_content = (strong / gc_bases * 100) if gc_bases > 0 else 0
+        
+        counts = {}
+        gaps = []
+        for accession, s in zip(accessions, replicon_stats):
+            for symbol, count in self._symbol_counts(s["nucleotide_composition"]).items():
+                counts[symbol] = counts.get(symbol, 0) + count
+            gaps.extend(
+                {"replicon": accession, "start": run["start"], "end": run["end"]}
+                for run in s["nucleotide_composition"]["gaps"]["runs"]
+            )
+        gap_summary = {
+            "count": sum(s["nucleotide_composition"]["gaps"]["count"] for s in replicon_stats),
+            "total_length": sum(s["nucleotide_composition"]["gaps"]["total_length"] for s in replicon_stats),
+            "runs": gaps[:GAP_RUN_LIMIT]
+        }
+        
+        coding_density = (coverage["covered_length"]["total"] / genome_size * 100) if genome_size > 0 else 0
+        
+        replicons = [
+            {
+                "accession": accession,
+                "organism": s["organism"],
+                "genome_size": s["genome_size"],
+                "gc_content": s["gc_content"],
+                "gene_count": s["gene_count"],
+                "coding_density": s["coding_density"],
+                "skew": s["skew"]
+            }
+            for accession, s in zip(accessions, replicon_stats)
+        ]
+        
+        return {
+            "organism": replicon_stats[0]["organism"],
+            "accession": replicon_stats[0]["accession"],
+            "genome_size": genome_size,
+            "gc_content": round(gc_content, 2),
+            "nucleotide_composition": self._composition_from_counts(counts, genome_size, gap_summary),
+            "gene_count": gene_count,
+            "coding_length": coding_length,
+            "coding_coverage": coverage,
+            "coding_density": round(coding_density, 2),
+            "average_gene_length": round(coding_length / gene_count, 2) if gene_count > 0 else 0,
+            "skew": replicon_stats[0]["skew"],  # Skew is per replicon; report the first (chromosome)
+            "replicon_count": len(replicons),
+            "replicons": replicons
+        }
+    
+    def calculate_coding_coverage(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Measure how much of the genome is coding, per strand.
+        
+        Works on the CDS part coordinates alone. The summed length adds up
+        every CDS, so overlapping genes count twice; the covered length is
+        the size of the union of the CDS parts, found with a sorted sweep.
+        
+        Args:
+            context: Parsed genome context
+            
+        Returns:
+            Dictionary with "summed_length" and "covered_length" (each
+            with "total", "+" and "-") and "overlap_length", the bases
+            counted more than once in the summed total
+        """
+        rows = [part for f in context.features if f.type == "CDS" and f.parts is not None for part in f.parts]
+        parts = np.array(rows, dtype=np.int64).reshape(-1, 3)
+        starts = np.clip(parts[:, 0], 0, len(context))
+        ends = np.clip(parts[:, 1], 0, len(context))
+        lengths = parts[:, 1] - parts[:, 0]
+        
+        summed = {"total": int(lengths.sum())}
+        covered = {"total": covered_length(starts, ends)}
+        for strand, value in (("+", 1), ("-", -1)):
+            on_strand = parts[:, 2] == value
+            summed[strand] = int(lengths[on_strand].sum())
+            covered[strand] = covered_length(starts[on_strand], ends[on_strand])
+        
+        return {
+            "summed_length": summed,
+            "covered_length": covered,
+            "overlap_length": summed["total"] - covered["total"]
+        }
+    
+    def calculate_skew(self, context: GenomeContext, scan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Calculate windowed GC and AT skew and the cumulative GC skew.
+        
+        Window base counts are summed from the binned counts of scan. The
+        cumulative GC skew reaches its minimum at the replication origin
+        and its maximum at the terminus, which are reported at window
+        resolution.
+        
+        Args:
+            context: Parsed genome context
+            scan: Symbol counts of the genome from scan, counted here if
+                not given
+            
+        Returns:
+            Dictionary with the window size, the predicted origin and
+            terminus, and a downsampled track of GC skew, AT skew and
+            cumulative GC skew for charting
+        """
+        scan = scan or self.scan(context)
+        window_size = self.skew_window_size
+        counts = group_counts(scan["counts"][:, :4], window_size // scan["bin_size"])
+        a, c, g, t = counts.T
+        
+        gc_skew = _skew(g, c)
+        cumulative = np.cumsum(gc_skew)
+        
+        result = {
+            "window_size": window_size,
+            "window_count": len(counts),
+            "gc_skew": round(float(_skew(g.sum(), c.sum())), 4),
+            "at_skew": round(float(_skew(a.sum(), t.sum())), 4),
+            "origin": None,
+            "terminus": None,
+            "track": {"bin_size": window_size, "positions": [], "gc_skew": [], "at_skew": [], "cumulative_gc_skew": []}
+        }
+        if len(counts) == 0:
+            return result
+        
+        length = len(context)
+        for key, window in (("origin", int(np.argmin(cumulative))), ("terminus", int(np.argmax(cumulative)))):
+            result[key] = {
+                "position": min((window + 1) * window_size, length),
+                "cumulative_gc_skew": round(float(cumulative[window]), 4)
+            }
+        
+        # Downsample by summing whole groups of windows; cumulative skew is
+        # sampled at the end of each group
+        group = -(-len(counts) // self.skew_track_points)
+        padded = np.zeros((-(-len(counts) // group) * group, 4), dtype=np.int64)
+        padded[:len(counts)] = counts
+        grouped = padded.reshape(-1, group, 4).sum(axis=1)
+        ends = np.minimum(np.arange(1, len(grouped) + 1) * group, len(counts))
+        bin_size = window_size * group
+        
+        result["track"] = {
+            "bin_size": bin_size,
+            "positions": np.minimum(np.arange(len(grouped)) * bin_size + bin_size // 2, length).tolist(),
+            "gc_skew": np.round(_skew(grouped[:, 2], grouped[:, 1]), 4).tolist(),
+            "at_skew": np.round(_skew(grouped[:, 0], grouped[:, 3]), 4).tolist(),
+            "cumulative_gc_skew": np.round(cumulative[ends - 1], 4).tolist()
+        }
+        return result
+    
+    def _calculate_composition(self, sequence: Union[str, bytes, bytearray]) -> Dict[str, Any]:
         """
         Calculate nucleotide composition.
         
+        Every symbol is counted in one blocked bincount pass over the
+        sequence buffer, and runs of N are reported as gaps (searched
+        only when the counts show N is present).
+        
         Args:
-            sequence: DNA sequence string
+            sequence: DNA sequence (upper-cased)
             
         Returns:
             Dictionary with nucleotide counts and percentages
         """
-        total = len(sequence)
+        if isinstance(sequence, str):
+            sequence = sequence.encode("latin-1")
+        
+        whole = SequenceChunk(0, len(sequence), sequence)
+        _, _, counts, runs = chunk_genome_counts(whole, max(len(sequence), 1))
+        return self._composition_from_partials([(counts, runs)], len(sequence))
+    
+    def _composition_from_partials(self, partials: Iterable[Tuple[np.ndarray, List[Tuple[int, int]]]],
+                                   total: int) -> Dict[str, Any]:
+        """
+        Calculate nucleotide composition from per-chunk counts and gaps.
+        
+        Symbol counts add up across chunks. A gap still open at the end of
+        a chunk is carried over and extended if the next chunk starts
+        with N, so runs are the same as in a single pass.
+        
+        Args:
+            partials: Byte counts and N runs of chunk_genome_counts, in
+                chunk order
+            total: Sequence length
+            
+        Returns:
+            Dictionary with nucleotide counts and percentages
+        """
+        byte_counts = np.zeros(256, dtype=np.int64)
+        gaps = {"count": 0, "total_length": 0, "runs": []}
+        open_run = None
+        
+        def close(run: Tuple[int, int]):
+            gaps["count"] += 1
+            gaps["total_length"] += run[1] - run[0]
+            if len(gaps["runs"]) < GAP_RUN_LIMIT:
+                gaps["runs"].append({"start": run[0], "end": run[1]})
+        
+        for chunk_counts, runs in partials:
+            byte_counts += chunk_counts
+            for start, end in runs:
+                if open_run is not None and open_run[1] == start:
+                    open_run = (open_run[0], end)
+                    continue
+                if open_run is not None:
+                    close(open_run)
+                open_run = (start, end)
+        
+        if open_run is not None:
+            close(open_run)
+        
+        counts = {chr(value): count for value, count in enumerate(byte_counts.tolist()) if count}
+        return self._composition_from_counts(counts, total, gaps)
+    
+    def _composition_from_counts(self, counts: Dict[str, int], total: int,
+                                 gaps: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build the nucleotide composition from symbol counts.
+        
+        Args:
+            counts: Count of each symbol (A, T, G, C and any other symbol
+                present)
+            total: Sequence length
+            gaps: Optional gap summary (count, total_length and runs)
+            
+        Returns:
+            Dictionary with nucleotide counts and percentages. A, T, G and
+            C percentages are over the sequence length, or over A+C+G+T
+            when the analyzer is acgt_only; ambiguity code percentages are
+            always over the sequence length.
+        """
+        acgt_total = sum(counts.get(nucleotide, 0) for nucleotide in "ACGT")
+        denominator = acgt_total if self.acgt_only else total
         
         composition = {}
         for nucleotide in ["A", "T", "G", "C"]:
-            count = sequence.count(nucleotide)
-            percentage = (count / total * 100) if total > 0 else 0
+            count = counts.get(nucleotide, 0)
+            percentage = (count / denominator * 100) if denominator > 0 else 0
             composition[nucleotide] = {
                 "count": count,
                 "percentage": round(percentage, 2)
@@ -115,13 +525,46 @@ class GenomeAnalyzer(BaseAnalyzer):
         
         composition["AT_content"] = round(at_content, 2)
         composition["GC_content"] = round(gc_content, 2)
+        composition["denominator"] = "acgt" if self.acgt_only else "total"
+        
+        # IUPAC codes in their usual order, then any other symbol
+        others = sorted(
+            (symbol for symbol in counts if symbol not in "ACGT"),
+            key=lambda symbol: (symbol not in IUPAC_SYMBOLS, IUPAC_SYMBOLS.find(symbol), symbol)
+        )
+        composition["ambiguous"] = {
+            symbol: {
+                "count": counts[symbol],
+                "percentage": round(counts[symbol] / total * 100, 2) if total > 0 else 0
+            }
+            for symbol in others
+        }
+        composition["ambiguous_count"] = total - acgt_total
+        composition["gaps"] = gaps or {"count": 0, "total_length": 0, "runs": []}
         
         return composition
     
-    def calculate_gc_sliding_window(self, sequence: str, window_size: int = 1000, step: int = 500) -> Dict[str, List]:
+    def _symbol_counts(self, composition: Dict[str, Any]) -> Dict[str, int]:
+        """Recover the symbol counts behind a composition (PRIVATE)."""
+        counts = {nucleotide: composition[nucleotide]["count"] for nucleotide in "ACGT"}
+        counts.update({symbol: entry["count"] for symbol, entry in composition["ambiguous"].items()})
+        return counts
+    
+    def _strong_weak_counts(self, composition: Dict[str, Any]) -> Tuple[int, int]:
+        """Count strong (G, C, S) and weak (A, T, W) bases of a composition (PRIVATE)."""
+        counts = self._symbol_counts(composition)
+        strong = sum(counts.get(symbol, 0) for symbol in "GCS")
+        weak = sum(counts.get(symbol, 0) for symbol in "ATW")
+        return strong, weak
+    
+    def calculate_gc_sliding_window(self, sequence: Union[str, bytes], window_size: int = 1000,
+                                    step: int = 500) -> Dict[str, List]:
         """
         Calculate GC content in sliding windows across the genome.
         
+        The G+C count of every window is the difference of two entries of
+        a cumulative sum, so the cost is O(n) whatever the window size.
+        
         Args:
             sequence: DNA sequence string
             window_size: Size of sliding window
@@ -130,18 +573,19 @@ class GenomeAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with positions and GC values
         """
-        positions = []
-        gc_values = []
+        if isinstance(sequence, str):
+            sequence = sequence.encode("latin-1")
+        
+        is_gc = np.frombuffer(bytes(sequence).translate(_GC_TABLE), dtype=np.uint8)
+        cumulative = np.zeros(len(is_gc) + 1, dtype=np.int64)
+        np.cumsum(is_gc, out=cumulative[1:])
         
-        for i in range(0, len(sequence) - window_size, step):
-            window = sequence[i:i + window_size]
-            gc = (window.count("G") + window.count("C")) / len(window) * 100
-            positions.append(i + window_size // 2)  # Center of window
-            gc_values.append(round(gc, 2))
+        starts = np.arange(0, len(sequence) - window_size, step)
+        gc = (cumulative[starts + window_size] - cumulative[starts]) / window_size * 100
         
         return {
-            "positions": positions,
-            "gc_values": gc_values,
+            "positions": (starts + window_size // 2).tolist(),  # Center of window
+            "gc_values": [round(value, 2) for value in gc.tolist()],
             "window_size": window_size,
             "step": step
         }
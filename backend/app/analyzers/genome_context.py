@@ -0,0 +1,348 @@
+"""Parsed genome context shared by all analyzers of an analysis run."""
+
+from functools import cached_property
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+import numpy as np
+from app.analyzers.genbank_reader import GenBankFeature, GenBankReader, GenBankRecord, read_genbank
+from app.analyzers.genome_store import GenomeStore, PackedRecord
+from app.analyzers.sequence_chunks import SequenceChunk
+from app.analyzers.sequence_encoding import encode_sequence
+from app.core.logging import logger
+
+
+class GenomeContext:
+    """
+    Genome parsed once and shared across analyzers.
+    
+    Parsing a GenBank file dominates the cost of an analysis, so the
+    analysis task builds a single context and hands it to every analyzer
+    instead of letting each one re-read the file. A context opened from
+    the packed genome store decodes its sequence lazily, on first access
+    of sequence_bytes or per range through fetch and iter_chunks.
+    
+    Analyzers read the sequence through chunks. By default a genome is one
+    chunk backed by the cached sequence_bytes and encoded arrays. With a
+    chunk_size, records longer than it are handed out as overlapping
+    chunks fetched from the packed store, and the whole sequence is never
+    decoded, which bounds memory for very large genomes.
+    
+    Scans that split into a per-chunk map step and a reduce step use
+    map_chunks, which runs the map step on the chunk_pool (a ChunkPool
+    sharing the sequence with worker processes) when one is set.
+    
+    A context opened by load or load_record owns the GenomeStore behind
+    it; close it (or use it as a context manager) to release the store's
+    file handle and memory map.
+    
+    Attributes:
+        source_file: Path of the GenBank file the context was built from
+        accession: Record identifier (accession.version)
+        description: Record description (organism / title)
+        circular: Whether the record topology is circular
+        length: Sequence length in base pairs
+        features: Compact feature table (GenBankFeature tuples)
+        packed_record: Backing PackedRecord when opened from the store
+        chunk_size: Bases per chunk of chunks(), or None for whole-genome mode
+        chunk_pool: ChunkPool running map_chunks in parallel, or None
+    """
+    
+    def __init__(self, accession: str, description: str, sequence_bytes: Optional[bytearray],
+                 features: List[GenBankFeature], circular: bool = False,
+                 source_file: str = None, packed_record: PackedRecord = None,
+                 chunk_size: Optional[int] = None):
+        """
+        Initialize the context.
+        
+        Args:
+            accession: Record identifier
+            description: Record description
+            sequence_bytes: Upper-cased sequence bytes, or None to decode
+                them from packed_record on demand
+            features: Compact feature table
+            circular: Whether the record topology is circular
+            source_file: Optional path of the originating GenBank file
+            packed_record: Optional packed store record backing the sequence
+            chunk_size: Optional chunk size enabling chunked mode
+        """
+        self.source_file = source_file
+        self.accession = accession
+        self.description = description
+        self.circular = circular
+        self.features = features
+        self.packed_record = packed_record
+        self.chunk_size = chunk_size
+        self.chunk_pool = None
+        self._cumulative_counts = {}
+        self._store: Optional[GenomeStore] = None
+        if sequence_bytes is not None:
+            self.sequence_bytes = sequence_bytes
+            self.length = len(sequence_bytes)
+        else:
+            self.length = len(packed_record)
+    
+    @classmethod
+    def load(cls, genbank_file: str) -> "GenomeContext":
+        """
+        Open a genome, preferring its packed store over the GenBank text.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            GenomeContext for the file
+        """
+        if GenomeStore.exists(genbank_file):
+            store = GenomeStore(genbank_file)
+            if len(store.records) != 1:
+                store.close()
+                raise ValueError(f"Expected one record in {genbank_file}, found {len(store.records)}")
+            return cls._owning(store, 0, genbank_file)
+        
+        return cls.from_genbank(genbank_file)
+    
+    @staticmethod
+    def record_offsets(genbank_file: str) -> List[Optional[int]]:
+        """
+        Locate the records (replicons) of a possibly multi-record genome.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            One entry per record, in file order: None when the record is
+            served from the packed store, otherwise the byte offset of its
+            LOCUS line in the GenBank file
+        """
+        if GenomeStore.exists(genbank_file):
+            with GenomeStore(genbank_file) as store:
+                return [None] * len(store.records)
+        
+        return GenBankReader(genbank_file).record_offsets()
+    
+    @classmethod
+    def load_record(cls, genbank_file: str, index: int, offset: Optional[int] = None) -> "GenomeContext":
+        """
+        Open a single record of a possibly multi-record genome.
+        
+        Only that record is read, so the memory used is bounded by the
+        largest replicon rather than the whole genome.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            index: Record index, in file order
+            offset: Byte offset from record_offsets, or None to use the store
+            
+        Returns:
+            GenomeContext for the record
+        """
+        if offset is None:
+            return cls._owning(GenomeStore(genbank_file), index, genbank_file)
+        
+        record = GenBankReader(genbank_file).read_at(offset)
+        return cls.from_genbank_record(record, source_file=str(genbank_file))
+    
+    @classmethod
+    def _owning(cls, store: GenomeStore, index: int, genbank_file: str) -> "GenomeContext":
+        """Build a context for a store record that closes the store with it (PRIVATE)."""
+        try:
+            context = cls.from_packed_record(store.records[index], source_file=str(genbank_file))
+        except Exception:
+            store.close()
+            raise
+        context._store = store
+        return context
+    
+    @classmethod
+    def from_genbank(cls, genbank_file: str) -> "GenomeContext":
+        """
+        Parse a GenBank file into a genome context.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            GenomeContext for the file
+        """
+        logger.info(f"Parsing GenBank file {genbank_file}")
+        return cls.from_genbank_record(read_genbank(genbank_file), source_file=str(genbank_file))
+    
+    @classmethod
+    def from_genbank_record(cls, record: GenBankRecord, source_file: str = None) -> "GenomeContext":
+        """
+        Build a context from a record parsed by the native GenBank reader.
+        
+        Args:
+            record: Parsed GenBankRecord
+            source_file: Optional path of the originating GenBank file
+            
+        Returns:
+            GenomeContext for the record
+        """
+        return cls(
+            record.id,
+            record.description,
+            record.sequence,
+            record.features,
+            circular=record.circular,
+            source_file=source_file
+        )
+    
+    @classmethod
+    def from_packed_record(cls, record: PackedRecord, source_file: str = None) -> "GenomeContext":
+        """
+        Build a lazily decoded context from a packed store record.
+        
+        Args:
+            record: PackedRecord from a GenomeStore
+            source_file: Optional path of the originating GenBank file
+            
+        Returns:
+            GenomeContext for the record
+        """
+        logger.info(f"Opening packed genome store for {record.id}")
+        return cls(
+            record.id,
+            record.description,
+            None,
+            record.features,
+            circular=record.circular,
+            source_file=source_file,
+            packed_record=record
+        )
+    
+    @cached_property
+    def sequence_bytes(self) -> bytearray:
+        """Upper-cased sequence bytes, decoded from the packed store on first access."""
+        return self.packed_record.fetch()
+    
+    @cached_property
+    def sequence(self) -> str:
+        """Upper-cased sequence string, decoded on first access."""
+        return self.sequence_bytes.decode("latin-1")
+    
+    @cached_property
+    def encoded(self) -> np.ndarray:
+        """Sequence as uint8 base codes (see encode_sequence), computed on first access."""
+        return encode_sequence(self.sequence_bytes)
+    
+    def cumulative_counts(self, symbols: str) -> np.ndarray:
+        """
+        Get prefix sums of the occurrences of a set of symbols.
+        
+        The array is computed once per symbol set and cached on the
+        context, so the count of those symbols in any interval [start, end)
+        is the O(1) lookup counts[end] - counts[start].
+        
+        Args:
+            symbols: Upper-case symbols to count together (e.g. "GCS")
+            
+        Returns:
+            Array of len(self) + 1 counts where counts[i] is the number of
+            matching symbols in sequence[:i]
+        """
+        key = "".join(sorted(set(symbols)))
+        if key not in self._cumulative_counts:
+            table = bytes(1 if chr(value) in key else 0 for value in range(256))
+            matches = np.frombuffer(self.sequence_bytes.translate(table), dtype=np.uint8)
+            
+            counts = np.zeros(len(matches) + 1, dtype=np.uint32 if len(matches) < 2 ** 32 else np.int64)
+            np.cumsum(matches, dtype=counts.dtype, out=counts[1:])
+            self._cumulative_counts[key] = counts
+        
+        return self._cumulative_counts[key]
+    
+    def fetch(self, start: int, end: int) -> bytearray:
+        """
+        Get the upper-cased bases of a range without decoding the whole genome.
+        
+        Args:
+            start: 0-based start position
+            end: End-exclusive position
+            
+        Returns:
+            Sequence bytes for the range
+        """
+        if self.packed_record is not None and "sequence_bytes" not in self.__dict__:
+            return self.packed_record.fetch(start, end)
+        return self.sequence_bytes[start:end]
+    
+    def iter_chunks(self, chunk_size: int, overlap: int = 0) -> Iterator[Tuple[int, bytearray]]:
+        """
+        Iterate over the sequence in consecutive chunks.
+        
+        Args:
+            chunk_size: Bases per chunk (excluding the overlap)
+            overlap: Extra bases appended from the next chunk
+            
+        Yields:
+            Tuples of (chunk start position, chunk bytes)
+        """
+        for start in range(0, self.length, chunk_size):
+            yield start, self.fetch(start, start + chunk_size + overlap)
+    
+    @property
+    def chunked(self) -> bool:
+        """Whether chunks() splits the sequence (chunked mode)."""
+        return self.chunk_size is not None and self.length > self.chunk_size
+    
+    def chunks(self, overlap: int = 0) -> Iterator[SequenceChunk]:
+        """
+        Iterate over the sequence for a bounded-memory scan.
+        
+        In whole-genome mode the only chunk shares the cached sequence
+        bytes and codes with every other analyzer. In chunked mode each
+        chunk is fetched (and encoded) on its own and dropped after use.
+        
+        Args:
+            overlap: Bases of look-ahead past the end of each chunk, e.g.
+                2 for codons or k - 1 for k-mers
+            
+        Yields:
+            SequenceChunk objects covering the sequence in order
+        """
+        if not self.chunked:
+            yield SequenceChunk(0, self.length, self.sequence_bytes, codes=self.encoded)
+            return
+        
+        for start, sequence in self.iter_chunks(self.chunk_size, overlap):
+            yield SequenceChunk(start, min(start + self.chunk_size, self.length), sequence)
+    
+    def map_chunks(self, function: Callable[..., Any], *args, overlap: int = 0) -> List[Any]:
+        """
+        Run the map step of a chunked scan over the sequence.
+        
+        Without a chunk_pool the function runs here on chunks(); with one,
+        it runs on the pool's workers and chunks. Either way the partial
+        results must reduce to the same answer, so the function may only
+        depend on the chunk and its arguments.
+        
+        Args:
+            function: Module-level callable (chunk, *args) -> partial result
+            *args: Extra arguments passed to every call
+            overlap: Bases of look-ahead past the end of each chunk
+            
+        Returns:
+            Partial results in chunk order
+        """
+        if self.chunk_pool is not None:
+            return self.chunk_pool.map(function, args, overlap)
+        return [function(chunk, *args) for chunk in self.chunks(overlap)]
+    
+    def close(self):
+        """Close the GenomeStore opened for this context, if any."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __len__(self) -> int:
+        """Return the sequence length in base pairs."""
+        return self.length
+    
+    def __repr__(self):
+        return f"<GenomeContext(accession='{self.accession}', length={len(self)})>"
@@ -0,0 +1,409 @@
+"""2-bit packed, memory-mapped on-disk genome store."""
+
+import json
+import mmap
+import os
+import re
+import struct
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.analyzers.genbank_reader import GenBankFeature, GenBankReader, GenBankRecord
+from app.core.logging import logger
+
+
+STORE_MAGIC = b"GS2B"
+STORE_VERSION = 1
+
+# Bases packed per pass when writing, keeps conversion memory bounded
+PACK_BLOCK_SIZE = 16 * 1024 * 1024
+
+_HEADER = struct.Struct("<4sI")
+_TRAILER = struct.Struct("<QI4s")
+
+# A, C, G, T -> 0..3; any other symbol is packed as A and restored from the mask
+_PACK_CODES = np.zeros(256, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    _PACK_CODES[_base] = _code
+
+# Packed byte -> its four bases, first base in the high bits
+_UNPACK_TABLE = np.array(
+    [[b"ACGT"[(value >> shift) & 3] for shift in (6, 4, 2, 0)] for value in range(256)],
+    dtype=np.uint8
+)
+
+_AMBIGUOUS_RUN = re.compile(rb"([^ACGT])\1*")
+
+
+def store_paths(genbank_file: str) -> Dict[str, Path]:
+    """
+    Get the store file paths that sit next to a GenBank file.
+    
+    Args:
+        genbank_file: Path to GenBank file
+        
+    Returns:
+        Dictionary with "sequence", "mask" and "features" paths
+    """
+    path = Path(genbank_file)
+    return {
+        "sequence": path.with_suffix(".2bit"),
+        "mask": path.with_suffix(".mask.npz"),
+        "features": path.with_suffix(".features.npz"),
+    }
+
+
+def pack_sequence(sequence: bytes) -> bytes:
+    """
+    Pack an upper-cased sequence at four bases per byte.
+    
+    Args:
+        sequence: Upper-cased sequence bytes
+        
+    Returns:
+        Packed bytes (non-ACGT symbols are packed as A)
+    """
+    codes = _PACK_CODES[np.frombuffer(sequence, dtype=np.uint8)]
+    padding = (-len(codes)) % 4
+    if padding:
+        codes = np.concatenate([codes, np.zeros(padding, dtype=np.uint8)])
+    quads = codes.reshape(-1, 4)
+    return ((quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]).tobytes()
+
+
+def unpack_sequence(packed: np.ndarray, start: int, end: int) -> bytearray:
+    """
+    Decode bases start..end from packed bytes that begin at base 0.
+    
+    Args:
+        packed: Packed bytes covering at least the requested range
+        start: First base to decode, relative to the first packed byte
+        end: End-exclusive base to decode
+        
+    Returns:
+        Decoded bases without ambiguity codes applied
+    """
+    return bytearray(_UNPACK_TABLE[packed].reshape(-1)[start:end].tobytes())
+
+
+class GenomeStore:
+    """
+    On-disk genome store built once per downloaded GenBank file.
+    
+    Files written next to ``<accession>.gb``:
+    
+    - ``<accession>.2bit``: sequences packed four bases per byte with a
+      JSON footer describing each record
+    - ``<accession>.mask.npz``: runs of non-ACGT symbols (N and other IUPAC
+      codes) that the 2-bit encoding cannot represent
+    - ``<accession>.features.npz``: feature coordinates as flat arrays plus
+      feature keys, raw locations and qualifiers
+    
+    The sequence file is opened with mmap and decoded lazily, so several
+    workers opening the same genome share the page cache and only touch
+    the quarter-size packed data they actually read.
+    """
+    
+    def __init__(self, genbank_file: str):
+        """
+        Open the store for a GenBank file.
+        
+        Args:
+            genbank_file: Path to the GenBank file the store was built from
+        """
+        self.genbank_file = str(genbank_file)
+        self.paths = store_paths(genbank_file)
+        self._file = open(self.paths["sequence"], "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version = _HEADER.unpack_from(self._mmap, 0)
+        footer_offset, footer_length, trailer_magic = _TRAILER.unpack_from(
+            self._mmap, len(self._mmap) - _TRAILER.size
+        )
+        if magic != STORE_MAGIC or trailer_magic != STORE_MAGIC or version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"Not a genome store: {self.paths['sequence']}")
+        
+        footer = json.loads(self._mmap[footer_offset:footer_offset + footer_length])
+        self._mask = None
+        self._features = None
+        self.records = [
+            PackedRecord(self, index, entry) for index, entry in enumerate(footer["records"])
+        ]
+    
+    @classmethod
+    def exists(cls, genbank_file: str) -> bool:
+        """
+        Check whether an up-to-date store exists for a GenBank file.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            True if all store files exist and are newer than the GenBank file
+        """
+        source = Path(genbank_file)
+        paths = store_paths(genbank_file)
+        if not source.exists() or not all(p.exists() for p in paths.values()):
+            return False
+        source_mtime = source.stat().st_mtime
+        return all(p.stat().st_mtime >= source_mtime for p in paths.values())
+    
+    @classmethod
+    def build(cls, genbank_file: str) -> "GenomeStore":
+        """
+        Convert a GenBank file into a genome store.
+        
+        Records are converted one at a time and files are written to
+        temporary paths and renamed, so concurrent readers never see a
+        partially written store.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            Opened GenomeStore
+        """
+        logger.info(f"Building genome store for {genbank_file}")
+        paths = store_paths(genbank_file)
+        # Unique per build, so concurrent builds of one genome never share a file
+        suffix = f".{uuid.uuid4().hex}.tmp"
+        temp_paths = {key: path.with_name(path.name + suffix) for key, path in paths.items()}
+        
+        try:
+            cls._write(genbank_file, temp_paths)
+        except BaseException:
+            for path in temp_paths.values():
+                path.unlink(missing_ok=True)
+            raise
+        
+        # Sequence file last: its presence marks the store as complete
+        os.replace(temp_paths["mask"], paths["mask"])
+        os.replace(temp_paths["features"], paths["features"])
+        os.replace(temp_paths["sequence"], paths["sequence"])
+        
+        logger.info(f"Genome store written to {paths['sequence']}")
+        return cls(genbank_file)
+    
+    @classmethod
+    def _write(cls, genbank_file: str, temp_paths: Dict[str, Path]):
+        """Write the store files to their temporary paths (PRIVATE)."""
+        records = []
+        mask_offsets, mask_starts, mask_lengths, mask_symbols = [0], [], [], []
+        feature_meta, part_offsets, part_rows = [], [0], []
+        
+        with open(temp_paths["sequence"], "wb") as handle:
+            handle.write(_HEADER.pack(STORE_MAGIC, STORE_VERSION))
+            
+            for record in GenBankReader(genbank_file):
+                records.append(cls._write_record(handle, record))
+                
+                for match in _AMBIGUOUS_RUN.finditer(record.sequence):
+                    mask_starts.append(match.start())
+                    mask_lengths.append(match.end() - match.start())
+                    mask_symbols.append(match.group(1)[0])
+                mask_offsets.append(len(mask_starts))
+                
+                for feature in record.features:
+                    feature_meta.append([len(records) - 1, feature.type, feature.location, feature.qualifiers])
+                    part_rows.extend(feature.parts or ())
+                    part_offsets.append(len(part_rows))
+            
+            footer = json.dumps({"records": records}).encode("utf-8")
+            footer_offset = handle.tell()
+            handle.write(footer)
+            handle.write(_TRAILER.pack(footer_offset, len(footer), STORE_MAGIC))
+        
+        with open(temp_paths["mask"], "wb") as handle:
+            np.savez(
+                handle,
+                record_offsets=np.array(mask_offsets, dtype=np.int64),
+                starts=np.array(mask_starts, dtype=np.int64),
+                lengths=np.array(mask_lengths, dtype=np.int64),
+                symbols=np.array(mask_symbols, dtype=np.uint8)
+            )
+        
+        parts = np.array(part_rows, dtype=np.int64).reshape(-1, 3)
+        with open(temp_paths["features"], "wb") as handle:
+            np.savez(
+                handle,
+                part_offsets=np.array(part_offsets, dtype=np.int64),
+                part_starts=parts[:, 0],
+                part_ends=parts[:, 1],
+                part_strands=parts[:, 2].astype(np.int8),
+                meta=np.frombuffer(json.dumps(feature_meta).encode("utf-8"), dtype=np.uint8)
+            )
+    
+    @staticmethod
+    def _write_record(handle, record: GenBankRecord) -> Dict[str, Any]:
+        """Append one packed record and return its footer entry (PRIVATE)."""
+        offset = handle.tell()
+        sequence = memoryview(record.sequence)
+        for block_start in range(0, len(sequence), PACK_BLOCK_SIZE):
+            handle.write(pack_sequence(sequence[block_start:block_start + PACK_BLOCK_SIZE]))
+        
+        return {
+            "id": record.id,
+            "name": record.name,
+            "description": record.description,
+            "circular": record.circular,
+            "length": len(record.sequence),
+            "offset": offset,
+        }
+    
+    @classmethod
+    def open_or_build(cls, genbank_file: str) -> "GenomeStore":
+        """
+        Open the store for a GenBank file, building it if missing or stale.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            
+        Returns:
+            Opened GenomeStore
+        """
+        if cls.exists(genbank_file):
+            return cls(genbank_file)
+        return cls.build(genbank_file)
+    
+    @property
+    def mask(self) -> Dict[str, np.ndarray]:
+        """Ambiguity runs, loaded on first access."""
+        if self._mask is None:
+            with np.load(self.paths["mask"]) as data:
+                self._mask = {key: data[key] for key in data.files}
+        return self._mask
+    
+    def record_features(self, index: int) -> List[GenBankFeature]:
+        """
+        Get the features of one record from the binary feature index.
+        
+        Args:
+            index: Record index
+            
+        Returns:
+            List of GenBankFeature tuples
+        """
+        if self._features is None:
+            with np.load(self.paths["features"]) as data:
+                meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+                offsets = data["part_offsets"]
+                parts = np.stack(
+                    [data["part_starts"], data["part_ends"], data["part_strands"].astype(np.int64)],
+                    axis=1
+                ).tolist()
+            
+            self._features = [[] for _ in self.records]
+            for i, (record_index, key, location, qualifiers) in enumerate(meta):
+                feature_parts = tuple(tuple(part) for part in parts[offsets[i]:offsets[i + 1]])
+                self._features[record_index].append(
+                    GenBankFeature(key, location, feature_parts or None, qualifiers)
+                )
+        return self._features[index]
+    
+    def close(self):
+        """Release the memory map and file handle."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __repr__(self):
+        return f"<GenomeStore(file='{self.paths['sequence']}', records={len(self.records)})>"
+
+
+class PackedRecord:
+    """
+    One record of a GenomeStore with lazy, range-based decoding.
+    
+    Attributes:
+        id: Accession with version
+        name: LOCUS name
+        description: Record description
+        circular: Whether the record topology is circular
+        length: Sequence length in base pairs
+    """
+    
+    def __init__(self, store: GenomeStore, index: int, entry: Dict[str, Any]):
+        """Initialize the record from its footer entry."""
+        self.store = store
+        self.index = index
+        self.id = entry["id"]
+        self.name = entry["name"]
+        self.description = entry["description"]
+        self.circular = entry["circular"]
+        self.length = entry["length"]
+        self._offset = entry["offset"]
+    
+    def __len__(self) -> int:
+        """Return the sequence length in base pairs."""
+        return self.length
+    
+    @property
+    def features(self) -> List[GenBankFeature]:
+        """Features of the record, loaded from the feature index on first access."""
+        return self.store.record_features(self.index)
+    
+    def fetch(self, start: int = 0, end: Optional[int] = None) -> bytearray:
+        """
+        Decode a range of the sequence.
+        
+        Args:
+            start: 0-based start position
+            end: End-exclusive position (defaults to the record end)
+            
+        Returns:
+            Upper-cased sequence bytes for the range
+        """
+        end = self.length if end is None else min(end, self.length)
+        start = max(0, min(start, end))
+        first_byte = start // 4
+        packed = np.frombuffer(
+            self.store._mmap, dtype=np.uint8,
+            count=(end + 3) // 4 - first_byte, offset=self._offset + first_byte
+        )
+        sequence = unpack_sequence(packed, start - first_byte * 4, end - first_byte * 4)
+        
+        for run_start, run_length, symbol in self._ambiguous_runs(start, end):
+            run_from = max(run_start, start)
+            run_to = min(run_start + run_length, end)
+            sequence[run_from - start:run_to - start] = bytes([symbol]) * (run_to - run_from)
+        return sequence
+    
+    def iter_chunks(self, chunk_size: int, overlap: int = 0) -> Iterator[Tuple[int, bytearray]]:
+        """
+        Decode the sequence in consecutive chunks.
+        
+        Args:
+            chunk_size: Bases per chunk (excluding the overlap)
+            overlap: Extra bases appended from the next chunk
+            
+        Yields:
+            Tuples of (chunk start position, chunk bytes)
+        """
+        for start in range(0, self.length, chunk_size):
+            yield start, self.fetch(start, start + chunk_size + overlap)
+    
+    def _ambiguous_runs(self, start: int, end: int) -> List[Tuple[int, int, int]]:
+        """Ambiguity runs overlapping a range (PRIVATE)."""
+        mask = self.store.mask
+        first, last = mask["record_offsets"][self.index:self.index + 2]
+        starts = mask["starts"][first:last]
+        lengths = mask["lengths"][first:last]
+        ends = starts + lengths
+        
+        lo = np.searchsorted(ends, start, side="right")
+        hi = np.searchsorted(starts, end, side="left")
+        return list(zip(
+            starts[lo:hi].tolist(), lengths[lo:hi].tolist(), mask["symbols"][first:last][lo:hi].tolist()
+        ))
+    
+    def __repr__(self):
+        return f"<PackedRecord(id='{self.id}', length={self.length})>"
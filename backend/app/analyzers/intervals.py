@@ -0,0 +1,52 @@
+"""Vectorized operations on sets of half-open intervals."""
+
+from typing import Tuple
+import numpy as np
+
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge intervals into their non-overlapping union.
+    
+    Intervals are swept in start order; a new merged interval begins
+    wherever a start lies beyond every end seen so far. Touching
+    intervals ([0, 10) and [10, 20)) are merged.
+    
+    Args:
+        starts: Interval starts (0-based, inclusive)
+        ends: Interval ends (exclusive)
+        
+    Returns:
+        Tuple of (merged starts, merged ends), sorted and disjoint
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return starts, ends
+    
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    
+    first = np.empty(len(starts), dtype=bool)
+    first[0] = True
+    first[1:] = starts[1:] > reach[:-1]
+    boundaries = np.flatnonzero(first)
+    return starts[boundaries], np.maximum.reduceat(ends, boundaries)
+
+
+def covered_length(starts: np.ndarray, ends: np.ndarray) -> int:
+    """
+    Count the bases covered by at least one interval.
+    
+    Args:
+        starts: Interval starts (0-based, inclusive)
+        ends: Interval ends (exclusive)
+        
+    Returns:
+        Length of the union of the intervals
+    """
+    merged_starts, merged_ends = merge_intervals(starts, ends)
+    return int((merged_ends - merged_starts).sum())
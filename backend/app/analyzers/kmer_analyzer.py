@@ -0,0 +1,147 @@
+"""k-mer spectrum and Markov signature analyzer."""
+
+from typing import Dict, List, Any
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.kmer_engine import (
+    KmerCounts, chunk_kmer_counts, rho_star, rho_star_distance, sum_kmer_counts, tetranucleotide_zscores,
+    zscore_correlation
+)
+from app.core.logging import logger
+
+
+# Lengths needed for rho* (1, 2) and the tetranucleotide model (2, 3, 4)
+SIGNATURE_KS = (1, 2, 3, 4)
+
+
+class KmerAnalyzer(BaseAnalyzer):
+    """
+    Analyzer for k-mer frequencies and compositional genome signatures.
+    
+    Analyzes:
+    - k-mer spectrum for a configurable k (forward strand)
+    - Dinucleotide relative abundances rho* (Karlin)
+    - Tetranucleotide z-scores under a maximal-order Markov model
+    
+    Every output is derived from KmerCounts, which add up exactly, so
+    replicons are counted separately and their counts summed in
+    merge_results. Large records are counted the same way chunk by chunk,
+    with chunks overlapping by k - 1 bases so k-mers across a chunk
+    boundary are counted once. k-mers never span two records. The full
+    spectrum is kept in the "kmer_counts" artifact as sorted keys and
+    counts, keyed "<accession>/<k>/keys" and "<accession>/<k>/counts".
+    """
+    
+    name = "kmer_analysis"
+    version = "1"
+    outputs = ("kmer_counts",)
+    
+    def __init__(self, k: int = 8, top_count: int = 20):
+        """
+        Initialize the k-mer analyzer.
+        
+        Args:
+            k: Length of the k-mer spectrum
+            top_count: Number of most frequent k-mers to report
+        """
+        super().__init__()
+        self.k = k
+        self.top_count = top_count
+    
+    def analyze_record(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Compute the k-mer profile of a parsed genome.
+        
+        Args:
+            context: Parsed genome context
+            
+        Returns:
+            Dictionary with k-mer analysis results
+        """
+        return self.analyze_replicon(context)["results"]
+    
+    def analyze_replicon(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Count the k-mers of one replicon, keeping the counts for merging.
+        
+        Args:
+            context: Parsed genome context of a single replicon
+            
+        Returns:
+            Dictionary with the replicon results and its KmerCounts by k
+        """
+        logger.info(f"Starting k-mer analysis for {context.accession} (k={self.k})")
+        
+        ks = sorted(set(SIGNATURE_KS) | {self.k})
+        counts = sum_kmer_counts(context.map_chunks(chunk_kmer_counts, ks, overlap=ks[-1] - 1), ks)
+        self.artifacts = {"kmer_counts": self._count_arrays(context.accession, counts[self.k])}
+        
+        logger.info("k-mer analysis completed")
+        return {"results": self.profile(counts), "counts": counts}
+    
+    def merge_results(self, partials: List[Dict[str, Any]], accessions: List[str]) -> Dict[str, Any]:
+        """
+        Sum per-replicon k-mer counts into a genome-level profile.
+        
+        Args:
+            partials: Results of analyze_replicon, in record order
+            accessions: Accession of each replicon, in record order
+            
+        Returns:
+            Dictionary with k-mer analysis results and a per-replicon
+            breakdown comparing each replicon's signature to the genome's
+        """
+        counts = sum_kmer_counts([partial["counts"] for partial in partials], list(partials[0]["counts"]))
+        
+        results = self.profile(counts)
+        results["replicons"] = [
+            {
+                "accession": accession,
+                "total_kmers": p["results"]["total_kmers"],
+                "distinct_kmers": p["results"]["distinct_kmers"],
+                "rho_star_distance": rho_star_distance(p["results"]["rho_star"], results["rho_star"]),
+                "zscore_correlation": zscore_correlation(
+                    p["results"]["tetranucleotide_zscores"], results["tetranucleotide_zscores"]
+                )
+            }
+            for accession, p in zip(accessions, partials)
+        ]
+        return results
+    
+    def profile(self, counts: Dict[int, KmerCounts]) -> Dict[str, Any]:
+        """
+        Build the k-mer profile from counts.
+        
+        Args:
+            counts: KmerCounts for every k of SIGNATURE_KS and self.k
+            
+        Returns:
+            Dictionary with the spectrum summary, rho* and tetranucleotide
+            z-scores
+        """
+        spectrum = counts[self.k]
+        total = spectrum.total
+        
+        return {
+            "k": self.k,
+            "total_kmers": total,
+            "distinct_kmers": spectrum.distinct,
+            "possible_kmers": 4 ** self.k,
+            "top_kmers": [
+                {
+                    "kmer": kmer,
+                    "count": count,
+                    "frequency": round(count / total, 6) if total > 0 else 0
+                }
+                for kmer, count in spectrum.most_common(self.top_count)
+            ],
+            "rho_star": rho_star(counts[1], counts[2]),
+            "tetranucleotide_zscores": tetranucleotide_zscores(counts[2], counts[3], counts[4])
+        }
+    
+    def _count_arrays(self, accession: str, counts: KmerCounts) -> Dict[str, Any]:
+        """Artifact arrays of a replicon's k-mer spectrum (PRIVATE)."""
+        return {
+            f"{accession}/{counts.k}/keys": counts.keys,
+            f"{accession}/{counts.k}/counts": counts.counts
+        }
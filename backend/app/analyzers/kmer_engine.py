@@ -0,0 +1,354 @@
+"""k-mer counting on 2-bit encoded sequences and Markov-based genome signatures."""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.analyzers.sequence_encoding import BASES, COUNT_BLOCK_SIZE, INVALID_CODE
+
+
+# Longest k-mer that fits a 2-bit key in a uint64
+MAX_K = 32
+
+# Largest k counted into a dense table of 4 ** k bins with bincount; longer
+# k-mers are counted sparsely by sorting their keys
+DENSE_MAX_K = 12
+
+DINUCLEOTIDES = [first + second for first in BASES for second in BASES]
+TETRANUCLEOTIDES = [a + b + c + d for a in BASES for b in BASES for c in BASES for d in BASES]
+
+
+def kmer_keys(codes: np.ndarray, k: int) -> np.ndarray:
+    """
+    Compute the 2-bit key of every ACGT-only k-mer of an encoded sequence.
+    
+    The key of the k-mer starting at i packs its bases, first base in the
+    highest bits, so keys sort like the k-mer strings. The k bases are
+    read through shifted views of the same buffer rather than rolled one
+    position at a time, so the loop runs k times, not once per base.
+    
+    Args:
+        codes: Encoded sequence from encode_sequence
+        k: k-mer length, 1 to MAX_K
+        
+    Returns:
+        Keys of the k-mers without a non-ACGT symbol, in sequence order
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}, got {k}")
+    
+    windows = len(codes) - k + 1
+    if windows <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    
+    dtype = np.uint32 if k <= 16 else np.uint64
+    keys = np.zeros(windows, dtype=dtype)
+    for offset in range(k):
+        keys <<= dtype(2)
+        keys |= codes[offset:offset + windows] & np.uint8(3)
+    
+    # A window is valid when it holds no invalid code
+    invalid = np.concatenate(([0], np.cumsum(codes == INVALID_CODE, dtype=np.int64)))
+    return keys[invalid[k:] == invalid[:windows]]
+
+
+def reverse_complement_keys(keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    Map k-mer keys to the keys of their reverse complements.
+    
+    Args:
+        keys: 2-bit k-mer keys
+        k: k-mer length
+        
+    Returns:
+        Reverse complement keys, as uint64
+    """
+    keys = keys.astype(np.uint64)
+    reverse = np.zeros_like(keys)
+    for _ in range(k):
+        reverse = (reverse << np.uint64(2)) | (np.uint64(3) - (keys & np.uint64(3)))
+        keys = keys >> np.uint64(2)
+    return reverse
+
+
+def kmer_string(key: int, k: int) -> str:
+    """
+    Decode a 2-bit key into its k-mer.
+    
+    Args:
+        key: k-mer key
+        k: k-mer length
+        
+    Returns:
+        k-mer string
+    """
+    return "".join(BASES[(int(key) >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+def _collapse(keys: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum the counts of equal keys, returning sorted unique keys (PRIVATE)."""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    keys, counts = keys[order], counts[order]
+    first = np.concatenate(([True], keys[1:] != keys[:-1]))
+    boundaries = np.flatnonzero(first)
+    return keys[boundaries], np.add.reduceat(counts, boundaries)
+
+
+class KmerCounts:
+    """
+    Counts of the k-mers of one length, stored as sorted (key, count) pairs.
+    
+    Counts are plain sums, so counts of separate chunks, records or
+    workers combine exactly with ``+`` as long as each chunk after the
+    first starts k - 1 bases before the previous one ended.
+    """
+    
+    def __init__(self, k: int, keys: Optional[np.ndarray] = None, counts: Optional[np.ndarray] = None):
+        """
+        Initialize the counts.
+        
+        Args:
+            k: k-mer length
+            keys: Sorted unique k-mer keys
+            counts: Count of each key
+        """
+        self.k = k
+        self.keys = np.zeros(0, dtype=np.uint64) if keys is None else keys.astype(np.uint64)
+        self.counts = np.zeros(0, dtype=np.int64) if counts is None else counts.astype(np.int64)
+    
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, k: int, block_size: int = COUNT_BLOCK_SIZE) -> "KmerCounts":
+        """
+        Count the k-mers of an encoded sequence.
+        
+        The sequence is counted in overlapping blocks, which bounds the
+        temporary key arrays. Up to DENSE_MAX_K every block is one
+        bincount into a 4 ** k table (blocks are made at least as long as
+        the table); longer k-mers are sorted and counted per block and the
+        block counts merged once at the end.
+        
+        Args:
+            codes: Encoded sequence from encode_sequence
+            k: k-mer length, 1 to MAX_K
+            block_size: k-mers counted per block
+            
+        Returns:
+            KmerCounts of the sequence
+            
+        Raises:
+            ValueError: If k is out of range
+        """
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k must be between 1 and {MAX_K}, got {k}")
+        
+        dense = k <= DENSE_MAX_K
+        if dense:
+            block_size = max(block_size, 4 ** k)
+            table = np.zeros(4 ** k, dtype=np.int64)
+        else:
+            parts = []
+        
+        for block_start in range(0, max(len(codes) - k + 1, 0), block_size):
+            keys = kmer_keys(codes[block_start:block_start + block_size + k - 1], k)
+            if dense:
+                table += np.bincount(keys, minlength=4 ** k)
+            else:
+                unique, counts = np.unique(keys, return_counts=True)
+                parts.append((unique, counts))
+        
+        if dense:
+            keys = np.flatnonzero(table)
+            return cls(k, keys, table[keys])
+        if not parts:
+            return cls(k)
+        return cls(k, *_collapse(
+            np.concatenate([keys for keys, _ in parts]),
+            np.concatenate([counts for _, counts in parts])
+        ))
+    
+    @property
+    def total(self) -> int:
+        """Number of k-mers counted."""
+        return int(self.counts.sum())
+    
+    @property
+    def distinct(self) -> int:
+        """Number of distinct k-mers seen."""
+        return len(self.keys)
+    
+    def dense(self) -> np.ndarray:
+        """
+        Expand the counts into a table of 4 ** k counts indexed by key.
+        
+        Returns:
+            Dense count array
+        """
+        if self.k > DENSE_MAX_K:
+            raise ValueError(f"Dense tables are limited to k <= {DENSE_MAX_K}")
+        table = np.zeros(4 ** self.k, dtype=np.int64)
+        table[self.keys.astype(np.intp)] = self.counts
+        return table
+    
+    def both_strands(self) -> "KmerCounts":
+        """
+        Add the counts of the reverse complement strand.
+        
+        Returns:
+            KmerCounts of the sequence and its reverse complement
+        """
+        return self + KmerCounts(self.k, *_collapse(reverse_complement_keys(self.keys, self.k), self.counts))
+    
+    def most_common(self, count: int) -> List[Tuple[str, int]]:
+        """
+        List the most frequent k-mers.
+        
+        Args:
+            count: Number of k-mers
+            
+        Returns:
+            (k-mer, count) pairs, most frequent first, ties by k-mer
+        """
+        order = np.argsort(-self.counts, kind="stable")[:count]
+        return [(kmer_string(self.keys[i], self.k), int(self.counts[i])) for i in order]
+    
+    def __add__(self, other: "KmerCounts") -> "KmerCounts":
+        if other.k != self.k:
+            raise ValueError(f"Cannot add {other.k}-mer counts to {self.k}-mer counts")
+        return KmerCounts(self.k, *_collapse(
+            np.concatenate([self.keys, other.keys]),
+            np.concatenate([self.counts, other.counts])
+        ))
+    
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, KmerCounts) and other.k == self.k
+            and np.array_equal(other.keys, self.keys) and np.array_equal(other.counts, self.counts)
+        )
+    
+    def __repr__(self):
+        return f"<KmerCounts(k={self.k}, distinct={self.distinct}, total={self.total})>"
+
+
+def chunk_kmer_counts(chunk, ks: Sequence[int]) -> Dict[int, KmerCounts]:
+    """
+    Count the k-mers starting in one chunk for several k.
+    
+    This is the map step of a chunked k-mer count; sum_kmer_counts is the
+    reduce step.
+    
+    Args:
+        chunk: SequenceChunk with at least max(ks) - 1 bases of overlap
+        ks: k-mer lengths
+        
+    Returns:
+        KmerCounts keyed by k
+    """
+    return {k: KmerCounts.from_codes(chunk.codes[:chunk.owned + k - 1], k) for k in ks}
+
+
+def sum_kmer_counts(parts: Iterable[Dict[int, KmerCounts]], ks: Sequence[int]) -> Dict[int, KmerCounts]:
+    """
+    Add up per-chunk (or per-record) k-mer counts.
+    
+    Args:
+        parts: KmerCounts keyed by k, e.g. from chunk_kmer_counts
+        ks: k-mer lengths
+        
+    Returns:
+        Summed KmerCounts keyed by k
+    """
+    counts = {k: KmerCounts(k) for k in ks}
+    for part in parts:
+        for k in ks:
+            counts[k] = counts[k] + part[k]
+    return counts
+
+
+def rho_star(mono: KmerCounts, di: KmerCounts) -> Dict[str, float]:
+    """
+    Compute the symmetrized dinucleotide relative abundances (rho*).
+    
+    rho*_XY = f*_XY / (f*_X f*_Y), with frequencies taken over the
+    sequence and its reverse complement (Karlin's genomic signature).
+    
+    Args:
+        mono: Single-strand 1-mer counts
+        di: Single-strand 2-mer counts
+        
+    Returns:
+        rho* of the 16 dinucleotides (0.0 when a base is absent)
+    """
+    mono_counts = mono.both_strands().dense().astype(np.float64)
+    di_counts = di.both_strands().dense().astype(np.float64)
+    if mono_counts.sum() == 0 or di_counts.sum() == 0:
+        return {dinucleotide: 0.0 for dinucleotide in DINUCLEOTIDES}
+    
+    mono_frequencies = mono_counts / mono_counts.sum()
+    di_frequencies = (di_counts / di_counts.sum()).reshape(4, 4)
+    expected = np.outer(mono_frequencies, mono_frequencies)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = np.where(expected > 0, di_frequencies / expected, 0.0).ravel()
+    return {dinucleotide: round(float(value), 4) for dinucleotide, value in zip(DINUCLEOTIDES, rho)}
+
+
+def tetranucleotide_zscores(di: KmerCounts, tri: KmerCounts, tetra: KmerCounts) -> Dict[str, float]:
+    """
+    Compute tetranucleotide z-scores against a maximal-order Markov model.
+    
+    The expected count of n1n2n3n4 is N(n1n2n3) N(n2n3n4) / N(n2n3), with
+    variance E (N(n2n3) - N(n1n2n3)) (N(n2n3) - N(n2n3n4)) / N(n2n3)^2
+    (Teeling et al., TETRA). Counts cover both strands.
+    
+    Args:
+        di: Single-strand 2-mer counts
+        tri: Single-strand 3-mer counts
+        tetra: Single-strand 4-mer counts
+        
+    Returns:
+        z-score of each of the 256 tetranucleotides (0.0 where the
+        variance is zero)
+    """
+    n2 = di.both_strands().dense().astype(np.float64).reshape(4, 4)
+    n3 = tri.both_strands().dense().astype(np.float64).reshape(4, 4, 4)
+    n4 = tetra.both_strands().dense().astype(np.float64).reshape(4, 4, 4, 4)
+    
+    prefix = n3[:, :, :, None]   # N(n1n2n3)
+    suffix = n3[None, :, :, :]   # N(n2n3n4)
+    middle = n2[None, :, :, None]  # N(n2n3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.where(middle > 0, prefix * suffix / middle, 0.0)
+        variance = np.where(middle > 0, expected * (middle - prefix) * (middle - suffix) / middle ** 2, 0.0)
+        z = np.where(variance > 0, (n4 - expected) / np.sqrt(variance), 0.0).ravel()
+    return {tetranucleotide: round(float(value), 4) for tetranucleotide, value in zip(TETRANUCLEOTIDES, z)}
+
+
+def rho_star_distance(first: Dict[str, float], second: Dict[str, float]) -> float:
+    """
+    Compute Karlin's delta* distance between two genomic signatures.
+    
+    Args:
+        first: rho* values from rho_star
+        second: rho* values from rho_star
+        
+    Returns:
+        Mean absolute rho* difference over the 16 dinucleotides
+    """
+    return round(sum(abs(first[d] - second[d]) for d in DINUCLEOTIDES) / len(DINUCLEOTIDES), 4)
+
+
+def zscore_correlation(first: Dict[str, float], second: Dict[str, float]) -> Optional[float]:
+    """
+    Correlate two tetranucleotide z-score profiles.
+    
+    Args:
+        first: z-scores from tetranucleotide_zscores
+        second: z-scores from tetranucleotide_zscores
+        
+    Returns:
+        Pearson correlation, or None if either profile is constant
+    """
+    a = np.array([first[t] for t in TETRANUCLEOTIDES])
+    b = np.array([second[t] for t in TETRANUCLEOTIDES])
+    if a.std() == 0 or b.std() == 0:
+        return None
+    return round(float(np.corrcoef(a, b)[0, 1]), 4)
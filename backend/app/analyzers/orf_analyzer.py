@@ -0,0 +1,367 @@
+"""ORF analyzer for finding open reading frames in all six frames."""
+
+from typing import Dict, List, Any, Tuple
+import numpy as np
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.codon_engine import CODON_OVERLAP, FRAMES, STRANDS, merge_codon_scans, scan_chunk_codons
+from app.analyzers.genome_context import GenomeContext
+from app.core.logging import logger
+
+
+def _frame_orfs(starts: np.ndarray, stops: np.ndarray, frame: int,
+                from_start_codon: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the ORFs of one frame from sorted in-frame codon positions (PRIVATE).
+    
+    Args:
+        starts: Sorted ATG positions of the frame
+        stops: Sorted stop codon positions of the frame
+        frame: Frame offset, used as the virtual stop before the first codon
+        from_start_codon: True for ATG-to-stop ORFs, False for stop-to-stop
+        
+    Returns:
+        Tuple of (ORF starts, ORF ends) with ends including the stop codon
+    """
+    if not from_start_codon:
+        return stops[:-1] + 3, stops[1:] + 3
+    
+    if len(starts) == 0 or len(stops) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    
+    # The longest ORF ending at each stop begins at the first ATG after the previous stop
+    previous = np.concatenate(([frame - 3], stops[:-1]))
+    first = np.searchsorted(starts, previous, side="right")
+    has_start = first < len(starts)
+    candidates = starts[np.minimum(first, len(starts) - 1)]
+    valid = has_start & (candidates < stops)
+    return candidates[valid], stops[valid] + 3
+
+
+class OrfAnalyzer(BaseAnalyzer):
+    """
+    Analyzer for open reading frames in all six frames.
+    
+    Analyzes:
+    - ATG-to-stop ORFs (longest ORF per stop codon)
+    - Stop-to-stop ORFs (between consecutive in-frame stops)
+    - ORF length distribution
+    - Overlap of ORFs with annotated CDS features
+    
+    ORFs are derived from the vectorized start and stop codon position
+    arrays of each frame, without walking the sequence base by base.
+    ORFs crossing the origin of circular records are not reported. Codon
+    positions are reused from the codon analyzer when it ran first.
+    """
+    
+    name = "orf_analysis"
+    version = "1"
+    requires = ("codon_analysis",)
+    outputs = ("orfs",)
+    
+    def __init__(self, min_length: int = 300):
+        """
+        Initialize the ORF analyzer.
+        
+        Args:
+            min_length: Minimum ORF length in nucleotides, stop codon included
+        """
+        super().__init__()
+        self.min_length = min_length
+        self.start_codon = "ATG"
+        self.stop_codons = ["TAA", "TAG", "TGA"]
+        self.length_bin_size = 100
+    
+    def analyze_record(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Find ORFs in a parsed genome.
+        
+        Args:
+            context: Parsed genome context
+            
+        Returns:
+            Dictionary with ORF analysis results
+        """
+        logger.info(f"Starting ORF analysis for {context.accession}")
+        
+        positions = self.codon_positions(context)
+        atg_orfs = self.find_orfs(context, from_start_codon=True, positions=positions)
+        stop_orfs = self.find_orfs(context, from_start_codon=False, positions=positions)
+        
+        lengths = atg_orfs["end"] - atg_orfs["start"]
+        results = {
+            "min_length": self.min_length,
+            "orf_counts": {
+                "atg_to_stop": self._count_by_frame(atg_orfs),
+                "stop_to_stop": self._count_by_frame(stop_orfs)
+            },
+            "length_stats": self._length_statistics(lengths),
+            "length_distribution": self._length_distribution(lengths),
+            "annotation_overlap": self.compare_with_annotation(atg_orfs, context),
+            "longest_orfs": self._longest_orfs(atg_orfs)
+        }
+        
+        order = np.argsort(atg_orfs["start"], kind="stable")
+        self.artifacts = {
+            "orfs": {
+                f"{context.accession}/{column}": atg_orfs[column][order]
+                for column in ("start", "end", "strand", "frame")
+            }
+        }
+        
+        logger.info(f"ORF analysis completed. Found {len(lengths)} ATG-to-stop ORFs")
+        return results
+    
+    def find_orfs(self, context: GenomeContext, from_start_codon: bool = True,
+                  positions: Dict[str, np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Find all ORFs of at least min_length in the six frames.
+        
+        Minus-strand ORFs are found in reverse complement coordinates and
+        reported in forward coordinates, so every ORF covers
+        [start, end) of the forward sequence.
+        
+        Args:
+            context: Parsed genome context
+            from_start_codon: True for ATG-to-stop ORFs, False for stop-to-stop
+            positions: Optional start and stop positions from codon_positions,
+                computed from the context when omitted
+            
+        Returns:
+            Dictionary of equal-length arrays: start, end, strand (1 or -1)
+            and frame (1..3, counted on the ORF's own strand)
+        """
+        length = len(context)
+        if positions is None:
+            positions = self.codon_positions(context)
+        columns = {"start": [], "end": [], "strand": [], "frame": []}
+        
+        for strand_sign, strand in zip((1, -1), STRANDS):
+            starts = positions[f"{self.start_codon}{strand}"]
+            stops = np.sort(np.concatenate([positions[f"{codon}{strand}"] for codon in self.stop_codons]))
+            if strand_sign == -1:
+                # Read the minus strand 5' to 3' as reverse complement coordinates
+                starts = (length - 3 - starts)[::-1]
+                stops = (length - 3 - stops)[::-1]
+            
+            for frame in range(FRAMES):
+                orf_starts, orf_ends = _frame_orfs(
+                    starts[starts % FRAMES == frame], stops[stops % FRAMES == frame], frame, from_start_codon
+                )
+                keep = orf_ends - orf_starts >= self.min_length
+                orf_starts, orf_ends = orf_starts[keep], orf_ends[keep]
+                if strand_sign == -1:
+                    orf_starts, orf_ends = length - orf_ends, length - orf_starts
+                
+                columns["start"].append(orf_starts)
+                columns["end"].append(orf_ends)
+                columns["strand"].append(np.full(len(orf_starts), strand_sign, dtype=np.int8))
+                columns["frame"].append(np.full(len(orf_starts), frame + 1, dtype=np.int8))
+        
+        return {name: np.concatenate(arrays) for name, arrays in columns.items()}
+    
+    def codon_positions(self, context: GenomeContext) -> Dict[str, np.ndarray]:
+        """
+        Locate the start and stop codons of both strands.
+        
+        The positions are taken from the "codon_positions" input produced
+        by the codon analyzer when it holds every codon needed, otherwise
+        the sequence is scanned chunk by chunk.
+        
+        Args:
+            context: Parsed genome context
+            
+        Returns:
+            Position arrays keyed "<codon><strand>" (see
+            codon_engine.codon_positions)
+        """
+        located = self.inputs.get("codon_positions", {})
+        keys = [f"{codon}{strand}" for codon in [self.start_codon] + self.stop_codons for strand in STRANDS]
+        if all(f"{context.accession}/{key}" in located for key in keys):
+            return {key: located[f"{context.accession}/{key}"] for key in keys}
+        
+        codons = [self.start_codon] + self.stop_codons
+        _, positions = merge_codon_scans(
+            context.map_chunks(scan_chunk_codons, codons, overlap=CODON_OVERLAP), len(context), codons
+        )
+        return positions
+    
+    def compare_with_annotation(self, orfs: Dict[str, np.ndarray], context: GenomeContext) -> Dict[str, Any]:
+        """
+        Compare ORFs with the annotated CDS features.
+        
+        An annotated CDS is matched when an ORF on the same strand ends at
+        the same stop codon. An ORF overlaps the annotation when it shares
+        at least one base with a CDS on the same strand.
+        
+        Args:
+            orfs: ORF arrays from find_orfs
+            context: Parsed genome context
+            
+        Returns:
+            Dictionary with overlap counts and percentages
+        """
+        cds = [
+            f for f in context.features
+            if f.type == "CDS" and f.parts is not None and f.strand is not None
+        ]
+        
+        matched = 0
+        overlapping = np.zeros(len(orfs["start"]), dtype=bool)
+        
+        for strand_sign in (1, -1):
+            strand_cds = [f for f in cds if f.strand == strand_sign]
+            on_strand = orfs["strand"] == strand_sign
+            if not strand_cds or not on_strand.any():
+                continue
+            
+            # The stop codon is at the 3' end: end on "+", start on "-"
+            orf_stops = orfs["end"][on_strand] if strand_sign == 1 else orfs["start"][on_strand]
+            cds_stops = np.array([f.end if strand_sign == 1 else f.start for f in strand_cds])
+            matched += int(np.isin(cds_stops, orf_stops).sum())
+            
+            # Interval overlap against CDS sorted by start with a running max of ends
+            cds_starts = np.array([f.start for f in strand_cds])
+            order = np.argsort(cds_starts)
+            cds_starts = cds_starts[order]
+            max_ends = np.maximum.accumulate(np.array([f.end for f in strand_cds])[order])
+            
+            last = np.searchsorted(cds_starts, orfs["end"][on_strand], side="left") - 1
+            overlaps = (last >= 0) & (max_ends[np.maximum(last, 0)] > orfs["start"][on_strand])
+            overlapping[on_strand] = overlaps
+        
+        total_orfs = len(orfs["start"])
+        orfs_overlapping = int(overlapping.sum())
+        
+        return {
+            "annotated_cds": len(cds),
+            "cds_with_orf": matched,
+            "cds_with_orf_percent": round(matched / len(cds) * 100, 2) if cds else 0,
+            "orfs_overlapping_cds": orfs_overlapping,
+            "orfs_overlapping_cds_percent": round(orfs_overlapping / total_orfs * 100, 2) if total_orfs else 0
+        }
+    
+    def analyze_replicon(self, context: GenomeContext) -> Dict[str, Any]:
+        """
+        Find the ORFs of one replicon, keeping the lengths for merging.
+        
+        Args:
+            context: Parsed genome context of a single replicon
+            
+        Returns:
+            Dictionary with the replicon results and its ATG-to-stop ORF lengths
+        """
+        results = self.analyze_record(context)
+        orfs = self.artifacts["orfs"]
+        lengths = orfs[f"{context.accession}/end"] - orfs[f"{context.accession}/start"]
+        return {"results": results, "lengths": lengths}
+    
+    def merge_results(self, partials: List[Dict[str, Any]], accessions: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-replicon ORF results into genome-level totals.
+        
+        Args:
+            partials: Results of analyze_replicon, in record order
+            accessions: Accession of each replicon, in record order
+            
+        Returns:
+            Dictionary with ORF analysis results and a per-replicon breakdown
+        """
+        replicon_results = [p["results"] for p in partials]
+        lengths = np.concatenate([p["lengths"] for p in partials])
+        
+        orf_counts = {
+            kind: {
+                label: sum(r["orf_counts"][kind][label] for r in replicon_results)
+                for label in replicon_results[0]["orf_counts"][kind]
+            }
+            for kind in ("atg_to_stop", "stop_to_stop")
+        }
+        
+        overlap_counts = {
+            key: sum(r["annotation_overlap"][key] for r in replicon_results)
+            for key in ("annotated_cds", "cds_with_orf", "orfs_overlapping_cds")
+        }
+        total_orfs = len(lengths)
+        annotation_overlap = {
+            "annotated_cds": overlap_counts["annotated_cds"],
+            "cds_with_orf": overlap_counts["cds_with_orf"],
+            "cds_with_orf_percent": round(
+                overlap_counts["cds_with_orf"] / overlap_counts["annotated_cds"] * 100, 2
+            ) if overlap_counts["annotated_cds"] else 0,
+            "orfs_overlapping_cds": overlap_counts["orfs_overlapping_cds"],
+            "orfs_overlapping_cds_percent": round(
+                overlap_counts["orfs_overlapping_cds"] / total_orfs * 100, 2
+            ) if total_orfs else 0
+        }
+        
+        longest = [
+            dict(orf, replicon=accession)
+            for accession, r in zip(accessions, replicon_results)
+            for orf in r["longest_orfs"]
+        ]
+        longest.sort(key=lambda orf: orf["length"], reverse=True)
+        
+        return {
+            "min_length": self.min_length,
+            "orf_counts": orf_counts,
+            "length_stats": self._length_statistics(lengths),
+            "length_distribution": self._length_distribution(lengths),
+            "annotation_overlap": annotation_overlap,
+            "longest_orfs": longest[:10],
+            "replicons": [
+                {
+                    "accession": accession,
+                    "atg_to_stop": r["orf_counts"]["atg_to_stop"]["total"],
+                    "stop_to_stop": r["orf_counts"]["stop_to_stop"]["total"],
+                    "cds_with_orf": r["annotation_overlap"]["cds_with_orf"]
+                }
+                for accession, r in zip(accessions, replicon_results)
+            ]
+        }
+    
+    def _count_by_frame(self, orfs: Dict[str, np.ndarray]) -> Dict[str, int]:
+        """Count ORFs per frame, labelled "+1".."+3" and "-1".."-3" (PRIVATE)."""
+        counts = {"total": len(orfs["start"])}
+        for strand_sign, strand in zip((1, -1), STRANDS):
+            for frame in range(1, FRAMES + 1):
+                selected = (orfs["strand"] == strand_sign) & (orfs["frame"] == frame)
+                counts[f"{strand}{frame}"] = int(selected.sum())
+        return counts
+    
+    def _length_statistics(self, lengths: np.ndarray) -> Dict[str, Any]:
+        """Summarize ORF lengths (PRIVATE)."""
+        if len(lengths) == 0:
+            return {"mean": 0, "median": 0, "min": 0, "max": 0}
+        
+        return {
+            "mean": round(float(lengths.mean()), 2),
+            "median": float(np.median(lengths)),
+            "min": int(lengths.min()),
+            "max": int(lengths.max())
+        }
+    
+    def _length_distribution(self, lengths: np.ndarray) -> Dict[str, List]:
+        """Bin ORF lengths like GeneAnalyzer.get_length_distribution (PRIVATE)."""
+        counts = np.bincount(lengths // self.length_bin_size) if len(lengths) else np.zeros(1, dtype=np.int64)
+        
+        return {
+            "bins": list(range(0, len(counts) * self.length_bin_size, self.length_bin_size)),
+            "counts": counts.tolist(),
+            "bin_size": self.length_bin_size
+        }
+    
+    def _longest_orfs(self, orfs: Dict[str, np.ndarray], count: int = 10) -> List[Dict[str, Any]]:
+        """List the longest ORFs (PRIVATE)."""
+        lengths = orfs["end"] - orfs["start"]
+        longest = np.argsort(-lengths, kind="stable")[:count]
+        
+        return [
+            {
+                "start": int(orfs["start"][i]),
+                "end": int(orfs["end"][i]),
+                "strand": "+" if orfs["strand"][i] == 1 else "-",
+                "frame": int(orfs["frame"][i]),
+                "length": int(lengths[i])
+            }
+            for i in longest
+        ]
@@ -0,0 +1,235 @@
+"""Per-replicon analysis of multi-record genomes on a process pool."""
+
+import copy
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.analyzers.chunk_pool import ChunkPool
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.sequence_chunks import MIN_CHUNK_SIZE, chunk_size_for_budget
+from app.analyzers.stage_scheduler import Stage, StageScheduler
+from app.core.config import settings
+from app.core.logging import logger
+
+
+# (accession, {analyzer name: partial result}, {analyzer name: artifacts})
+# for one replicon
+RepliconResult = Tuple[str, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]
+
+
+def _analyzer_stage(key: str, analyzer: Any, context: GenomeContext, requires: List[str],
+                    replicon: bool) -> Stage:
+    """Wrap one analyzer run into a stage returning (result, artifacts) (PRIVATE)."""
+    def run(inputs: Dict[str, Any], report: Callable[[float], None]):
+        analyzer.artifacts = {}
+        analyzer.inputs = {}
+        for _, artifacts in inputs.values():
+            analyzer.inputs.update(artifacts)
+        try:
+            if replicon:
+                result = analyzer.analyze_replicon(context)
+            else:
+                result = analyzer.analyze_record(context)
+        finally:
+            analyzer.inputs = {}
+        return result, analyzer.artifacts
+    
+    return Stage(key, run, requires)
+
+
+def _run_analyzers(analyzers: Dict[str, Any], context: GenomeContext, replicon: bool, threads: int,
+                   progress_callback: Optional[Callable[[int, int], None]] = None
+                   ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Run every analyzer on one context, independent ones concurrently (PRIVATE).
+    
+    Analyzers are ordered by their requires declarations; requirements
+    missing from the run are ignored, so the analyzer computes what it
+    needs itself.
+    
+    Returns:
+        Tuple of ({key: result}, {key: artifacts})
+    """
+    keys = {getattr(analyzer, "name", None) or key: key for key, analyzer in analyzers.items()}
+    stages = [
+        _analyzer_stage(
+            key, analyzer, context,
+            [keys[name] for name in getattr(analyzer, "requires", ()) if name in keys],
+            replicon
+        )
+        for key, analyzer in analyzers.items()
+    ]
+    
+    finished = []
+    
+    def report_stage(key: str, outcome: Any):
+        finished.append(key)
+        if progress_callback:
+            progress_callback(len(finished), len(stages))
+    
+    outcomes = StageScheduler(stages, max_workers=threads).run(stage_callback=report_stage)
+    return (
+        {key: outcomes[key][0] for key in analyzers},
+        {key: outcomes[key][1] for key in analyzers}
+    )
+
+
+def _analyze_replicon(genbank_file: str, index: int, offset: Optional[int], analyzers: Dict[str, Any],
+                      chunk_size: Optional[int] = None, threads: int = 1) -> RepliconResult:
+    """Open a single record and run every analyzer on it (PRIVATE)."""
+    with GenomeContext.load_record(genbank_file, index, offset) as context:
+        context.chunk_size = chunk_size
+        partials, artifacts = _run_analyzers(analyzers, context, True, threads)
+        return context.accession, partials, artifacts
+
+
+class RepliconRunner:
+    """
+    Run a set of analyzers over every record of a GenBank file.
+    
+    Single-record genomes are analyzed in-process with analyze_record;
+    when they span several MIN_CHUNK_SIZE chunks, the chunked scans of
+    the analyzers are mapped over a ChunkPool of worker processes that
+    share the sequence, so one genome uses several cores. Multi-record genomes (chromosomes plus plasmids,
+    WGS contig sets) are analyzed one record per task on a process pool.
+    Each worker opens only its own record, so memory stays bounded to one
+    replicon per worker, and the per-replicon partial results are
+    combined with each analyzer's merge_results. Artifacts produced by
+    the workers are collected back onto the analyzers of the runner.
+    
+    Within a record, analyzers run on a thread pool in the order set by
+    their requires declarations (see BaseAnalyzer), so independent
+    analyzers overlap wherever NumPy releases the GIL, and an analyzer
+    reads the artifacts of its requirements instead of recomputing them.
+    
+    The memory budget is shared by the workers and their threads.
+    Records too long to analyze whole within a thread's share are scanned
+    in chunks (see GenomeContext.chunks) with identical results.
+    
+    A daemonic process, such as a Celery prefork worker, cannot start
+    worker processes; there the replicons and chunks are handed to
+    threads instead, each replicon with its own copy of the analyzers.
+    """
+    
+    def __init__(self, analyzers: Dict[str, Any], max_workers: Optional[int] = None,
+                 memory_budget_mb: Optional[float] = None, threads: Optional[int] = None):
+        """
+        Initialize the runner.
+        
+        Args:
+            analyzers: Analyzer instances keyed by result name
+            max_workers: Worker processes (defaults to ANALYSIS_WORKERS,
+                0 meaning one per CPU)
+            memory_budget_mb: Sequence working memory of the whole run
+                (defaults to ANALYSIS_MEMORY_BUDGET_MB)
+            threads: Analyzers run at once on each record (defaults to
+                ANALYSIS_THREADS)
+        """
+        self.analyzers = analyzers
+        self.threads = max(settings.ANALYSIS_THREADS if threads is None else threads, 1)
+        self.max_workers = settings.ANALYSIS_WORKERS if max_workers is None else max_workers
+        self.memory_budget_mb = settings.ANALYSIS_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+    
+    def run(self, genbank_file: str,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze all records of a GenBank file.
+        
+        Args:
+            genbank_file: Path to GenBank file
+            progress_callback: Optional callable receiving (records done,
+                total records), or (analyzers done, total analyzers) for
+                single-record genomes
+            
+        Returns:
+            Dictionary of results keyed by analyzer name
+        """
+        offsets = GenomeContext.record_offsets(genbank_file)
+        if not offsets:
+            raise ValueError(f"No records found in {genbank_file}")
+        
+        if len(offsets) == 1:
+            with GenomeContext.load_record(genbank_file, 0, offsets[0]) as context:
+                context.chunk_size = chunk_size_for_budget(self.memory_budget_mb / self.threads)
+                if context.chunked:
+                    logger.info(f"Analyzing {context.accession} in chunks of {context.chunk_size} bp")
+                workers = self._worker_count(-(-len(context) // MIN_CHUNK_SIZE))
+                if workers > 1:
+                    logger.info(f"Analyzing {context.accession} on {workers} workers")
+                    with ChunkPool(context, workers, self.memory_budget_mb, threads=self._in_daemon()) as pool:
+                        context.chunk_pool = pool
+                        results, artifacts = _run_analyzers(
+                            self.analyzers, context, False, self.threads, progress_callback
+                        )
+                else:
+                    results, artifacts = _run_analyzers(
+                        self.analyzers, context, False, self.threads, progress_callback
+                    )
+            for name, analyzer in self.analyzers.items():
+                analyzer.artifacts = artifacts[name]
+            return results
+        
+        logger.info(f"Analyzing {len(offsets)} replicons of {genbank_file}")
+        replicons = self._analyze_replicons(genbank_file, offsets, progress_callback)
+        accessions = [accession for accession, _, _ in replicons]
+        
+        results = {}
+        for name, analyzer in self.analyzers.items():
+            results[name] = analyzer.merge_results([partials[name] for _, partials, _ in replicons], accessions)
+            
+            # Artifact arrays are keyed by replicon, so merging is a union
+            analyzer.artifacts = {}
+            for _, _, artifacts in replicons:
+                for artifact_name, arrays in artifacts[name].items():
+                    analyzer.artifacts.setdefault(artifact_name, {}).update(arrays)
+        
+        return results
+    
+    def _analyze_replicons(self, genbank_file: str, offsets: List[Optional[int]],
+                           progress_callback: Optional[Callable[[int, int], None]]) -> List[RepliconResult]:
+        """Analyze every record, in parallel when possible (PRIVATE)."""
+        total = len(offsets)
+        replicons: List[Optional[RepliconResult]] = [None] * total
+        workers = self._worker_count(total)
+        chunk_size = chunk_size_for_budget(self.memory_budget_mb / (max(workers, 1) * self.threads))
+        
+        if workers <= 1:
+            for index, offset in enumerate(offsets):
+                replicons[index] = _analyze_replicon(
+                    genbank_file, index, offset, self.analyzers, chunk_size, self.threads
+                )
+                if progress_callback:
+                    progress_callback(index + 1, total)
+            return replicons
+        
+        # Threads share the analyzer instances, which hold per-run state
+        threaded = self._in_daemon()
+        executor_class = ThreadPoolExecutor if threaded else ProcessPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _analyze_replicon, str(genbank_file), index, offset,
+                    copy.deepcopy(self.analyzers) if threaded else self.analyzers, chunk_size, self.threads
+                ): index
+                for index, offset in enumerate(offsets)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                replicons[futures[future]] = future.result()
+                if progress_callback:
+                    progress_callback(done, total)
+        
+        return replicons
+    
+    def _worker_count(self, tasks: int) -> int:
+        """Number of workers to use for a number of records or chunks (PRIVATE)."""
+        workers = self.max_workers or os.cpu_count() or 1
+        return min(workers, tasks)
+    
+    @staticmethod
+    def _in_daemon() -> bool:
+        """Whether workers must be threads, daemonic processes having no children (PRIVATE)."""
+        if multiprocessing.current_process().daemon:
+            logger.info("Running in a daemonic process, using worker threads")
+            return True
+        return False
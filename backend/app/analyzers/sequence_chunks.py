@@ -0,0 +1,199 @@
+"""Fixed-size, overlapping sequence chunks for bounded-memory scans."""
+
+from functools import cached_property
+from typing import Iterable, Optional, Sequence, Tuple, Union
+import numpy as np
+from app.analyzers.sequence_encoding import BASES, binned_base_counts, encode_sequence
+
+
+# Working memory of the analyzers per base of a chunk: the chunk bytes and
+# codes, codon and k-mer keys, prefix sums and bincount indices
+CHUNK_BYTES_PER_BASE = 32
+
+# Smallest chunk handed out whatever the budget
+MIN_CHUNK_SIZE = 1024 * 1024
+
+
+def chunk_size_for_budget(budget_mb: float) -> int:
+    """
+    Get the largest chunk whose working set fits a memory budget.
+    
+    Args:
+        budget_mb: Memory budget in MiB
+        
+    Returns:
+        Chunk size in bases, at least MIN_CHUNK_SIZE
+    """
+    return max(int(budget_mb * 1024 * 1024) // CHUNK_BYTES_PER_BASE, MIN_CHUNK_SIZE)
+
+
+def symbol_table(symbols: str) -> bytes:
+    """
+    Build a bytes.translate table that marks a set of symbols.
+    
+    Args:
+        symbols: Upper-case symbols to mark
+        
+    Returns:
+        Table mapping those symbols to 1 and every other byte to 0
+    """
+    return bytes(1 if chr(value) in symbols else 0 for value in range(256))
+
+
+class SequenceChunk:
+    """
+    One chunk of a genome sequence.
+    
+    A chunk owns the bases [start, end) and carries up to overlap bases
+    past end, so a scan can read windows (codons, k-mers) that start in
+    the chunk but end in the next one. Anything counted per window start
+    must be restricted to the first ``owned`` windows to avoid counting
+    boundary windows twice.
+    
+    Attributes:
+        start: Position of the first owned base
+        end: End of the owned bases (exclusive)
+        sequence: Upper-cased bytes of the owned bases plus the overlap
+    """
+    
+    def __init__(self, start: int, end: int, sequence: Union[bytes, bytearray],
+                 codes: Optional[np.ndarray] = None):
+        """
+        Initialize the chunk.
+        
+        Args:
+            start: Position of the first owned base
+            end: End of the owned bases (exclusive)
+            sequence: Upper-cased bytes of the owned bases plus the overlap
+            codes: Optional already encoded sequence
+        """
+        self.start = start
+        self.end = end
+        self.sequence = sequence
+        if codes is not None:
+            self.codes = codes
+    
+    @property
+    def owned(self) -> int:
+        """Number of bases owned by the chunk."""
+        return self.end - self.start
+    
+    @cached_property
+    def codes(self) -> np.ndarray:
+        """Chunk bytes as uint8 base codes (see encode_sequence), computed on first access."""
+        return encode_sequence(self.sequence)
+    
+    def __repr__(self):
+        return f"<SequenceChunk(start={self.start}, end={self.end})>"
+
+
+def chunk_binned_counts(chunk: SequenceChunk, bin_size: int, table: Optional[bytes] = None,
+                        classes: int = len(BASES)) -> Tuple[int, np.ndarray]:
+    """
+    Count symbol classes (four by default) in the bins one chunk touches.
+    
+    This is the map step of chunked_binned_counts. Bins are aligned to
+    sequence positions, so a bin cut by the chunk boundary is counted in
+    part here and in part by the neighbouring chunk.
+    
+    Args:
+        chunk: Chunk to count
+        bin_size: Bases per bin
+        table: Optional bytes.translate table mapping each byte to a
+            class 0..classes - 1 (or classes, not counted); defaults to
+            A, C, G and T
+        classes: Number of counted classes of the table
+            
+    Returns:
+        Tuple of (index of the first bin touched, counts of shape
+        (bins, classes))
+    """
+    if table is None:
+        codes = chunk.codes[:chunk.owned]
+    else:
+        codes = np.frombuffer(chunk.sequence.translate(table), dtype=np.uint8)[:chunk.owned]
+    
+    # Pad the first bin up to its start with uncounted codes
+    offset = chunk.start % bin_size
+    if offset:
+        codes = np.concatenate((np.full(offset, classes, dtype=np.uint8), codes))
+    
+    return chunk.start // bin_size, binned_base_counts(codes, bin_size, classes=classes)
+
+
+def add_binned_counts(partials: Iterable[Tuple[int, np.ndarray]], length: int, bin_size: int,
+                      classes: int = len(BASES)) -> np.ndarray:
+    """
+    Add up per-chunk bin counts (the reduce step of chunked_binned_counts).
+    
+    Args:
+        partials: Results of chunk_binned_counts
+        length: Sequence length
+        bin_size: Bases per bin
+        classes: Number of counted classes
+        
+    Returns:
+        Integer array of shape (bins, classes) with the count of each class
+    """
+    counts = np.zeros((-(-length // bin_size), classes), dtype=np.int64)
+    for first, binned in partials:
+        counts[first:first + len(binned)] += binned
+    return counts
+
+
+def chunked_binned_counts(chunks: Iterable[SequenceChunk], length: int, bin_size: int,
+                          table: Optional[bytes] = None) -> np.ndarray:
+    """
+    Count four symbol classes in consecutive bins, chunk by chunk.
+    
+    Bins are aligned to sequence positions, not chunks. A bin cut by a
+    chunk boundary is counted in two parts that add up in the shared
+    output row, so the counts do not depend on the chunk size.
+    
+    Args:
+        chunks: Chunks covering the sequence, in order
+        length: Sequence length
+        bin_size: Bases per bin; the last bin may be shorter
+        table: Optional bytes.translate table mapping each byte to a
+            class 0..3 (or INVALID_CODE); defaults to A, C, G and T
+            
+    Returns:
+        Integer array of shape (bins, 4) with the count of each class
+    """
+    return add_binned_counts((chunk_binned_counts(chunk, bin_size, table) for chunk in chunks), length, bin_size)
+
+
+def range_symbol_counts(chunks: Iterable[SequenceChunk], starts: np.ndarray, ends: np.ndarray,
+                        symbol_sets: Sequence[str]) -> np.ndarray:
+    """
+    Count sets of symbols in many ranges, chunk by chunk.
+    
+    Each chunk gets its own prefix sums, and every range adds the part of
+    itself that falls in the chunk, so no genome-length array is built.
+    
+    Args:
+        chunks: Chunks covering the sequence, in order
+        starts: Range starts (0-based, inclusive)
+        ends: Range ends (exclusive)
+        symbol_sets: Symbol sets to count, e.g. ("GCS", "ATGCSW")
+        
+    Returns:
+        Integer array of shape (len(symbol_sets), len(starts))
+    """
+    tables = [symbol_table(symbols) for symbols in symbol_sets]
+    totals = np.zeros((len(tables), len(starts)), dtype=np.int64)
+    
+    for chunk in chunks:
+        hits = np.flatnonzero((starts < chunk.end) & (ends > chunk.start))
+        if len(hits) == 0:
+            continue
+        
+        low = np.clip(starts[hits] - chunk.start, 0, chunk.owned)
+        high = np.clip(ends[hits] - chunk.start, 0, chunk.owned)
+        for row, table in enumerate(tables):
+            matches = np.frombuffer(chunk.sequence.translate(table), dtype=np.uint8)[:chunk.owned]
+            cumulative = np.zeros(len(matches) + 1, dtype=np.int64)
+            np.cumsum(matches, out=cumulative[1:])
+            totals[row, hits] += cumulative[high] - cumulative[low]
+    
+    return totals
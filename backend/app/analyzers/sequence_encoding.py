@@ -0,0 +1,98 @@
+"""Numeric nucleotide encoding shared by the vectorized analyzers."""
+
+from typing import Union
+import numpy as np
+
+
+BASES = "ACGT"
+
+# Code given to every symbol other than upper-case A, C, G and T
+INVALID_CODE = 4
+
+# IUPAC nucleotide codes, unambiguous bases first
+IUPAC_SYMBOLS = "ACGTURYSWKMBDHVN"
+
+# Bytes counted per bincount call, bounding the temporary index array
+COUNT_BLOCK_SIZE = 1024 * 1024
+
+# Byte value -> A, C, G, T = 0..3, anything else INVALID_CODE, applied
+# with bytes.translate, which is much faster than a NumPy table lookup
+_BASE_TABLE = bytes(
+    BASES.index(chr(value)) if chr(value) in BASES else INVALID_CODE
+    for value in range(256)
+)
+
+
+def encode_sequence(sequence: Union[str, bytes, bytearray]) -> np.ndarray:
+    """
+    Encode an upper-cased sequence as one uint8 code per base.
+    
+    Args:
+        sequence: Upper-cased DNA sequence
+        
+    Returns:
+        Array with A, C, G, T encoded as 0..3 and every other symbol
+        (N, IUPAC codes, lower case) as INVALID_CODE
+    """
+    if isinstance(sequence, str):
+        sequence = sequence.encode("latin-1")
+    return np.frombuffer(sequence.translate(_BASE_TABLE), dtype=np.uint8)
+
+
+def symbol_counts(sequence: Union[bytes, bytearray, memoryview],
+                  block_size: int = COUNT_BLOCK_SIZE) -> np.ndarray:
+    """
+    Count every byte value of a sequence buffer.
+    
+    The buffer is viewed in place and counted block by block, so even a
+    100+ Mb sequence needs no full-size temporary copy.
+    
+    Args:
+        sequence: Sequence bytes
+        block_size: Bytes counted per bincount call
+        
+    Returns:
+        Array of 256 counts indexed by byte value
+    """
+    view = np.frombuffer(sequence, dtype=np.uint8)
+    counts = np.zeros(256, dtype=np.int64)
+    for block_start in range(0, len(view), block_size):
+        counts += np.bincount(view[block_start:block_start + block_size], minlength=256)
+    return counts
+
+
+def binned_base_counts(codes: np.ndarray, bin_size: int, block_bins: int = 4096,
+                       classes: int = len(BASES)) -> np.ndarray:
+    """
+    Count A, C, G and T in consecutive bins of an encoded sequence.
+    
+    The sequence is read once, one block of bins at a time; each block is
+    a single bincount over (bin, base) keys, so memory stays bounded by
+    the block size rather than the genome size.
+    
+    Args:
+        codes: Encoded sequence from encode_sequence
+        bin_size: Bases per bin; the last bin may be shorter
+        block_bins: Bins counted per block
+        classes: Number of counted codes; codes 0..classes - 1 are
+            counted and the code classes is not (INVALID_CODE for bases)
+        
+    Returns:
+        Integer array of shape (bins, classes) with the A, C, G and T
+        count (or the count of each class) of every bin
+    """
+    radix = classes + 1
+    bins = -(-len(codes) // bin_size)
+    counts = np.zeros((bins, radix), dtype=np.int64)
+    
+    block_size = bin_size * block_bins
+    keys = np.arange(min(block_size, len(codes)), dtype=np.intp) // bin_size * radix
+    for block_start in range(0, len(codes), block_size):
+        block = codes[block_start:block_start + block_size]
+        first = block_start // bin_size
+        block_keys = keys[:len(block)] + block
+        counts[first:first + -(-len(block) // bin_size)] = np.bincount(
+            block_keys, minlength=-(-len(block) // bin_size) * radix
+        ).reshape(-1, radix)
+    
+    return counts[:, :classes]
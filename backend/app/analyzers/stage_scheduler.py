@@ -0,0 +1,183 @@
+"""Dependency-ordered execution of analysis stages on a worker pool."""
+
+import os
+import queue
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Seconds between checks for progress reported by running stages
+PROGRESS_POLL_INTERVAL = 0.1
+
+
+def _ignore_progress(fraction: float):
+    """Progress reporter handed to stages run in worker processes (PRIVATE)."""
+
+
+class Stage:
+    """
+    One unit of work of a StageScheduler.
+    
+    The run callable receives the results of the required stages, keyed
+    by stage name, and a report callable taking the completed fraction of
+    the stage (0..1). Stages run on a process pool must be picklable, and
+    their reports are ignored.
+    
+    Attributes:
+        name: Unique stage name
+        run: Callable (inputs, report) -> result
+        requires: Names of the stages whose results the stage needs
+        weight: Share of the overall progress the stage accounts for
+    """
+    
+    def __init__(self, name: str, run: Callable[[Dict[str, Any], Callable[[float], None]], Any],
+                 requires: Iterable[str] = (), weight: float = 1.0):
+        """
+        Initialize the stage.
+        
+        Args:
+            name: Unique stage name
+            run: Callable (inputs, report) -> result
+            requires: Names of the stages whose results the stage needs
+            weight: Share of the overall progress
+        """
+        self.name = name
+        self.run = run
+        self.requires = tuple(requires)
+        self.weight = weight
+    
+    def __repr__(self):
+        return f"<Stage(name='{self.name}', requires={self.requires})>"
+
+
+class StageScheduler:
+    """
+    Run stages as soon as their dependencies are done.
+    
+    Stages form a directed acyclic graph through their requires lists.
+    Every stage whose dependencies have finished is submitted to the pool
+    at once, so independent stages overlap. Progress is the weighted
+    share of finished work and is reported, like stage completions, on
+    the thread that called run, so callbacks may use resources that are
+    not thread-safe (e.g. a database session).
+    """
+    
+    def __init__(self, stages: List[Stage], max_workers: Optional[int] = None, use_processes: bool = False):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            stages: Stages to run
+            max_workers: Pool size (defaults to one per CPU)
+            use_processes: Run stages on a process pool instead of threads
+            
+        Raises:
+            ValueError: If stage names repeat, a dependency is unknown or
+                the dependencies form a cycle
+        """
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        
+        for stage in stages:
+            unknown = [name for name in stage.requires if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} requires unknown stages: {', '.join(unknown)}")
+        
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.levels()
+    
+    def levels(self) -> List[List[str]]:
+        """
+        Group the stages into dependency levels.
+        
+        Returns:
+            Lists of stage names; every stage comes after all of its
+            dependencies, and stages of one level are independent
+            
+        Raises:
+            ValueError: If the dependencies form a cycle
+        """
+        remaining = {name: set(stage.requires) for name, stage in self.stages.items()}
+        levels = []
+        while remaining:
+            level = [name for name, requires in remaining.items() if not requires]
+            if not level:
+                raise ValueError(f"Stage dependencies form a cycle: {', '.join(sorted(remaining))}")
+            for name in level:
+                del remaining[name]
+            for requires in remaining.values():
+                requires.difference_update(level)
+            levels.append(level)
+        return levels
+    
+    def run(self, progress_callback: Optional[Callable[[str, float], None]] = None,
+            stage_callback: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Run every stage.
+        
+        Args:
+            progress_callback: Optional callable receiving (stage name,
+                overall completed fraction) when a stage starts, reports
+                progress or finishes
+            stage_callback: Optional callable receiving (stage name,
+                result) when a stage finishes
+                
+        Returns:
+            Results keyed by stage name
+            
+        Raises:
+            Exception: The first exception raised by a stage; stages not
+                yet started are cancelled
+        """
+        total_weight = sum(stage.weight for stage in self.stages.values()) or 1.0
+        fractions = {name: 0.0 for name in self.stages}
+        results = {}
+        running: Dict[Future, str] = {}
+        reports = queue.Queue()
+        
+        def notify(name: str):
+            if progress_callback:
+                done = sum(self.stages[n].weight * fraction for n, fraction in fractions.items())
+                progress_callback(name, min(done / total_weight, 1.0))
+        
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=self.max_workers) as executor:
+            try:
+                while len(results) < len(self.stages):
+                    started = set(running.values()) | set(results)
+                    for name, stage in self.stages.items():
+                        if name in started or any(dep not in results for dep in stage.requires):
+                            continue
+                        if self.use_processes:
+                            report = _ignore_progress
+                        else:
+                            report = lambda fraction, name=name: reports.put((name, fraction))
+                        inputs = {dep: results[dep] for dep in stage.requires}
+                        running[executor.submit(stage.run, inputs, report)] = name
+                        notify(name)
+                    
+                    done, _ = wait(running, timeout=PROGRESS_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    
+                    while not reports.empty():
+                        name, fraction = reports.get()
+                        if name not in results:
+                            fractions[name] = max(fractions[name], min(fraction, 1.0))
+                            notify(name)
+                    
+                    for future in done:
+                        name = running.pop(future)
+                        results[name] = future.result()
+                        fractions[name] = 1.0
+                        if stage_callback:
+                            stage_callback(name, results[name])
+                        notify(name)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+        
+        return results
@@ -1,21 +1,69 @@
 """Analysis endpoints for managing genome analysis tasks."""
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from celery import chain
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.schemas.analysis import AnalysisRequest, AnalysisStatus, AnalysisResponse
-from app.services.ncbi_service import NCBIService
+from app.schemas.analysis import (
+    AnalysisRequest, AnalysisStatus, AnalysisResponse, AnalysisWorkload, BatchRequest, BatchResponse, BatchStatus
+)
+from app.services.result_cache import ResultCache
+from app.services.single_flight import get_single_flight
+from app.services.batch_service import TERMINAL_STATUSES, BatchService
+from app.services.cost_model import CostModel
+from app.services.progress_channel import (
+    STATE_FIELDS, analysis_state, get_progress_broadcaster, get_progress_channel
+)
+from app.analyzers.base_analyzer import BaseAnalyzer
 from app.models.genome import Genome
 from app.models.analysis import Analysis
+from app.core.config import settings
 from app.core.logging import logger
-from app.core.exceptions import NCBIException
 import uuid
 
 router = APIRouter()
 
 
+def _channel_state(analysis_id: int) -> Optional[Dict[str, Any]]:
+    """Get the state of an analysis from the progress channel, if complete (PRIVATE)."""
+    state = get_progress_channel().get(analysis_id)
+    if state and all(field in state for field in STATE_FIELDS):
+        return state
+    return None
+
+
+def _abandon_analysis(db: Session, analysis: Optional[Analysis], message: str, error: Exception):
+    """Mark an analysis that could not be started as failed, so duplicates stop attaching to it (PRIVATE)."""
+    if analysis is None:
+        return
+    try:
+        db.rollback()
+        if analysis.status == "pending":
+            analysis.status = "failed"
+            analysis.message = message
+            analysis.error_message = str(error)
+            db.commit()
+    except Exception as e:
+        logger.error(f"Could not mark analysis {analysis.id} failed: {e}")
+
+
+def _analysis_status(state: Dict[str, Any]) -> AnalysisStatus:
+    """Build the status response of an analysis state (PRIVATE)."""
+    return AnalysisStatus(**dict(state, progress=round(state["progress"] or 0.0, 1)))
+
+
+def _status_event(event: str, state: Dict[str, Any]) -> str:
+    """Format the state of an analysis as a server-sent event (PRIVATE)."""
+    return f"event: {event}\ndata: {_analysis_status(state).model_dump_json()}\n\n"
+
+
 @router.post("/start", response_model=AnalysisStatus, status_code=202)
-async def start_analysis(
+def start_analysis(
     request: AnalysisRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -26,61 +74,107 @@ async def start_analysis(
     - **accession**: NCBI accession number to analyze
     
     This endpoint will:
-    1. Download the genome from NCBI (if not already downloaded)
+    1. Attach to the analysis of the accession already in flight, if any,
+       and return its status
     2. Create a genome record in the database
-    3. Start an asynchronous analysis task
+    3. Start an asynchronous analysis task, chained after a download of
+       the genome from NCBI if it is not downloaded yet, unless every
+       analyzer result is cached for the genome file content, in which
+       case the analysis completes immediately with the cached results
     4. Return the analysis status
     
+    Concurrent requests for one accession are serialized by a
+    single-flight lock, so they share one download and one analysis.
+    The endpoint is synchronous, so FastAPI runs it in its thread pool
+    and waiting for the lock does not block the event loop.
+    
     The analysis runs in the background. Use the returned analysis_id
     to check the status with GET /analysis/{analysis_id}
     """
     logger.info(f"Starting analysis for: {request.accession}")
     
+    flight = get_single_flight()
+    analysis = None
     try:
-        # Check if genome already exists
-        genome = db.query(Genome).filter(Genome.accession == request.accession).first()
-        
-        if not genome:
-            # Download genome
-            ncbi_service = NCBIService()
-            file_path = ncbi_service.download_genome(request.accession)
-            metadata = ncbi_service.get_genome_metadata(request.accession)
+        with flight.lock(flight.key("accession", request.accession)):
+            genome = db.query(Genome).filter(Genome.accession == request.accession).first()
             
-            # Create genome record
-            genome = Genome(
-                accession=request.accession,
-                organism_name=metadata.get("organism", "Unknown"),
-                genome_size=metadata.get("length", 0),
-                file_path=file_path,
-                metadata=metadata
+            # Duplicate requests get the analysis in flight; older ones are
+            # presumed dead (e.g. their worker was killed)
+            since = datetime.now(timezone.utc) - timedelta(hours=settings.SINGLE_FLIGHT_MAX_AGE_HOURS)
+            in_flight = genome and (
+                db.query(Analysis)
+                .filter(
+                    Analysis.genome_id == genome.id,
+                    Analysis.status.notin_(TERMINAL_STATUSES),
+                    Analysis.started_at >= since
+                )
+                .order_by(Analysis.id)
+                .first()
             )
-            db.add(genome)
-            db.commit()
-            db.refresh(genome)
+            if in_flight:
+                logger.info(f"Attached to analysis in flight: {in_flight.id}")
+                return _analysis_status(_channel_state(in_flight.id) or analysis_state(in_flight))
             
-            logger.info(f"Genome downloaded and saved: {genome.id}")
-        else:
-            logger.info(f"Genome already exists: {genome.id}")
+            # Create genome record, filled in once downloaded
+            if not genome:
+                genome = Genome(accession=request.accession, organism_name="Unknown")
+                db.add(genome)
+            
+            # Create analysis record
+            task_id = str(uuid.uuid4())
+            analysis = Analysis(
+                genome=genome,
+                task_id=task_id,
+                status="pending",
+                progress=0.0,
+                message="Analysis queued" if genome.file_path else "Waiting for download"
+            )
+            db.add(analysis)
+            db.commit()
+            db.refresh(analysis)
         
-        # Create analysis record
-        task_id = str(uuid.uuid4())
-        analysis = Analysis(
-            genome_id=genome.id,
-            task_id=task_id,
-            status="pending",
-            progress=0.0,
-            message="Analysis queued"
-        )
-        db.add(analysis)
-        db.commit()
-        db.refresh(analysis)
+        # A genome whose every analyzer result is cached completes right away
+        if genome.file_path and settings.RESULT_CACHE_ENABLED:
+            cache = ResultCache(db)
+            versions = BaseAnalyzer.versions()
+            cached = cache.lookup(cache.genome_hash(genome), versions)
+            if len(cached) == len(versions):
+                cache.complete(analysis, cached)
+                logger.info(f"Analysis created from cache: {analysis.id}")
+                
+                return AnalysisStatus(
+                    analysis_id=analysis.id,
+                    task_id=task_id,
+                    status=analysis.status,
+                    progress=analysis.progress,
+                    message=analysis.message,
+                    started_at=analysis.started_at,
+                    completed_at=analysis.completed_at
+                )
         
-        # Start Celery task
-        from app.tasks.analysis_tasks import analyze_genome_task
-        task = analyze_genome_task.apply_async(
-            args=[analysis.id, genome.file_path, genome.accession],
-            task_id=task_id
-        )
+        # Publish the queued state before the worker can publish its own
+        get_progress_channel().update(analysis.id, **analysis_state(analysis))
+        
+        # Start Celery task, routed by genome size and estimated cost; a
+        # genome not downloaded yet is downloaded by a worker first, and
+        # the analysis fails if its download does
+        from app.tasks.analysis_tasks import analyze_genome_task, dispatch_options, fail_analysis_task
+        from app.tasks.download_tasks import download_genome_task
+        if genome.file_path:
+            logger.info(f"Genome already exists: {genome.id}")
+            task = analyze_genome_task.apply_async(
+                args=[analysis.id, genome.file_path, genome.accession],
+                task_id=task_id,
+                **dispatch_options(genome, CostModel(db))
+            )
+        else:
+            task = chain(
+                download_genome_task.si(genome.accession, genome.id),
+                analyze_genome_task.si(analysis.id, None, genome.accession).set(
+                    task_id=task_id, **dispatch_options(genome, CostModel(db))
+                )
+            ).on_error(fail_analysis_task.si(analysis.id)).apply_async()
         
         logger.info(f"Analysis created: {analysis.id}, Task: {task.id}")
         
@@ -89,20 +183,102 @@ async def start_analysis(
             task_id=task_id,
             status="pending",
             progress=0.0,
-            message="Analysis queued for processing",
+            message=analysis.message,
             started_at=analysis.started_at
         )
         
-    except NCBIException as e:
-        logger.error(f"NCBI error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         logger.error(f"Error starting analysis: {e}")
+        _abandon_analysis(db, analysis, "Analysis could not be started", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/batch", response_model=BatchResponse, status_code=202)
+def start_batch(
+    request: BatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Start the analysis of many genomes at once.
+    
+    - **accessions**: NCBI accession numbers to analyze
+    
+    Genome and analysis records are created in bulk and the downloads
+    and analyses are queued as one Celery workflow, so the request
+    returns without waiting for NCBI. Use the returned batch_id to follow
+    the batch with GET /analysis/batch/{batch_id}, or each analysis_id
+    with GET /analysis/{analysis_id}.
+    
+    The bulk inserts and the publishing of the workflow block, so the
+    endpoint is synchronous and runs in FastAPI's thread pool.
+    """
+    logger.info(f"Starting batch analysis of {len(request.accessions)} accessions")
+    
+    try:
+        batch, jobs = BatchService(db).create(request.accessions)
+        
+        from app.tasks.batch_tasks import batch_workflow
+        task = batch_workflow(batch.id, jobs).apply_async()
+        batch.task_id = task.id
+        db.commit()
+        
+        logger.info(f"Batch created: {batch.id}, Task: {task.id}")
+        
+        return BatchResponse(
+            batch_id=batch.id,
+            total=len(jobs),
+            analyses=[
+                {"accession": job["accession"], "analysis_id": job["analysis_id"], "task_id": job["task_id"]}
+                for job in jobs
+            ]
+        )
+        
+    except Exception as e:
+        logger.error(f"Error starting batch analysis: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/batch/{batch_id}", response_model=BatchStatus)
+def get_batch_status(
+    batch_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the aggregated status of a batch.
+    
+    - **batch_id**: Batch ID returned from POST /analysis/batch
+    
+    Returns the number of analyses in each status and the overall
+    progress, aggregated in a single query.
+    """
+    progress = BatchService(db).progress(batch_id)
+    
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    return BatchStatus(**progress)
+
+
+@router.get("/workload", response_model=AnalysisWorkload)
+def get_workload(
+    hours: float = Query(24.0, gt=0, le=720, description="Length of the window in hours"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the workload of the analysis queues and the cost model.
+    
+    - **hours**: Length of the window, ending now
+    
+    Returns the stage time recorded on each queue over the window, with
+    the average number of workers it kept busy (the minimum concurrency
+    of the queue's pool), and the fitted cost of each stage that sets
+    the priority of analysis tasks.
+    """
+    return CostModel(db).workload(hours)
+
+
 @router.get("/{analysis_id}", response_model=AnalysisStatus)
-async def get_analysis_status(
+def get_analysis_status(
     analysis_id: int,
     db: Session = Depends(get_db)
 ):
@@ -111,10 +287,17 @@ async def get_analysis_status(
     
     - **analysis_id**: Analysis ID returned from POST /analysis/start
     
-    Returns the current status, progress, and any error messages.
+    Returns the current status, progress, and any error messages. The
+    state published to the progress channel is returned when available,
+    so polling a running analysis does not query the database. Reading
+    the channel blocks, so the endpoint runs in FastAPI's thread pool.
     """
     logger.info(f"Fetching analysis status: {analysis_id}")
     
+    state = _channel_state(analysis_id)
+    if state:
+        return _analysis_status(state)
+    
     analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
     
     if not analysis:
@@ -131,6 +314,75 @@ async def get_analysis_status(
     )
 
 
+def _stream_state(analysis_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Get the state an event stream starts from, off the event loop (PRIVATE)."""
+    try:
+        state = _channel_state(analysis_id)
+        if state is None:
+            analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+            if not analysis:
+                raise HTTPException(status_code=404, detail="Analysis not found")
+            state = analysis_state(analysis)
+    finally:
+        # Streams stay open for the whole analysis; do not hold a connection
+        db.close()
+    return state
+
+
+@router.get("/{analysis_id}/events")
+async def stream_analysis_events(
+    analysis_id: int,
+    state: Dict[str, Any] = Depends(_stream_state)
+):
+    """
+    Stream the status of an analysis as server-sent events.
+    
+    - **analysis_id**: Analysis ID returned from POST /analysis/start
+    
+    The current status is sent first, then every update published by
+    the workers, until the analysis completes or fails. Each event
+    carries the same data as GET /analysis/{analysis_id}, and is named
+    after what changed: `status`, `stage` (a new status message) or
+    `progress`. A comment is sent on idle streams every
+    PROGRESS_HEARTBEAT_SECONDS to keep proxies from closing them.
+    
+    The channel and the database are read in the thread pool (see
+    _stream_state), so an unavailable channel does not block the event
+    loop; only the subscription is awaited on it.
+    """
+    async def events():
+        async with get_progress_broadcaster().subscribe(analysis_id) as queue:
+            # Read the channel again once subscribed, so no update is missed
+            current = await run_in_threadpool(_channel_state, analysis_id) or state
+            previous = None
+            while True:
+                if current != previous:
+                    if previous is None or current["status"] != previous["status"]:
+                        event = "status"
+                    elif current["message"] != previous["message"]:
+                        event = "stage"
+                    else:
+                        event = "progress"
+                    yield _status_event(event, current)
+                    previous = current
+                
+                if current["status"] in TERMINAL_STATUSES:
+                    return
+                
+                try:
+                    published = await asyncio.wait_for(queue.get(), settings.PROGRESS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                current = dict(current, **published)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/", response_model=list[AnalysisResponse])
 async def list_analyses(
     skip: int = 0,
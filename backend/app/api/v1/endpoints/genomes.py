@@ -2,10 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.session import get_db
+from app.models.genome import Genome
+from app.analyzers.feature_index import FeatureIndex
 from app.services.ncbi_service import NCBIService
-from app.schemas.genome import GenomeSearchResult, GenomeDetail
+from app.schemas.genome import GenomeSearchResult, GenomeDetail, FeatureRegionResponse
 from app.core.logging import logger
 from app.core.exceptions import NCBIException, GenomeNotFoundException
 
@@ -72,3 +74,61 @@ async def get_genome_details(
     except Exception as e:
         logger.error(f"Unexpected error fetching genome: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{accession}/features", response_model=FeatureRegionResponse)
+async def get_genome_features(
+    accession: str,
+    end: int = Query(..., gt=0, description="Region end (0-based, exclusive)"),
+    start: int = Query(0, ge=0, description="Region start (0-based, inclusive)"),
+    strand: Optional[str] = Query(None, pattern="^[+-]$", description="Strand: + or -"),
+    replicon: Optional[str] = Query(None, description="Replicon accession (default: first replicon)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of genes returned"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the genes overlapping a region of a downloaded genome.
+    
+    - **accession**: NCBI accession number of a downloaded genome
+    - **start** / **end**: Region in 0-based, end-exclusive coordinates
+    - **strand**: Optional strand filter, + or -
+    - **replicon**: Replicon of a multi-record genome
+    - **limit**: Maximum number of genes (default: 1000, max: 10000)
+    
+    Answered from the interval index built when the genome was
+    downloaded, with two binary searches per query. A gene overlaps the
+    region when any of its parts does, so the intron of a joined CDS or
+    the far side of an origin-spanning CDS is not reported.
+    """
+    logger.info(f"Fetching features of {accession} in [{start}, {end})")
+    
+    if start >= end:
+        raise HTTPException(status_code=400, detail="Region start must be lower than end")
+    
+    genome = db.query(Genome).filter(Genome.accession == accession).first()
+    if not genome or not genome.file_path:
+        raise HTTPException(status_code=404, detail=f"Genome not downloaded: {accession}")
+    
+    try:
+        index = FeatureIndex.open_or_build(genome.file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Genome file missing for {accession}")
+    
+    if replicon is None:
+        if not index.records:
+            raise HTTPException(status_code=404, detail=f"No records indexed for {accession}")
+        replicon = index.records[0]
+    if replicon not in index.records:
+        raise HTTPException(status_code=404, detail=f"Replicon not found: {replicon}")
+    
+    total, features = index.query(replicon, start, end, strand=strand, limit=limit)
+    
+    return FeatureRegionResponse(
+        accession=accession,
+        replicon=replicon,
+        start=start,
+        end=end,
+        strand=strand,
+        total=total,
+        features=features
+    )
@@ -1,14 +1,18 @@
 """Results endpoints for retrieving analysis results."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.session import get_db
 from app.models.analysis import Analysis
 from app.models.result import Result
 from app.models.validation import Validation
-from app.schemas.result import ResultResponse, CompleteAnalysisResult
+from app.schemas.result import ResultResponse, CompleteAnalysisResult, CodonPositionsResponse, GenePage, GcTrackResponse
+from app.services.artifact_store import ArtifactStore
+from app.services.gene_table import GeneTable
+from app.analyzers.gc_track import gc_track_region, track_accessions
 from app.core.logging import logger
+from app.core.exceptions import ValidationException
 
 router = APIRouter()
 
@@ -27,6 +31,8 @@ async def get_analysis_results(
     - Codon analysis (start and stop codons)
     - Gene statistics
     - Genome statistics
+    - ORF analysis
+    - k-mer profile (rho* and tetranucleotide z-scores)
     - Validation results
     - Chart URLs (if available)
     
@@ -76,6 +82,8 @@ async def get_analysis_results(
         codon_analysis=result_data.get("codon_analysis"),
         gene_stats=result_data.get("gene_stats"),
         genome_stats=result_data.get("genome_stats"),
+        orf_analysis=result_data.get("orf_analysis"),
+        kmer_analysis=result_data.get("kmer_analysis"),
         validation=validation_data,
         charts=result_data.get("charts")
     )
@@ -104,3 +112,181 @@ async def get_raw_results(
     results = db.query(Result).filter(Result.analysis_id == analysis_id).all()
     
     return results
+
+
+@router.get("/{analysis_id}/codons", response_model=CodonPositionsResponse)
+async def get_codon_positions(
+    analysis_id: int,
+    end: int = Query(..., gt=0, description="Window end (0-based, exclusive)"),
+    start: int = Query(0, ge=0, description="Window start (0-based, inclusive)"),
+    codon: str = Query("ATG", description="Start or stop codon: ATG, TAA, TAG or TGA"),
+    strand: str = Query("+", pattern="^[+-]$", description="Strand: + or -"),
+    accession: Optional[str] = Query(None, description="Replicon accession (default: first replicon)"),
+    limit: int = Query(10000, ge=1, le=100000, description="Maximum number of positions returned"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the positions of a start or stop codon inside a genome window.
+    
+    - **analysis_id**: Analysis ID
+    - **start** / **end**: Window in 0-based, end-exclusive coordinates
+    - **codon**: ATG, TAA, TAG or TGA
+    - **strand**: + or - (minus-strand codons are reported at their
+      leftmost forward coordinate)
+    - **accession**: Replicon of a multi-record genome
+    - **limit**: Maximum number of positions (default: 10000, max: 100000)
+    
+    Positions are read from the compressed codon position artifact with a
+    binary search, so the full position lists never go through the
+    database. The total is exact even when the positions are truncated.
+    """
+    logger.info(f"Fetching {codon}{strand} positions for analysis {analysis_id} in [{start}, {end})")
+    
+    codon = codon.upper()
+    if codon not in ("ATG", "TAA", "TAG", "TGA"):
+        raise HTTPException(status_code=400, detail=f"Unsupported codon: {codon}")
+    if start >= end:
+        raise HTTPException(status_code=400, detail="Window start must be lower than end")
+    
+    analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    artifact_store = ArtifactStore(analysis_id)
+    if not artifact_store.exists("codon_positions"):
+        raise HTTPException(status_code=404, detail="Codon positions not available for this analysis")
+    
+    keys = artifact_store.keys("codon_positions")
+    if accession is None:
+        accession = keys[0].rsplit("/", 1)[0]
+    
+    key = f"{accession}/{codon}{strand}"
+    if key not in keys:
+        raise HTTPException(status_code=404, detail=f"Replicon not found: {accession}")
+    
+    total, positions = artifact_store.window("codon_positions", key, start, end, limit=limit)
+    
+    return CodonPositionsResponse(
+        analysis_id=analysis_id,
+        accession=accession,
+        codon=codon,
+        strand=strand,
+        start=start,
+        end=end,
+        total=total,
+        positions=positions.tolist()
+    )
+
+
+@router.get("/{analysis_id}/gc-track", response_model=GcTrackResponse)
+async def get_gc_track(
+    analysis_id: int,
+    end: int = Query(..., gt=0, description="Region end (0-based, exclusive)"),
+    start: int = Query(0, ge=0, description="Region start (0-based, inclusive)"),
+    bin_size: Optional[int] = Query(None, gt=0, description="Zoom level in bases per bin (default: automatic)"),
+    max_bins: int = Query(2000, ge=1, le=100000, description="Maximum bins when picking the zoom level"),
+    accession: Optional[str] = Query(None, description="Replicon accession (default: first replicon)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the GC content track of a genome region.
+    
+    - **analysis_id**: Analysis ID
+    - **start** / **end**: Region in 0-based, end-exclusive coordinates
+    - **bin_size**: Zoom level (100, 1000, 10000 or 100000 bp); by default
+      the finest level that covers the region in at most max_bins bins
+    - **accession**: Replicon of a multi-record genome
+    
+    The track is precomputed at every zoom level during the analysis and
+    stored as compact per-bin counts, so a request is a slice of one
+    cached array whatever the region size.
+    """
+    logger.info(f"Fetching GC track for analysis {analysis_id} in [{start}, {end})")
+    
+    if start >= end:
+        raise HTTPException(status_code=400, detail="Region start must be lower than end")
+    
+    analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    artifact_store = ArtifactStore(analysis_id)
+    if not artifact_store.exists("gc_track"):
+        raise HTTPException(status_code=404, detail="GC track not available for this analysis")
+    
+    arrays = artifact_store.load("gc_track")
+    accessions = track_accessions(arrays)
+    if accession is None:
+        accession = accessions[0]
+    if accession not in accessions:
+        raise HTTPException(status_code=404, detail=f"Replicon not found: {accession}")
+    
+    try:
+        region = gc_track_region(arrays, accession, start, end, bin_size=bin_size, max_bins=max_bins)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unsupported bin size: {bin_size}")
+    
+    return GcTrackResponse(analysis_id=analysis_id, accession=accession, **region)
+
+
+@router.get("/{analysis_id}/genes", response_model=GenePage)
+async def get_genes(
+    analysis_id: int,
+    sort: str = Query("start", pattern="^(start|length|gc_content|gene_name)$", description="Sort column"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order: asc or desc"),
+    limit: int = Query(100, ge=1, le=1000, description="Genes per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    replicon: Optional[str] = Query(None, description="Replicon accession"),
+    strand: Optional[str] = Query(None, pattern="^[+-]$", description="Strand: + or -"),
+    min_length: Optional[int] = Query(None, ge=0, description="Minimum gene length (bp)"),
+    max_length: Optional[int] = Query(None, ge=0, description="Maximum gene length (bp)"),
+    min_gc: Optional[float] = Query(None, ge=0, le=100, description="Minimum GC content (%)"),
+    max_gc: Optional[float] = Query(None, ge=0, le=100, description="Maximum GC content (%)"),
+    name: Optional[str] = Query(None, max_length=100, description="Gene name or locus tag prefix"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a page of the full gene table of an analysis.
+    
+    - **analysis_id**: Analysis ID
+    - **sort**: start, length, gc_content or gene_name (default: start)
+    - **order**: asc or desc (default: asc)
+    - **limit**: Genes per page (default: 100, max: 1000)
+    - **cursor**: Pass the previous page's next_cursor to get the next page
+    - **replicon**, **strand**, **min_length**, **max_length**, **min_gc**,
+      **max_gc**, **name**: Optional filters
+    
+    Pages use keyset pagination over indexed columns, so every page of a
+    genome with tens of thousands of genes costs the same. The total is
+    only counted on the first page. Cursors are only valid with the sort,
+    order and filters they were issued for.
+    """
+    logger.info(f"Fetching genes for analysis {analysis_id} (sort={sort} {order}, limit={limit})")
+    
+    analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    filters = {
+        "replicon": replicon,
+        "strand": strand,
+        "min_length": min_length,
+        "max_length": max_length,
+        "min_gc": min_gc,
+        "max_gc": max_gc,
+        "name": name
+    }
+    
+    try:
+        page = GeneTable(db).page(analysis_id, sort=sort, order=order, limit=limit, cursor=cursor, filters=filters)
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return GenePage(
+        analysis_id=analysis_id,
+        sort=sort,
+        order=order,
+        total=page["total"],
+        next_cursor=page["next_cursor"],
+        genes=page["genes"]
+    )
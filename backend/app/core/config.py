@@ -19,6 +19,13 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    PROGRESS_CHANNEL: str = "redis"  # where running analyses report progress: redis, or memory (single process)
+    PROGRESS_TTL_HOURS: int = 24
+    PROGRESS_HEARTBEAT_SECONDS: int = 15  # keep-alive interval of idle analysis event streams
+    SINGLE_FLIGHT_LOCKS: str = "redis"  # where duplicate requests are serialized: redis, or local (single process)
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: int = 900  # longest a download or analysis waits for a duplicate in flight
+    SINGLE_FLIGHT_MAX_AGE_HOURS: int = 12  # analyses in flight for longer are presumed dead and not attached to
+    SINGLE_FLIGHT_WAIT_SECONDS: int = 30  # re-check interval of an analysis waiting for one of identical content
     
     # NCBI
     NCBI_EMAIL: str
@@ -27,12 +34,24 @@ class Settings(BaseSettings):
     
     # File Storage
     DATA_DIR: str = "./data"
-    MAX_GENOME_SIZE_MB: int = 50
+    MAX_GENOME_SIZE_MB: int = 1024
     CACHE_TTL_HOURS: int = 24
+    RESULT_CACHE_ENABLED: bool = True  # reuse analyzer results of identical genome files
+    
+    # Analysis
+    ANALYSIS_WORKERS: int = 0  # workers per genome (replicons or chunks), 0 = one per CPU; threads in prefork Celery workers
+    ANALYSIS_THREADS: int = 4  # analyzers run at once on each record
+    ANALYSIS_MEMORY_BUDGET_MB: int = 1024  # sequence working memory per analysis; larger records are analyzed in chunks
+    BATCH_MAX_ACCESSIONS: int = 500  # accessions accepted by one batch request
     
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    ANALYSIS_SMALL_QUEUE: str = ""  # queue of stages that scan small genomes, empty = default routing
+    ANALYSIS_LARGE_QUEUE: str = ""  # queue of stages that scan large genomes, empty = default routing
+    ANALYSIS_LIGHT_QUEUE: str = ""  # queue of stages that only read saved results, empty = default routing
+    ANALYSIS_LARGE_GENOME_MB: float = 5.0  # genomes from this size on go to the large queue
+    ANALYSIS_COST_HISTORY: int = 200  # stage timings per stage the cost model is fitted on
     
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
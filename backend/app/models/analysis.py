@@ -13,6 +13,7 @@ class Analysis(Base):
     Attributes:
         id: Primary key
         genome_id: Foreign key to genome
+        batch_id: Foreign key to the batch the analysis was submitted in
         task_id: Celery task ID
         status: Analysis status (pending, running, completed, failed)
         progress: Progress percentage (0-100)
@@ -26,6 +27,7 @@ class Analysis(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     genome_id = Column(Integer, ForeignKey("genomes.id"), nullable=False)
+    batch_id = Column(Integer, ForeignKey("batches.id"), index=True)
     task_id = Column(String(100), unique=True, index=True)
     status = Column(String(50), default="pending", index=True)
     progress = Column(Float, default=0.0)
@@ -36,8 +38,10 @@ class Analysis(Base):
     
     # Relationships
     genome = relationship("Genome", back_populates="analyses")
+    batch = relationship("Batch", back_populates="analyses")
     results = relationship("Result", back_populates="analysis", cascade="all, delete-orphan")
     validations = relationship("Validation", back_populates="analysis", cascade="all, delete-orphan")
+    genes = relationship("Gene", back_populates="analysis", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Analysis(id={self.id}, status='{self.status}', progress={self.progress})>"
@@ -0,0 +1,41 @@
+"""Batch model for tracking analyses submitted together."""
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+
+class Batch(Base):
+    """
+    Batch model representing accessions submitted in one batch request.
+    
+    Progress is not stored here; it is aggregated from the batch's
+    analyses. The summary is written by the chord callback that runs
+    once every analysis of the batch has succeeded.
+    
+    Attributes:
+        id: Primary key
+        task_id: Celery task ID of the summary callback
+        status: Batch status (pending, completed)
+        total: Number of analyses in the batch
+        created_at: Timestamp when the batch was submitted
+        completed_at: Timestamp when the summary callback ran
+        summary: Analysis counts by status, written on completion
+    """
+    
+    __tablename__ = "batches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(String(100), unique=True, index=True)
+    status = Column(String(50), default="pending")
+    total = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+    summary = Column(JSON)
+    
+    # Relationships
+    analyses = relationship("Analysis", back_populates="batch")
+    
+    def __repr__(self):
+        return f"<Batch(id={self.id}, total={self.total}, status='{self.status}')>"
@@ -0,0 +1,57 @@
+"""Gene model for storing every annotated CDS of an analysis."""
+
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+
+class Gene(Base):
+    """
+    Gene model representing one CDS of an analyzed genome.
+    
+    Rows are bulk-inserted by the analysis task and read page by page.
+    Every sortable column has a composite (analysis_id, column, id) index,
+    so a keyset page is a single index range scan whatever the genome size.
+    
+    Attributes:
+        id: Primary key (tie-breaker of every sort order)
+        analysis_id: Foreign key to analysis
+        replicon: Accession of the record the gene belongs to
+        gene_name: Gene name (gene qualifier)
+        locus_tag: Locus tag
+        product: Product description
+        location: GenBank location string
+        start: 0-based start position
+        end: End position (exclusive)
+        length: Length in base pairs
+        gc_content: GC content percentage
+        strand: Strand (+ or -)
+    """
+    
+    __tablename__ = "genes"
+    
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False)
+    replicon = Column(String(50))
+    gene_name = Column(String(100))
+    locus_tag = Column(String(100))
+    product = Column(String(500))
+    location = Column(String(2000))
+    start = Column(Integer, nullable=False)
+    end = Column(Integer, nullable=False)
+    length = Column(Integer, nullable=False)
+    gc_content = Column(Float, nullable=False)
+    strand = Column(String(1), nullable=False)
+    
+    # Relationships
+    analysis = relationship("Analysis", back_populates="genes")
+    
+    __table_args__ = (
+        Index("ix_genes_analysis_start", "analysis_id", "start", "id"),
+        Index("ix_genes_analysis_length", "analysis_id", "length", "id"),
+        Index("ix_genes_analysis_gc_content", "analysis_id", "gc_content", "id"),
+        Index("ix_genes_analysis_gene_name", "analysis_id", "gene_name", "id"),
+    )
+    
+    def __repr__(self):
+        return f"<Gene(id={self.id}, name='{self.gene_name}', start={self.start})>"
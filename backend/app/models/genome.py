@@ -18,7 +18,8 @@ class Genome(Base):
         gc_content: GC content percentage
         download_date: Timestamp when genome was downloaded
         file_path: Path to the downloaded GenBank file
-        metadata: Additional metadata as JSON
+        content_hash: SHA-256 hex digest of the GenBank file (result cache key)
+        genome_metadata: Additional metadata as JSON (stored in the metadata column)
     """
     
     __tablename__ = "genomes"
@@ -30,7 +31,8 @@ class Genome(Base):
     gc_content = Column(Numeric(5, 2))
     download_date = Column(DateTime(timezone=True), server_default=func.now())
     file_path = Column(String(500))
-    metadata = Column(JSON)
+    content_hash = Column(String(64), index=True)
+    genome_metadata = Column("metadata", JSON)
     
     # Relationships
     analyses = relationship("Analysis", back_populates="genome", cascade="all, delete-orphan")
@@ -13,7 +13,7 @@ class Result(Base):
     Attributes:
         id: Primary key
         analysis_id: Foreign key to analysis
-        result_type: Type of result (codon_analysis, gene_stats, genome_stats)
+        result_type: Type of result (codon_analysis, gene_stats, genome_stats, orf_analysis, kmer_analysis)
         data: Result data as JSON
         created_at: Timestamp when result was created
     """
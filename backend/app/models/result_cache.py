@@ -0,0 +1,43 @@
+"""Result cache model for reusing analyzer results across analyses."""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+
+class ResultCacheEntry(Base):
+    """
+    Result cache entry pointing at the result of one analyzer on one genome file.
+    
+    Entries are content-addressed: the key is the SHA-256 of the GenBank
+    file plus the analyzer name and version, so identical files share
+    results whatever their accession, and bumping an analyzer's version
+    only misses that analyzer's entries.
+    
+    Attributes:
+        id: Primary key
+        content_hash: SHA-256 hex digest of the GenBank file
+        analyzer: Analyzer name (the result type)
+        version: Analyzer version
+        result_id: Foreign key to the cached result
+        created_at: Timestamp when the entry was created
+    """
+    
+    __tablename__ = "result_cache"
+    __table_args__ = (
+        UniqueConstraint("content_hash", "analyzer", "version", name="uq_result_cache_key"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    analyzer = Column(String(50), nullable=False)
+    version = Column(String(20), nullable=False)
+    result_id = Column(Integer, ForeignKey("results.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    result = relationship("Result")
+    
+    def __repr__(self):
+        return f"<ResultCacheEntry(analyzer='{self.analyzer}', version='{self.version}')>"
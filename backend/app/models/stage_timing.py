@@ -0,0 +1,36 @@
+"""Stage timing model for the estimated cost of analyses."""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class StageTiming(Base):
+    """
+    Run time of one completed stage task of an analysis.
+    
+    Timings are the history the cost model is fitted on, against the
+    size of the analyzed genome, and the workload of each queue is
+    summed from them.
+    
+    Attributes:
+        id: Primary key
+        analysis_id: Foreign key to the analysis
+        stage: Stage name (prepare, validation, charts, or the first
+            analyzer of an analyzer stage)
+        queue: Queue the stage task was consumed from
+        duration: Run time in seconds
+        created_at: Timestamp when the stage completed
+    """
+    
+    __tablename__ = "stage_timings"
+    
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False, index=True)
+    stage = Column(String(50), nullable=False, index=True)
+    queue = Column(String(100), nullable=False)
+    duration = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    def __repr__(self):
+        return f"<StageTiming(stage='{self.stage}', duration={self.duration})>"
@@ -1,8 +1,9 @@
 """Pydantic schemas for analysis-related requests and responses."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from app.core.config import settings
 
 
 class AnalysisRequest(BaseModel):
@@ -58,3 +59,101 @@ class AnalysisResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class BatchRequest(BaseModel):
+    """Schema for batch analysis request."""
+    
+    accessions: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_MAX_ACCESSIONS,
+        description="NCBI accession numbers to analyze (duplicates are analyzed once)"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "accessions": ["NC_000913.3", "NC_002695.2"]
+            }
+        }
+
+
+class BatchAnalysis(BaseModel):
+    """Schema for one analysis of a batch."""
+    
+    accession: str
+    analysis_id: int
+    task_id: str
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch analysis response."""
+    
+    batch_id: int = Field(..., description="Batch ID")
+    total: int = Field(..., description="Number of analyses in the batch")
+    analyses: List[BatchAnalysis]
+
+
+class BatchStatus(BaseModel):
+    """Schema for batch status response."""
+    
+    batch_id: int = Field(..., description="Batch ID")
+    status: str = Field(..., description="Status: pending, running, completed, completed_with_errors, failed")
+    total: int = Field(..., description="Number of analyses in the batch")
+    counts: Dict[str, int] = Field(..., description="Number of analyses by status")
+    progress: float = Field(..., description="Overall progress percentage (0-100)")
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "batch_id": 1,
+                "status": "running",
+                "total": 3,
+                "counts": {"completed": 1, "running": 1, "pending": 1},
+                "progress": 51.7,
+                "created_at": "2024-01-15T10:30:00Z",
+                "completed_at": None
+            }
+        }
+
+
+class QueueWorkload(BaseModel):
+    """Schema for the recorded workload of a queue."""
+    
+    stages: int = Field(..., description="Stage tasks completed in the window")
+    busy_seconds: float = Field(..., description="Total run time of the stage tasks")
+    workers: float = Field(..., description="Average number of busy workers")
+
+
+class StageCost(BaseModel):
+    """Schema for the fitted cost of a stage."""
+    
+    seconds: float = Field(..., description="Fixed run time in seconds")
+    seconds_per_mb: float = Field(..., description="Run time per megabase of genome")
+    samples: int = Field(..., description="Timings the fit is based on")
+
+
+class AnalysisWorkload(BaseModel):
+    """Schema for the workload of the analysis queues."""
+    
+    window_hours: float = Field(..., description="Length of the window, ending now")
+    queues: Dict[str, QueueWorkload] = Field(..., description="Workload by queue")
+    stages: Dict[str, StageCost] = Field(..., description="Cost model by stage")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "window_hours": 24.0,
+                "queues": {
+                    "analysis_small": {"stages": 1200, "busy_seconds": 9500.0, "workers": 0.11},
+                    "analysis_large": {"stages": 40, "busy_seconds": 61000.0, "workers": 0.71}
+                },
+                "stages": {
+                    "prepare": {"seconds": 0.4, "seconds_per_mb": 1.9, "samples": 200},
+                    "kmer_analysis": {"seconds": 0.2, "seconds_per_mb": 3.1, "samples": 200}
+                }
+            }
+        }
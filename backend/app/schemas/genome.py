@@ -1,7 +1,7 @@
 """Pydantic schemas for genome-related requests and responses."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -55,6 +55,33 @@ class GenomeDetail(BaseModel):
         }
 
 
+class GenomeFeature(BaseModel):
+    """Schema for a gene found by a region query."""
+    
+    gene_name: str
+    locus_tag: str
+    product: str
+    location: str = Field(..., description="GenBank location string")
+    start: int = Field(..., description="0-based start position")
+    end: int = Field(..., description="End position (exclusive)")
+    length: int
+    gc_content: float
+    strand: str = Field(..., description="Strand: + or -")
+    replicon: str = Field(..., description="Replicon accession")
+
+
+class FeatureRegionResponse(BaseModel):
+    """Schema for the genes overlapping a genome region."""
+    
+    accession: str
+    replicon: str = Field(..., description="Replicon the region was taken from")
+    start: int = Field(..., description="Region start (0-based, inclusive)")
+    end: int = Field(..., description="Region end (exclusive)")
+    strand: Optional[str] = Field(None, description="Strand filter: + or -")
+    total: int = Field(..., description="Number of overlapping genes")
+    features: List[GenomeFeature] = Field(..., description="Overlapping genes sorted by start, at most limit of them")
+
+
 class GenomeBase(BaseModel):
     """Base schema for genome."""
     
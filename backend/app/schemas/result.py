@@ -10,7 +10,7 @@ class ResultResponse(BaseModel):
     
     id: int
     analysis_id: int
-    result_type: str = Field(..., description="Type: codon_analysis, gene_stats, genome_stats")
+    result_type: str = Field(..., description="Type: codon_analysis, gene_stats, genome_stats, orf_analysis, kmer_analysis")
     data: Dict[str, Any] = Field(..., description="Result data")
     created_at: datetime
     
@@ -26,6 +26,31 @@ class CodonAnalysisResult(BaseModel):
     genome_length: int
 
 
+class CodonPositionsResponse(BaseModel):
+    """Schema for codon positions inside a genome window."""
+    
+    analysis_id: int
+    accession: str = Field(..., description="Replicon accession")
+    codon: str
+    strand: str = Field(..., description="Strand: + or -")
+    start: int = Field(..., description="Window start (0-based, inclusive)")
+    end: int = Field(..., description="Window end (exclusive)")
+    total: int = Field(..., description="Number of codons in the window")
+    positions: List[int] = Field(..., description="0-based codon positions, at most limit of them")
+
+
+class GcTrackResponse(BaseModel):
+    """Schema for the GC content track of a genome region."""
+    
+    analysis_id: int
+    accession: str = Field(..., description="Replicon accession")
+    bin_size: int = Field(..., description="Bases per bin at the served zoom level")
+    start: int = Field(..., description="Start of the first bin (0-based)")
+    end: int = Field(..., description="End of the last bin (exclusive)")
+    gc_content: List[Optional[float]] = Field(..., description="GC percentage per bin, null for bins without A, C, G or T")
+    bin_sizes: List[int] = Field(..., description="Zoom levels available")
+
+
 class GeneStatsResult(BaseModel):
     """Schema for gene statistics result."""
     
@@ -34,6 +59,36 @@ class GeneStatsResult(BaseModel):
     genes: Optional[List[Dict[str, Any]]] = None
 
 
+class GeneRecord(BaseModel):
+    """Schema for one row of the gene table."""
+    
+    id: int
+    replicon: Optional[str] = Field(None, description="Replicon accession")
+    gene_name: Optional[str] = None
+    locus_tag: Optional[str] = None
+    product: Optional[str] = None
+    location: Optional[str] = Field(None, description="GenBank location string")
+    start: int = Field(..., description="0-based start position")
+    end: int = Field(..., description="End position (exclusive)")
+    length: int
+    gc_content: float
+    strand: str = Field(..., description="Strand: + or -")
+    
+    class Config:
+        from_attributes = True
+
+
+class GenePage(BaseModel):
+    """Schema for one keyset page of the gene table."""
+    
+    analysis_id: int
+    sort: str
+    order: str
+    total: Optional[int] = Field(None, description="Number of genes matching the filters (first page only)")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, absent on the last page")
+    genes: List[GeneRecord]
+
+
 class GenomeStatsResult(BaseModel):
     """Schema for genome statistics result."""
     
@@ -44,6 +99,32 @@ class GenomeStatsResult(BaseModel):
     nucleotide_composition: Dict[str, Any]
     gene_count: int
     coding_density: float
+    coding_coverage: Optional[Dict[str, Any]] = Field(None, description="Summed and non-redundant CDS length, total and per strand")
+    skew: Optional[Dict[str, Any]] = Field(None, description="GC/AT skew, cumulative GC skew and predicted ori/ter")
+
+
+class OrfAnalysisResult(BaseModel):
+    """Schema for ORF analysis result."""
+    
+    min_length: int
+    orf_counts: Dict[str, Any]
+    length_stats: Dict[str, Any]
+    length_distribution: Dict[str, Any]
+    annotation_overlap: Dict[str, Any]
+    longest_orfs: Optional[List[Dict[str, Any]]] = None
+
+
+class KmerAnalysisResult(BaseModel):
+    """Schema for k-mer analysis result."""
+    
+    k: int
+    total_kmers: int
+    distinct_kmers: int
+    possible_kmers: int
+    top_kmers: List[Dict[str, Any]]
+    rho_star: Dict[str, float] = Field(..., description="Dinucleotide relative abundances over both strands")
+    tetranucleotide_zscores: Dict[str, float] = Field(..., description="Tetranucleotide z-scores over both strands")
+    replicons: Optional[List[Dict[str, Any]]] = None
 
 
 class ValidationResult(BaseModel):
@@ -67,6 +148,8 @@ class CompleteAnalysisResult(BaseModel):
     codon_analysis: Optional[CodonAnalysisResult] = None
     gene_stats: Optional[GeneStatsResult] = None
     genome_stats: Optional[GenomeStatsResult] = None
+    orf_analysis: Optional[OrfAnalysisResult] = None
+    kmer_analysis: Optional[KmerAnalysisResult] = None
     validation: Optional[ValidationResult] = None
     charts: Optional[Dict[str, str]] = None
     
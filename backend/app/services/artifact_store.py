@@ -0,0 +1,233 @@
+"""Per-analysis storage for large array results kept out of the database."""
+
+import os
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+from app.core.config import settings
+from app.core.logging import logger
+
+
+# Array listing the keys stored as deltas
+_DELTA_KEY = "__delta__"
+
+
+def _is_sorted_positions(array: np.ndarray) -> bool:
+    """Whether an array is a non-decreasing 1-D non-negative integer array (PRIVATE)."""
+    if array.ndim != 1 or not np.issubdtype(array.dtype, np.integer):
+        return False
+    if len(array) == 0:
+        return True
+    return bool(array[0] >= 0 and np.all(array[1:] >= array[:-1]))
+
+
+def delta_encode(positions: np.ndarray) -> np.ndarray:
+    """
+    Delta-encode sorted positions into the narrowest unsigned dtype.
+    
+    Args:
+        positions: Non-decreasing non-negative integer positions
+        
+    Returns:
+        Gaps between consecutive positions (the first gap is from 0)
+    """
+    deltas = np.diff(positions, prepend=0)
+    largest = int(deltas.max()) if len(deltas) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if largest <= np.iinfo(dtype).max:
+            return deltas.astype(dtype)
+    return deltas.astype(np.uint64)
+
+
+def delta_decode(deltas: np.ndarray) -> np.ndarray:
+    """
+    Restore positions from delta_encode output.
+    
+    Args:
+        deltas: Encoded gaps
+        
+    Returns:
+        Sorted int64 positions
+    """
+    return np.cumsum(deltas, dtype=np.int64)
+
+
+def _temp_path(path: Path) -> Path:
+    """Get a temporary path next to an artifact, unique to the writer (PRIVATE)."""
+    return path.with_suffix(f".{uuid.uuid4().hex}.tmp.npz")
+
+
+@lru_cache(maxsize=32)
+def _load_arrays(path: str, mtime_ns: int) -> Dict[str, np.ndarray]:
+    """Load and decode an artifact; cached per file version (PRIVATE)."""
+    arrays = {}
+    with np.load(path) as data:
+        delta_keys = set(data[_DELTA_KEY].tolist()) if _DELTA_KEY in data.files else set()
+        for key in data.files:
+            if key == _DELTA_KEY:
+                continue
+            array = delta_decode(data[key]) if key in delta_keys else data[key]
+            array.setflags(write=False)  # shared by every caller of the cache
+            arrays[key] = array
+    return arrays
+
+
+class ArtifactStore:
+    """
+    Compressed array artifacts of one analysis.
+    
+    Results that are too large for the Result.data JSON column, such as
+    every codon position of a genome, are written to
+    DATA_DIR/results/<analysis_id>/<name>.npz. Sorted integer arrays are
+    delta-encoded before compression, which shrinks position lists to a
+    byte or two per entry. Loaded artifacts are cached, so repeated window
+    queries only pay for the binary search.
+    """
+    
+    def __init__(self, analysis_id: int, base_dir: str = None):
+        """
+        Initialize the store.
+        
+        Args:
+            analysis_id: Database analysis ID
+            base_dir: Root directory (defaults to DATA_DIR/results)
+        """
+        self.analysis_id = analysis_id
+        self.directory = Path(base_dir or Path(settings.DATA_DIR) / "results") / str(analysis_id)
+    
+    def path(self, name: str) -> Path:
+        """
+        Get the file path of an artifact.
+        
+        Args:
+            name: Artifact name
+            
+        Returns:
+            Path of the artifact file
+        """
+        return self.directory / f"{name}.npz"
+    
+    def exists(self, name: str) -> bool:
+        """Whether an artifact has been saved."""
+        return self.path(name).exists()
+    
+    def save(self, name: str, arrays: Dict[str, np.ndarray]) -> Path:
+        """
+        Save an artifact, delta-encoding sorted integer arrays.
+        
+        Args:
+            name: Artifact name
+            arrays: Arrays to store, keyed by name
+            
+        Returns:
+            Path of the written file
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        payload = {}
+        delta_keys = []
+        for key, array in arrays.items():
+            array = np.asarray(array)
+            if _is_sorted_positions(array):
+                payload[key] = delta_encode(array)
+                delta_keys.append(key)
+            else:
+                payload[key] = array
+        payload[_DELTA_KEY] = np.array(delta_keys, dtype=str)
+        
+        path = self.path(name)
+        temp_path = _temp_path(path)
+        try:
+            np.savez_compressed(temp_path, **payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        
+        logger.info(f"Saved artifact {name} for analysis {self.analysis_id} ({path.stat().st_size} bytes)")
+        return path
+    
+    def copy_from(self, source: "ArtifactStore", name: str) -> Path:
+        """
+        Copy an artifact from another analysis.
+        
+        Artifact files are never modified in place (save replaces them),
+        so a hard link is used where the filesystem allows it.
+        
+        Args:
+            source: Store of the analysis that saved the artifact
+            name: Artifact name
+            
+        Returns:
+            Path of the copied file
+        """
+        source_path = source.path(name)
+        if not source_path.exists():
+            raise FileNotFoundError(f"Artifact {name} not found for analysis {source.analysis_id}")
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(name)
+        temp_path = _temp_path(path)
+        try:
+            try:
+                os.link(source_path, temp_path)
+            except OSError:
+                shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            # Renaming a link onto the same file leaves the link in place
+            temp_path.unlink(missing_ok=True)
+        return path
+    
+    def load(self, name: str) -> Dict[str, np.ndarray]:
+        """
+        Load a decoded artifact.
+        
+        Args:
+            name: Artifact name
+            
+        Returns:
+            Arrays keyed by name
+        """
+        path = self.path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"Artifact {name} not found for analysis {self.analysis_id}")
+        return _load_arrays(str(path), path.stat().st_mtime_ns)
+    
+    def keys(self, name: str) -> List[str]:
+        """
+        List the array names of an artifact.
+        
+        Args:
+            name: Artifact name
+            
+        Returns:
+            Array names in storage order
+        """
+        return list(self.load(name))
+    
+    def window(self, name: str, key: str, start: int, end: int, limit: int = None) -> Tuple[int, np.ndarray]:
+        """
+        Get the sorted positions of one array that fall inside a window.
+        
+        Args:
+            name: Artifact name
+            key: Array name inside the artifact
+            start: Window start (inclusive)
+            end: Window end (exclusive)
+            limit: Optional maximum number of positions to return
+            
+        Returns:
+            Tuple of (number of positions in the window, positions array)
+        """
+        positions = self.load(name)[key]
+        lo = int(np.searchsorted(positions, start, side="left"))
+        hi = int(np.searchsorted(positions, end, side="left"))
+        
+        count = max(hi - lo, 0)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return count, positions[lo:max(hi, lo)]
@@ -0,0 +1,218 @@
+"""Bulk creation and progress aggregation of batch analyses."""
+
+import contextlib
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session
+from app.models.analysis import Analysis
+from app.models.batch import Batch
+from app.models.genome import Genome
+from app.services.cost_model import CostModel
+from app.services.progress_channel import get_progress_channel
+from app.services.single_flight import get_single_flight
+from app.core.logging import logger
+
+
+# Analysis statuses that no longer change
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def batch_status(counts: Dict[str, int]) -> str:
+    """
+    Derive the status of a batch from its analysis counts.
+    
+    Args:
+        counts: Number of analyses by status
+        
+    Returns:
+        pending, running, completed, completed_with_errors or failed
+    """
+    active = sum(count for status, count in counts.items() if status not in TERMINAL_STATUSES)
+    if active:
+        return "pending" if counts.get("pending", 0) == sum(counts.values()) else "running"
+    if not counts.get("failed"):
+        return "completed"
+    if not counts.get("completed"):
+        return "failed"
+    return "completed_with_errors"
+
+
+class BatchService:
+    """
+    Analyses of many accessions submitted as one batch.
+    
+    A batch is created with a fixed number of statements whatever its
+    size: one query for the genomes already known, one bulk insert for
+    placeholder genomes of the accessions still to download, and one
+    bulk insert for the analyses. Progress is aggregated from the
+    analyses in a single grouped query, plus the progress channel for
+    the analyses that are running.
+    
+    Genomes are looked up and created under the single-flight locks of
+    their accessions, the same locks POST /analysis/start takes, so a
+    batch racing another request for a new accession shares its genome
+    record instead of failing on the unique accession. Each batch still
+    creates its own analyses, since its progress and summary count them.
+    An analysis of a genome that is already being analyzed waits for
+    that analysis and clones its cached results (see analyze_genome).
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize the service.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    def create(self, accessions: List[str]) -> Tuple[Batch, List[Dict[str, Any]]]:
+        """
+        Create a batch with one pending analysis per accession.
+        
+        Args:
+            accessions: NCBI accession numbers; duplicates are analyzed once
+            
+        Returns:
+            Tuple of (batch, jobs), where each job holds the accession,
+            genome_id, analysis_id, task_id, file_path (None if the
+            genome still has to be downloaded), genome_size and the
+            priority of its analysis, in request order
+        """
+        accessions = list(dict.fromkeys(accessions))
+        
+        # Sorted, so requests sharing accessions take their locks in one order
+        flight = get_single_flight()
+        with contextlib.ExitStack() as locks:
+            for accession in sorted(accessions):
+                locks.enter_context(flight.lock(flight.key("accession", accession)))
+            
+            genomes = {
+                row.accession: row
+                for row in self.db.query(Genome.id, Genome.accession, Genome.file_path, Genome.genome_size)
+                .filter(Genome.accession.in_(accessions))
+            }
+            missing = [accession for accession in accessions if accession not in genomes]
+            if missing:
+                # Placeholders are filled in by the download task
+                rows = self.db.execute(
+                    insert(Genome).returning(Genome.id, Genome.accession, Genome.file_path, Genome.genome_size),
+                    [{"accession": accession, "organism_name": "Unknown"} for accession in missing]
+                )
+                genomes.update((row.accession, row) for row in rows)
+            
+            batch = Batch(total=len(accessions), status="pending")
+            self.db.add(batch)
+            self.db.flush()
+            
+            task_ids = {accession: str(uuid.uuid4()) for accession in accessions}
+            rows = self.db.execute(
+                insert(Analysis).returning(Analysis.id, Analysis.task_id),
+                [
+                    {
+                        "genome_id": genomes[accession].id,
+                        "batch_id": batch.id,
+                        "task_id": task_ids[accession],
+                        "status": "pending",
+                        "progress": 0.0,
+                        "message": "Analysis queued" if genomes[accession].file_path else "Waiting for download"
+                    }
+                    for accession in accessions
+                ]
+            )
+            analysis_ids = {row.task_id: row.id for row in rows}
+            self.db.commit()
+        
+        cost_model = CostModel(self.db)
+        jobs = [
+            {
+                "accession": accession,
+                "genome_id": genomes[accession].id,
+                "analysis_id": analysis_ids[task_ids[accession]],
+                "task_id": task_ids[accession],
+                "file_path": genomes[accession].file_path,
+                "genome_size": genomes[accession].genome_size,
+                "priority": cost_model.priority(genomes[accession].genome_size)
+            }
+            for accession in accessions
+        ]
+        logger.info(f"Batch {batch.id} created with {len(jobs)} analyses ({len(missing)} genomes to download)")
+        return batch, jobs
+    
+    def progress(self, batch_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate the progress of a batch.
+        
+        Args:
+            batch_id: Database batch ID
+            
+        Returns:
+            Dictionary with the batch status, total, analysis counts by
+            status, overall progress and timestamps, or None if the batch
+            does not exist
+        """
+        # Finished analyses count as done whatever progress they reached
+        done = case((Analysis.status.in_(TERMINAL_STATUSES), 100.0), else_=func.coalesce(Analysis.progress, 0.0))
+        rows = (
+            self.db.query(
+                Batch.total, Batch.created_at, Batch.completed_at,
+                Analysis.status, func.count(Analysis.id), func.sum(done)
+            )
+            .outerjoin(Analysis, Analysis.batch_id == Batch.id)
+            .filter(Batch.id == batch_id)
+            .group_by(Batch.id, Batch.total, Batch.created_at, Batch.completed_at, Analysis.status)
+            .all()
+        )
+        if not rows:
+            return None
+        
+        total, created_at, completed_at = rows[0][:3]
+        counts = {status: count for _, _, _, status, count, _ in rows if status is not None}
+        progress_sum = sum(row_sum or 0.0 for *_, row_sum in rows)
+        
+        # Running analyses report their progress to the channel, not the row
+        if counts.get("running"):
+            running = dict(
+                self.db.query(Analysis.id, Analysis.progress)
+                .filter(Analysis.batch_id == batch_id, Analysis.status == "running")
+            )
+            states = get_progress_channel().get_many(running)
+            progress_sum += sum(
+                min(state.get("progress", 0.0), 100.0) - (running[analysis_id] or 0.0)
+                for analysis_id, state in states.items()
+            )
+        
+        return {
+            "batch_id": batch_id,
+            "status": batch_status(counts),
+            "total": total,
+            "counts": counts,
+            "progress": round(progress_sum / total, 1) if total else 100.0,
+            "created_at": created_at,
+            "completed_at": completed_at
+        }
+    
+    def complete(self, batch_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Record the final summary of a batch.
+        
+        Args:
+            batch_id: Database batch ID
+            
+        Returns:
+            Batch progress as returned by progress, or None if the batch
+            does not exist
+        """
+        progress = self.progress(batch_id)
+        if progress is None:
+            return None
+        
+        batch = self.db.query(Batch).filter(Batch.id == batch_id).first()
+        batch.status = progress["status"]
+        batch.summary = progress["counts"]
+        batch.completed_at = func.now()
+        self.db.commit()
+        
+        logger.info(f"Batch {batch_id} {progress['status']}: {progress['counts']}")
+        return progress
@@ -0,0 +1,170 @@
+"""Estimated cost of analyses from historical stage timings."""
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.analysis import Analysis
+from app.models.genome import Genome
+from app.models.stage_timing import StageTiming
+from app.core.config import settings
+from app.core.logging import logger
+
+
+# Cost of a whole analysis, as (seconds, seconds per Mb), until timings are recorded
+DEFAULT_COST = (5.0, 10.0)
+
+# Estimated seconds doubling at each priority level
+PRIORITY_UNIT_SECONDS = 10.0
+
+# Priority levels; with the Redis broker, lower levels are consumed first
+PRIORITY_LEVELS = 10
+
+
+class CostModel:
+    """
+    Run time of analyses, estimated from the timings of past stages.
+    
+    The duration of each stage is fitted as a linear function of the
+    genome size, by least squares over the last ANALYSIS_COST_HISTORY
+    timings of the stage, and the cost of an analysis is the sum over
+    its stages. The estimate sets the priority of analysis tasks, so
+    cheap analyses are not queued behind expensive ones, and the
+    workload of each queue tells how many workers it needs.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize the model.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self._stages: Optional[Dict[str, Tuple[float, float, int]]] = None
+    
+    @property
+    def stages(self) -> Dict[str, Tuple[float, float, int]]:
+        """Fitted (seconds, seconds per Mb, samples) of each stage, fitted on first use."""
+        if self._stages is None:
+            self._stages = self.fit()
+        return self._stages
+    
+    def fit(self) -> Dict[str, Tuple[float, float, int]]:
+        """
+        Fit the duration of each stage to the genome size.
+        
+        Returns:
+            (seconds, seconds per Mb, samples) keyed by stage; the
+            coefficients are never negative
+        """
+        recent = (
+            self.db.query(
+                StageTiming.stage,
+                StageTiming.duration,
+                Genome.genome_size,
+                func.row_number().over(partition_by=StageTiming.stage, order_by=StageTiming.id.desc()).label("rank")
+            )
+            .join(Analysis, Analysis.id == StageTiming.analysis_id)
+            .join(Genome, Genome.id == Analysis.genome_id)
+            .filter(Genome.genome_size > 0)
+            .subquery()
+        )
+        rows = self.db.query(recent.c.stage, recent.c.duration, recent.c.genome_size).filter(
+            recent.c.rank <= settings.ANALYSIS_COST_HISTORY
+        )
+        
+        samples: Dict[str, list] = {}
+        for stage, duration, genome_size in rows:
+            samples.setdefault(stage, []).append((genome_size / 1e6, duration))
+        
+        stages = {}
+        for stage, points in samples.items():
+            sizes, durations = np.array(points).T
+            if len(points) > 1 and np.ptp(sizes) > 0:
+                per_mb, seconds = np.polyfit(sizes, durations, 1)
+            else:
+                per_mb, seconds = float(np.mean(durations / sizes)), 0.0
+            if per_mb < 0:
+                # Duration does not grow with size in this history
+                per_mb, seconds = 0.0, float(np.mean(durations))
+            stages[stage] = (max(float(seconds), 0.0), float(per_mb), len(points))
+        return stages
+    
+    def estimate(self, genome_size: Optional[int]) -> float:
+        """
+        Estimate the run time of an analysis.
+        
+        Args:
+            genome_size: Genome size in base pairs (None or 0 if unknown)
+            
+        Returns:
+            Estimated seconds, or 0.0 if the size is unknown
+        """
+        if not genome_size:
+            return 0.0
+        size_mb = genome_size / 1e6
+        if not self.stages:
+            seconds, per_mb = DEFAULT_COST
+            return seconds + per_mb * size_mb
+        return sum(seconds + per_mb * size_mb for seconds, per_mb, _ in self.stages.values())
+    
+    def priority(self, genome_size: Optional[int]) -> int:
+        """
+        Get the Celery priority of the tasks of an analysis.
+        
+        The level grows with the logarithm of the estimated run time, so
+        analyses of a few seconds come first and long ones are ordered
+        by magnitude.
+        
+        Args:
+            genome_size: Genome size in base pairs (None or 0 if unknown)
+            
+        Returns:
+            Priority from 0 to PRIORITY_LEVELS - 1 (the middle level if the
+            size is unknown)
+        """
+        if not genome_size:
+            return PRIORITY_LEVELS // 2
+        level = int(math.log2(1 + self.estimate(genome_size) / PRIORITY_UNIT_SECONDS))
+        return min(level, PRIORITY_LEVELS - 1)
+    
+    def workload(self, hours: float) -> Dict[str, Any]:
+        """
+        Sum the recorded stage time of each queue over a recent window.
+        
+        Busy seconds divided by the window gives the average number of
+        workers a queue kept busy, the minimum concurrency for its pool.
+        
+        Args:
+            hours: Length of the window, ending now
+            
+        Returns:
+            Dictionary with the window, the workload of each queue (stage
+            count, busy seconds and busy workers) and the fitted stages
+        """
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        rows = (
+            self.db.query(StageTiming.queue, func.count(StageTiming.id), func.sum(StageTiming.duration))
+            .filter(StageTiming.created_at >= since)
+            .group_by(StageTiming.queue)
+            .all()
+        )
+        
+        window = hours * 3600
+        queues = {
+            queue: {"stages": count, "busy_seconds": round(busy, 1), "workers": round(busy / window, 2)}
+            for queue, count, busy in rows
+        }
+        logger.info(f"Workload over {hours}h: {queues}")
+        
+        return {
+            "window_hours": hours,
+            "queues": queues,
+            "stages": {
+                stage: {"seconds": round(seconds, 3), "seconds_per_mb": round(per_mb, 3), "samples": count}
+                for stage, (seconds, per_mb, count) in self.stages.items()
+            }
+        }
@@ -0,0 +1,234 @@
+"""Storage and keyset pagination of the per-analysis gene table."""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, insert, literal, or_, select, tuple_
+from sqlalchemy.orm import Session
+from app.models.gene import Gene
+from app.core.exceptions import ValidationException
+from app.core.logging import logger
+
+
+# Sortable columns; each one is backed by an (analysis_id, column, id) index
+SORT_COLUMNS = {
+    "start": Gene.start,
+    "length": Gene.length,
+    "gc_content": Gene.gc_content,
+    "gene_name": Gene.gene_name,
+}
+
+# Columns copied from the gene dictionaries of GeneAnalyzer.extract_genes
+GENE_FIELDS = ("gene_name", "locus_tag", "product", "location", "start", "end", "length", "gc_content", "strand")
+
+
+def encode_cursor(value: Any, gene_id: int) -> str:
+    """
+    Encode the position after a gene as an opaque page cursor.
+    
+    Args:
+        value: Sort column value of the last gene of a page
+        gene_id: ID of the last gene of a page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([value, gene_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (sort value, gene ID)
+        
+    Raises:
+        ValidationException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, gene_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(gene_id, int):
+            raise ValueError("gene id is not an integer")
+        return value, gene_id
+    except (ValueError, TypeError) as e:
+        raise ValidationException(f"Invalid cursor: {e}")
+
+
+class GeneTable:
+    """
+    Every CDS of an analysis, stored as rows of the genes table.
+    
+    Pages are fetched with keyset pagination: the cursor carries the sort
+    value and ID of the last gene returned, and the next page is the
+    index range strictly after that pair. Unlike OFFSET paging, the cost
+    of a page does not grow with its depth.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize the table.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    def save(self, analysis_id: int, genes: List[Dict[str, Any]], replicon: Optional[str] = None) -> int:
+        """
+        Bulk-insert the genes of an analysis.
+        
+        Args:
+            analysis_id: Database analysis ID
+            genes: Gene dictionaries from GeneAnalyzer
+            replicon: Replicon of genes without a "replicon" key
+            
+        Returns:
+            Number of rows inserted
+        """
+        rows = [
+            dict(
+                {field: gene[field] for field in GENE_FIELDS},
+                analysis_id=analysis_id,
+                replicon=gene.get("replicon", replicon)
+            )
+            for gene in genes
+        ]
+        if rows:
+            self.db.execute(insert(Gene), rows)
+            self.db.commit()
+        
+        logger.info(f"Saved {len(rows)} genes for analysis {analysis_id}")
+        return len(rows)
+    
+    def delete(self, analysis_id: int) -> int:
+        """
+        Delete the genes of an analysis.
+        
+        Args:
+            analysis_id: Database analysis ID
+            
+        Returns:
+            Number of rows deleted
+        """
+        count = self.db.query(Gene).filter(Gene.analysis_id == analysis_id).delete(synchronize_session=False)
+        self.db.commit()
+        return count
+    
+    def copy(self, source_analysis_id: int, analysis_id: int) -> int:
+        """
+        Copy the genes of one analysis to another inside the database.
+        
+        Args:
+            source_analysis_id: Analysis whose genes are copied
+            analysis_id: Analysis receiving the copies
+            
+        Returns:
+            Number of rows inserted
+        """
+        columns = ("replicon",) + GENE_FIELDS
+        rows = select(
+            literal(analysis_id), *(getattr(Gene, column) for column in columns)
+        ).where(Gene.analysis_id == source_analysis_id).order_by(Gene.id)
+        count = self.db.execute(
+            insert(Gene).from_select(("analysis_id",) + columns, rows)
+        ).rowcount
+        self.db.commit()
+        
+        logger.info(f"Copied {count} genes from analysis {source_analysis_id} to {analysis_id}")
+        return count
+    
+    def page(self, analysis_id: int, sort: str = "start", order: str = "asc", limit: int = 100,
+             cursor: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fetch one page of genes.
+        
+        Args:
+            analysis_id: Database analysis ID
+            sort: Sort column, one of SORT_COLUMNS
+            order: "asc" or "desc"
+            limit: Maximum number of genes
+            cursor: Cursor of the previous page's next_cursor, or None
+                for the first page
+            filters: Optional filters: replicon, strand, min_length,
+                max_length, min_gc, max_gc and name (case-insensitive
+                prefix of the gene name or locus tag)
+                
+        Returns:
+            Dictionary with the genes, the total number of matching genes
+            (first page only, None when a cursor is given) and the cursor
+            of the next page (None on the last page)
+            
+        Raises:
+            ValidationException: If the sort, order or cursor is invalid
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValidationException(f"Unsupported sort column: {sort}")
+        if order not in ("asc", "desc"):
+            raise ValidationException(f"Unsupported sort order: {order}")
+        
+        column = SORT_COLUMNS[sort]
+        conditions = [Gene.analysis_id == analysis_id] + self._filter_conditions(filters or {})
+        
+        # Counting scans every matching row, so only the first page pays for it
+        total = None
+        query = self.db.query(Gene).filter(*conditions)
+        if cursor is None:
+            total = self.db.query(func.count(Gene.id)).filter(*conditions).scalar()
+        else:
+            # Row-value comparison lets the (analysis_id, column, id) index
+            # seek straight to the first gene after the cursor
+            value, gene_id = decode_cursor(cursor)
+            if order == "asc":
+                query = query.filter(tuple_(column, Gene.id) > tuple_(value, gene_id))
+            else:
+                query = query.filter(tuple_(column, Gene.id) < tuple_(value, gene_id))
+        
+        if order == "asc":
+            query = query.order_by(column.asc(), Gene.id.asc())
+        else:
+            query = query.order_by(column.desc(), Gene.id.desc())
+        
+        # One extra row tells whether another page follows
+        genes = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(genes) > limit:
+            genes = genes[:limit]
+            last = genes[-1]
+            next_cursor = encode_cursor(getattr(last, sort), last.id)
+        
+        return {
+            "total": total,
+            "genes": genes,
+            "next_cursor": next_cursor
+        }
+    
+    def _filter_conditions(self, filters: Dict[str, Any]) -> List[Any]:
+        """Build SQL conditions from page filters (PRIVATE)."""
+        conditions = []
+        
+        if filters.get("replicon") is not None:
+            conditions.append(Gene.replicon == filters["replicon"])
+        if filters.get("strand") is not None:
+            conditions.append(Gene.strand == filters["strand"])
+        if filters.get("min_length") is not None:
+            conditions.append(Gene.length >= filters["min_length"])
+        if filters.get("max_length") is not None:
+            conditions.append(Gene.length <= filters["max_length"])
+        if filters.get("min_gc") is not None:
+            conditions.append(Gene.gc_content >= filters["min_gc"])
+        if filters.get("max_gc") is not None:
+            conditions.append(Gene.gc_content <= filters["max_gc"])
+        if filters.get("name"):
+            prefix = filters["name"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append(or_(
+                Gene.gene_name.ilike(prefix, escape="\\"),
+                Gene.locus_tag.ilike(prefix, escape="\\")
+            ))
+        
+        return conditions
@@ -1,11 +1,16 @@
 """NCBI service for interacting with NCBI Entrez API."""
 
+import os
 import time
+import uuid
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from Bio import Entrez, SeqIO
+from Bio import Entrez
 import httpx
 from app.core.config import settings
+from app.analyzers.genbank_reader import GenBankReader
+from app.analyzers.genome_store import GenomeStore
+from app.analyzers.feature_index import FeatureIndex
 from app.core.logging import logger
 from app.core.exceptions import NCBIException, GenomeNotFoundException
 
@@ -118,6 +123,8 @@ class NCBIService:
             output_file = self.download_dir / f"{accession}.gb"
             if output_file.exists():
                 logger.info(f"Genome already downloaded: {output_file}")
+                self._build_genome_store(output_file)
+                self._build_feature_index(output_file)
                 return str(output_file)
             
             self._rate_limit_wait()
@@ -130,16 +137,24 @@ class NCBIService:
                 retmode="text"
             )
             
-            # Save to file
-            with open(output_file, 'w') as f:
+            # Save to a file of this download only, moved into place once
+            # valid, so concurrent downloads never see a partial file
+            partial_file = output_file.with_name(f"{output_file.name}.{uuid.uuid4().hex}.part")
+            with open(partial_file, 'w') as f:
                 f.write(fetch_handle.read())
             
             fetch_handle.close()
             
             # Validate file
-            if not self._validate_genbank_file(output_file):
-                output_file.unlink()
+            if not self._validate_genbank_file(partial_file):
+                partial_file.unlink()
                 raise NCBIException(f"Downloaded file is not a valid GenBank file")
+            os.replace(partial_file, output_file)
+            
+            # Convert once into the packed store so analyses skip text parsing,
+            # and index the genes for region queries
+            self._build_genome_store(output_file)
+            self._build_feature_index(output_file)
             
             logger.info(f"Genome downloaded successfully: {output_file}")
             return str(output_file)
@@ -201,12 +216,49 @@ class NCBIService:
             True if valid, False otherwise
         """
         try:
-            record = SeqIO.read(str(file_path), "genbank")
-            return len(record.seq) > 0
+            # Multi-record files (plasmids, contig sets) are valid; records
+            # are streamed so only one is held in memory at a time
+            return any(len(record) > 0 for record in GenBankReader(file_path))
         except Exception as e:
             logger.error(f"GenBank validation failed: {e}")
             return False
     
+    def _build_genome_store(self, file_path: Path):
+        """
+        Build the 2-bit packed genome store next to a GenBank file.
+        
+        Failures are logged and ignored: analyses fall back to parsing
+        the GenBank file when no store is available.
+        
+        Args:
+            file_path: Path to GenBank file
+        """
+        if GenomeStore.exists(str(file_path)):
+            return
+        
+        try:
+            GenomeStore.build(str(file_path)).close()
+        except Exception as e:
+            logger.warning(f"Could not build genome store for {file_path}: {e}")
+    
+    def _build_feature_index(self, file_path: Path):
+        """
+        Build the gene interval index next to a GenBank file.
+        
+        Failures are logged and ignored: the index is rebuilt on the
+        first region query.
+        
+        Args:
+            file_path: Path to GenBank file
+        """
+        if FeatureIndex.exists(str(file_path)):
+            return
+        
+        try:
+            FeatureIndex.build(str(file_path))
+        except Exception as e:
+            logger.warning(f"Could not build feature index for {file_path}: {e}")
+    
     def _extract_organism(self, title: str) -> str:
         """
         Extract organism name from title.
@@ -0,0 +1,353 @@
+"""Fast channel for the progress of running analyses."""
+
+import asyncio
+import contextlib
+import json
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+import redis
+import redis.asyncio
+from app.models.analysis import Analysis
+from app.core.config import settings
+from app.core.logging import logger
+
+
+# Fields of the published state, as returned by GET /analysis/{analysis_id}
+STATE_FIELDS = ("analysis_id", "task_id", "status", "progress", "message", "started_at", "completed_at")
+
+# States queued for a subscriber that is not reading; older states are dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+def analysis_state(analysis: Analysis) -> Dict[str, Any]:
+    """
+    Get the full progress state of an analysis record.
+    
+    Args:
+        analysis: Analysis record
+        
+    Returns:
+        Dictionary with the STATE_FIELDS of the analysis
+    """
+    return {
+        "analysis_id": analysis.id,
+        "task_id": analysis.task_id,
+        "status": analysis.status,
+        "progress": analysis.progress or 0.0,
+        "message": analysis.message,
+        "started_at": analysis.started_at,
+        "completed_at": analysis.completed_at
+    }
+
+
+def _encode(value: Any) -> str:
+    """Encode a state field as JSON (PRIVATE)."""
+    return json.dumps(value.isoformat() if isinstance(value, datetime) else value)
+
+
+class ProgressChannel(ABC):
+    """
+    Progress of analyses, kept out of the relational database.
+    
+    Stage tasks report their progress here instead of committing it to
+    the Analysis row, which is only written when the analysis starts,
+    completes or fails. Each analysis has a small state of STATE_FIELDS
+    that readers poll, and every update is also published to the
+    analysis's topic for subscribers. Progress is advanced atomically, so
+    stages running in parallel can each add their share.
+    
+    The channel is an optimisation: errors are logged and never fail an
+    analysis, and readers fall back to the database when the state is
+    missing or incomplete.
+    """
+    
+    def key(self, analysis_id: int) -> str:
+        """Get the key of the state of an analysis."""
+        return f"analysis:{analysis_id}:progress"
+    
+    def topic(self, analysis_id: int) -> str:
+        """Get the pub/sub topic of an analysis."""
+        return f"analysis:{analysis_id}:events"
+    
+    def update(self, analysis_id: int, step: float = 0.0, /, **fields) -> Optional[Dict[str, Any]]:
+        """
+        Update the state of an analysis and publish it.
+        
+        Args:
+            analysis_id: Database analysis ID
+            step: Progress to add to the current progress
+            **fields: State fields to set (see STATE_FIELDS, which include
+                analysis_id itself)
+            
+        Returns:
+            The updated state, or None if the channel is unavailable
+        """
+        try:
+            state = self._apply(analysis_id, {name: _encode(value) for name, value in fields.items()}, step)
+        except Exception as e:
+            logger.warning(f"Progress of analysis {analysis_id} not published: {e}")
+            return None
+        return state
+    
+    def get(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of an analysis.
+        
+        Args:
+            analysis_id: Database analysis ID
+            
+        Returns:
+            State dictionary, or None if there is no state or the channel
+            is unavailable
+        """
+        return self.get_many([analysis_id]).get(analysis_id)
+    
+    def get_many(self, analysis_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the states of many analyses in one round trip.
+        
+        Args:
+            analysis_ids: Database analysis IDs
+            
+        Returns:
+            States keyed by analysis ID, for the analyses that have one
+        """
+        analysis_ids = list(analysis_ids)
+        if not analysis_ids:
+            return {}
+        try:
+            states = self._read(analysis_ids)
+        except Exception as e:
+            logger.warning(f"Progress channel unavailable: {e}")
+            return {}
+        return {analysis_id: state for analysis_id, state in zip(analysis_ids, states) if state}
+    
+    @abstractmethod
+    def listen(self) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Receive the states published for every analysis.
+        
+        Returns:
+            Async iterator of (analysis_id, state) tuples, as they are
+            published
+        """
+        pass
+    
+    @abstractmethod
+    def _apply(self, analysis_id: int, fields: Dict[str, str], step: float) -> Dict[str, Any]:
+        """Set encoded fields, add step to the progress and publish the state (PRIVATE)."""
+        pass
+    
+    @abstractmethod
+    def _read(self, analysis_ids: List[int]) -> List[Dict[str, Any]]:
+        """Read the states of analyses, empty if missing (PRIVATE)."""
+        pass
+    
+    @staticmethod
+    def _decode(fields: Dict[Any, Any]) -> Dict[str, Any]:
+        """Decode a stored state (PRIVATE)."""
+        return {
+            (name.decode() if isinstance(name, bytes) else name): json.loads(value)
+            for name, value in fields.items()
+        }
+
+
+class RedisProgressChannel(ProgressChannel):
+    """
+    Progress channel stored in Redis.
+    
+    Each state is a hash expiring PROGRESS_TTL_HOURS after its last
+    update, and is published to the analysis's topic on every update.
+    """
+    
+    def __init__(self, url: str):
+        """
+        Initialize the channel.
+        
+        Args:
+            url: Redis URL
+        """
+        self.url = url
+        self.client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+    
+    async def listen(self) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        # One pattern subscription receives the topics of every analysis
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.psubscribe(self.topic("*"))
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    yield int(message["channel"].split(b":")[1]), json.loads(message["data"])
+        finally:
+            await pubsub.close()
+            await client.close()
+    
+    def _apply(self, analysis_id: int, fields: Dict[str, str], step: float) -> Dict[str, Any]:
+        key = self.key(analysis_id)
+        pipeline = self.client.pipeline()
+        if fields:
+            pipeline.hset(key, mapping=fields)
+        if step:
+            pipeline.hincrbyfloat(key, "progress", step)
+        pipeline.expire(key, settings.PROGRESS_TTL_HOURS * 3600)
+        pipeline.hgetall(key)
+        state = self._decode(pipeline.execute()[-1])
+        
+        self.client.publish(self.topic(analysis_id), json.dumps(state))
+        return state
+    
+    def _read(self, analysis_ids: List[int]) -> List[Dict[str, Any]]:
+        pipeline = self.client.pipeline(transaction=False)
+        for analysis_id in analysis_ids:
+            pipeline.hgetall(self.key(analysis_id))
+        return [self._decode(fields) for fields in pipeline.execute()]
+
+
+class MemoryProgressChannel(ProgressChannel):
+    """
+    Progress channel kept in the memory of the current process.
+    
+    Stand-in for Redis in tests and single-process deployments (e.g.
+    Celery in eager mode); states do not expire.
+    """
+    
+    def __init__(self):
+        """Initialize the channel."""
+        self.states: Dict[str, Dict[str, str]] = {}
+        self.listeners: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.lock = threading.Lock()
+    
+    async def listen(self) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        listener = (asyncio.get_running_loop(), asyncio.Queue())
+        with self.lock:
+            self.listeners.append(listener)
+        try:
+            while True:
+                yield await listener[1].get()
+        finally:
+            with self.lock:
+                self.listeners.remove(listener)
+    
+    def _apply(self, analysis_id: int, fields: Dict[str, str], step: float) -> Dict[str, Any]:
+        with self.lock:
+            stored = self.states.setdefault(self.key(analysis_id), {})
+            stored.update(fields)
+            if step:
+                stored["progress"] = json.dumps((json.loads(stored.get("progress", "0")) or 0.0) + step)
+            state = self._decode(stored)
+            
+            # Updates come from worker threads as well as the event loop
+            for loop, queue in self.listeners:
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(queue.put_nowait, (analysis_id, state))
+            return state
+    
+    def _read(self, analysis_ids: List[int]) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self._decode(self.states.get(self.key(analysis_id), {})) for analysis_id in analysis_ids]
+
+
+@lru_cache(maxsize=None)
+def get_progress_channel() -> ProgressChannel:
+    """
+    Get the progress channel configured by PROGRESS_CHANNEL.
+    
+    Returns:
+        Shared ProgressChannel instance
+    """
+    if settings.PROGRESS_CHANNEL == "memory":
+        return MemoryProgressChannel()
+    return RedisProgressChannel(settings.REDIS_URL)
+
+
+class ProgressBroadcaster:
+    """
+    Fan-out of published progress states to the subscribers of an API process.
+    
+    A single listener receives the states of every analysis from the
+    channel and hands each one to the bounded queues of the subscribers
+    of that analysis. An idle subscriber therefore costs one queue, not
+    a channel connection, and a subscriber that falls behind only misses
+    intermediate states: the latest state always reaches it.
+    """
+    
+    def __init__(self, channel: ProgressChannel):
+        """
+        Initialize the broadcaster.
+        
+        Args:
+            channel: Progress channel to listen to
+        """
+        self.channel = channel
+        self.subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self.listener: Optional[asyncio.Task] = None
+    
+    @contextlib.asynccontextmanager
+    async def subscribe(self, analysis_id: int) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to the states published for an analysis.
+        
+        Args:
+            analysis_id: Database analysis ID
+            
+        Yields:
+            Queue receiving the published states of the analysis
+        """
+        self._start()
+        # Let a new listener subscribe to the channel before states are awaited
+        await asyncio.sleep(0)
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.setdefault(analysis_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self.subscribers.get(analysis_id, set())
+            queues.discard(queue)
+            if not queues:
+                self.subscribers.pop(analysis_id, None)
+    
+    def dispatch(self, analysis_id: int, state: Dict[str, Any]):
+        """
+        Hand a published state to the subscribers of its analysis.
+        
+        Args:
+            analysis_id: Database analysis ID
+            state: Published state
+        """
+        for queue in self.subscribers.get(analysis_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(state)
+    
+    def _start(self):
+        """Start the listener in the running event loop unless it is running (PRIVATE)."""
+        loop = asyncio.get_running_loop()
+        if self.listener is None or self.listener.done() or self.listener.get_loop() is not loop:
+            self.listener = loop.create_task(self._listen())
+    
+    async def _listen(self):
+        """Dispatch published states until cancelled, reconnecting on errors (PRIVATE)."""
+        while True:
+            try:
+                async for analysis_id, state in self.channel.listen():
+                    self.dispatch(analysis_id, state)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Progress channel subscription lost: {e}")
+            await asyncio.sleep(1.0)
+
+
+@lru_cache(maxsize=None)
+def get_progress_broadcaster() -> ProgressBroadcaster:
+    """
+    Get the broadcaster of the progress channel of this process.
+    
+    Returns:
+        Shared ProgressBroadcaster instance
+    """
+    return ProgressBroadcaster(get_progress_channel())
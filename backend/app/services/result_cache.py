@@ -0,0 +1,224 @@
+"""Content-addressed cache of analyzer results."""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import func
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.models.analysis import Analysis
+from app.models.genome import Genome
+from app.models.result import Result
+from app.models.result_cache import ResultCacheEntry
+from app.models.validation import Validation
+from app.services.artifact_store import ArtifactStore
+from app.services.gene_table import GeneTable
+from app.core.logging import logger
+
+
+# Bytes read at a time while hashing a genome file
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def content_hash(path: str) -> str:
+    """
+    Hash a genome file without reading it into memory.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        SHA-256 hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Analyzer results reused across analyses of identical genome files.
+    
+    Each completed analysis records, for every analyzer it ran, an entry
+    keyed by the SHA-256 of the genome file, the analyzer name and the
+    analyzer version, pointing at the Result row it saved. A later
+    analysis of the same content clones the Result rows of the entries
+    matching the current analyzer versions, together with the genes and
+    artifacts the analyzers produced, and only runs the analyzers that
+    missed. Bumping one analyzer's version therefore re-runs just that
+    analyzer.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize the cache.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+    
+    def genome_hash(self, genome: Genome) -> Optional[str]:
+        """
+        Get the content hash of a genome, hashing its file on first use.
+        
+        Args:
+            genome: Genome record
+            
+        Returns:
+            SHA-256 hex digest, or None if the file is not available
+        """
+        if genome.content_hash is None:
+            if not genome.file_path or not Path(genome.file_path).exists():
+                return None
+            genome.content_hash = content_hash(genome.file_path)
+            self.db.commit()
+        return genome.content_hash
+    
+    def lookup(self, digest: Optional[str], versions: Dict[str, str]) -> Dict[str, ResultCacheEntry]:
+        """
+        Find the cached results of a genome for the given analyzer versions.
+        
+        Args:
+            digest: Genome content hash (None never hits)
+            versions: Analyzer versions keyed by analyzer name
+            
+        Returns:
+            Entries keyed by analyzer name, for the analyzers that hit
+        """
+        if digest is None or not versions:
+            return {}
+        
+        entries = (
+            self.db.query(ResultCacheEntry)
+            .options(joinedload(ResultCacheEntry.result))
+            .filter(ResultCacheEntry.content_hash == digest, ResultCacheEntry.analyzer.in_(list(versions)))
+            .all()
+        )
+        return {
+            entry.analyzer: entry
+            for entry in entries
+            if entry.version == versions[entry.analyzer]
+        }
+    
+    def store(self, digest: Optional[str], analysis_id: int, versions: Dict[str, str]) -> int:
+        """
+        Record the results of a completed analysis.
+        
+        Args:
+            digest: Genome content hash (None stores nothing)
+            analysis_id: Analysis whose results are recorded
+            versions: Versions of the analyzers that ran, keyed by name
+            
+        Returns:
+            Number of entries created
+        """
+        if digest is None or not versions:
+            return 0
+        
+        cached = self.lookup(digest, versions)
+        results = (
+            self.db.query(Result)
+            .filter(Result.analysis_id == analysis_id, Result.result_type.in_(list(versions)))
+            .all()
+        )
+        entries = [
+            ResultCacheEntry(
+                content_hash=digest,
+                analyzer=result.result_type,
+                version=versions[result.result_type],
+                result_id=result.id
+            )
+            for result in results
+            if result.result_type not in cached
+        ]
+        
+        try:
+            self.db.add_all(entries)
+            self.db.commit()
+        except IntegrityError:
+            # An analysis of the same content finished first; its entries win
+            self.db.rollback()
+            logger.info(f"Results of analysis {analysis_id} were already cached")
+            return 0
+        
+        logger.info(f"Cached {len(entries)} results of analysis {analysis_id}")
+        return len(entries)
+    
+    def clone(self, entries: Dict[str, ResultCacheEntry], analysis_id: int) -> Dict[str, Any]:
+        """
+        Copy cached results, with their genes and artifacts, to an analysis.
+        
+        Args:
+            entries: Entries from lookup, keyed by analyzer name
+            analysis_id: Analysis receiving the results
+            
+        Returns:
+            Cloned result data keyed by analyzer name
+        """
+        analyzers = BaseAnalyzer.registered()
+        results = {}
+        for name, entry in entries.items():
+            source_id = entry.result.analysis_id
+            self.db.add(Result(analysis_id=analysis_id, result_type=name, data=entry.result.data))
+            results[name] = entry.result.data
+            
+            if name == "gene_stats":
+                GeneTable(self.db).copy(source_id, analysis_id)
+            
+            artifact_store = ArtifactStore(analysis_id)
+            for artifact_name in getattr(analyzers.get(name), "outputs", ()):
+                source_store = ArtifactStore(source_id)
+                if source_store.exists(artifact_name):
+                    artifact_store.copy_from(source_store, artifact_name)
+        self.db.commit()
+        
+        logger.info(f"Cloned cached results {sorted(entries)} to analysis {analysis_id}")
+        return results
+    
+    def complete(self, analysis: Analysis, entries: Dict[str, ResultCacheEntry]) -> Dict[str, Any]:
+        """
+        Complete an analysis entirely from cache.
+        
+        Analyzer results are cloned; the validation and charts, which are
+        derived from them, are copied from the latest analysis the
+        entries came from.
+        
+        Args:
+            analysis: Pending analysis whose every analyzer hit the cache
+            entries: Entries from lookup, keyed by analyzer name
+            
+        Returns:
+            Cloned result data keyed by analyzer name
+        """
+        results = self.clone(entries, analysis.id)
+        
+        source_id = max(entry.result.analysis_id for entry in entries.values())
+        validation = self.db.query(Validation).filter(Validation.analysis_id == source_id).first()
+        if validation:
+            self.db.add(Validation(
+                analysis_id=analysis.id,
+                reference_accession=validation.reference_accession,
+                deviations=validation.deviations,
+                validation_status=validation.validation_status
+            ))
+        charts = (
+            self.db.query(Result)
+            .filter(Result.analysis_id == source_id, Result.result_type == "charts")
+            .first()
+        )
+        if charts:
+            self.db.add(Result(analysis_id=analysis.id, result_type="charts", data=charts.data))
+        
+        analysis.status = "completed"
+        analysis.progress = 100.0
+        analysis.message = "Analysis completed from cache"
+        analysis.completed_at = func.now()
+        self.db.commit()
+        self.db.refresh(analysis)
+        
+        logger.info(f"Analysis {analysis.id} completed from cache of analysis {source_id}")
+        return results
@@ -0,0 +1,139 @@
+"""Single-flight locks that keep duplicate requests from doing the same work twice."""
+
+import contextlib
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import ContextManager, Dict, Iterator
+import redis
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class SingleFlight(ABC):
+    """
+    Named locks shared by every API process and worker.
+    
+    Work on one accession or one genome content is done under the lock
+    of its key; a duplicate request waits for the lock, then finds the
+    work in flight or done and attaches to it instead of repeating it.
+    The kinds of keys are:
+    
+    - accession: the genome and analysis records of an accession, held
+      briefly while they are looked up, created or filled in
+    - download: the fetch of an accession from NCBI, held for the whole
+      download and always taken before the accession lock
+    - content: the start of an analysis of a genome content
+    
+    Locks expire after SINGLE_FLIGHT_TIMEOUT_SECONDS, so a crashed holder
+    cannot block a key forever. When the lock store is unavailable the
+    work goes ahead unlocked: a duplicate is better than a failed request.
+    """
+    
+    def key(self, kind: str, value: str) -> str:
+        """
+        Get the lock key of an accession or content hash.
+        
+        Args:
+            kind: What the lock guards (accession, download or content)
+            value: Accession number or SHA-256 hex digest
+            
+        Returns:
+            Lock key
+        """
+        return f"single-flight:{kind}:{value}"
+    
+    @abstractmethod
+    def lock(self, key: str) -> ContextManager[None]:
+        """
+        Hold the lock of a key, waiting for its current holder.
+        
+        Args:
+            key: Lock key (see key)
+            
+        Returns:
+            Context manager holding the lock while it is entered
+        """
+        pass
+
+
+class RedisSingleFlight(SingleFlight):
+    """Single-flight locks stored in Redis."""
+    
+    def __init__(self, url: str):
+        """
+        Initialize the locks.
+        
+        Args:
+            url: Redis URL
+        """
+        self.client = redis.Redis.from_url(url, socket_timeout=5.0, socket_connect_timeout=1.0)
+    
+    @contextlib.contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        lock = self.client.lock(
+            key,
+            timeout=settings.SINGLE_FLIGHT_TIMEOUT_SECONDS,
+            blocking_timeout=settings.SINGLE_FLIGHT_TIMEOUT_SECONDS
+        )
+        try:
+            acquired = lock.acquire()
+            if not acquired:
+                logger.warning(f"Timed out waiting for lock {key}, continuing without it")
+        except redis.RedisError as e:
+            logger.warning(f"Lock {key} unavailable, continuing without it: {e}")
+            acquired = False
+        
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    lock.release()
+                except redis.RedisError as e:
+                    # Expired while held; it will not block anyone
+                    logger.warning(f"Lock {key} not released: {e}")
+
+
+class LocalSingleFlight(SingleFlight):
+    """
+    Single-flight locks in the memory of the current process.
+    
+    Stand-in for Redis in tests and single-process deployments; locks
+    are only shared by the threads of the process.
+    """
+    
+    def __init__(self):
+        """Initialize the locks."""
+        self.locks: Dict[str, threading.Lock] = {}
+        self.holders: Dict[str, int] = {}
+        self.guard = threading.Lock()
+    
+    @contextlib.contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with self.guard:
+            lock = self.locks.setdefault(key, threading.Lock())
+            self.holders[key] = self.holders.get(key, 0) + 1
+        try:
+            with lock:
+                yield
+        finally:
+            with self.guard:
+                # Forget the lock once nobody holds or waits for it
+                self.holders[key] -= 1
+                if not self.holders[key]:
+                    del self.holders[key]
+                    del self.locks[key]
+
+
+@lru_cache(maxsize=None)
+def get_single_flight() -> SingleFlight:
+    """
+    Get the single-flight locks configured by SINGLE_FLIGHT_LOCKS.
+    
+    Returns:
+        Shared SingleFlight instance
+    """
+    if settings.SINGLE_FLIGHT_LOCKS == "local":
+        return LocalSingleFlight()
+    return RedisSingleFlight(settings.REDIS_URL)
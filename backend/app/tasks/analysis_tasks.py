@@ -1,41 +1,316 @@
 """Analysis tasks for processing genomes."""
 
-from celery import Task
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+from celery import Task, chain, group
+from celery.canvas import Signature
+from celery.exceptions import Ignore
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from app.tasks.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.models.analysis import Analysis
+from app.models.genome import Genome
 from app.models.result import Result
+from app.models.stage_timing import StageTiming
 from app.models.validation import Validation
-from app.analyzers.codon_analyzer import CodonAnalyzer
-from app.analyzers.gene_analyzer import GeneAnalyzer
-from app.analyzers.genome_analyzer import GenomeAnalyzer
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.genome_store import GenomeStore
+from app.analyzers.replicon_runner import RepliconRunner
 from app.analyzers.visualization import VisualizationGenerator
+from app.services.artifact_store import ArtifactStore
+from app.services.cost_model import CostModel
+from app.services.gene_table import GeneTable
+from app.services.progress_channel import analysis_state, get_progress_channel
+from app.services.result_cache import ResultCache
+from app.services.single_flight import get_single_flight
 from app.services.validation_service import ValidationService
+from app.core.config import settings
 from app.core.logging import logger
 from app.core.exceptions import AnalysisException
 
 
+# Progress message shown while each stage of the analysis runs
+STAGE_MESSAGES = {
+    "prepare": "Encoding genome...",
+    "validation": "Validating results...",
+    "charts": "Generating charts..."
+}
+
+
+def generate_charts(sequence_results: dict) -> dict:
+    """
+    Generate the summary charts of an analysis.
+    
+    Charts are saved in DATA_DIR/results, not the working directory of
+    the worker.
+    
+    Args:
+        sequence_results: Analyzer results keyed by analyzer name
+        
+    Returns:
+        Chart paths keyed by chart name (charts that fail are left out)
+    """
+    viz_generator = VisualizationGenerator(str(Path(settings.DATA_DIR) / "results"))
+    charts = {}
+    
+    try:
+        # Generate stop codon chart
+        stop_codon_chart = viz_generator.create_stop_codon_chart(
+            sequence_results["codon_analysis"].get("stop_codons", {})
+        )
+        charts["stop_codon_frequency"] = stop_codon_chart
+        
+        # Generate nucleotide composition chart
+        composition_chart = viz_generator.create_nucleotide_composition_chart(
+            sequence_results["genome_stats"].get("nucleotide_composition", {})
+        )
+        charts["nucleotide_composition"] = composition_chart
+    
+    except Exception as e:
+        logger.warning(f"Error generating charts: {e}")
+    
+    return charts
+
+
+def analyzer_stages(analyzer_classes: Dict[str, Type[BaseAnalyzer]]) -> Dict[str, List[str]]:
+    """
+    Group analyzers into stage tasks.
+    
+    An analyzer runs in the same stage as the analyzers it requires, so
+    their artifacts are handed over in memory; every other analyzer gets
+    a stage of its own.
+    
+    Args:
+        analyzer_classes: Analyzer classes to run, keyed by name
+        
+    Returns:
+        Analyzer names of each stage, keyed by the name of the stage's
+        first analyzer
+    """
+    parent = {name: name for name in analyzer_classes}
+    
+    def root(name: str) -> str:
+        while parent[name] != name:
+            name = parent[name]
+        return name
+    
+    for name, analyzer_class in analyzer_classes.items():
+        for required in analyzer_class.requires:
+            if required in parent:
+                parent[root(name)] = root(required)
+    
+    stages: Dict[str, List[str]] = {}
+    for name in analyzer_classes:
+        stages.setdefault(root(name), []).append(name)
+    return {names[0]: names for names in stages.values()}
+
+
+def stage_options(heavy: bool, genome_size: Optional[int] = None, priority: Optional[int] = None) -> dict:
+    """
+    Get the routing options of a stage task.
+    
+    Stages that scan the sequence go to the small or large queue by
+    genome size, so a large genome does not hold up the small ones
+    queued behind it; stages that only read saved results go to the
+    light queue.
+    
+    Args:
+        heavy: Whether the stage scans the genome sequence, as opposed to
+            only reading saved results
+        genome_size: Genome size in base pairs (None if unknown, routed
+            as small)
+        priority: Celery priority of the task (see CostModel.priority)
+            
+    Returns:
+        Options for Signature.set (empty to use the default routing)
+    """
+    if not heavy:
+        queue = settings.ANALYSIS_LIGHT_QUEUE
+    elif genome_size and genome_size >= settings.ANALYSIS_LARGE_GENOME_MB * 1e6:
+        queue = settings.ANALYSIS_LARGE_QUEUE
+    else:
+        queue = settings.ANALYSIS_SMALL_QUEUE
+    
+    options = {"queue": queue} if queue else {}
+    if priority is not None:
+        options["priority"] = priority
+    return options
+
+
+def dispatch_options(genome: Genome, cost_model: CostModel) -> dict:
+    """
+    Get the routing options of the analyze_genome task of a genome at submit time.
+    
+    Args:
+        genome: Genome record (its size is unknown before its download)
+        cost_model: Cost model giving the priority
+        
+    Returns:
+        Options for apply_async or Signature.set
+    """
+    return stage_options(True, genome.genome_size, cost_model.priority(genome.genome_size))
+
+
+def analysis_workflow(analysis_id: int, genbank_file: str, accession: str, analyzers: List[str],
+                      genome_size: Optional[int] = None, priority: Optional[int] = None) -> Signature:
+    """
+    Build the chain of stage tasks of an analysis.
+    
+    The genome is encoded first, then the analyzer stages run as a group
+    (a chord whose body is the validation), followed by the charts and
+    the final bookkeeping. Stages pass each other only IDs: results live
+    in the database and arrays in the ArtifactStore. Stages report their
+    progress to the progress channel; the Analysis row is only written
+    when the analysis starts, completes or fails.
+    
+    Args:
+        analysis_id: Database analysis ID
+        genbank_file: Path to GenBank file
+        accession: Genome accession number
+        analyzers: Names of the registered analyzers to run
+        genome_size: Genome size in base pairs, for routing (see
+            stage_options)
+        priority: Celery priority of the stage tasks
+        
+    Returns:
+        Chain signature, ready for apply_async or Task.replace
+    """
+    registered = BaseAnalyzer.registered()
+    classes = {name: registered[name] for name in analyzers}
+    stages = analyzer_stages(classes)
+    
+    # Each stage adds its share of progress as its last step, after
+    # everything that can fail and retry it; finishing sets 100
+    step = round(100.0 / (len(stages) + 4), 1)
+    
+    heavy = stage_options(True, genome_size, priority)
+    light = stage_options(False, genome_size, priority)
+    
+    steps = [prepare_genome_task.si(analysis_id, genbank_file, step).set(**heavy)]
+    if stages:
+        steps.append(group(
+            run_analyzers_task.si(analysis_id, genbank_file, accession, names, step).set(**heavy)
+            for names in stages.values()
+        ))
+    steps += [
+        validate_results_task.si(analysis_id, accession, step).set(**light),
+        generate_charts_task.si(analysis_id, step).set(**light),
+        finish_analysis_task.si(
+            analysis_id, {name: analyzer_class.version for name, analyzer_class in classes.items()}
+        ).set(**light)
+    ]
+    return chain(*steps)
+
+
+def _mark_failed(analysis_id: int, message: str):
+    """Mark an analysis as failed unless it already finished (PRIVATE)."""
+    db: Session = SessionLocal()
+    
+    try:
+        failed = db.query(Analysis).filter(
+            Analysis.id == analysis_id, Analysis.status.notin_(("completed", "failed"))
+        ).update({"status": "failed", "error_message": message, "message": "Analysis failed"},
+                 synchronize_session=False)
+        db.commit()
+        
+        if failed:
+            analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+            get_progress_channel().update(analysis_id, **analysis_state(analysis))
+    finally:
+        db.close()
+
+
+def _record_timing(task: Task, analysis_id: int, stage: str, started: float):
+    """Record the run time of a completed stage for the cost model (PRIVATE)."""
+    queue = (task.request.delivery_info or {}).get("routing_key") or celery_app.conf.task_default_queue
+    db: Session = SessionLocal()
+    
+    try:
+        db.add(StageTiming(analysis_id=analysis_id, stage=stage, queue=queue, duration=time.monotonic() - started))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _claim_content(db: Session, analysis: Analysis, digest: str) -> bool:
+    """Mark an analysis running unless an identical genome is being analyzed (PRIVATE)."""
+    flight = get_single_flight()
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.SINGLE_FLIGHT_MAX_AGE_HOURS)
+    
+    with flight.lock(flight.key("content", digest)):
+        running = (
+            db.query(Analysis.id)
+            .join(Genome, Genome.id == Analysis.genome_id)
+            .filter(
+                Genome.content_hash == digest,
+                Analysis.id != analysis.id,
+                Analysis.status == "running",
+                Analysis.started_at >= since
+            )
+            .first()
+        )
+        if running:
+            return False
+        analysis.status = "running"
+        db.commit()
+        return True
+
+
+def _load_results(db: Session, analysis_id: int, result_types: List[str]) -> dict:
+    """Load saved result data of an analysis, keyed by result type (PRIVATE)."""
+    results = db.query(Result).filter(Result.analysis_id == analysis_id, Result.result_type.in_(result_types))
+    data = {result.result_type: result.data for result in results}
+    missing = [result_type for result_type in result_types if result_type not in data]
+    if missing:
+        raise AnalysisException(f"Analysis {analysis_id} has no {', '.join(missing)} results")
+    return data
+
+
 class AnalysisTask(Task):
-    """Base task for analysis with error handling."""
+    """
+    Base task for analysis stages with error handling.
+    
+    Every stage saves its own output, so a failing stage is retried on
+    its own while the stages before it keep their results. Once its
+    retries are exhausted, the analysis is marked as failed.
+    """
     
-    autoretry_for = (AnalysisException,)
+    autoretry_for = (AnalysisException, OperationalError)
     retry_kwargs = {"max_retries": 2}
     retry_backoff = True
+    
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        analysis_id = args[0] if args else kwargs.get("analysis_id")
+        logger.error(f"Task {task_id}: Analysis {analysis_id} failed - {exc}")
+        if analysis_id is not None:
+            _mark_failed(analysis_id, str(exc))
 
 
 @celery_app.task(base=AnalysisTask, bind=True, name="analyze_genome")
-def analyze_genome_task(self, analysis_id: int, genbank_file: str, accession: str) -> dict:
+def analyze_genome_task(self, analysis_id: int, genbank_file: Optional[str], accession: str,
+                        wait_until: Optional[float] = None):
     """
-    Perform complete genome analysis.
+    Start a complete genome analysis.
+    
+    While a genome of identical content is being analyzed, the task
+    waits for it by re-queuing itself until its wait deadline. Waits do
+    not count as retries, so a task that waited still has all its
+    retries for failures. Results cached for the genome content are
+    cloned, then the task replaces itself with the stage workflow of the
+    remaining analyzers (see analysis_workflow), keeping its task ID.
     
     Args:
         analysis_id: Database analysis ID
-        genbank_file: Path to GenBank file
+        genbank_file: Path to GenBank file, or None to use the file of the
+            analysis's genome (e.g. when chained after its download)
         accession: Genome accession number
-        
-    Returns:
-        Dictionary with analysis results
+        wait_until: Time (as time.time()) until which the task waits for an
+            identical analysis; None for SINGLE_FLIGHT_TIMEOUT_SECONDS from
+            now
     """
     logger.info(f"Task {self.request.id}: Starting analysis {analysis_id}")
     
@@ -46,159 +321,277 @@ def analyze_genome_task(self, analysis_id: int, genbank_file: str, accession: st
         analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
         if not analysis:
             raise AnalysisException(f"Analysis {analysis_id} not found")
+        genbank_path = genbank_file or analysis.genome.file_path
+        if not genbank_path:
+            raise AnalysisException(f"Genome {accession} has not been downloaded")
+        
+        # An identical genome (same content, another accession or a
+        # re-submission) being analyzed fills the result cache, so this
+        # analysis waits for it, then clones its results; after its wait
+        # deadline it runs anyway
+        digest = None
+        if settings.RESULT_CACHE_ENABLED:
+            cache = ResultCache(db)
+            digest = cache.genome_hash(analysis.genome)
+        if wait_until is None:
+            wait_until = time.time() + settings.SINGLE_FLIGHT_TIMEOUT_SECONDS
+        if digest and time.time() < wait_until and not _claim_content(db, analysis, digest):
+            logger.info(f"Analysis {analysis_id} waiting for an identical genome")
+            get_progress_channel().update(analysis_id, message="Waiting for an identical analysis...")
+            # Re-queued like a retry (same task ID, chain and routing), but
+            # keeping the retry count of the task
+            self.signature_from_request(
+                self.request, (analysis_id, genbank_file, accession), {"wait_until": wait_until},
+                countdown=settings.SINGLE_FLIGHT_WAIT_SECONDS, retries=self.request.retries
+            ).apply_async()
+            raise Ignore()
         
         # Update status
         analysis.status = "running"
         analysis.progress = 0.0
         analysis.message = "Starting analysis..."
         db.commit()
+        get_progress_channel().update(analysis_id, **analysis_state(analysis))
         
-        # Step 1: Codon Analysis
-        logger.info(f"Task {self.request.id}: Running codon analysis")
-        analysis.progress = 10.0
-        analysis.message = "Analyzing codons..."
-        db.commit()
-        
-        codon_analyzer = CodonAnalyzer()
-        codon_results = codon_analyzer.analyze(genbank_file)
+        # Analyzers whose results are cached for this genome content and
+        # analyzer version are cloned instead of run
+        versions = BaseAnalyzer.versions()
+        cached = {}
+        if digest:
+            cached = cache.lookup(digest, versions)
+            if cached:
+                cache.clone(cached, analysis_id)
         
-        # Save codon results
-        codon_result = Result(
-            analysis_id=analysis_id,
-            result_type="codon_analysis",
-            data=codon_results
+        # The genome size is known by now, even if the genome was
+        # downloaded after the analysis was submitted
+        genome_size = analysis.genome.genome_size
+        workflow = analysis_workflow(
+            analysis_id, genbank_path, accession, [name for name in versions if name not in cached],
+            genome_size, CostModel(db).priority(genome_size)
         )
-        db.add(codon_result)
-        db.commit()
+    finally:
+        db.close()
+    
+    return self.replace(workflow)
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="prepare_genome")
+def prepare_genome_task(self, analysis_id: int, genbank_file: str, step: float) -> dict:
+    """
+    Encode a genome into its packed store, so analyzer stages do not parse the GenBank text.
+    
+    Args:
+        analysis_id: Database analysis ID
+        genbank_file: Path to GenBank file
+        step: Progress added once the stage has succeeded
         
-        # Step 2: Gene Analysis
-        logger.info(f"Task {self.request.id}: Running gene analysis")
-        analysis.progress = 35.0
-        analysis.message = "Analyzing genes..."
-        db.commit()
+    Returns:
+        Dictionary with the GenBank file and its number of records
+    """
+    started = time.monotonic()
+    channel = get_progress_channel()
+    channel.update(analysis_id, message=STAGE_MESSAGES["prepare"])
+    
+    with GenomeStore.open_or_build(genbank_file) as store:
+        records = len(store.records)
+    
+    _record_timing(self, analysis_id, "prepare", started)
+    channel.update(analysis_id, step)
+    logger.info(f"Task {self.request.id}: Genome of analysis {analysis_id} encoded ({records} records)")
+    
+    return {"genbank_file": genbank_file, "records": records}
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="run_analyzers")
+def run_analyzers_task(self, analysis_id: int, genbank_file: str, accession: str,
+                       names: List[str], step: float) -> dict:
+    """
+    Run one stage of registered analyzers and save their output.
+    
+    Results are saved as Result rows, genes as gene table rows and arrays
+    as artifacts; a retried stage replaces what an earlier attempt saved.
+    
+    Args:
+        analysis_id: Database analysis ID
+        genbank_file: Path to GenBank file
+        accession: Genome accession number
+        names: Names of the analyzers of the stage
+        step: Progress added once the stage has succeeded
+        
+    Returns:
+        Dictionary with the saved Result IDs keyed by analyzer name and
+        the saved artifact names
+    """
+    started = time.monotonic()
+    channel = get_progress_channel()
+    db: Session = SessionLocal()
+    
+    try:
+        channel.update(analysis_id, message=f"Running {', '.join(names)}...")
         
-        gene_analyzer = GeneAnalyzer()
-        gene_results = gene_analyzer.analyze(genbank_file)
+        registered = BaseAnalyzer.registered()
+        runner = RepliconRunner({name: registered[name]() for name in names})
+        results = runner.run(genbank_file)
         
-        # Save gene results
-        gene_result = Result(
-            analysis_id=analysis_id,
-            result_type="gene_stats",
-            data=gene_results
-        )
-        db.add(gene_result)
+        db.query(Result).filter(
+            Result.analysis_id == analysis_id, Result.result_type.in_(names)
+        ).delete(synchronize_session=False)
+        saved = {name: Result(analysis_id=analysis_id, result_type=name, data=results[name]) for name in names}
+        db.add_all(saved.values())
         db.commit()
         
-        # Step 3: Genome Analysis
-        logger.info(f"Task {self.request.id}: Running genome analysis")
-        analysis.progress = 60.0
-        analysis.message = "Analyzing genome statistics..."
-        db.commit()
+        # Save every gene as a row of the paginated gene table
+        if "gene_stats" in runner.analyzers:
+            gene_table = GeneTable(db)
+            gene_table.delete(analysis_id)
+            gene_table.save(analysis_id, runner.analyzers["gene_stats"].genes, accession)
         
-        genome_analyzer = GenomeAnalyzer()
-        genome_results = genome_analyzer.analyze(genbank_file)
+        # Save array artifacts (e.g. codon positions) outside the database
+        artifact_store = ArtifactStore(analysis_id)
+        artifacts = []
+        for analyzer in runner.analyzers.values():
+            for artifact_name, arrays in analyzer.artifacts.items():
+                artifact_store.save(artifact_name, arrays)
+                artifacts.append(artifact_name)
         
-        # Save genome results
-        genome_result = Result(
-            analysis_id=analysis_id,
-            result_type="genome_stats",
-            data=genome_results
-        )
-        db.add(genome_result)
-        db.commit()
+        _record_timing(self, analysis_id, names[0], started)
+        channel.update(analysis_id, step)
+        logger.info(f"Task {self.request.id}: Stage {', '.join(names)} of analysis {analysis_id} completed")
         
-        # Step 4: Validation
-        logger.info(f"Task {self.request.id}: Running validation")
-        analysis.progress = 80.0
-        analysis.message = "Validating results..."
-        db.commit()
+        return {"results": {name: result.id for name, result in saved.items()}, "artifacts": artifacts}
+    finally:
+        db.close()
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="validate_results")
+def validate_results_task(self, analysis_id: int, accession: str, step: float) -> dict:
+    """
+    Validate saved analyzer results against reference data.
+    
+    Args:
+        analysis_id: Database analysis ID
+        accession: Genome accession number
+        step: Progress added once the stage has succeeded
         
-        validation_service = ValidationService()
-        validation_results = validation_service.validate_results(
-            accession,
-            {
-                "codon_analysis": codon_results,
-                "gene_stats": gene_results,
-                "genome_stats": genome_results
-            }
+    Returns:
+        Dictionary with the validation status
+    """
+    started = time.monotonic()
+    channel = get_progress_channel()
+    db: Session = SessionLocal()
+    
+    try:
+        channel.update(analysis_id, message=STAGE_MESSAGES["validation"])
+        
+        validation = ValidationService().validate_results(
+            accession, _load_results(db, analysis_id, ["codon_analysis", "gene_stats", "genome_stats"])
         )
         
-        # Save validation
-        validation = Validation(
+        db.query(Validation).filter(Validation.analysis_id == analysis_id).delete(synchronize_session=False)
+        db.add(Validation(
             analysis_id=analysis_id,
-            reference_accession=validation_results.get("reference_accession"),
-            deviations=validation_results.get("validations"),
-            validation_status=validation_results.get("status", "unknown")
-        )
-        db.add(validation)
+            reference_accession=validation.get("reference_accession"),
+            deviations=validation.get("validations"),
+            validation_status=validation.get("status", "unknown")
+        ))
         db.commit()
         
-        # Step 5: Generate visualizations
-        logger.info(f"Task {self.request.id}: Generating visualizations")
-        analysis.progress = 90.0
-        analysis.message = "Generating charts..."
-        db.commit()
+        _record_timing(self, analysis_id, "validation", started)
+        channel.update(analysis_id, step)
+        logger.info(f"Task {self.request.id}: Results of analysis {analysis_id} validated")
         
-        viz_generator = VisualizationGenerator()
-        charts = {}
+        return {"status": validation.get("status", "unknown")}
+    finally:
+        db.close()
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="generate_charts")
+def generate_charts_task(self, analysis_id: int, step: float) -> dict:
+    """
+    Generate and save the summary charts of an analysis.
+    
+    Args:
+        analysis_id: Database analysis ID
+        step: Progress added once the stage has succeeded
         
-        try:
-            # Generate stop codon chart
-            stop_codon_chart = viz_generator.create_stop_codon_chart(
-                codon_results.get("stop_codons", {})
-            )
-            charts["stop_codon_frequency"] = stop_codon_chart
-            
-            # Generate nucleotide composition chart
-            composition_chart = viz_generator.create_nucleotide_composition_chart(
-                genome_results.get("nucleotide_composition", {})
-            )
-            charts["nucleotide_composition"] = composition_chart
-            
-        except Exception as e:
-            logger.warning(f"Error generating charts: {e}")
+    Returns:
+        Chart paths keyed by chart name
+    """
+    started = time.monotonic()
+    channel = get_progress_channel()
+    db: Session = SessionLocal()
+    
+    try:
+        channel.update(analysis_id, message=STAGE_MESSAGES["charts"])
+        
+        charts = generate_charts(_load_results(db, analysis_id, ["codon_analysis", "genome_stats"]))
         
-        # Save chart paths
+        db.query(Result).filter(
+            Result.analysis_id == analysis_id, Result.result_type == "charts"
+        ).delete(synchronize_session=False)
         if charts:
-            chart_result = Result(
-                analysis_id=analysis_id,
-                result_type="charts",
-                data=charts
-            )
-            db.add(chart_result)
-            db.commit()
+            db.add(Result(analysis_id=analysis_id, result_type="charts", data=charts))
+        db.commit()
+        
+        _record_timing(self, analysis_id, "charts", started)
+        channel.update(analysis_id, step)
+        logger.info(f"Task {self.request.id}: Charts of analysis {analysis_id} generated")
+        
+        return charts
+    finally:
+        db.close()
+
+
+@celery_app.task(base=AnalysisTask, bind=True, name="finish_analysis")
+def finish_analysis_task(self, analysis_id: int, versions: Dict[str, str]) -> dict:
+    """
+    Mark an analysis as completed and cache the results of the analyzers it ran.
+    
+    Args:
+        analysis_id: Database analysis ID
+        versions: Versions of the analyzers that ran, keyed by name
+        
+    Returns:
+        Dictionary with the analysis status
+    """
+    db: Session = SessionLocal()
+    
+    try:
+        analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+        if not analysis:
+            raise AnalysisException(f"Analysis {analysis_id} not found")
         
-        # Mark as completed
         analysis.status = "completed"
         analysis.progress = 100.0
         analysis.message = "Analysis completed successfully"
+        analysis.completed_at = func.now()
         db.commit()
+        db.refresh(analysis)
+        get_progress_channel().update(analysis_id, **analysis_state(analysis))
         
-        logger.info(f"Task {self.request.id}: Analysis completed")
-        
-        return {
-            "status": "completed",
-            "analysis_id": analysis_id,
-            "results": {
-                "codon_analysis": codon_results,
-                "gene_stats": gene_results,
-                "genome_stats": genome_results,
-                "validation": validation_results,
-                "charts": charts
-            }
-        }
-        
-    except Exception as e:
-        logger.error(f"Task {self.request.id}: Analysis failed - {e}")
+        if settings.RESULT_CACHE_ENABLED:
+            cache = ResultCache(db)
+            cache.store(cache.genome_hash(analysis.genome), analysis_id, versions)
         
-        # Update analysis status
-        if analysis:
-            analysis.status = "failed"
-            analysis.error_message = str(e)
-            analysis.message = "Analysis failed"
-            db.commit()
-        
-        raise
+        logger.info(f"Task {self.request.id}: Analysis {analysis_id} completed")
         
+        return {"status": "completed", "analysis_id": analysis_id}
     finally:
         db.close()
+
+
+@celery_app.task(bind=True, name="fail_analysis")
+def fail_analysis_task(self, analysis_id: int, message: str = "Genome download failed") -> None:
+    """
+    Mark an analysis as failed when a task before it in its chain fails.
+    
+    Linked as the error callback of download-then-analyze chains; an
+    analysis that already finished (e.g. failed in one of its own stages)
+    is left as it is.
+    
+    Args:
+        analysis_id: Database analysis ID
+        message: Error message to record
+    """
+    _mark_failed(analysis_id, message)
+    logger.info(f"Task {self.request.id}: Analysis {analysis_id} failed - {message}")
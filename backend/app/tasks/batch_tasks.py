@@ -0,0 +1,66 @@
+"""Batch tasks for analyzing many genomes at once."""
+
+from typing import Any, Dict, List
+from celery import chain, chord, group
+from celery.canvas import Signature
+from app.tasks.celery_app import celery_app
+from app.tasks.analysis_tasks import analyze_genome_task, fail_analysis_task, stage_options
+from app.tasks.download_tasks import download_genome_task
+from app.db.session import SessionLocal
+from app.services.batch_service import BatchService
+from app.core.logging import logger
+
+
+def batch_workflow(batch_id: int, jobs: List[Dict[str, Any]]) -> Signature:
+    """
+    Build the Celery workflow of a batch.
+    
+    Every job becomes an analysis task, chained after a download of its
+    genome when the file is not there yet. The jobs run as a group, and
+    a chord callback records the batch summary once they have all
+    finished. A failed download marks its analysis failed. Celery only
+    runs a chord callback when every job succeeded, so the summary is
+    also linked as the error callback of the chord callback, which
+    Celery calls once every job has finished and one of them failed.
+    Analysis tasks are routed by genome size, with the priority of their
+    job.
+    
+    Args:
+        batch_id: Database batch ID
+        jobs: Jobs returned by BatchService.create
+        
+    Returns:
+        Chord signature, ready for apply_async
+    """
+    chains = []
+    for job in jobs:
+        workflow = analyze_genome_task.si(
+            job["analysis_id"], job["file_path"], job["accession"]
+        ).set(task_id=job["task_id"], **stage_options(True, job["genome_size"], job["priority"]))
+        if job["file_path"] is None:
+            workflow = chain(download_genome_task.si(job["accession"], job["genome_id"]), workflow)
+        chains.append(workflow.on_error(fail_analysis_task.si(job["analysis_id"])))
+    
+    summary = summarize_batch_task.si(batch_id)
+    return chord(group(chains), summary.clone().on_error(summary))
+
+
+@celery_app.task(bind=True, name="summarize_batch")
+def summarize_batch_task(self, batch_id: int) -> dict:
+    """
+    Record the summary of a finished batch.
+    
+    Args:
+        batch_id: Database batch ID
+        
+    Returns:
+        Dictionary with the batch progress
+    """
+    logger.info(f"Task {self.request.id}: Summarizing batch {batch_id}")
+    
+    db = SessionLocal()
+    try:
+        progress = BatchService(db).complete(batch_id)
+        return {key: value for key, value in (progress or {}).items() if key not in ("created_at", "completed_at")}
+    finally:
+        db.close()
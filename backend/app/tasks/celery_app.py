@@ -10,7 +10,8 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
     include=[
         "app.tasks.analysis_tasks",
-        "app.tasks.download_tasks"
+        "app.tasks.download_tasks",
+        "app.tasks.batch_tasks"
     ]
 )
 
@@ -26,6 +27,9 @@ celery_app.conf.update(
     task_soft_time_limit=3000,  # 50 minutes soft limit
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=50,
+    # Analysis tasks carry a priority from 0 to 9 (see CostModel.priority);
+    # the Redis transport keeps a list per level and consumes 0 first
+    broker_transport_options={"priority_steps": list(range(10))},
 )
 
 # Task routes (optional - for multiple queues)
@@ -1,8 +1,12 @@
 """Download tasks for fetching genomes from NCBI."""
 
+from typing import Optional
 from celery import Task
 from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.models.genome import Genome
 from app.services.ncbi_service import NCBIService
+from app.services.single_flight import get_single_flight
 from app.core.logging import logger
 from app.core.exceptions import NCBIException
 
@@ -16,12 +20,23 @@ class DownloadTask(Task):
 
 
 @celery_app.task(base=DownloadTask, bind=True, name="download_genome")
-def download_genome_task(self, accession: str) -> dict:
+def download_genome_task(self, accession: str, genome_id: Optional[int] = None) -> dict:
     """
     Download a genome from NCBI.
     
+    The fetch holds the download lock of the accession, so a concurrent
+    download of the same genome is waited for, then finds the file
+    already there. The genome record is then written under the
+    accession lock, which POST /analysis/start and batches hold while
+    they look up and create the records of the accession. The two locks
+    differ so that requests for an accession being downloaded attach to
+    its analysis right away instead of waiting for NCBI; the download
+    lock is always taken first.
+    
     Args:
         accession: NCBI accession number
+        genome_id: Optional genome record (e.g. a batch placeholder) to
+            fill in with the file path and metadata
         
     Returns:
         Dictionary with download results
@@ -51,19 +66,37 @@ def download_genome_task(self, accession: str) -> dict:
             }
         )
         
-        file_path = ncbi_service.download_genome(accession)
-        
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "current": 80,
-                "total": 100,
-                "status": "Validating file..."
-            }
-        )
-        
-        # Get metadata
-        metadata = ncbi_service.get_genome_metadata(accession)
+        flight = get_single_flight()
+        with flight.lock(flight.key("download", accession)):
+            file_path = ncbi_service.download_genome(accession)
+            
+            self.update_state(
+                state="PROGRESS",
+                meta={
+                    "current": 80,
+                    "total": 100,
+                    "status": "Validating file..."
+                }
+            )
+            
+            # Get metadata
+            metadata = ncbi_service.get_genome_metadata(accession)
+            
+            # The record is written under the lock of the accession, like
+            # every other read-then-write of its genome and analyses
+            if genome_id is not None:
+                db = SessionLocal()
+                try:
+                    with flight.lock(flight.key("accession", accession)):
+                        genome = db.query(Genome).filter(Genome.id == genome_id).first()
+                        if genome:
+                            genome.organism_name = metadata.get("organism", "Unknown")
+                            genome.genome_size = metadata.get("length", 0)
+                            genome.file_path = file_path
+                            genome.genome_metadata = metadata
+                            db.commit()
+                finally:
+                    db.close()
         
         logger.info(f"Task {self.request.id}: Download completed")
         
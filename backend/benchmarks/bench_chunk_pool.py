@@ -0,0 +1,68 @@
+"""Benchmark how single-genome analysis scales with chunk pool workers.
+
+Usage:
+    python benchmarks/bench_chunk_pool.py [--size 20] [--workers 1,2,4,8,16] [--repeat 3]
+
+Size is in megabases. A synthetic single-record genome is packed into the
+genome store and analyzed by every registered analyzer through the
+RepliconRunner, once per worker count. With one worker the chunked scans
+run in-process; with more, composition, codon, k-mer, window GC and ORF
+codon scans are mapped over a ChunkPool sharing the sequence through
+shared memory. The best of --repeat runs is reported with the speedup
+and parallel efficiency over the first worker count (scaled linearly
+to one worker), and every run is checked to give identical results.
+Speedup is bounded by the CPUs available (reported) and by the parts
+that stay serial: parsing, gene statistics, ORF assembly and the reduce
+steps.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.genome_store import GenomeStore
+from app.analyzers.replicon_runner import RepliconRunner
+from benchmarks.synthetic import write_synthetic_genbank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20, help="Genome size in Mb")
+    parser.add_argument("--workers", default="1,2,4,8,16", help="Comma-separated worker counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count")
+    args = parser.parse_args()
+    worker_counts = [int(count) for count in args.workers.split(",")]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(write_synthetic_genbank(Path(directory) / "genome.gb", args.size * 1_000_000))
+        GenomeStore.build(path).close()
+        
+        print(f"{args.size} Mb genome, {os.cpu_count()} CPUs available")
+        print(f"{'workers':>8} {'time s':>8} {'speedup':>8} {'efficiency':>11}")
+        expected = None
+        baseline = None
+        for workers in worker_counts:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = RepliconRunner(BaseAnalyzer.create_all(), max_workers=workers).run(path)
+                timings.append(time.perf_counter() - started)
+                if expected is None:
+                    expected = results
+                assert results == expected
+            
+            seconds = min(timings)
+            baseline = baseline or seconds * worker_counts[0]
+            speedup = baseline / seconds
+            print(f"{workers:>8} {seconds:>8.2f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark whole-genome and chunked analysis of a large genome.
+
+Usage:
+    python benchmarks/bench_chunked_mode.py [--size 50] [--budget 256]
+
+Size is in megabases and budget in MiB. A synthetic genome is packed
+into the genome store, then the sequence analyzers run once on the whole
+decoded sequence and once in chunks sized for the budget. Peak traced
+memory (Python and NumPy allocations) and wall time are reported, and
+the two runs are checked to give identical results. The budget covers
+sequence working memory; the loaded annotation ("context") and the
+results themselves come on top of it.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.genome_store import GenomeStore
+from app.analyzers.kmer_analyzer import KmerAnalyzer
+from app.analyzers.sequence_chunks import chunk_size_for_budget
+from benchmarks.synthetic import write_synthetic_genbank
+
+
+def run(genbank_file, chunk_size):
+    """Analyze a fresh context, returning results, seconds, context MiB and peak MiB."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    context = GenomeContext.load(genbank_file)
+    context.chunk_size = chunk_size
+    loaded, _ = tracemalloc.get_traced_memory()
+    results = {
+        name: analyzer.analyze_record(context)
+        for name, analyzer in (
+            ("genome_stats", GenomeAnalyzer()),
+            ("codon_analysis", CodonAnalyzer()),
+            ("gene_stats", GeneAnalyzer()),
+            ("kmer_analysis", KmerAnalyzer())
+        )
+    }
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, elapsed, loaded / 2 ** 20, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50, help="Genome size in Mb")
+    parser.add_argument("--budget", type=float, default=256, help="Memory budget in MiB")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_synthetic_genbank(Path(directory) / "large.gb", args.size * 1_000_000)
+        GenomeStore.build(str(path)).close()
+        
+        chunk_size = chunk_size_for_budget(args.budget)
+        whole, *whole_stats = run(str(path), None)
+        chunked, *chunked_stats = run(str(path), chunk_size)
+        assert chunked == whole
+        
+        print(f"{'mode':>8} {'chunk bp':>12} {'time s':>8} {'context MiB':>12} {'peak MiB':>9}")
+        for mode, size, (seconds, loaded, peak) in (
+            ("whole", args.size * 1_000_000, whole_stats),
+            ("chunked", chunk_size, chunked_stats)
+        ):
+            print(f"{mode:>8} {size:>12} {seconds:>8.2f} {loaded:>12.1f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark the vectorized codon engine against the regex codon scans.
+
+Usage:
+    python benchmarks/bench_codon_engine.py [--sizes 10] [--repeat 3]
+
+Sizes are in megabases. The regex baseline is the previous CodonAnalyzer:
+one scan for ATG and one per stop codon, forward strand only. The engine
+counts all 64 codons in 3 frames on both strands.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from app.analyzers.codon_engine import codon_total, count_codons
+from app.analyzers.sequence_encoding import encode_sequence
+from benchmarks.synthetic import random_sequence
+
+
+def regex_counts(sequence):
+    """Count ATG and stop codons with one regex scan each."""
+    counts = {"ATG": len([m.start() for m in re.compile("ATG").finditer(sequence)])}
+    for codon in ("TAA", "TAG", "TGA"):
+        counts[codon] = len(re.compile(codon).findall(sequence))
+    return counts
+
+
+def engine_counts(sequence):
+    """Encode once and derive the same totals from the codon matrix."""
+    counts = count_codons(encode_sequence(sequence))
+    return {codon: codon_total(counts, codon) for codon in ("ATG", "TAA", "TAG", "TGA")}
+
+
+def best_time(func, sequence, repeat):
+    """Return (result, best of repeat wall-clock seconds)."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(sequence)
+        timings.append(time.perf_counter() - started)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10], help="Genome sizes in Mb")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+    
+    print(f"{'size':>6} {'method':>8} {'seconds':>9} {'speedup':>8}")
+    for size in args.sizes:
+        sequence = random_sequence(size * 1_000_000).upper().decode("ascii")
+        
+        regex_result, regex_time = best_time(regex_counts, sequence, args.repeat)
+        engine_result, engine_time = best_time(engine_counts, sequence, args.repeat)
+        assert regex_result == engine_result, (regex_result, engine_result)
+        
+        print(f"{size:>4}Mb {'regex':>8} {regex_time:>9.3f}")
+        print(f"{size:>4}Mb {'engine':>8} {engine_time:>9.3f} {regex_time / engine_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
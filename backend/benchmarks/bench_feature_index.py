@@ -0,0 +1,65 @@
+"""Benchmark region queries on the gene interval index.
+
+Usage:
+    python benchmarks/bench_feature_index.py [--sizes 5] [--queries 2000]
+
+Sizes are in megabases; the synthetic genomes carry one CDS per kb.
+Each query is compared with a linear scan over the CDS features.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from app.analyzers.feature_index import FeatureIndex
+from app.analyzers.genome_context import GenomeContext
+from benchmarks.synthetic import write_synthetic_genbank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5], help="Genome sizes in Mb")
+    parser.add_argument("--queries", type=int, default=2000, help="Region queries per genome")
+    args = parser.parse_args()
+    
+    print(f"{'size':>6} {'genes':>7} {'build s':>8} {'index us':>9} {'scan us':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            length = size * 1_000_000
+            path = os.path.join(directory, f"bench_{size}.gb")
+            write_synthetic_genbank(path, length)
+            
+            started = time.perf_counter()
+            index = FeatureIndex.build(path)
+            build = time.perf_counter() - started
+            
+            rng = random.Random(0)
+            regions = []
+            for _ in range(args.queries):
+                start = rng.randrange(0, length - 10000)
+                regions.append((start, start + rng.choice([100, 1000, 10000])))
+            
+            accession = index.records[0]
+            started = time.perf_counter()
+            for start, end in regions:
+                index.query(accession, start, end)
+            indexed = (time.perf_counter() - started) / len(regions)
+            
+            features = [f for f in GenomeContext.load(path).features if f.type == "CDS"]
+            started = time.perf_counter()
+            for start, end in regions:
+                [f for f in features if any(s < end and e > start for s, e, _ in f.parts)]
+            scanned = (time.perf_counter() - started) / len(regions)
+            
+            print(f"{size:>4}Mb {len(index.genes):>7} {build:>8.2f} {indexed * 1e6:>9.1f} {scanned * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
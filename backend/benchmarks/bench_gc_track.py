@@ -0,0 +1,63 @@
+"""Benchmark GC sliding windows and the GC track pyramid.
+
+Usage:
+    python benchmarks/bench_gc_track.py [--sizes 1 5] [--window 1000] [--step 500]
+
+Sizes are in megabases. The per-window slicing loop the sliding window
+used to run is timed against the cumulative-sum version.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from app.analyzers.gc_track import build_gc_pyramid
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from benchmarks.synthetic import random_sequence
+
+
+def slicing_windows(sequence, window_size, step):
+    """Per-window slice and count, as the sliding window used to work."""
+    return [
+        round((sequence[i:i + window_size].count("G") + sequence[i:i + window_size].count("C")) / window_size * 100, 2)
+        for i in range(0, len(sequence) - window_size, step)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5], help="Genome sizes in Mb")
+    parser.add_argument("--window", type=int, default=1000, help="Window size in bp")
+    parser.add_argument("--step", type=int, default=500, help="Step in bp")
+    args = parser.parse_args()
+    
+    analyzer = GenomeAnalyzer()
+    print(f"{'size':>6} {'slicing s':>10} {'cumsum s':>9} {'pyramid s':>10}")
+    for size in args.sizes:
+        sequence = random_sequence(size * 1_000_000).upper().decode("latin-1")
+        
+        started = time.perf_counter()
+        expected = slicing_windows(sequence, args.window, args.step)
+        slicing = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        windows = analyzer.calculate_gc_sliding_window(sequence, args.window, args.step)
+        cumulative = time.perf_counter() - started
+        assert windows["gc_values"] == expected
+        
+        context = GenomeContext("BENCH.1", "Benchmark", bytearray(sequence.encode("latin-1")), [])
+        started = time.perf_counter()
+        build_gc_pyramid(context)
+        pyramid = time.perf_counter() - started
+        
+        print(f"{size:>4}Mb {slicing:>10.3f} {cumulative:>9.3f} {pyramid:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
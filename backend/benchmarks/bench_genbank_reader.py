@@ -0,0 +1,74 @@
+"""Benchmark the native GenBank reader against Bio.SeqIO.read.
+
+Usage:
+    python benchmarks/bench_genbank_reader.py [--sizes 10 100]
+
+Sizes are in megabases. Each synthetic file carries one CDS per kilobase.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from Bio import SeqIO
+from app.analyzers.genbank_reader import read_genbank
+from benchmarks.synthetic import write_synthetic_genbank
+
+
+def biopython_read(path):
+    """Parse with SeqIO and build the upper-cased string analyzers used to build."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        record = SeqIO.read(str(path), "genbank")
+    return len(str(record.seq).upper()), len(record.features)
+
+
+def native_read(path):
+    """Parse with the streaming reader."""
+    record = read_genbank(str(path))
+    return len(record.sequence), len(record.features)
+
+
+def measure(func, path):
+    """Return (result, seconds, peak traced MB); memory is traced in a second run."""
+    started = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - started
+    
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100], help="Genome sizes in Mb")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'size':>6} {'reader':>10} {'seconds':>9} {'peak MB':>9} {'speedup':>8}")
+        for size in args.sizes:
+            path = write_synthetic_genbank(Path(tmp) / f"synthetic_{size}mb.gb", size * 1_000_000)
+            
+            bio_result, bio_time, bio_peak = measure(biopython_read, path)
+            native_result, native_time, native_peak = measure(native_read, path)
+            assert bio_result == native_result, (bio_result, native_result)
+            
+            print(f"{size:>4}Mb {'SeqIO':>10} {bio_time:>9.2f} {bio_peak:>9.0f}")
+            print(f"{size:>4}Mb {'native':>10} {native_time:>9.2f} {native_peak:>9.0f} "
+                  f"{bio_time / native_time:>7.1f}x")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
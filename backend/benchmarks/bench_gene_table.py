@@ -0,0 +1,107 @@
+"""Benchmark keyset pages of the gene table.
+
+Usage:
+    python benchmarks/bench_gene_table.py [--genes 20000] [--limit 100] [--database sqlite://]
+
+Inserts one analysis worth of genes, then times the first page, a page
+deep into the table and an OFFSET query reaching the same depth. Pass a
+PostgreSQL URL as --database to measure the production backend.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.genome import Genome
+from app.models.analysis import Analysis
+from app.models.result import Result  # noqa: F401 - registers the model
+from app.models.validation import Validation  # noqa: F401 - registers the model
+from app.models.gene import Gene
+from app.services.gene_table import GeneTable, encode_cursor
+
+
+def make_genes(count):
+    """Random genes shaped like GeneAnalyzer.extract_genes output."""
+    rng = random.Random(0)
+    genes = []
+    for index in range(count):
+        length = rng.randrange(90, 3000, 3)
+        genes.append({
+            "gene_name": f"gen{rng.randrange(5000)}",
+            "locus_tag": f"BENCH_{index:05d}",
+            "product": "hypothetical protein",
+            "location": f"[{index * 1000}:{index * 1000 + length}](+)",
+            "start": index * 1000,
+            "end": index * 1000 + length,
+            "length": length,
+            "gc_content": round(rng.uniform(30, 70), 2),
+            "strand": rng.choice("+-"),
+            "replicon": "BENCH.1"
+        })
+    return genes
+
+
+def timed(function, repeat=20):
+    """Best wall time of a call in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--genes", type=int, default=20000, help="Number of genes")
+    parser.add_argument("--limit", type=int, default=100, help="Genes per page")
+    parser.add_argument("--database", default="sqlite://", help="SQLAlchemy database URL")
+    args = parser.parse_args()
+    
+    engine = create_engine(args.database)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    
+    genome = Genome(accession="BENCH.1", organism_name="Benchmark")
+    db.add(genome)
+    db.commit()
+    analysis = Analysis(genome_id=genome.id, task_id=f"bench-{time.time()}", status="completed")
+    db.add(analysis)
+    db.commit()
+    
+    table = GeneTable(db)
+    started = time.perf_counter()
+    table.save(analysis.id, make_genes(args.genes))
+    print(f"insert {args.genes} genes: {time.perf_counter() - started:.2f} s")
+    
+    depth = args.genes - 2 * args.limit
+    deep = db.query(Gene).filter(Gene.analysis_id == analysis.id).order_by(Gene.length, Gene.id).offset(depth).first()
+    cursor = encode_cursor(deep.length, deep.id)
+    
+    print(f"{'query':>28} {'ms':>8}")
+    for label, function in [
+        ("first page (start)", lambda: table.page(analysis.id, limit=args.limit)),
+        ("first page (gc desc)", lambda: table.page(analysis.id, sort="gc_content", order="desc", limit=args.limit)),
+        (f"keyset page at {depth}", lambda: table.page(analysis.id, sort="length", limit=args.limit, cursor=cursor)),
+        (f"offset page at {depth}", lambda: db.query(Gene).filter(Gene.analysis_id == analysis.id)
+         .order_by(Gene.length, Gene.id).offset(depth).limit(args.limit).all()),
+    ]:
+        print(f"{label:>28} {timed(function):>8.2f}")
+    
+    db.query(Gene).filter(Gene.analysis_id == analysis.id).delete()
+    db.delete(analysis)
+    db.delete(genome)
+    db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark the six-frame ORF analyzer.
+
+Usage:
+    python benchmarks/bench_orf_analyzer.py [--sizes 10] [--min-length 300]
+
+Sizes are in megabases. Random sequence is a worst case for ORF finding:
+stops are dense, so nearly every stop codon closes a stop-to-stop ORF.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("NCBI_EMAIL", "benchmark@example.com")
+
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.orf_analyzer import OrfAnalyzer
+from benchmarks.synthetic import random_sequence
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10], help="Genome sizes in Mb")
+    parser.add_argument("--min-length", type=int, default=300, help="Minimum ORF length in nt")
+    args = parser.parse_args()
+    
+    print(f"{'size':>6} {'seconds':>9} {'atg orfs':>9} {'stop orfs':>10}")
+    for size in args.sizes:
+        sequence = bytearray(random_sequence(size * 1_000_000).upper())
+        context = GenomeContext("BENCH.1", "Benchmark", sequence, [])
+        analyzer = OrfAnalyzer(min_length=args.min_length)
+        
+        started = time.perf_counter()
+        results = analyzer.analyze_record(context)
+        elapsed = time.perf_counter() - started
+        
+        counts = results["orf_counts"]
+        print(f"{size:>4}Mb {elapsed:>9.2f} {counts['atg_to_stop']['total']:>9} "
+              f"{counts['stop_to_stop']['total']:>10}")
+
+
+if __name__ == "__main__":
+    main()
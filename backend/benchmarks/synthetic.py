@@ -0,0 +1,65 @@
+"""Synthetic GenBank files for benchmarks."""
+
+import os
+from pathlib import Path
+
+_BASES = bytes.maketrans(bytes(range(256)), b"acgt" * 64)
+
+
+def random_sequence(length: int) -> bytes:
+    """Generate a random lower-case ACGT sequence."""
+    return os.urandom(length).translate(_BASES)
+
+
+def write_synthetic_genbank(path: Path, length: int, gene_spacing: int = 1000,
+                            accession: str = "SYN000001.1", records: int = 1) -> Path:
+    """
+    Write a synthetic GenBank file with one CDS every gene_spacing bases.
+    
+    Args:
+        path: Output file path
+        length: Sequence length of each record in base pairs
+        gene_spacing: Distance between CDS starts
+        accession: Accession.version of the first record
+        records: Number of records to write
+        
+    Returns:
+        Path of the written file
+    """
+    name, _, version = accession.partition(".")
+    with open(path, "w") as handle:
+        for index in range(records):
+            record_name = name if records == 1 else f"{name}{index:03d}"
+            record_accession = f"{record_name}.{version or 1}"
+            handle.write(
+                f"LOCUS       {record_name} {str(length).rjust(16 - len(record_name))} bp    DNA"
+                f"     linear   BCT 01-JAN-2024\n"
+                f"DEFINITION  Synthetic genome {record_accession}.\n"
+                f"ACCESSION   {record_name}\n"
+                f"VERSION     {record_accession}\n"
+                f"FEATURES             Location/Qualifiers\n"
+                f"     source          1..{length}\n"
+                f"                     /organism=\"Synthetic organism\"\n"
+            )
+            for i, start in enumerate(range(1, length - gene_spacing, gene_spacing)):
+                end = start + (gene_spacing * 3) // 4 - 1
+                location = f"{start}..{end}" if i % 2 == 0 else f"complement({start}..{end})"
+                handle.write(
+                    f"     CDS             {location}\n"
+                    f"                     /locus_tag=\"SYN_{i:06d}\"\n"
+                    f"                     /product=\"hypothetical protein\"\n"
+                )
+            
+            handle.write("ORIGIN\n")
+            sequence = random_sequence(length).decode("ascii")
+            lines = []
+            for offset in range(0, length, 60):
+                block = sequence[offset:offset + 60]
+                groups = " ".join(block[i:i + 10] for i in range(0, len(block), 10))
+                lines.append(f"{offset + 1:>9} {groups}\n")
+                if len(lines) >= 10000:
+                    handle.writelines(lines)
+                    lines = []
+            handle.writelines(lines)
+            handle.write("//\n")
+    return Path(path)
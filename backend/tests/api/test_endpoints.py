@@ -35,38 +35,370 @@ def test_search_genomes(mock_search):
     assert len(data) == 1
     assert data[0]['accession'] == "NC_000913.3"
 
-@patch('app.db.session.get_db')
-@patch('app.tasks.analysis_tasks.analyze_genome_task.apply_async')
-def test_start_analysis(mock_celery, mock_get_db):
-    """Test starting an analysis."""
-    # Mock DB session
-    mock_db = MagicMock()
-    mock_get_db.return_value = mock_db
-    
-    # Mock genome query to return None (trigger download)
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-    
-    # Mock NCBIService download and metadata
-    with patch('app.api.v1.endpoints.analysis.NCBIService') as MockNCBIService:
-        service_instance = MockNCBIService.return_value
-        service_instance.download_genome.return_value = "/tmp/genome.gb"
-        service_instance.get_genome_metadata.return_value = {
-            "organism": "E. coli",
-            "length": 4600000
-        }
-        
-        # Mock Celery task
-        mock_task = MagicMock()
-        mock_task.id = "task-123"
-        mock_celery.return_value = mock_task
-        
+@patch('app.api.v1.endpoints.analysis.chain')
+def test_start_analysis(mock_chain, db_session):
+    """Test that starting the analysis of a new genome queues its download and analysis."""
+    from app.db.session import get_db
+    from app.models.genome import Genome
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
         response = client.post(
             "/api/v1/analysis/start",
             json={"accession": "NC_000913.3"}
         )
         
-        # We expect 202 Accepted
+        # We expect 202 Accepted, without waiting for NCBI
         assert response.status_code == 202
         data = response.json()
         assert data['status'] == "pending"
-        assert 'task_id' in data
+        assert data['message'] == "Waiting for download"
+        
+        genome = db_session.query(Genome).filter_by(accession="NC_000913.3").one()
+        assert genome.file_path is None
+        
+        # The download is chained before the analysis, which keeps the task ID
+        download, analyze = mock_chain.call_args.args
+        assert download.task == "download_genome"
+        assert download.args == ("NC_000913.3", genome.id)
+        assert analyze.task == "analyze_genome"
+        assert analyze.args == (data['analysis_id'], None, "NC_000913.3")
+        assert analyze.options["task_id"] == data['task_id']
+        
+        # A failed download fails the analysis
+        failure = mock_chain.return_value.on_error.call_args.args[0]
+        assert failure.task == "fail_analysis"
+        assert failure.args == (data['analysis_id'],)
+        mock_chain.return_value.on_error.return_value.apply_async.assert_called_once_with()
+    finally:
+        app.dependency_overrides.clear()
+
+def test_gene_table_pages(db_session):
+    """Test keyset pagination of the gene table endpoint."""
+    from app.db.session import get_db
+    from app.models.analysis import Analysis
+    from app.models.genome import Genome
+    from app.services.gene_table import GeneTable
+    
+    genome = Genome(accession="SYN000001.1", organism_name="Synthetic organism")
+    db_session.add(genome)
+    db_session.commit()
+    analysis = Analysis(genome_id=genome.id, task_id="task-genes", status="completed")
+    db_session.add(analysis)
+    db_session.commit()
+    GeneTable(db_session).save(analysis.id, [
+        {"gene_name": f"gene{index}", "locus_tag": f"SYN_{index:04d}", "product": "protein",
+         "location": f"[{index * 100}:{index * 100 + 90 + index}](+)", "start": index * 100,
+         "end": index * 100 + 90 + index, "length": 90 + index, "gc_content": 50.0,
+         "strand": "+" if index % 2 else "-"}
+        for index in range(25)
+    ], replicon="SYN000001.1")
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        url = f"/api/v1/results/{analysis.id}/genes"
+        first = client.get(url, params={"sort": "length", "order": "desc", "limit": 10}).json()
+        second = client.get(url, params={"sort": "length", "order": "desc", "limit": 10,
+                                         "cursor": first["next_cursor"]}).json()
+        assert first["total"] == 25
+        assert [gene["length"] for gene in first["genes"] + second["genes"]] == list(range(114, 94, -1))
+        assert first["genes"][0]["replicon"] == "SYN000001.1"
+        
+        filtered = client.get(url, params={"strand": "+", "min_length": 100}).json()
+        assert filtered["total"] == 7
+        assert filtered["next_cursor"] is None
+        
+        assert client.get(url, params={"cursor": "garbage"}).status_code == 400
+        assert client.get(url, params={"sort": "product"}).status_code == 422
+        assert client.get("/api/v1/results/999/genes").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+def test_genome_features_region(db_session, synthetic_genbank_file):
+    """Test the region query endpoint on a downloaded genome."""
+    from app.db.session import get_db
+    from app.models.genome import Genome
+    
+    db_session.add(Genome(accession="SYN000001.1", organism_name="Synthetic organism",
+                          file_path=synthetic_genbank_file))
+    db_session.commit()
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        url = "/api/v1/genomes/SYN000001.1/features"
+        data = client.get(url, params={"start": 450, "end": 1050}).json()
+        assert data["replicon"] == "SYN000001.1"
+        assert data["total"] == 2
+        assert [f["locus_tag"] for f in data["features"]] == ["SYN_0002", ""]
+        
+        minus = client.get(url, params={"start": 0, "end": 6000, "strand": "-"}).json()
+        assert {f["gene_name"] for f in minus["features"]} == {"Unknown", "synD", "synF"}
+        
+        assert client.get(url, params={"start": 10, "end": 5}).status_code == 400
+        assert client.get(url, params={"end": 10, "replicon": "NOPE.1"}).status_code == 404
+        assert client.get("/api/v1/genomes/NOPE.1/features", params={"end": 10}).status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+def test_gc_track_region(db_session, tmp_path, monkeypatch):
+    """Test that the GC track endpoint serves stored zoom levels."""
+    import numpy as np
+    from app.db.session import get_db
+    from app.models.analysis import Analysis
+    from app.models.genome import Genome
+    from app.services.artifact_store import ArtifactStore
+    
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    genome = Genome(accession="SYN000001.1", organism_name="Synthetic organism")
+    db_session.add(genome)
+    db_session.commit()
+    analysis = Analysis(genome_id=genome.id, task_id="task-gc", status="completed")
+    db_session.add(analysis)
+    db_session.commit()
+    ArtifactStore(analysis.id).save("gc_track", {
+        "SYN000001.1/length": np.array([250]),
+        "SYN000001.1/100/gc": np.array([50, 25, 0], dtype=np.uint8),
+        "SYN000001.1/100/total": np.array([100, 100, 0], dtype=np.uint8),
+        "SYN000001.1/1000/gc": np.array([75], dtype=np.uint16),
+        "SYN000001.1/1000/total": np.array([200], dtype=np.uint16),
+    })
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        url = f"/api/v1/results/{analysis.id}/gc-track"
+        data = client.get(url, params={"start": 0, "end": 1000}).json()
+        assert data["bin_size"] == 100
+        assert data["gc_content"] == [50.0, 25.0, None]
+        assert data["end"] == 250
+        
+        coarse = client.get(url, params={"end": 1000, "bin_size": 1000}).json()
+        assert coarse["gc_content"] == [37.5]
+        assert coarse["bin_sizes"] == [100, 1000]
+        
+        assert client.get(url, params={"end": 100, "bin_size": 500}).status_code == 400
+        assert client.get(url, params={"end": 100, "accession": "NOPE.1"}).status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+def test_batch_analysis(db_session):
+    """Test batch creation, its Celery workflow and aggregated status."""
+    from celery.canvas import _chord
+    from app.db.session import get_db
+    from app.models.analysis import Analysis
+    from app.models.genome import Genome
+    from app.services.batch_service import BatchService
+    from app.services.progress_channel import get_progress_channel
+    
+    db_session.add(Genome(accession="SYN000001.1", organism_name="Synthetic organism", file_path="/tmp/syn.gb"))
+    db_session.commit()
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        with patch.object(_chord, "apply_async", autospec=True) as mock_apply:
+            mock_apply.return_value = MagicMock(id="batch-task")
+            response = client.post("/api/v1/analysis/batch", json={
+                "accessions": ["SYN000001.1", "NEW000001.1", "SYN000001.1"]
+            })
+        
+        assert response.status_code == 202
+        data = response.json()
+        assert data["total"] == 2
+        assert [job["accession"] for job in data["analyses"]] == ["SYN000001.1", "NEW000001.1"]
+        
+        # Known genomes are analyzed directly; new ones are downloaded first
+        workflow = mock_apply.call_args[0][0]
+        known, new = workflow.tasks
+        assert known.task == "analyze_genome"
+        assert known.options["task_id"] == data["analyses"][0]["task_id"]
+        assert known.options["priority"] == 5  # size unknown
+        assert [task.task for task in new.tasks] == ["download_genome", "analyze_genome"]
+        assert new.tasks[0].args[1] == db_session.query(Genome).filter_by(accession="NEW000001.1").one().id
+        assert new.options["link_error"][0]["task"] == "fail_analysis"
+        assert workflow.body.task == "summarize_batch"
+        
+        url = f"/api/v1/analysis/batch/{data['batch_id']}"
+        status = client.get(url).json()
+        assert status["status"] == "pending"
+        assert status["counts"] == {"pending": 2}
+        
+        first, second = (db_session.get(Analysis, job["analysis_id"]) for job in data["analyses"])
+        first.status, first.progress = "failed", 30.0
+        second.status, second.progress = "running", 50.0
+        db_session.commit()
+        status = client.get(url).json()
+        assert status["status"] == "running"
+        assert status["progress"] == 75.0
+        
+        # Progress of running analyses is read from the progress channel
+        get_progress_channel().update(second.id, progress=90.0)
+        assert client.get(url).json()["progress"] == 95.0
+        
+        second.status = "completed"
+        db_session.commit()
+        BatchService(db_session).complete(data["batch_id"])
+        status = client.get(url).json()
+        assert status["status"] == "completed_with_errors"
+        assert status["completed_at"] is not None
+        
+        assert client.get("/api/v1/analysis/batch/999").status_code == 404
+        assert client.post("/api/v1/analysis/batch", json={"accessions": []}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+def test_analysis_status_from_channel(db_session):
+    """Test that the status endpoint prefers the progress channel over the database."""
+    from app.db.session import get_db
+    from app.models.analysis import Analysis
+    from app.models.genome import Genome
+    from app.services.progress_channel import analysis_state, get_progress_channel
+    
+    analysis = Analysis(
+        genome=Genome(accession="SYN000001.1", organism_name="Synthetic organism"),
+        task_id="task-channel", status="running", progress=0.0, message="Starting analysis..."
+    )
+    db_session.add(analysis)
+    db_session.commit()
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        url = f"/api/v1/analysis/{analysis.id}"
+        assert client.get(url).json()["message"] == "Starting analysis..."
+        
+        channel = get_progress_channel()
+        channel.update(analysis.id, **analysis_state(analysis))
+        channel.update(analysis.id, 12.5, message="Running gene_stats...")
+        channel.update(analysis.id, 12.5)
+        data = client.get(url).json()
+        assert data["status"] == "running"
+        assert data["progress"] == 25.0
+        assert data["message"] == "Running gene_stats..."
+        assert data["task_id"] == "task-channel"
+        
+        # A partial state, e.g. after the channel lost the start, is ignored
+        channel.update(999, 12.5)
+        assert client.get("/api/v1/analysis/999").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+def test_analysis_events(db_session):
+    """Test that analysis events are streamed until the analysis finishes."""
+    import asyncio
+    import json
+    import threading
+    import time
+    from app.db.session import get_db
+    from app.models.analysis import Analysis
+    from app.models.genome import Genome
+    from app.services.progress_channel import get_progress_broadcaster, get_progress_channel
+    
+    analysis = Analysis(
+        genome=Genome(accession="SYN000001.1", organism_name="Synthetic organism"),
+        task_id="task-events", status="running", progress=0.0, message="Starting analysis..."
+    )
+    db_session.add(analysis)
+    db_session.commit()
+    analysis_id = analysis.id
+    
+    def publish():
+        # Publish once the stream has subscribed
+        while analysis_id not in get_progress_broadcaster().subscribers:
+            time.sleep(0.01)
+        channel = get_progress_channel()
+        channel.update(analysis_id, 12.5, message="Encoding genome...")
+        channel.update(analysis_id, 12.5)
+        channel.update(analysis_id, status="completed", progress=100.0, message="Analysis completed successfully")
+    
+    reads = []
+    read = get_progress_channel().get
+    
+    def record_read(read_id):
+        try:
+            asyncio.get_running_loop()
+            reads.append("event loop")
+        except RuntimeError:
+            reads.append("thread pool")
+        return read(read_id)
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        publisher = threading.Thread(target=publish)
+        publisher.start()
+        with patch.object(get_progress_channel(), "get", side_effect=record_read):
+            response = client.get(f"/api/v1/analysis/{analysis_id}/events")
+        publisher.join()
+        
+        # The channel is never read on the event loop
+        assert reads == ["thread pool", "thread pool"]
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            (lines[0].removeprefix("event: "), json.loads(lines[1].removeprefix("data: ")))
+            for lines in (block.split("\n") for block in response.text.strip().split("\n\n"))
+        ]
+        assert [(event, data["status"], data["progress"]) for event, data in events] == [
+            ("status", "running", 0.0),
+            ("stage", "running", 12.5),
+            ("progress", "running", 25.0),
+            ("status", "completed", 100.0)
+        ]
+        assert events[1][1]["task_id"] == "task-events"
+        assert not get_progress_broadcaster().subscribers
+        
+        # A finished analysis sends its final status and closes
+        analysis = db_session.get(Analysis, analysis_id)
+        analysis.status = "failed"
+        db_session.commit()
+        get_progress_channel.cache_clear()
+        response = client.get(f"/api/v1/analysis/{analysis_id}/events")
+        assert response.text.startswith("event: status\n")
+        assert '"status":"failed"' in response.text
+        
+        assert client.get("/api/v1/analysis/999/events").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+def test_workload(db_session):
+    """Test the workload of the analysis queues."""
+    from app.db.session import get_db
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        response = client.get("/api/v1/analysis/workload", params={"hours": 6})
+        
+        assert response.status_code == 200
+        assert response.json() == {"window_hours": 6.0, "queues": {}, "stages": {}}
+        assert client.get("/api/v1/analysis/workload", params={"hours": 0}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+def test_duplicate_analysis_attached(db_session, synthetic_genbank_file):
+    """Test that repeated requests for an accession share its download and analysis."""
+    from app.db.session import get_db
+    from app.models.analysis import Analysis
+    from app.models.genome import Genome
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        with patch('app.api.v1.endpoints.analysis.chain') as mock_chain, \
+                patch('app.tasks.analysis_tasks.analyze_genome_task.apply_async') as mock_apply:
+            first = client.post("/api/v1/analysis/start", json={"accession": "SYN000001.1"}).json()
+            second = client.post("/api/v1/analysis/start", json={"accession": "SYN000001.1"}).json()
+            
+            assert second["analysis_id"] == first["analysis_id"]
+            assert second["task_id"] == first["task_id"]
+            assert second["status"] == "pending"
+            assert mock_chain.call_count == 1
+            
+            # A finished analysis is not attached to; the genome is not downloaded again
+            db_session.query(Genome).filter_by(accession="SYN000001.1").one().file_path = synthetic_genbank_file
+            db_session.get(Analysis, first["analysis_id"]).status = "completed"
+            db_session.commit()
+            third = client.post("/api/v1/analysis/start", json={"accession": "SYN000001.1"}).json()
+            
+            assert third["analysis_id"] != first["analysis_id"]
+            assert third["message"] == "Analysis queued"
+            assert mock_chain.call_count == 1
+            assert mock_apply.call_count == 1
+    finally:
+        app.dependency_overrides.clear()
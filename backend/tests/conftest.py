@@ -9,6 +9,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ["NCBI_EMAIL"] = "test@example.com"
 os.environ["NCBI_API_KEY"] = "test_key"
 os.environ["SECRET_KEY"] = "test_secret"
+os.environ["PROGRESS_CHANNEL"] = "memory"
+os.environ["SINGLE_FLIGHT_LOCKS"] = "local"
 
 from app.core.config import settings
 
@@ -52,3 +54,94 @@ ORIGIN
 """
     p.write_text(content)
     return str(p)
+
+
+def write_genbank(path, sequence, features, accession="SYN000001.1", topology="linear"):
+    """Write a minimal GenBank flat file for the given sequence and features."""
+    name = accession.split(".")[0]
+    locus = "LOCUS       " + name + " " + str(len(sequence)).rjust(16 - len(name))
+    lines = [
+        locus + " bp    DNA     " + topology.ljust(8) + " BCT 01-JAN-2024",
+        "DEFINITION  Synthetic test genome, complete",
+        "            sequence.",
+        "ACCESSION   " + name,
+        "VERSION     " + accession,
+        "FEATURES             Location/Qualifiers",
+    ]
+    for key, location, qualifiers in features:
+        first, *rest = location.split("\n")
+        lines.append("     " + key.ljust(16) + first)
+        lines.extend("                     " + part for part in rest)
+        for qualifier in qualifiers:
+            lines.extend("                     " + part for part in qualifier.split("\n"))
+    lines.append("ORIGIN")
+    for offset in range(0, len(sequence), 60):
+        block = sequence[offset:offset + 60]
+        groups = " ".join(block[i:i + 10] for i in range(0, len(block), 10))
+        lines.append(str(offset + 1).rjust(9) + " " + groups)
+    lines.append("//")
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def synthetic_genbank_file(tmp_path):
+    """Create a GenBank file exercising joins, complements and fuzzy locations."""
+    import random
+    rng = random.Random(42)
+    sequence = "".join(rng.choice("acgtACGT") for _ in range(6000))
+    sequence = sequence[:3000] + "NNNNNnnnnn" + sequence[3010:]
+    features = [
+        ("source", "1..6000", ['/organism="Synthetic organism"', '/mol_type="genomic DNA"']),
+        ("gene", "101..400", ['/gene="synA"']),
+        ("CDS", "101..400", ['/gene="synA"', '/locus_tag="SYN_0001"',
+                             '/product="first ""quoted"" protein"',
+                             '/translation="MKRISTTITTTITITTGNGAG\nMKRISTTITTTITI"']),
+        ("CDS", "complement(501..899)", ['/locus_tag="SYN_0002"', '/product="reverse\nstrand protein"']),
+        ("CDS", "join(1001..1100,1201..1400)", ['/gene="synC"', '/pseudo']),
+        ("CDS", "complement(join(2001..2100,\n2201..2500))", ['/gene="synD"']),
+        ("CDS", "<2601..>2900", ['/gene="synE"', '/note="partial on both ends"']),
+        ("CDS", "join(complement(3301..3400),complement(3101..3200))", ['/gene="synF"']),
+        ("CDS", "2950..3050", ['/gene="synG"', '/note="spans the N gap"']),
+        ("misc_feature", "4001^4002", ['/note="between two bases"']),
+        ("CDS", "order(4101..4200,4301..4400)", ['/gene="synH"']),
+    ]
+    return write_genbank(tmp_path / "synthetic.gb", sequence, features)
+
+
+@pytest.fixture(autouse=True)
+def progress_channel():
+    """Give every test an empty in-memory progress channel."""
+    from app.services.progress_channel import get_progress_broadcaster, get_progress_channel
+    
+    get_progress_channel.cache_clear()
+    get_progress_broadcaster.cache_clear()
+    yield get_progress_channel()
+    get_progress_channel.cache_clear()
+    get_progress_broadcaster.cache_clear()
+
+
+@pytest.fixture
+def db_session():
+    """Create a session on a fresh in-memory SQLite database with every table."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.db.base import Base
+    from app.models.genome import Genome  # noqa: F401 - register every model
+    from app.models.analysis import Analysis  # noqa: F401
+    from app.models.result import Result  # noqa: F401
+    from app.models.validation import Validation  # noqa: F401
+    from app.models.gene import Gene  # noqa: F401
+    from app.models.result_cache import ResultCacheEntry  # noqa: F401
+    from app.models.batch import Batch  # noqa: F401
+    from app.models.stage_timing import StageTiming  # noqa: F401
+    
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
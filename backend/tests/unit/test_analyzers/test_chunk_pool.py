@@ -0,0 +1,108 @@
+import multiprocessing
+import random
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from conftest import write_genbank
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.chunk_pool import ChunkPool
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.replicon_runner import RepliconRunner
+
+
+def chunk_span(chunk):
+    """Module-level map function so it can be sent to the workers."""
+    return chunk.start, chunk.end, len(chunk.sequence)
+
+
+def run_in_daemon(genbank_file):
+    """Run the analyzers in a pool worker, which is daemonic like a Celery prefork worker."""
+    from app.analyzers import chunk_pool, replicon_runner
+    replicon_runner.MIN_CHUNK_SIZE = chunk_pool.MIN_CHUNK_SIZE = 20000
+    pools = []
+    pool_map = ChunkPool.map
+    ChunkPool.map = lambda self, *args: pools.append(self.threads) or pool_map(self, *args)
+    
+    assert multiprocessing.current_process().daemon
+    return RepliconRunner(BaseAnalyzer.create_all(), max_workers=2).run(genbank_file), pools
+
+
+@pytest.fixture
+def gapped_genbank_file(tmp_path):
+    """Create a 120 kb genome whose gaps and ambiguity codes straddle chunk boundaries."""
+    rng = random.Random(33)
+    sequence = list("".join(rng.choice("ACGTACGTACGTRY") for _ in range(120000)))
+    for start in (29990, 59999, 90000):
+        sequence[start:start + 25] = "N" * 25
+    features = [
+        ("CDS", f"{start + 1}..{start + 600}", [f'/locus_tag="G{start}"'])
+        for start in range(50, 118000, 4001)
+    ]
+    return write_genbank(tmp_path / "gapped.gb", "".join(sequence), features)
+
+
+class TestChunkPool:
+    def test_pool_matches_serial(self, gapped_genbank_file):
+        """Test that every analyzer gives identical results with its scans mapped on the pool."""
+        context = GenomeContext.load(gapped_genbank_file)
+        
+        for name, analyzer in BaseAnalyzer.create_all().items():
+            expected = analyzer.analyze_record(context)
+            expected_artifacts = analyzer.artifacts
+            
+            with ChunkPool(context, 2, 64, chunk_size=30011) as pool:
+                context.chunk_pool = pool
+                results = analyzer.analyze_record(context)
+            context.chunk_pool = None
+            
+            assert results == expected, name
+            for artifact, arrays in expected_artifacts.items():
+                for key, array in arrays.items():
+                    assert np.array_equal(analyzer.artifacts[artifact][key], array), key
+    
+    def test_map_in_chunk_order(self):
+        """Test that partial results come back in chunk order with the requested overlap."""
+        sequence = bytearray(b"ACGT" * 2500)
+        context = GenomeContext("MAP.1", "Map", sequence, [])
+        
+        with ChunkPool(context, 2, 64, chunk_size=3000) as pool:
+            partials = pool.map(chunk_span, overlap=2)
+        serial = GenomeContext("MAP.1", "Map", sequence, [], chunk_size=3000).map_chunks(chunk_span, overlap=2)
+        
+        assert partials == serial
+        assert partials == [(0, 3000, 3002), (3000, 6000, 3002), (6000, 9000, 3002), (9000, 10000, 1000)]
+    
+    def test_shared_memory_released(self):
+        """Test that the shared sequence is unlinked when the pool closes."""
+        context = GenomeContext("SHM.1", "Shared", bytearray(b"ACGT" * 1000), [])
+        with ChunkPool(context, 2, 64, chunk_size=1000) as pool:
+            name = pool._block.name
+        
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+    
+    def test_runner_maps_single_record(self, gapped_genbank_file, monkeypatch):
+        """Test that the runner spreads a single record over worker processes."""
+        from app.analyzers import chunk_pool, replicon_runner
+        expected = RepliconRunner(BaseAnalyzer.create_all(), max_workers=1).run(gapped_genbank_file)
+        
+        mapped = []
+        pool_map = ChunkPool.map
+        monkeypatch.setattr(replicon_runner, "MIN_CHUNK_SIZE", 20000)
+        monkeypatch.setattr(chunk_pool, "MIN_CHUNK_SIZE", 20000)
+        monkeypatch.setattr(ChunkPool, "map", lambda self, *args: mapped.append(self.chunk_size) or pool_map(self, *args))
+        
+        results = RepliconRunner(BaseAnalyzer.create_all(), max_workers=2).run(gapped_genbank_file)
+        
+        assert results == expected
+        assert mapped and set(mapped) == {20000}
+    
+    def test_runner_maps_on_threads_in_daemon(self, gapped_genbank_file):
+        """Test that a daemonic worker still maps a single record, on threads."""
+        expected = RepliconRunner(BaseAnalyzer.create_all(), max_workers=1).run(gapped_genbank_file)
+        
+        with multiprocessing.get_context("fork").Pool(1) as pool:
+            results, pools = pool.apply(run_in_daemon, (gapped_genbank_file,))
+        
+        assert results == expected
+        assert pools and set(pools) == {True}
@@ -0,0 +1,85 @@
+import random
+import re
+import numpy as np
+from app.analyzers.codon_engine import (
+    CODONS, codon_count_table, codon_counts_from_table, codon_positions, codon_total, count_codons
+)
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.sequence_encoding import encode_sequence
+
+
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+
+def naive_counts(sequence):
+    """Count codons frame by frame on both strands with plain Python."""
+    counts = np.zeros((2, 3, 64), dtype=np.int64)
+    reverse = sequence.translate(COMPLEMENT)[::-1]
+    for strand, strand_sequence in enumerate((sequence, reverse)):
+        for frame in range(3):
+            for i in range(frame, len(strand_sequence) - 2, 3):
+                codon = strand_sequence[i:i + 3]
+                if codon in CODONS:
+                    counts[strand, frame, CODONS.index(codon)] += 1
+    return counts
+
+
+class TestCodonEngine:
+    def test_matches_naive_counts(self):
+        """Test the vectorized matrix against frame-by-frame counting."""
+        rng = random.Random(3)
+        for length in (0, 2, 3, 4, 5, 100, 1001):
+            sequence = "".join(rng.choice("ACGTACGTN") for _ in range(length))
+            
+            assert np.array_equal(count_codons(encode_sequence(sequence)), naive_counts(sequence))
+    
+    def test_matches_regex_counts(self):
+        """Test that forward totals equal the previous regex scans."""
+        rng = random.Random(5)
+        sequence = "".join(rng.choice("ACGTN") for _ in range(5000))
+        counts = count_codons(encode_sequence(sequence))
+        
+        for codon in ("ATG", "TAA", "TAG", "TGA"):
+            assert codon_total(counts, codon) == len(re.findall(codon, sequence))
+    
+    def test_table_roundtrip(self):
+        """Test that the JSON table rebuilds the same matrix."""
+        counts = count_codons(encode_sequence("ATGAAATTTGGGCCCTAA"))
+        table = codon_count_table(counts)
+        
+        assert len(table["codons"]) == 64
+        assert set(table) == {"codons", "+1", "+2", "+3", "-1", "-2", "-3"}
+        assert np.array_equal(codon_counts_from_table(table), counts)
+    
+    def test_codon_positions(self):
+        """Test that positions on both strands match a regex scan."""
+        rng = random.Random(11)
+        sequence = "".join(rng.choice("ACGTN") for _ in range(5000))
+        positions = codon_positions(encode_sequence(sequence), ["ATG", "TAA"])
+        
+        assert set(positions) == {"ATG+", "ATG-", "TAA+", "TAA-"}
+        assert positions["ATG+"].tolist() == [m.start() for m in re.finditer("(?=ATG)", sequence)]
+        assert positions["ATG-"].tolist() == [m.start() for m in re.finditer("(?=CAT)", sequence)]
+        assert positions["TAA-"].tolist() == [m.start() for m in re.finditer("(?=TTA)", sequence)]
+    
+    def test_analyzer_summaries(self, synthetic_genbank_file):
+        """Test that the analyzer summaries are derived from the matrix."""
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        analyzer = CodonAnalyzer()
+        results = analyzer.analyze_record(context)
+        sequence = context.sequence
+        
+        assert results["start_codons"]["total_count"] == sequence.count("ATG")
+        assert results["start_codons"]["positions"] == [m.start() for m in re.finditer("ATG", sequence)][:100]
+        for codon in ("TAA", "TAG", "TGA"):
+            assert results["stop_codons"]["codons"][codon]["count"] == sequence.count(codon)
+        
+        table = results["codon_counts"]
+        forward = sum(sum(table[frame]) for frame in ("+1", "+2", "+3"))
+        reverse = sum(sum(table[frame]) for frame in ("-1", "-2", "-3"))
+        assert forward == reverse
+        
+        artifact = analyzer.artifacts["codon_positions"]
+        assert len(artifact) == 8
+        assert len(artifact["SYN000001.1/ATG+"]) == results["start_codons"]["total_count"]
@@ -0,0 +1,94 @@
+import random
+import pytest
+from conftest import write_genbank
+from app.analyzers.feature_index import FeatureIndex, feature_index_path
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.genome_store import GenomeStore
+
+
+@pytest.fixture
+def annotated_genome(tmp_path):
+    """Create a genome with many overlapping, joined and nested CDS features."""
+    rng = random.Random(11)
+    length = 50000
+    sequence = "".join(rng.choice("ACGT") for _ in range(length))
+    features = []
+    for index in range(400):
+        start = rng.randrange(1, length - 3000)
+        end = start + rng.randrange(30, 3000)
+        location = f"{start}..{end}"
+        if index % 7 == 0:
+            middle = (start + end) // 2
+            location = f"join({start}..{middle - 20},{middle + 20}..{end})"
+        if index % 3 == 0:
+            location = f"complement({location})"
+        features.append(("CDS", location, [f'/locus_tag="IDX_{index:04d}"']))
+    features.append(("CDS", "complement(49001..1000)", ['/gene="oriX"']))
+    return write_genbank(tmp_path / "annotated.gb", sequence, features, topology="circular")
+
+
+def brute_force(genbank_file, start, end, strand=None):
+    """Scan every CDS part of the first record for overlaps."""
+    analyzer = GeneAnalyzer()
+    context = GenomeContext.load_record(genbank_file, 0, GenomeContext.record_offsets(genbank_file)[0])
+    hits = []
+    for feature, gene in zip(analyzer.cds_features(context), analyzer.extract_genes(context)):
+        if strand is not None and gene["strand"] != strand:
+            continue
+        if any(part_start < end and part_end > start for part_start, part_end, _ in feature.parts):
+            hits.append((gene["start"], gene["locus_tag"], gene["gene_name"]))
+    return sorted(hits)
+
+
+class TestFeatureIndex:
+    def test_matches_brute_force(self, annotated_genome):
+        """Test random region queries against a linear scan of every CDS part."""
+        index = FeatureIndex.build(annotated_genome)
+        rng = random.Random(3)
+        
+        assert FeatureIndex.exists(annotated_genome)
+        assert index.records == ["SYN000001.1"]
+        for _ in range(50):
+            start = rng.randrange(0, 50000)
+            end = start + rng.choice([1, 10, 500, 5000])
+            strand = rng.choice([None, "+", "-"])
+            total, genes = index.query("SYN000001.1", start, end, strand=strand)
+            
+            expected = brute_force(annotated_genome, start, end, strand)
+            assert total == len(expected)
+            assert sorted((g["start"], g["locus_tag"], g["gene_name"]) for g in genes) == expected
+            assert [g["start"] for g in genes] == sorted(g["start"] for g in genes)
+    
+    def test_split_locations(self, annotated_genome):
+        """Test that introns and the far side of an origin-spanning CDS are not hits."""
+        index = FeatureIndex.open_or_build(annotated_genome)
+        
+        _, near_origin = index.query("SYN000001.1", 0, 10)
+        _, mid_genome = index.query("SYN000001.1", 20000, 20001)
+        assert "oriX" in [g["gene_name"] for g in near_origin]
+        assert "oriX" not in [g["gene_name"] for g in mid_genome]
+        
+        total, limited = index.query("SYN000001.1", 0, 50000, limit=5)
+        assert total == 401
+        assert len(limited) == 5
+    
+    def test_multi_record_from_store(self, tmp_path, synthetic_genbank_file):
+        """Test that every record is indexed and stored genomes are used."""
+        plasmid = write_genbank(tmp_path / "plasmid.gb", "ACGT" * 500,
+                                [("CDS", "101..400", ['/gene="repA"'])], accession="SYN000002.1")
+        path = tmp_path / "multi.gb"
+        path.write_text(open(synthetic_genbank_file).read() + open(plasmid).read())
+        GenomeStore.build(str(path)).close()
+        
+        index = FeatureIndex.build(str(path))
+        
+        assert feature_index_path(str(path)) == tmp_path / "multi.genes.npz"
+        assert index.records == ["SYN000001.1", "SYN000002.1"]
+        total, genes = index.query("SYN000002.1", 0, 2000)
+        assert total == 1
+        assert genes[0]["gene_name"] == "repA"
+        assert genes[0]["replicon"] == "SYN000002.1"
+        assert index.query("SYN000001.1", 1150, 1160)[0] == 0  # intron of synC
+        with pytest.raises(KeyError):
+            index.query("MISSING.1", 0, 10)
@@ -0,0 +1,66 @@
+import random
+import pytest
+from Bio.SeqUtils import gc_fraction
+from app.analyzers.gc_track import build_gc_pyramid, gc_track_region, track_accessions, track_bin_sizes
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+from app.analyzers.genome_context import GenomeContext
+
+
+@pytest.fixture
+def context():
+    """Create a 25,050 bp genome with an N gap and IUPAC codes."""
+    rng = random.Random(9)
+    sequence = "".join(rng.choice("ACGT") for _ in range(25050))
+    sequence = sequence[:1000] + "N" * 300 + "SSWW" + sequence[1304:]
+    return GenomeContext("TRACK.1", "Track genome", bytearray(sequence.encode()), [])
+
+
+class TestGcTrack:
+    def test_pyramid_matches_gc_fraction(self, context):
+        """Test that every bin of every level matches gc_fraction of its slice."""
+        arrays = build_gc_pyramid(context, bin_sizes=(100, 1000, 10000))
+        sequence = context.sequence
+        
+        assert track_accessions(arrays) == ["TRACK.1"]
+        assert track_bin_sizes(arrays, "TRACK.1") == [100, 1000, 10000]
+        assert arrays["TRACK.1/100/gc"].dtype.itemsize == 1
+        assert arrays["TRACK.1/1000/total"].dtype.itemsize == 2
+        for bin_size in (100, 1000, 10000):
+            gc = arrays[f"TRACK.1/{bin_size}/gc"]
+            total = arrays[f"TRACK.1/{bin_size}/total"]
+            assert len(gc) == -(-len(sequence) // bin_size)
+            for index in range(len(gc)):
+                window = sequence[index * bin_size:(index + 1) * bin_size]
+                if total[index]:
+                    assert gc[index] / total[index] == pytest.approx(gc_fraction(window))
+                else:
+                    assert set(window) == {"N"}
+    
+    def test_region(self, context):
+        """Test zoom level selection, bin alignment and empty bins."""
+        arrays = build_gc_pyramid(context, bin_sizes=(100, 1000, 10000))
+        
+        region = gc_track_region(arrays, "TRACK.1", 950, 1450)
+        assert region["bin_size"] == 100
+        assert (region["start"], region["end"]) == (900, 1500)
+        assert region["gc_content"][1:3] == [None, None]
+        assert region["gc_content"][4] is not None
+        
+        coarse = gc_track_region(arrays, "TRACK.1", 0, 10 ** 9, max_bins=5)
+        assert coarse["bin_size"] == 10000
+        assert coarse["end"] == 25050
+        assert len(coarse["gc_content"]) == 3
+        
+        with pytest.raises(KeyError):
+            gc_track_region(arrays, "TRACK.1", 0, 100, bin_size=500)
+        with pytest.raises(KeyError):
+            gc_track_region(arrays, "OTHER.1", 0, 100)
+    
+    def test_genome_analyzer_artifact(self, context):
+        """Test that genome analysis produces the GC track artifact."""
+        analyzer = GenomeAnalyzer()
+        analyzer.analyze_record(context)
+        
+        arrays = analyzer.artifacts["gc_track"]
+        assert track_bin_sizes(arrays, "TRACK.1") == [100, 1000, 10000, 100000]
+        assert int(arrays["TRACK.1/100000/total"].sum()) == 25050 - 300
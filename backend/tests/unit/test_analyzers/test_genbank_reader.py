@@ -0,0 +1,117 @@
+import pytest
+from Bio import SeqIO
+from Bio.SeqUtils import gc_fraction
+from app.analyzers.genbank_reader import GenBankReader, read_genbank, parse_location
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+
+
+def biopython_genes(record):
+    """Gene table as computed by the original SeqFeature based GeneAnalyzer."""
+    genes = []
+    for feature in record.features:
+        if feature.type == "CDS":
+            sequence = feature.extract(record.seq)
+            genes.append({
+                "gene_name": feature.qualifiers.get("gene", ["Unknown"])[0],
+                "locus_tag": feature.qualifiers.get("locus_tag", [""])[0],
+                "product": feature.qualifiers.get("product", ["Unknown protein"])[0],
+                "location": str(feature.location),
+                "start": int(feature.location.start),
+                "end": int(feature.location.end),
+                "length": len(sequence),
+                "gc_content": round(gc_fraction(sequence) * 100, 2),
+                "strand": "+" if feature.location.strand == 1 else "-"
+            })
+    return genes
+
+
+class TestGenBankReader:
+    @pytest.mark.filterwarnings("ignore")
+    def test_matches_biopython(self, synthetic_genbank_file):
+        """Test that sequence and features match SeqIO.read."""
+        expected = SeqIO.read(synthetic_genbank_file, "genbank")
+        record = read_genbank(synthetic_genbank_file)
+        
+        assert record.id == expected.id
+        assert record.name == expected.name
+        assert record.description == expected.description
+        assert bytes(record.sequence) == str(expected.seq).upper().encode()
+        assert len(record.features) == len(expected.features)
+        
+        for feature, bio_feature in zip(record.features, expected.features):
+            assert feature.type == bio_feature.type
+            assert feature.location_string(len(record)) == str(bio_feature.location)
+            assert feature.start == int(bio_feature.location.start)
+            assert feature.end == int(bio_feature.location.end)
+            assert feature.strand == bio_feature.location.strand
+            qualifiers = {k: v for k, v in bio_feature.qualifiers.items() if k != "translation"}
+            assert feature.qualifiers == qualifiers
+    
+    @pytest.mark.filterwarnings("ignore")
+    def test_analyzers_match_biopython(self, synthetic_genbank_file):
+        """Test analyzer output on the native reader against the SeqFeature based output."""
+        expected = SeqIO.read(synthetic_genbank_file, "genbank")
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        
+        genes = GeneAnalyzer().extract_genes(context)
+        assert genes == biopython_genes(expected)
+        
+        stats = GenomeAnalyzer().analyze_record(context)
+        coding_length = sum(len(f.extract(expected.seq)) for f in expected.features if f.type == "CDS")
+        assert stats["genome_size"] == len(expected.seq)
+        assert stats["gc_content"] == round(gc_fraction(expected.seq) * 100, 2)
+        assert stats["coding_length"] == coding_length
+        assert stats["organism"] == expected.description
+        
+        codons = CodonAnalyzer().analyze_record(context)
+        assert codons["start_codons"]["total_count"] == str(expected.seq).upper().count("ATG")
+    
+    def test_mock_genome(self, mock_genome_file):
+        """Test reading the small fixture with an inconsistent LOCUS length."""
+        record = read_genbank(mock_genome_file)
+        
+        assert record.id == "NC_000913.3"
+        assert len(record) == 360
+        cds = [f for f in record.features if f.type == "CDS"]
+        assert cds[0].parts == ((189, 255, 1),)
+        assert cds[0].qualifiers["gene"] == ["thrL"]
+    
+    def test_multiple_records(self, tmp_path, mock_genome_file):
+        """Test that read rejects multi-record files while iteration yields each record."""
+        content = open(mock_genome_file).read()
+        path = tmp_path / "multi.gb"
+        path.write_text(content + content)
+        
+        assert len(list(GenBankReader(str(path)))) == 2
+        with pytest.raises(ValueError):
+            read_genbank(str(path))
+    
+    def test_terminator_across_blocks(self, tmp_path, mock_genome_file, monkeypatch):
+        """Test that a // terminator split between ORIGIN blocks ends the sequence."""
+        from app.analyzers import genbank_reader
+        
+        content = open(mock_genome_file, "rb").read()
+        path = tmp_path / "multi.gb"
+        path.write_bytes(content + content)
+        origin = content.index(b"\n", content.index(b"\nORIGIN")) + 1
+        slashes = content.index(b"\n//", origin) + 1 - origin
+        expected = [record.sequence for record in GenBankReader(str(path))]
+        
+        # Blocks ending just before, between and after the two slashes
+        for block_size in (1, 2, 3, slashes - 1, slashes, slashes + 1, slashes + 2):
+            monkeypatch.setattr(genbank_reader, "ORIGIN_BLOCK_SIZE", block_size)
+            records = list(GenBankReader(str(path)))
+            
+            assert [record.sequence for record in records] == expected
+            assert b"/" not in records[0].sequence
+    
+    def test_parse_location(self):
+        """Test location parsing conventions."""
+        assert parse_location("complement(join(1..10,21..30))") == ((20, 30, -1), (0, 10, -1))
+        assert parse_location("join(91..100,1..5)") == ((90, 100, 1), (0, 5, 1))
+        assert parse_location("91..5", 100, circular=True) == ((90, 100, 1), (0, 5, 1))
+        assert parse_location("91..5", 100) is None
+        assert parse_location("AB000001.1:1..10") is None
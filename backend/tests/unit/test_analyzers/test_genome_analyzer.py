@@ -4,9 +4,10 @@ from app.analyzers.genome_analyzer import GenomeAnalyzer
 class TestGenomeAnalyzer:
     def test_calculate_statistics(self, mock_genome_file):
         """Test genome statistics calculation."""
+        from app.analyzers.genome_context import GenomeContext
         analyzer = GenomeAnalyzer()
         
-        stats = analyzer.calculate_statistics(mock_genome_file)
+        stats = analyzer.calculate_genome_stats(GenomeContext.load(mock_genome_file))
         
         # Check basic stats presence
         assert 'genome_size' in stats
@@ -25,15 +26,164 @@ class TestGenomeAnalyzer:
         assert 'T' in comp
         
         # Percentages should sum to roughly 100
-        total_pct = sum(comp.values())
+        total_pct = sum(comp[base]['percentage'] for base in "ACGT")
         assert 99.0 <= total_pct <= 101.0
-
+        assert comp['AT_content'] + comp['GC_content'] == pytest.approx(total_pct)
+    
     def test_coding_density(self, mock_genome_file):
         """Test coding density calculation."""
+        from app.analyzers.genome_context import GenomeContext
         analyzer = GenomeAnalyzer()
         
         # Mock file has one CDS defined
-        density = analyzer.calculate_coding_density(mock_genome_file)
+        stats = analyzer.calculate_genome_stats(GenomeContext.load(mock_genome_file))
+        density = stats['coding_density']
         
         assert isinstance(density, float)
         assert 0.0 <= density <= 100.0
+        assert density == round(stats['coding_coverage']['covered_length']['total'] / stats['genome_size'] * 100, 2)
+    
+    def test_gc_sliding_window(self):
+        """Test the cumulative-sum sliding window against per-window counting."""
+        import random
+        rng = random.Random(5)
+        sequence = "".join(rng.choice("ACGTN") for _ in range(5003))
+        
+        windows = GenomeAnalyzer().calculate_gc_sliding_window(sequence, window_size=100, step=37)
+        
+        starts = range(0, len(sequence) - 100, 37)
+        assert windows["positions"] == [i + 50 for i in starts]
+        assert windows["gc_values"] == [
+            round((sequence[i:i + 100].count("G") + sequence[i:i + 100].count("C")) / 100 * 100, 2)
+            for i in starts
+        ]
+        assert GenomeAnalyzer().calculate_gc_sliding_window("ACGT", window_size=10)["positions"] == []
+    
+    def test_skew_origin_and_terminus(self):
+        """Test that cumulative GC skew locates a synthetic origin and terminus."""
+        import random
+        from app.analyzers.genome_context import GenomeContext
+        rng = random.Random(8)
+        c_rich = lambda n: "".join(rng.choice("AACCCGTT") for _ in range(n))
+        g_rich = lambda n: "".join(rng.choice("AACGGGTT") for _ in range(n))
+        sequence = c_rich(25000) + g_rich(50000) + c_rich(25000) + "ACG"
+        context = GenomeContext("SKEW.1", "Skew genome", bytearray(sequence.encode()), [], circular=True)
+        
+        skew = GenomeAnalyzer(skew_window_size=1000, skew_track_points=20).calculate_skew(context)
+        
+        assert skew["window_count"] == 101
+        assert abs(skew["origin"]["position"] - 25000) <= 2000
+        assert abs(skew["terminus"]["position"] - 75000) <= 2000
+        assert skew["origin"]["cumulative_gc_skew"] < 0 < skew["terminus"]["cumulative_gc_skew"]
+        
+        track = skew["track"]
+        assert track["bin_size"] == 6000
+        assert len(track["positions"]) == len(track["gc_skew"]) == len(track["cumulative_gc_skew"]) == 17
+        assert track["gc_skew"][0] < 0 < track["gc_skew"][8]
+        assert track["positions"][-1] <= len(sequence)
+        g, c = sequence[:6000].count("G"), sequence[:6000].count("C")
+        assert track["gc_skew"][0] == round((g - c) / (g + c), 4)
+        
+        empty = GenomeContext("EMPTY.1", "Empty", bytearray(), [])
+        assert GenomeAnalyzer().calculate_skew(empty)["origin"] is None
+    
+    def test_composition_with_ambiguity_codes(self):
+        """Test IUPAC counts, gap runs and both denominators."""
+        from Bio.SeqUtils import gc_fraction
+        from app.analyzers.genome_context import GenomeContext
+        sequence = "NNACGTACGTRYNNNNNGGCCSWXAT" + "N" * 10
+        context = GenomeContext("AMB.1", "Ambiguous", bytearray(sequence.encode()), [])
+        
+        stats = GenomeAnalyzer().calculate_genome_stats(context)
+        composition = stats["nucleotide_composition"]
+        
+        assert composition["G"] == {"count": 4, "percentage": round(4 / len(sequence) * 100, 2)}
+        assert list(composition["ambiguous"]) == ["R", "Y", "S", "W", "N", "X"]
+        assert composition["ambiguous"]["N"]["count"] == 17
+        assert composition["ambiguous_count"] == 22
+        assert composition["gaps"]["count"] == 3
+        assert composition["gaps"]["total_length"] == 17
+        assert composition["gaps"]["runs"][1] == {"start": 12, "end": 17}
+        assert stats["gc_content"] == round(gc_fraction(sequence) * 100, 2)
+        
+        acgt = GenomeAnalyzer(acgt_only=True)._calculate_composition(sequence)
+        assert acgt["denominator"] == "acgt"
+        assert acgt["A"]["percentage"] == round(3 / 14 * 100, 2)
+        assert round(acgt["AT_content"] + acgt["GC_content"]) == 100
+    
+    def test_symbol_counts_blocks(self):
+        """Test that blocked counting matches a whole-buffer count."""
+        import random
+        from app.analyzers.sequence_encoding import symbol_counts
+        rng = random.Random(1)
+        sequence = bytes(rng.choice(b"ACGTNRY") for _ in range(10007))
+        
+        counts = symbol_counts(sequence, block_size=1000)
+        
+        assert counts.sum() == len(sequence)
+        assert all(counts[value] == sequence.count(bytes([value])) for value in b"ACGTNRY")
+    
+    def test_coding_coverage_overlapping_genes(self):
+        """Test that overlapping CDS parts are counted once, per strand."""
+        from app.analyzers.genbank_reader import GenBankFeature
+        from app.analyzers.genome_context import GenomeContext
+        features = [
+            GenBankFeature("CDS", "1..300", [(0, 300, 1)], {}),
+            GenBankFeature("CDS", "201..600", [(200, 600, 1)], {}),
+            GenBankFeature("CDS", "complement(251..450)", [(250, 450, -1)], {}),
+            GenBankFeature("CDS", "join(801..900,951..1000)", [(800, 900, 1), (950, 1000, 1)], {}),
+            GenBankFeature("gene", "1..1000", [(0, 1000, 1)], {}),
+        ]
+        context = GenomeContext("COV.1", "Overlaps", bytearray(b"A" * 1000), features)
+        
+        stats = GenomeAnalyzer().calculate_genome_stats(context)
+        coverage = stats["coding_coverage"]
+        
+        assert stats["coding_length"] == 300 + 400 + 200 + 150
+        assert coverage["summed_length"] == {"total": 1050, "+": 850, "-": 200}
+        assert coverage["covered_length"] == {"total": 750, "+": 750, "-": 200}
+        assert coverage["overlap_length"] == 300
+        assert stats["coding_density"] == 75.0
+    
+    def test_merge_intervals_matches_bitmap(self):
+        """Test the interval union against a per-base bitmap."""
+        import numpy as np
+        from app.analyzers.intervals import covered_length, merge_intervals
+        rng = np.random.default_rng(3)
+        starts = rng.integers(0, 5000, 400)
+        ends = starts + rng.integers(0, 120, 400)
+        bitmap = np.zeros(6000, dtype=bool)
+        for start, end in zip(starts, ends):
+            bitmap[start:end] = True
+        
+        merged_starts, merged_ends = merge_intervals(starts, ends)
+        
+        assert covered_length(starts, ends) == bitmap.sum()
+        assert np.all(merged_starts[1:] > merged_ends[:-1])
+        assert all(bitmap[start:end].all() for start, end in zip(merged_starts, merged_ends))
+        assert covered_length([], []) == 0
+        assert covered_length([0, 10], [10, 20]) == 20
+    
+    def test_single_scan(self, synthetic_genbank_file):
+        """Test that composition, skew and GC track come from one pass over the genome."""
+        import numpy as np
+        from app.analyzers.gc_track import build_gc_pyramid
+        from app.analyzers.genome_context import GenomeContext
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        map_chunks = context.map_chunks
+        calls = []
+        
+        def count_calls(function, *args, **kwargs):
+            calls.append(function.__name__)
+            return map_chunks(function, *args, **kwargs)
+        
+        context.map_chunks = count_calls
+        analyzer = GenomeAnalyzer()
+        stats = analyzer.analyze_record(context)
+        
+        assert calls == ["chunk_genome_counts"]
+        context.map_chunks = map_chunks
+        expected = build_gc_pyramid(context)
+        assert analyzer.artifacts["gc_track"].keys() == expected.keys()
+        assert all(np.array_equal(analyzer.artifacts["gc_track"][key], array) for key, array in expected.items())
+        assert stats["skew"] == GenomeAnalyzer().calculate_skew(context)
@@ -0,0 +1,51 @@
+import pytest
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+
+class TestGenomeContext:
+    def test_from_genbank(self, mock_genome_file):
+        """Test that the context exposes the parsed sequence and features."""
+        context = GenomeContext.from_genbank(mock_genome_file)
+        
+        assert context.accession == "NC_000913.3"
+        assert len(context) == 360
+        assert context.sequence == context.sequence.upper()
+        assert context.sequence_bytes == context.sequence.encode("ascii")
+        assert sum(1 for f in context.features if f.type == "CDS") == 1
+    
+    def test_analyze_record_matches_analyze(self, mock_genome_file):
+        """Test that the path-based analyze wraps analyze_record."""
+        context = GenomeContext.from_genbank(mock_genome_file)
+        
+        for analyzer_class in (CodonAnalyzer, GeneAnalyzer, GenomeAnalyzer):
+            analyzer = analyzer_class()
+            assert analyzer.analyze(mock_genome_file) == analyzer.analyze_record(context)
+    
+    def test_missing_file(self, tmp_path):
+        """Test that a missing GenBank file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            GenomeAnalyzer().analyze(str(tmp_path / "missing.gb"))
+    
+    def test_cumulative_counts(self, synthetic_genbank_file):
+        """Test that prefix sums give interval counts and are cached."""
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        counts = context.cumulative_counts("GCS")
+        sequence = context.sequence
+        
+        assert len(counts) == len(context) + 1
+        assert context.cumulative_counts("SGC") is counts
+        for start, end in ((0, 0), (0, 6000), (2990, 3020), (123, 4567)):
+            window = sequence[start:end]
+            assert counts[end] - counts[start] == sum(window.count(base) for base in "GCS")
+    
+    def test_extract_genes_uses_cumulative_counts(self, synthetic_genbank_file):
+        """Test that gene GC content is read from the context's cached prefix sums."""
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        genes = GeneAnalyzer().extract_genes(context)
+        counts = context.cumulative_counts("GCS")
+        
+        assert GeneAnalyzer().extract_genes(context) == genes
+        assert context.cumulative_counts("GCS") is counts
+        assert sorted(context._cumulative_counts) == ["ACGSTW", "CGS"]
@@ -0,0 +1,86 @@
+import os
+import random
+import threading
+from app.analyzers.genbank_reader import read_genbank
+from app.analyzers.genome_store import GenomeStore, pack_sequence, unpack_sequence, store_paths
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+import numpy as np
+
+class TestGenomeStore:
+    def test_pack_roundtrip(self):
+        """Test that packing and unpacking restores ACGT sequences of any length."""
+        for length in (0, 1, 5, 8, 1001):
+            sequence = bytes(random.Random(length).choice(b"ACGT") for _ in range(length))
+            packed = np.frombuffer(pack_sequence(sequence), dtype=np.uint8)
+            
+            assert len(packed) == (length + 3) // 4
+            assert unpack_sequence(packed, 0, length) == sequence
+    
+    def test_build_and_fetch(self, synthetic_genbank_file):
+        """Test that ranges decoded from the store match the parsed sequence."""
+        record = read_genbank(synthetic_genbank_file)
+        
+        with GenomeStore.build(synthetic_genbank_file) as store:
+            assert GenomeStore.exists(synthetic_genbank_file)
+            assert os.path.getsize(store.paths["sequence"]) < len(record) // 4 + 1024
+            
+            packed = store.records[0]
+            assert packed.id == record.id
+            assert len(packed) == len(record)
+            assert packed.fetch() == record.sequence
+            assert packed.fetch(2995, 3015) == record.sequence[2995:3015]
+            assert packed.features == record.features
+            
+            chunks = b"".join(chunk for _, chunk in packed.iter_chunks(1000))
+            assert chunks == record.sequence
+    
+    def test_context_from_store(self, synthetic_genbank_file):
+        """Test that analyzers give identical results from the store and the GenBank file."""
+        parsed = GenomeContext.from_genbank(synthetic_genbank_file)
+        GenomeStore.build(synthetic_genbank_file).close()
+        stored = GenomeContext.load(synthetic_genbank_file)
+        
+        assert stored.packed_record is not None
+        assert stored.fetch(100, 200) == parsed.sequence_bytes[100:200]
+        assert "sequence_bytes" not in stored.__dict__
+        
+        for analyzer_class in (GeneAnalyzer, GenomeAnalyzer):
+            analyzer = analyzer_class()
+            assert analyzer.analyze_record(stored) == analyzer.analyze_record(parsed)
+        
+        # The context owns the store it opened
+        store = stored.packed_record.store
+        stored.close()
+        assert store._file.closed
+    
+    def test_concurrent_builds(self, synthetic_genbank_file):
+        """Test that concurrent builds of one genome write separate temporary files."""
+        errors = []
+        
+        def build():
+            try:
+                GenomeStore.build(synthetic_genbank_file).close()
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=build) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert not [name for name in os.listdir(os.path.dirname(synthetic_genbank_file)) if name.endswith(".tmp")]
+        with GenomeContext.load(synthetic_genbank_file) as context:
+            assert context.fetch(0, len(context)) == read_genbank(synthetic_genbank_file).sequence
+    
+    def test_stale_store(self, synthetic_genbank_file):
+        """Test that a store older than its GenBank file is not used."""
+        GenomeStore.build(synthetic_genbank_file).close()
+        sequence_path = store_paths(synthetic_genbank_file)["sequence"]
+        os.utime(sequence_path, (0, 0))
+        
+        assert not GenomeStore.exists(synthetic_genbank_file)
+        assert GenomeContext.load(synthetic_genbank_file).packed_record is None
@@ -0,0 +1,129 @@
+import random
+from collections import Counter
+import numpy as np
+import pytest
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.kmer_analyzer import KmerAnalyzer
+from app.analyzers.kmer_engine import (
+    KmerCounts, kmer_string, reverse_complement_keys, rho_star, tetranucleotide_zscores
+)
+from app.analyzers.sequence_encoding import encode_sequence
+
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def naive_kmers(sequence, k):
+    """Count ACGT-only k-mers with a sliding slice."""
+    return Counter(
+        sequence[i:i + k] for i in range(len(sequence) - k + 1)
+        if set(sequence[i:i + k]) <= set("ACGT")
+    )
+
+
+def as_dict(counts):
+    return {kmer_string(key, counts.k): int(count) for key, count in zip(counts.keys, counts.counts)}
+
+
+class TestKmerCounts:
+    def test_matches_naive_counts(self):
+        """Test dense and sparse counting against a sliding slice."""
+        rng = random.Random(2)
+        sequence = "".join(rng.choice("ACGTACGTN") for _ in range(5000))
+        
+        for k in (1, 2, 4, 13, 20):
+            counts = KmerCounts.from_codes(encode_sequence(sequence), k, block_size=777)
+            assert as_dict(counts) == dict(naive_kmers(sequence, k))
+        
+        assert KmerCounts.from_codes(encode_sequence("ACG"), 4).total == 0
+        with pytest.raises(ValueError):
+            KmerCounts.from_codes(encode_sequence("ACGT"), 33)
+    
+    def test_chunk_counts_add_up(self):
+        """Test that chunks overlapping by k - 1 bases sum to the whole."""
+        rng = random.Random(4)
+        sequence = "".join(rng.choice("ACGTN") for _ in range(3000))
+        
+        for k in (5, 14):
+            whole = KmerCounts.from_codes(encode_sequence(sequence), k)
+            chunks = [KmerCounts.from_codes(encode_sequence(sequence[start:start + 1000 + k - 1]), k)
+                      for start in range(0, len(sequence), 1000)]
+            assert sum(chunks[1:], chunks[0]) == whole
+    
+    def test_reverse_complement(self):
+        """Test reverse complement keys and two-strand counts."""
+        keys = np.array([int("0123", 4), int("0000", 4)], dtype=np.uint64)
+        
+        assert [kmer_string(key, 4) for key in reverse_complement_keys(keys, 4)] == ["ACGT", "TTTT"]
+        
+        sequence = "AACGTTTGCA"
+        reverse = sequence.translate(COMPLEMENT)[::-1]
+        both = KmerCounts.from_codes(encode_sequence(sequence), 3).both_strands()
+        assert as_dict(both) == dict(naive_kmers(sequence, 3) + naive_kmers(reverse, 3))
+
+
+class TestKmerSignatures:
+    def test_rho_star(self):
+        """Test rho* against frequencies of the sequence plus its reverse complement."""
+        rng = random.Random(6)
+        sequence = "".join(rng.choice("AACGTT") for _ in range(4000))
+        both = sequence + "N" + sequence.translate(COMPLEMENT)[::-1]
+        codes = encode_sequence(sequence)
+        
+        rho = rho_star(KmerCounts.from_codes(codes, 1), KmerCounts.from_codes(codes, 2))
+        
+        mono, di = naive_kmers(both, 1), naive_kmers(both, 2)
+        f = lambda base: mono[base] / sum(mono.values())
+        expected = di["CG"] / sum(di.values()) / (f("C") * f("G"))
+        assert rho["CG"] == round(expected, 4)
+        assert len(rho) == 16
+        assert rho["GT"] == rho["AC"]
+    
+    def test_zscores_flag_overrepresented_tetranucleotide(self):
+        """Test that a planted tetranucleotide gets the highest z-score."""
+        rng = random.Random(9)
+        sequence = "".join(rng.choice("ACGT") + ("GATC" if rng.random() < 0.05 else "") for _ in range(20000))
+        codes = encode_sequence(sequence)
+        
+        z = tetranucleotide_zscores(*(KmerCounts.from_codes(codes, k) for k in (2, 3, 4)))
+        
+        assert len(z) == 256
+        assert max(z, key=z.get) == "GATC"
+        assert z["GATC"] > 10
+
+
+class TestKmerAnalyzer:
+    def test_analyze_record(self):
+        """Test the profile and the k-mer count artifact of one record."""
+        rng = random.Random(12)
+        sequence = "".join(rng.choice("ACGT") for _ in range(3000))
+        context = GenomeContext("KMER.1", "k-mers", bytearray(sequence.encode()), [])
+        analyzer = KmerAnalyzer(k=6, top_count=5)
+        
+        results = analyzer.analyze_record(context)
+        
+        assert results["total_kmers"] == 3000 - 5
+        assert results["possible_kmers"] == 4096
+        counts = naive_kmers(sequence, 6)
+        assert results["top_kmers"][0]["count"] == max(counts.values())
+        assert len(results["top_kmers"]) == 5
+        arrays = analyzer.artifacts["kmer_counts"]
+        assert arrays["KMER.1/6/counts"].sum() == 3000 - 5
+    
+    def test_merge_sums_replicon_counts(self):
+        """Test that merged results equal the profile of the summed counts."""
+        rng = random.Random(13)
+        sequences = ["".join(rng.choice("ACGT") for _ in range(length)) for length in (4000, 1500)]
+        contexts = [GenomeContext(f"R{i}.1", "r", bytearray(s.encode()), []) for i, s in enumerate(sequences)]
+        analyzer = KmerAnalyzer(k=4)
+        
+        partials = [analyzer.analyze_replicon(context) for context in contexts]
+        merged = analyzer.merge_results(partials, ["R0.1", "R1.1"])
+        
+        joined = GenomeContext("J.1", "j", bytearray((sequences[0] + "N" + sequences[1]).encode()), [])
+        whole = analyzer.analyze_record(joined)
+        assert merged["total_kmers"] == whole["total_kmers"]
+        assert merged["rho_star"] == whole["rho_star"]
+        assert merged["tetranucleotide_zscores"] == whole["tetranucleotide_zscores"]
+        assert [r["accession"] for r in merged["replicons"]] == ["R0.1", "R1.1"]
+        assert merged["replicons"][0]["rho_star_distance"] < 0.1
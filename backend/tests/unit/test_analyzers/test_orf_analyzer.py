@@ -0,0 +1,116 @@
+import random
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.genbank_reader import GenBankFeature
+from app.analyzers.orf_analyzer import OrfAnalyzer
+
+
+STOPS = {"TAA", "TAG", "TGA"}
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+
+def naive_orfs(sequence, min_length, from_start_codon):
+    """Walk every frame of both strands codon by codon."""
+    n = len(sequence)
+    found = set()
+    reverse = sequence.translate(COMPLEMENT)[::-1]
+    for strand, strand_sequence in ((1, sequence), (-1, reverse)):
+        for frame in range(3):
+            start = None
+            previous_stop = None
+            for i in range(frame, n - 2, 3):
+                codon = strand_sequence[i:i + 3]
+                if from_start_codon and codon == "ATG" and start is None:
+                    start = i
+                if codon in STOPS:
+                    begin = start if from_start_codon else (previous_stop + 3 if previous_stop is not None else None)
+                    if begin is not None and i + 3 - begin >= min_length:
+                        orf = (begin, i + 3) if strand == 1 else (n - i - 3, n - begin)
+                        found.add(orf + (strand, frame + 1))
+                    start = None
+                    previous_stop = i
+    return found
+
+
+def context_for(sequence, features=()):
+    return GenomeContext("SYN000001.1", "Synthetic", bytearray(sequence.encode()), list(features))
+
+
+class TestOrfAnalyzer:
+    def test_matches_naive_scan(self):
+        """Test vectorized ORFs against a codon-by-codon walk of all six frames."""
+        rng = random.Random(21)
+        sequence = "".join(rng.choice("AACGTTTN") for _ in range(20000))
+        context = context_for(sequence)
+        analyzer = OrfAnalyzer(min_length=60)
+        
+        for from_start_codon in (True, False):
+            orfs = analyzer.find_orfs(context, from_start_codon=from_start_codon)
+            found = set(zip(orfs["start"].tolist(), orfs["end"].tolist(),
+                            orfs["strand"].tolist(), orfs["frame"].tolist()))
+            
+            assert found == naive_orfs(sequence, 60, from_start_codon)
+            assert len(found) > 0
+    
+    def test_annotation_overlap(self):
+        """Test that annotated CDS are matched by ORFs sharing their stop codon."""
+        gene = "ATG" + "GCT" * 120 + "TAA"
+        reverse_gene = gene.translate(COMPLEMENT)[::-1]
+        sequence = "CC" + gene + "CCCC" + reverse_gene + "CC"
+        reverse_start = 2 + len(gene) + 4
+        features = [
+            GenBankFeature("CDS", "", ((2, 2 + len(gene), 1),), {}),
+            GenBankFeature("CDS", "", ((reverse_start, reverse_start + len(gene), -1),), {}),
+        ]
+        
+        results = OrfAnalyzer(min_length=300).analyze_record(context_for(sequence, features))
+        overlap = results["annotation_overlap"]
+        
+        assert results["orf_counts"]["atg_to_stop"]["+3"] == 1
+        assert overlap["annotated_cds"] == 2
+        assert overlap["cds_with_orf"] == 2
+        assert overlap["orfs_overlapping_cds"] == results["orf_counts"]["atg_to_stop"]["total"]
+        assert results["longest_orfs"][0]["length"] == len(gene)
+    
+    def test_results_shape(self, synthetic_genbank_file):
+        """Test the result summary and ORF artifact."""
+        analyzer = OrfAnalyzer(min_length=90)
+        results = analyzer.analyze(synthetic_genbank_file)
+        counts = results["orf_counts"]["atg_to_stop"]
+        
+        assert counts["total"] == sum(v for k, v in counts.items() if k != "total")
+        assert sum(results["length_distribution"]["counts"]) == counts["total"]
+        assert results["length_stats"]["min"] >= 90
+        assert len(analyzer.artifacts["orfs"]["SYN000001.1/start"]) == counts["total"]
+    
+    def test_merge_results(self):
+        """Test that per-replicon ORF results add up to the genome totals."""
+        rng = random.Random(8)
+        contexts = [
+            context_for("".join(rng.choice("AACGTTT") for _ in range(length)))
+            for length in (5000, 3000)
+        ]
+        analyzer = OrfAnalyzer(min_length=60)
+        partials = [analyzer.analyze_replicon(context) for context in contexts]
+        merged = analyzer.merge_results(partials, ["A.1", "B.1"])
+        
+        totals = [p["results"]["orf_counts"]["atg_to_stop"]["total"] for p in partials]
+        assert merged["orf_counts"]["atg_to_stop"]["total"] == sum(totals)
+        assert sum(merged["length_distribution"]["counts"]) == sum(totals)
+        assert [r["atg_to_stop"] for r in merged["replicons"]] == totals
+        assert merged["longest_orfs"][0]["replicon"] in ("A.1", "B.1")
+    
+    def test_reuses_codon_positions(self, synthetic_genbank_file, monkeypatch):
+        """Test that ORFs from the codon analyzer's positions match a fresh scan."""
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        codon_analyzer = CodonAnalyzer()
+        codon_analyzer.analyze_record(context)
+        expected = OrfAnalyzer(min_length=90).analyze_record(context)
+        
+        def no_scan(*args, **kwargs):
+            raise AssertionError("sequence scanned again")
+        monkeypatch.setattr(context, "map_chunks", no_scan)
+        analyzer = OrfAnalyzer(min_length=90)
+        analyzer.inputs = codon_analyzer.artifacts
+        
+        assert analyzer.analyze_record(context) == expected
@@ -0,0 +1,137 @@
+import multiprocessing
+import random
+import pytest
+from conftest import write_genbank
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.genome_store import GenomeStore
+from app.analyzers.replicon_runner import RepliconRunner
+
+
+@pytest.fixture
+def multi_record_file(tmp_path, synthetic_genbank_file):
+    """Create a chromosome plus circular plasmid GenBank file."""
+    rng = random.Random(7)
+    plasmid = "".join(rng.choice("ACGT") for _ in range(1500))
+    plasmid_file = write_genbank(
+        tmp_path / "plasmid.gb",
+        plasmid,
+        [
+            ("CDS", "11..310", ['/gene="repA"']),
+            ("CDS", "complement(1401..200)", ['/gene="parB"']),
+        ],
+        accession="SYN000002.1",
+        topology="circular"
+    )
+    
+    path = tmp_path / "multi.gb"
+    path.write_text(open(synthetic_genbank_file).read() + open(plasmid_file).read())
+    return str(path)
+
+
+def analyzers():
+    return {
+        "codon_analysis": CodonAnalyzer(),
+        "gene_stats": GeneAnalyzer(),
+        "genome_stats": GenomeAnalyzer()
+    }
+
+
+def run_in_daemon(genbank_file):
+    """Analyze the replicons in a pool worker, which is daemonic like a Celery prefork worker."""
+    from app.analyzers import replicon_runner
+    executors = []
+    thread_pool = replicon_runner.ThreadPoolExecutor
+    replicon_runner.ThreadPoolExecutor = lambda max_workers: executors.append(max_workers) or thread_pool(max_workers)
+    
+    assert multiprocessing.current_process().daemon
+    return RepliconRunner(analyzers(), max_workers=2).run(genbank_file), executors
+
+
+class TestRepliconRunner:
+    def test_single_record(self, synthetic_genbank_file):
+        """Test that single-record genomes give the plain analyze_record results."""
+        context = GenomeContext.from_genbank(synthetic_genbank_file)
+        results = RepliconRunner(analyzers(), max_workers=1).run(synthetic_genbank_file)
+        
+        for name, analyzer in analyzers().items():
+            assert results[name] == analyzer.analyze_record(context)
+            assert "replicons" not in results[name]
+    
+    def test_merged_totals(self, multi_record_file):
+        """Test that genome-level totals match the concatenated replicons."""
+        progress = []
+        results = RepliconRunner(analyzers(), max_workers=1).run(
+            multi_record_file, progress_callback=lambda done, total: progress.append((done, total))
+        )
+        contexts = [
+            GenomeContext.load_record(multi_record_file, index, offset)
+            for index, offset in enumerate(GenomeContext.record_offsets(multi_record_file))
+        ]
+        sequence = "".join(context.sequence for context in contexts)
+        
+        assert progress == [(1, 2), (2, 2)]
+        
+        codons = results["codon_analysis"]
+        assert codons["genome_length"] == 7500
+        assert codons["start_codons"]["total_count"] == sum(c.sequence.count("ATG") for c in contexts)
+        assert [r["accession"] for r in codons["replicons"]] == ["SYN000001.1", "SYN000002.1"]
+        
+        genes = [gene for context in contexts for gene in GeneAnalyzer().extract_genes(context)]
+        gene_stats = results["gene_stats"]
+        assert gene_stats["total_genes"] == 10
+        assert gene_stats["statistics"] == GeneAnalyzer().calculate_gene_statistics(genes)
+        assert gene_stats["replicons"][1]["total_genes"] == 2
+        
+        genome = results["genome_stats"]
+        assert genome["genome_size"] == 7500
+        assert genome["gc_content"] == round(GenomeAnalyzer().calculate_genome_stats(
+            GenomeContext("ALL", "", sequence.encode(), [])
+        )["gc_content"], 2)
+        assert genome["gene_count"] == 10
+        assert genome["nucleotide_composition"]["G"]["count"] == sequence.count("G")
+        assert genome["replicon_count"] == 2
+    
+    def test_process_pool_matches_serial(self, multi_record_file):
+        """Test that the process pool and the serial path give identical results."""
+        serial = RepliconRunner(analyzers(), max_workers=1).run(multi_record_file)
+        parallel = RepliconRunner(analyzers(), max_workers=2).run(multi_record_file)
+        
+        assert parallel == serial
+    
+    def test_threads_in_daemon(self, multi_record_file):
+        """Test that a daemonic worker analyzes replicons on threads with identical results."""
+        serial = RepliconRunner(analyzers(), max_workers=1).run(multi_record_file)
+        
+        with multiprocessing.get_context("fork").Pool(1) as pool:
+            threaded, executors = pool.apply(run_in_daemon, (multi_record_file,))
+        
+        assert threaded == serial
+        assert executors == [2]
+    
+    def test_artifacts_collected(self, multi_record_file):
+        """Test that artifacts of every replicon come back from the workers."""
+        codon_analyzer = CodonAnalyzer()
+        RepliconRunner({"codon_analysis": codon_analyzer}, max_workers=2).run(multi_record_file)
+        
+        keys = set(codon_analyzer.artifacts["codon_positions"])
+        assert "SYN000001.1/ATG+" in keys
+        assert "SYN000002.1/TGA-" in keys
+        assert len(keys) == 16
+    
+    def test_store_matches_genbank(self, multi_record_file):
+        """Test that records served from the packed store give identical results."""
+        from_genbank = RepliconRunner(analyzers(), max_workers=1).run(multi_record_file)
+        GenomeStore.build(multi_record_file).close()
+        
+        assert GenomeContext.record_offsets(multi_record_file) == [None, None]
+        assert RepliconRunner(analyzers(), max_workers=1).run(multi_record_file) == from_genbank
+    
+    def test_analyze_multi_record(self, multi_record_file):
+        """Test that the path-based analyze accepts multi-record files."""
+        results = GenomeAnalyzer().analyze(multi_record_file)
+        
+        assert results["replicon_count"] == 2
+        assert results["replicons"][1]["genome_size"] == 1500
@@ -0,0 +1,110 @@
+import random
+import numpy as np
+import pytest
+from conftest import write_genbank
+from app.analyzers.codon_analyzer import CodonAnalyzer
+from app.analyzers.gene_analyzer import GeneAnalyzer
+from app.analyzers.genome_analyzer import GenomeAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.genome_store import GenomeStore
+from app.analyzers.kmer_analyzer import KmerAnalyzer
+from app.analyzers.orf_analyzer import OrfAnalyzer
+from app.analyzers.replicon_runner import RepliconRunner
+from app.analyzers.sequence_chunks import (
+    MIN_CHUNK_SIZE, chunk_size_for_budget, chunked_binned_counts, range_symbol_counts
+)
+from app.analyzers.sequence_encoding import binned_base_counts, encode_sequence
+
+
+def analyzers():
+    return {
+        "codon_analysis": CodonAnalyzer(),
+        "gene_stats": GeneAnalyzer(),
+        "genome_stats": GenomeAnalyzer(),
+        "orf_analysis": OrfAnalyzer(),
+        "kmer_analysis": KmerAnalyzer(k=6)
+    }
+
+
+@pytest.fixture
+def large_genbank_file(tmp_path):
+    """Create a 250 kb genome with gaps and ambiguity codes, packed into a store."""
+    rng = random.Random(21)
+    sequence = list("".join(rng.choice("ACGTACGTACGTRY") for _ in range(250000)))
+    for start in (29990, 60000, 119995):
+        sequence[start:start + 20] = "N" * 20
+    sequence = "".join(sequence)
+    features = [
+        ("CDS", f"{start + 1}..{start + 900}", [f'/locus_tag="G{start}"'])
+        for start in range(100, 240000, 7001)
+    ] + [("CDS", "complement(59001..61500)", ['/locus_tag="SPAN"'])]
+    path = write_genbank(tmp_path / "large.gb", sequence, features)
+    GenomeStore.build(path).close()
+    return path
+
+
+class TestSequenceChunks:
+    def test_binned_counts_across_chunks(self):
+        """Test that bins cut by chunk boundaries add up to whole-sequence bins."""
+        rng = random.Random(2)
+        sequence = bytearray(rng.choice(b"ACGTN") for _ in range(10000))
+        context = GenomeContext("BIN.1", "Bins", sequence, [], chunk_size=777)
+        
+        counts = chunked_binned_counts(context.chunks(), len(context), 300)
+        
+        assert np.array_equal(counts, binned_base_counts(encode_sequence(sequence), 300))
+    
+    def test_range_counts_across_chunks(self):
+        """Test per-range symbol counts against slicing."""
+        rng = random.Random(3)
+        sequence = bytearray(rng.choice(b"ACGTS") for _ in range(5000))
+        context = GenomeContext("RNG.1", "Ranges", sequence, [], chunk_size=600)
+        starts = np.array([0, 599, 1000, 4990, 2500])
+        ends = np.array([10, 1801, 1000, 5000, 2501])
+        
+        gc, total = range_symbol_counts(context.chunks(), starts, ends, ("GCS", "ACGT"))
+        
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            assert gc[i] == sum(sequence[start:end].count(base) for base in b"GCS")
+            assert total[i] == end - start - sequence[start:end].count(b"S")
+    
+    def test_chunk_size_for_budget(self):
+        """Test that chunk size scales with the budget above the floor."""
+        assert chunk_size_for_budget(1) == MIN_CHUNK_SIZE
+        assert chunk_size_for_budget(2048) == 2 * chunk_size_for_budget(1024)
+    
+    def test_chunked_mode_matches_whole_genome(self, large_genbank_file):
+        """Test that every analyzer gives identical results and artifacts in chunked mode."""
+        whole = GenomeContext.load(large_genbank_file)
+        chunked = GenomeContext.load(large_genbank_file)
+        chunked.chunk_size = 30011
+        assert chunked.chunked and not whole.chunked
+        
+        for name, analyzer in analyzers().items():
+            expected = analyzer.analyze_record(whole)
+            expected_artifacts = analyzer.artifacts
+            
+            assert analyzer.analyze_record(chunked) == expected, name
+            for artifact, arrays in expected_artifacts.items():
+                for key, array in arrays.items():
+                    assert np.array_equal(analyzer.artifacts[artifact][key], array), key
+        
+        # The chunked context never decoded the whole sequence
+        assert "sequence_bytes" not in chunked.__dict__
+        assert "encoded" not in chunked.__dict__
+    
+    def test_runner_uses_memory_budget(self, large_genbank_file, monkeypatch):
+        """Test that a budget smaller than the genome switches the runner to chunks."""
+        from app.analyzers import sequence_chunks
+        expected = RepliconRunner(analyzers(), max_workers=1).run(large_genbank_file)
+        
+        fetched = []
+        iter_chunks = GenomeContext.iter_chunks
+        monkeypatch.setattr(sequence_chunks, "MIN_CHUNK_SIZE", 1000)
+        monkeypatch.setattr(GenomeContext, "iter_chunks", lambda self, *args: fetched.append(args) or iter_chunks(self, *args))
+        
+        results = RepliconRunner(analyzers(), max_workers=1, memory_budget_mb=0.5, threads=2).run(large_genbank_file)
+        
+        # The budget is shared by the analyzer threads
+        assert results == expected
+        assert fetched and all(chunk_size == 8192 for chunk_size, _ in fetched)
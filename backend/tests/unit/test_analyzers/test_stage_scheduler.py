@@ -0,0 +1,138 @@
+import threading
+import pytest
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.analyzers.genome_context import GenomeContext
+from app.analyzers.orf_analyzer import OrfAnalyzer
+from app.analyzers.replicon_runner import RepliconRunner
+from app.analyzers.stage_scheduler import Stage, StageScheduler
+
+
+def square_sum(inputs, report):
+    """Module-level stage so it can be sent to a worker process."""
+    return sum(value * value for value in inputs.values()) or 3
+
+
+class TestStageScheduler:
+    def test_independent_stages_overlap(self):
+        """Test that stages without dependencies between them run at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+        stages = [
+            Stage("first", lambda inputs, report: barrier.wait() >= 0),
+            Stage("second", lambda inputs, report: barrier.wait() >= 0)
+        ]
+        
+        assert StageScheduler(stages, max_workers=2).run() == {"first": True, "second": True}
+    
+    def test_dependency_results_are_inputs(self):
+        """Test that stages run after their requirements and receive their results."""
+        order = []
+        
+        def stage(name, value):
+            def run(inputs, report):
+                order.append(name)
+                return value + sum(inputs.values())
+            return run
+        
+        results = StageScheduler([
+            Stage("total", stage("total", 0), requires=["left", "right"]),
+            Stage("left", stage("left", 1)),
+            Stage("right", stage("right", 2), requires=["left"])
+        ]).run()
+        
+        assert order == ["left", "right", "total"]
+        assert results == {"left": 1, "right": 3, "total": 4}
+    
+    def test_invalid_graphs(self):
+        """Test that cycles, unknown requirements and duplicate names are rejected."""
+        noop = lambda inputs, report: None
+        
+        with pytest.raises(ValueError, match="cycle"):
+            StageScheduler([Stage("a", noop, ["b"]), Stage("b", noop, ["a"]), Stage("c", noop)])
+        with pytest.raises(ValueError, match="unknown"):
+            StageScheduler([Stage("a", noop, ["missing"])])
+        with pytest.raises(ValueError, match="Duplicate"):
+            StageScheduler([Stage("a", noop), Stage("a", noop)])
+        
+        levels = StageScheduler([Stage("a", noop), Stage("b", noop, ["a"]), Stage("c", noop, ["a"])]).levels()
+        assert levels == [["a"], ["b", "c"]]
+    
+    def test_weighted_progress(self):
+        """Test that progress includes partial reports, never decreases and ends at 1."""
+        def slow(inputs, report):
+            for step in range(1, 5):
+                report(step / 4)
+            return "slow"
+        
+        progress = []
+        completed = []
+        StageScheduler([
+            Stage("slow", slow, weight=3.0),
+            Stage("fast", lambda inputs, report: "fast", requires=["slow"], weight=1.0)
+        ]).run(
+            progress_callback=lambda stage, fraction: progress.append(fraction),
+            stage_callback=lambda stage, result: completed.append((stage, result))
+        )
+        
+        fractions = sorted(set(progress))
+        assert progress == sorted(progress)
+        assert 0.375 in fractions and 0.75 in fractions
+        assert progress[-1] == 1.0
+        assert completed == [("slow", "slow"), ("fast", "fast")]
+    
+    def test_failure_propagates(self):
+        """Test that a failing stage stops the run and skips its dependents."""
+        ran = []
+        
+        def fail(inputs, report):
+            raise RuntimeError("stage failed")
+        
+        scheduler = StageScheduler([
+            Stage("fail", fail),
+            Stage("after", lambda inputs, report: ran.append(True), requires=["fail"])
+        ])
+        with pytest.raises(RuntimeError, match="stage failed"):
+            scheduler.run()
+        assert ran == []
+    
+    def test_process_pool(self):
+        """Test that picklable stages run on a process pool."""
+        results = StageScheduler([
+            Stage("base", square_sum),
+            Stage("squared", square_sum, requires=["base"])
+        ], max_workers=2, use_processes=True).run()
+        
+        assert results == {"base": 3, "squared": 9}
+
+
+class TestAnalyzerRegistry:
+    def test_builtin_analyzers_registered(self):
+        """Test that the built-in analyzers register under their result names."""
+        registered = BaseAnalyzer.registered()
+        
+        assert {"codon_analysis", "gene_stats", "genome_stats", "orf_analysis", "kmer_analysis"} <= set(registered)
+        assert registered["orf_analysis"] is OrfAnalyzer
+        assert OrfAnalyzer.requires == ("codon_analysis",)
+        assert "codon_positions" in registered["codon_analysis"].outputs
+    
+    def test_duplicate_name_rejected(self):
+        """Test that a second class cannot take a registered name."""
+        with pytest.raises(ValueError, match="already registered"):
+            type("OtherOrfAnalyzer", (OrfAnalyzer,), {"name": "orf_analysis"})
+    
+    def test_runner_passes_inputs(self, synthetic_genbank_file, monkeypatch):
+        """Test that the runner gives ORF analysis the codon positions in any key order."""
+        analyzers = BaseAnalyzer.create_all()
+        reordered = {"orf_analysis": analyzers.pop("orf_analysis"), **analyzers}
+        seen = []
+        analyze_record = OrfAnalyzer.analyze_record
+        
+        def spy(analyzer, context):
+            seen.append(set(analyzer.inputs))
+            return analyze_record(analyzer, context)
+        
+        monkeypatch.setattr(OrfAnalyzer, "analyze_record", spy)
+        results = RepliconRunner(reordered, max_workers=1, threads=3).run(synthetic_genbank_file)
+        
+        assert seen == [{"codon_positions"}]
+        assert results["orf_analysis"] == analyze_record(OrfAnalyzer(), GenomeContext.load(synthetic_genbank_file))
+        assert reordered["orf_analysis"].inputs == {}
@@ -0,0 +1,83 @@
+import threading
+import numpy as np
+import pytest
+from app.services.artifact_store import ArtifactStore, delta_decode, delta_encode
+
+
+class TestArtifactStore:
+    def test_delta_roundtrip(self):
+        """Test that delta encoding is lossless and picks a narrow dtype."""
+        positions = np.cumsum(np.random.default_rng(0).integers(0, 200, 10000))
+        deltas = delta_encode(positions)
+        
+        assert deltas.dtype == np.uint8
+        assert np.array_equal(delta_decode(deltas), positions)
+        assert delta_encode(np.array([0, 70000])).dtype == np.uint32
+        assert len(delta_decode(delta_encode(np.array([], dtype=np.int64)))) == 0
+    
+    def test_save_and_load(self, tmp_path):
+        """Test that sorted and unsorted arrays both round-trip."""
+        store = ArtifactStore(1, base_dir=str(tmp_path))
+        positions = np.arange(0, 3_000_000, 17, dtype=np.int64)
+        values = np.array([3.5, 1.0, 2.25])
+        
+        path = store.save("example", {"SEQ.1/ATG+": positions, "values": values})
+        loaded = store.load("example")
+        
+        assert path == tmp_path / "1" / "example.npz"
+        assert path.stat().st_size < positions.nbytes // 20
+        assert store.keys("example") == ["SEQ.1/ATG+", "values"]
+        assert np.array_equal(loaded["SEQ.1/ATG+"], positions)
+        assert np.array_equal(loaded["values"], values)
+        assert not loaded["values"].flags.writeable
+    
+    def test_window(self, tmp_path):
+        """Test window queries against a linear scan."""
+        store = ArtifactStore(2, base_dir=str(tmp_path))
+        positions = np.sort(np.random.default_rng(1).choice(100000, 5000, replace=False))
+        store.save("positions", {"p": positions})
+        
+        for start, end in ((0, 10), (500, 9000), (99990, 200000), (40000, 40001)):
+            expected = positions[(positions >= start) & (positions < end)]
+            total, found = store.window("positions", "p", start, end)
+            assert total == len(expected)
+            assert np.array_equal(found, expected)
+        
+        total, found = store.window("positions", "p", 0, 100000, limit=10)
+        assert total == 5000
+        assert np.array_equal(found, positions[:10])
+    
+    def test_missing_artifact(self, tmp_path):
+        """Test that loading a missing artifact raises FileNotFoundError."""
+        store = ArtifactStore(3, base_dir=str(tmp_path))
+        
+        assert not store.exists("codon_positions")
+        with pytest.raises(FileNotFoundError):
+            store.load("codon_positions")
+    
+    def test_concurrent_writers(self, tmp_path):
+        """Test that concurrent saves and clones of an artifact never share a temporary file."""
+        source = ArtifactStore(4, base_dir=str(tmp_path))
+        target = ArtifactStore(5, base_dir=str(tmp_path))
+        positions = np.arange(0, 100000, 7, dtype=np.int64)
+        source.save("positions", {"p": positions})
+        errors = []
+        
+        def write(index):
+            try:
+                if index % 2:
+                    target.copy_from(source, "positions")
+                else:
+                    target.save("positions", {"p": positions})
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert sorted(path.name for path in target.directory.iterdir()) == ["positions.npz"]
+        assert np.array_equal(target.load("positions")["p"], positions)
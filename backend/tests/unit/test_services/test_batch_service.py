@@ -0,0 +1,35 @@
+import threading
+from sqlalchemy.orm import sessionmaker
+from app.models.genome import Genome
+from app.services.batch_service import BatchService
+from app.services.single_flight import get_single_flight
+
+
+class TestBatchService:
+    def test_genome_created_under_accession_lock(self, db_session):
+        """Test that a batch waits for a request creating the genome of one of its accessions."""
+        flight = get_single_flight()
+        session = sessionmaker(bind=db_session.get_bind())()
+        created = []
+        
+        try:
+            with flight.lock(flight.key("accession", "NEW000001.1")):
+                batch = threading.Thread(
+                    target=lambda: created.append(BatchService(session).create(["SYN000001.1", "NEW000001.1"]))
+                )
+                batch.start()
+                batch.join(0.2)
+                assert batch.is_alive()
+                
+                # POST /analysis/start creates the genome while holding the lock
+                genome = Genome(accession="NEW000001.1", organism_name="Unknown")
+                db_session.add(genome)
+                db_session.commit()
+            batch.join()
+        finally:
+            session.close()
+        
+        _, jobs = created[0]
+        assert [job["accession"] for job in jobs] == ["SYN000001.1", "NEW000001.1"]
+        assert jobs[1]["genome_id"] == genome.id
+        assert db_session.query(Genome).filter_by(accession="NEW000001.1").count() == 1
@@ -0,0 +1,57 @@
+import pytest
+from app.models.analysis import Analysis
+from app.models.genome import Genome
+from app.models.stage_timing import StageTiming
+from app.services.cost_model import DEFAULT_COST, PRIORITY_LEVELS, CostModel
+
+
+@pytest.fixture
+def timings(db_session):
+    """Stage timings of analyses of 1, 2 and 4 Mb genomes."""
+    for index, size_mb in enumerate((1, 2, 4)):
+        genome = Genome(accession=f"SYN00000{index}.1", organism_name="Synthetic", genome_size=size_mb * 1000000)
+        analysis = Analysis(genome=genome, task_id=f"task-{index}", status="completed")
+        db_session.add(analysis)
+        db_session.flush()
+        db_session.add_all([
+            StageTiming(analysis_id=analysis.id, stage="prepare", queue="analysis_small", duration=1.0 + 2.0 * size_mb),
+            StageTiming(analysis_id=analysis.id, stage="charts", queue="analysis_light", duration=0.5)
+        ])
+    db_session.commit()
+
+
+class TestCostModel:
+    def test_fit(self, db_session, timings):
+        """Test that stage durations are fitted linearly to the genome size."""
+        stages = CostModel(db_session).fit()
+        
+        assert stages["prepare"] == pytest.approx((1.0, 2.0, 3))
+        assert stages["charts"] == pytest.approx((0.5, 0.0, 3))
+    
+    def test_estimate(self, db_session, timings):
+        """Test that the estimate sums the stages and falls back to the default cost."""
+        assert CostModel(db_session).estimate(10000000) == pytest.approx(1.0 + 2.0 * 10 + 0.5)
+        assert CostModel(db_session).estimate(None) == 0.0
+        
+        db_session.query(StageTiming).delete()
+        assert CostModel(db_session).estimate(2000000) == pytest.approx(DEFAULT_COST[0] + DEFAULT_COST[1] * 2)
+    
+    def test_priority(self, db_session, timings):
+        """Test that cheaper analyses get lower (earlier) priority levels."""
+        model = CostModel(db_session)
+        priorities = [model.priority(size) for size in (5000, 1000000, 12000000, 10 ** 10)]
+        
+        assert priorities == sorted(priorities)
+        assert priorities[0] == 0
+        assert priorities[-1] == PRIORITY_LEVELS - 1
+        assert model.priority(None) == PRIORITY_LEVELS // 2
+    
+    def test_workload(self, db_session, timings):
+        """Test that the workload sums recorded stage time by queue."""
+        workload = CostModel(db_session).workload(1.0)
+        
+        assert workload["queues"] == {
+            "analysis_small": {"stages": 3, "busy_seconds": 17.0, "workers": round(17.0 / 3600, 2)},
+            "analysis_light": {"stages": 3, "busy_seconds": 1.5, "workers": 0.0}
+        }
+        assert workload["stages"]["prepare"]["seconds_per_mb"] == 2.0
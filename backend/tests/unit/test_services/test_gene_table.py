@@ -0,0 +1,93 @@
+import pytest
+from app.core.exceptions import ValidationException
+from app.models.analysis import Analysis
+from app.models.genome import Genome
+from app.services.gene_table import GeneTable, decode_cursor, encode_cursor
+
+
+def make_genes(count):
+    """Build gene dictionaries shaped like GeneAnalyzer.extract_genes output."""
+    return [
+        {
+            "gene_name": f"gen{index % 7}",
+            "locus_tag": f"TAG_{index:05d}",
+            "product": "hypothetical protein",
+            "location": f"[{index * 10}:{index * 10 + 9}](+)",
+            "start": index * 10,
+            "end": index * 10 + 9 + (index % 5),
+            "length": 9 + (index % 5),
+            "gc_content": float(index % 11) * 5,
+            "strand": "+" if index % 3 else "-",
+            "replicon": "CHR.1" if index < count - 10 else "PLS.1"
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def gene_table(db_session):
+    """Create an analysis with 250 genes."""
+    genome = Genome(accession="CHR.1", organism_name="Synthetic organism")
+    db_session.add(genome)
+    db_session.commit()
+    analysis = Analysis(genome_id=genome.id, task_id="task-1", status="completed")
+    db_session.add(analysis)
+    db_session.commit()
+    
+    table = GeneTable(db_session)
+    assert table.save(analysis.id, make_genes(250)) == 250
+    return table, analysis.id
+
+
+class TestGeneTable:
+    def test_cursor_roundtrip(self):
+        """Test that cursors are opaque, URL-safe and reversible."""
+        cursor = encode_cursor(42.5, 17)
+        
+        assert "=" not in cursor and "/" not in cursor
+        assert decode_cursor(cursor) == (42.5, 17)
+        with pytest.raises(ValidationException):
+            decode_cursor("not-a-cursor")
+    
+    @pytest.mark.parametrize("sort", ["start", "length", "gc_content", "gene_name"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_pages_cover_every_gene_in_order(self, gene_table, sort, order):
+        """Test that following cursors returns each gene once, in sort order."""
+        table, analysis_id = gene_table
+        seen = []
+        cursor = None
+        while True:
+            page = table.page(analysis_id, sort=sort, order=order, limit=40, cursor=cursor)
+            assert page["total"] == (250 if cursor is None else None)
+            seen.extend(page["genes"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        
+        keys = [(getattr(gene, sort), gene.id) for gene in seen]
+        assert len({gene.id for gene in seen}) == 250
+        assert keys == sorted(keys, reverse=(order == "desc"))
+    
+    def test_filters(self, gene_table):
+        """Test strand, length, GC, replicon and name filters."""
+        table, analysis_id = gene_table
+        genes = make_genes(250)
+        
+        page = table.page(analysis_id, limit=1000, filters={"strand": "-", "min_length": 12, "max_gc": 20})
+        expected = [g for g in genes if g["strand"] == "-" and g["length"] >= 12 and g["gc_content"] <= 20]
+        assert page["total"] == len(expected)
+        assert [gene.start for gene in page["genes"]] == [g["start"] for g in expected]
+        
+        assert table.page(analysis_id, filters={"replicon": "PLS.1"})["total"] == 10
+        assert table.page(analysis_id, filters={"name": "tag_0001"})["total"] == 10
+        assert table.page(analysis_id, filters={"name": "GEN3"})["total"] == 36
+        assert table.page(analysis_id, filters={"name": "%"})["total"] == 0
+    
+    def test_invalid_sort(self, gene_table):
+        """Test that unknown sort columns and orders are rejected."""
+        table, analysis_id = gene_table
+        
+        with pytest.raises(ValidationException):
+            table.page(analysis_id, sort="product")
+        with pytest.raises(ValidationException):
+            table.page(analysis_id, order="sideways")
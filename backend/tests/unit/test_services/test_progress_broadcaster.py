@@ -0,0 +1,62 @@
+import asyncio
+from app.services.progress_channel import SUBSCRIBER_QUEUE_SIZE, MemoryProgressChannel, ProgressBroadcaster
+
+
+class TestProgressBroadcaster:
+    def test_dispatch(self):
+        """Test that published states reach the subscribers of their analysis only."""
+        channel = MemoryProgressChannel()
+        broadcaster = ProgressBroadcaster(channel)
+        
+        async def receive():
+            async with broadcaster.subscribe(1) as first, broadcaster.subscribe(1) as second:
+                async with broadcaster.subscribe(2) as other:
+                    channel.update(1, 12.5)
+                    states = [await asyncio.wait_for(queue.get(), 1.0) for queue in (first, second)]
+                    return states, other.empty()
+        
+        states, other_empty = asyncio.run(receive())
+        
+        assert states == [{"progress": 12.5}, {"progress": 12.5}]
+        assert other_empty
+        assert broadcaster.subscribers == {}
+    
+    def test_slow_subscriber(self):
+        """Test that a subscriber that is not reading keeps the latest states."""
+        broadcaster = ProgressBroadcaster(MemoryProgressChannel())
+        
+        async def receive():
+            async with broadcaster.subscribe(1) as queue:
+                for progress in range(100):
+                    broadcaster.dispatch(1, {"progress": float(progress)})
+                return [queue.get_nowait()["progress"] for _ in range(queue.qsize())]
+        
+        assert asyncio.run(receive()) == [float(progress) for progress in range(100 - SUBSCRIBER_QUEUE_SIZE, 100)]
+    
+    def test_idle_subscribers(self):
+        """Test that many idle subscribers share one channel subscription."""
+        channel = MemoryProgressChannel()
+        broadcaster = ProgressBroadcaster(channel)
+        
+        async def subscribe(analysis_id, ready, done):
+            async with broadcaster.subscribe(analysis_id) as queue:
+                ready.set()
+                await done.wait()
+                return None if queue.empty() else queue.get_nowait()
+        
+        async def receive():
+            done = asyncio.Event()
+            ready = [asyncio.Event() for _ in range(2000)]
+            tasks = [asyncio.create_task(subscribe(index % 10, event, done)) for index, event in enumerate(ready)]
+            for event in ready:
+                await event.wait()
+            listeners = len(channel.listeners)
+            channel.update(3, 50.0)
+            await asyncio.sleep(0.01)
+            done.set()
+            return listeners, await asyncio.gather(*tasks)
+        
+        listeners, states = asyncio.run(receive())
+        
+        assert listeners == 1
+        assert sum(state == {"progress": 50.0} for state in states) == 200
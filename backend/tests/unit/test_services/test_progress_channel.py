@@ -0,0 +1,46 @@
+import threading
+import pytest
+from datetime import datetime, timezone
+from app.services.progress_channel import MemoryProgressChannel, ProgressChannel, RedisProgressChannel
+
+
+class TestProgressChannel:
+    def test_update(self):
+        """Test that updates merge fields and add progress steps."""
+        channel = MemoryProgressChannel()
+        started_at = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        
+        channel.update(1, status="running", progress=0.0, started_at=started_at)
+        state = channel.update(1, 12.5, message="Encoding genome...")
+        
+        assert state == {
+            "status": "running", "progress": 12.5, "started_at": "2024-01-15T10:30:00+00:00",
+            "message": "Encoding genome..."
+        }
+        assert channel.get(1) == state
+        assert channel.get(2) is None
+        assert channel.get_many([1, 2]) == {1: state}
+    
+    def test_parallel_steps(self):
+        """Test that steps added by concurrent stages are not lost."""
+        channel = MemoryProgressChannel()
+        threads = [threading.Thread(target=lambda: [channel.update(1, 0.5) for _ in range(100)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert channel.get(1)["progress"] == 200.0
+    
+    def test_unavailable(self):
+        """Test that an unreachable channel is reported as empty instead of raising."""
+        channel = RedisProgressChannel("redis://127.0.0.1:1/0")
+        
+        assert channel.update(1, 12.5, message="Encoding genome...") is None
+        assert channel.get(1) is None
+        assert channel.get_many([1, 2]) == {}
+    
+    def test_abstract(self):
+        """Test that a channel must implement listening, applying and reading states."""
+        with pytest.raises(TypeError, match="_apply, _read, listen"):
+            ProgressChannel()
@@ -0,0 +1,119 @@
+import hashlib
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.models.analysis import Analysis
+from app.models.gene import Gene
+from app.models.genome import Genome
+from app.models.result import Result
+from app.models.validation import Validation
+from app.services.artifact_store import ArtifactStore
+from app.services.gene_table import GeneTable
+from app.services.result_cache import ResultCache, content_hash
+
+
+VERSIONS = {"codon_analysis": "1", "gene_stats": "1", "genome_stats": "1"}
+
+
+@pytest.fixture
+def cached_analysis(db_session, tmp_path, monkeypatch):
+    """A completed analysis whose results are in the cache."""
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    genome_file = tmp_path / "genome.gb"
+    genome_file.write_text("LOCUS       SYN000001\n//\n")
+    genome = Genome(accession="SYN000001.1", organism_name="Synthetic", file_path=str(genome_file))
+    analysis = Analysis(genome=genome, task_id="source", status="completed")
+    db_session.add(analysis)
+    db_session.commit()
+    
+    for name in VERSIONS:
+        db_session.add(Result(analysis_id=analysis.id, result_type=name, data={"name": name}))
+    db_session.add(Result(analysis_id=analysis.id, result_type="charts", data={"chart": "chart.png"}))
+    db_session.add(Validation(analysis_id=analysis.id, deviations={}, validation_status="passed"))
+    db_session.commit()
+    GeneTable(db_session).save(analysis.id, [
+        {"gene_name": "thrL", "locus_tag": "b0001", "product": "leader", "location": "[0:66](+)",
+         "start": 0, "end": 66, "length": 66, "gc_content": 50.0, "strand": "+"}
+    ], "SYN000001.1")
+    ArtifactStore(analysis.id).save("codon_positions", {"SYN000001.1/ATG+": np.arange(0, 300, 3)})
+    
+    cache = ResultCache(db_session)
+    cache.store(cache.genome_hash(genome), analysis.id, VERSIONS)
+    return genome, analysis
+
+
+def new_analysis(db_session, genome, task_id):
+    """Add a pending analysis of a genome."""
+    analysis = Analysis(genome_id=genome.id, task_id=task_id, status="pending")
+    db_session.add(analysis)
+    db_session.commit()
+    return analysis
+
+
+class TestResultCache:
+    def test_content_hash(self, tmp_path):
+        """Test that the streamed hash matches hashing the whole file."""
+        path = tmp_path / "genome.gb"
+        path.write_bytes(b"ACGT" * 700000)
+        
+        assert content_hash(str(path)) == hashlib.sha256(b"ACGT" * 700000).hexdigest()
+    
+    def test_genome_hash(self, db_session, cached_analysis):
+        """Test that the genome hash is computed once and stored."""
+        genome, _ = cached_analysis
+        
+        assert genome.content_hash == content_hash(genome.file_path)
+        assert ResultCache(db_session).genome_hash(Genome(accession="X", organism_name="X")) is None
+    
+    def test_lookup_by_version(self, db_session, cached_analysis):
+        """Test that bumping one analyzer version only misses that analyzer."""
+        genome, _ = cached_analysis
+        cache = ResultCache(db_session)
+        
+        assert set(cache.lookup(genome.content_hash, VERSIONS)) == set(VERSIONS)
+        hits = cache.lookup(genome.content_hash, dict(VERSIONS, gene_stats="2"))
+        assert set(hits) == {"codon_analysis", "genome_stats"}
+        assert cache.lookup("0" * 64, VERSIONS) == {}
+        assert cache.lookup(None, VERSIONS) == {}
+    
+    def test_store_skips_cached(self, db_session, cached_analysis):
+        """Test that results already in the cache are not stored twice."""
+        genome, analysis = cached_analysis
+        cache = ResultCache(db_session)
+        
+        assert cache.store(genome.content_hash, analysis.id, VERSIONS) == 0
+        assert cache.store(genome.content_hash, analysis.id, dict(VERSIONS, gene_stats="2")) == 1
+        assert len(cache.lookup(genome.content_hash, dict(VERSIONS, gene_stats="2"))) == 3
+    
+    def test_clone(self, db_session, cached_analysis):
+        """Test that cloning copies results, genes and artifacts."""
+        genome, source = cached_analysis
+        cache = ResultCache(db_session)
+        analysis = new_analysis(db_session, genome, "clone")
+        
+        results = cache.clone(cache.lookup(genome.content_hash, VERSIONS), analysis.id)
+        
+        assert results == {name: {"name": name} for name in VERSIONS}
+        saved = db_session.query(Result).filter(Result.analysis_id == analysis.id).all()
+        assert {result.result_type for result in saved} == set(VERSIONS)
+        genes = db_session.query(Gene).filter(Gene.analysis_id == analysis.id).all()
+        assert [(gene.gene_name, gene.replicon, gene.length) for gene in genes] == [("thrL", "SYN000001.1", 66)]
+        assert np.array_equal(
+            ArtifactStore(analysis.id).load("codon_positions")["SYN000001.1/ATG+"],
+            ArtifactStore(source.id).load("codon_positions")["SYN000001.1/ATG+"]
+        )
+    
+    def test_complete(self, db_session, cached_analysis):
+        """Test that a full hit completes the analysis with validation and charts."""
+        genome, _ = cached_analysis
+        cache = ResultCache(db_session)
+        analysis = new_analysis(db_session, genome, "complete")
+        
+        cache.complete(analysis, cache.lookup(genome.content_hash, VERSIONS))
+        
+        assert analysis.status == "completed"
+        assert analysis.progress == 100.0
+        assert analysis.completed_at is not None
+        types = {result.result_type for result in analysis.results}
+        assert types == set(VERSIONS) | {"charts"}
+        assert [validation.validation_status for validation in analysis.validations] == ["passed"]
@@ -0,0 +1,53 @@
+import threading
+import time
+import pytest
+from app.services.single_flight import LocalSingleFlight, RedisSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    def test_mutual_exclusion(self):
+        """Test that a key is held by one thread at a time and forgotten once released."""
+        flight = LocalSingleFlight()
+        key = flight.key("accession", "SYN000001.1")
+        holders = []
+        overlaps = []
+        
+        def hold():
+            with flight.lock(key):
+                holders.append(1)
+                overlaps.append(len(holders))
+                time.sleep(0.01)
+                holders.pop()
+        
+        threads = [threading.Thread(target=hold) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert key == "single-flight:accession:SYN000001.1"
+        assert overlaps == [1, 1, 1, 1]
+        assert flight.locks == {} and flight.holders == {}
+    
+    def test_keys_independent(self):
+        """Test that holding one key does not block another."""
+        flight = LocalSingleFlight()
+        
+        with flight.lock(flight.key("download", "SYN000001.1")):
+            with flight.lock(flight.key("download", "SYN000002.1")):
+                assert len(flight.locks) == 2
+    
+    def test_unavailable(self):
+        """Test that an unreachable lock store lets the work go ahead unlocked."""
+        flight = RedisSingleFlight("redis://127.0.0.1:1/0")
+        ran = []
+        
+        with flight.lock(flight.key("content", "0" * 64)):
+            ran.append(1)
+        
+        assert ran == [1]
+    
+    def test_abstract(self):
+        """Test that single-flight locks must implement lock."""
+        with pytest.raises(TypeError, match="lock"):
+            SingleFlight()
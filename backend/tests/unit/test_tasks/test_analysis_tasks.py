@@ -0,0 +1,205 @@
+import time
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from sqlalchemy.orm import sessionmaker
+from app.analyzers.base_analyzer import BaseAnalyzer
+from app.core.config import settings
+from app.core.exceptions import AnalysisException
+from app.models.analysis import Analysis
+from app.models.genome import Genome
+from app.models.result import Result
+from app.models.stage_timing import StageTiming
+from app.services.result_cache import content_hash
+from app.tasks import analysis_tasks
+from app.tasks.analysis_tasks import analysis_workflow, analyzer_stages
+from app.tasks.celery_app import celery_app
+
+
+@pytest.fixture
+def eager_tasks(db_session, tmp_path, monkeypatch):
+    """Run tasks in-process on the test database with an in-memory result backend."""
+    monkeypatch.setattr(analysis_tasks, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setitem(celery_app.conf, "result_backend", "cache+memory://")
+    monkeypatch.delattr(celery_app._local, "backend", raising=False)
+    yield
+    celery_app._local.__dict__.pop("backend", None)
+
+
+@pytest.fixture
+def pending_analysis(db_session, synthetic_genbank_file):
+    """A pending analysis of the synthetic genome."""
+    genome = Genome(accession="SYN000001.1", organism_name="Synthetic organism", file_path=synthetic_genbank_file)
+    analysis = Analysis(genome=genome, task_id="task-stages", status="pending")
+    db_session.add(analysis)
+    db_session.commit()
+    return analysis
+
+
+class TestAnalysisStages:
+    def test_analyzer_stages(self):
+        """Test that analyzers share a stage only with the analyzers they require."""
+        stages = analyzer_stages(BaseAnalyzer.registered())
+        
+        assert stages["codon_analysis"] == ["codon_analysis", "orf_analysis"]
+        assert stages["gene_stats"] == ["gene_stats"]
+        assert len(stages) == len(BaseAnalyzer.registered()) - 1
+        
+        # Without its requirement, the ORF analyzer gets a stage of its own
+        registered = BaseAnalyzer.registered()
+        assert analyzer_stages({"orf_analysis": registered["orf_analysis"]}) == {"orf_analysis": ["orf_analysis"]}
+    
+    def test_workflow_routing(self, monkeypatch):
+        """Test the stage order and the queue of each stage."""
+        monkeypatch.setattr(settings, "ANALYSIS_SMALL_QUEUE", "analysis_small")
+        monkeypatch.setattr(settings, "ANALYSIS_LARGE_QUEUE", "analysis_large")
+        monkeypatch.setattr(settings, "ANALYSIS_LIGHT_QUEUE", "")
+        
+        workflow = analysis_workflow(
+            1, "/tmp/genome.gb", "SYN000001.1", ["codon_analysis", "orf_analysis", "gene_stats"], 50000, 2
+        )
+        # Celery turns the analyzer group and the stages after it into a chord
+        prepare, analyzers = workflow.tasks
+        validate, charts, finish = analyzers.body.tasks
+        
+        assert prepare.task == "prepare_genome"
+        assert [stage.args[3] for stage in analyzers.tasks] == [["codon_analysis", "orf_analysis"], ["gene_stats"]]
+        assert [validate.task, charts.task, finish.task] == ["validate_results", "generate_charts", "finish_analysis"]
+        assert prepare.options == {"queue": "analysis_small", "priority": 2}
+        assert all(stage.options["queue"] == "analysis_small" for stage in analyzers.tasks)
+        assert validate.options == {"priority": 2}
+        assert finish.args[1] == {"codon_analysis": "1", "orf_analysis": "1", "gene_stats": "1"}
+        
+        cached = analysis_workflow(1, "/tmp/genome.gb", "SYN000001.1", [], 12000000)
+        assert [task.task for task in cached.tasks] == [
+            "prepare_genome", "validate_results", "generate_charts", "finish_analysis"
+        ]
+        assert cached.tasks[0].options == {"queue": "analysis_large"}
+    
+    def test_workflow_runs(self, db_session, eager_tasks, pending_analysis, tmp_path):
+        """Test that the stage workflow saves every result and completes the analysis."""
+        analysis_tasks.analyze_genome_task.apply(args=(pending_analysis.id, None, "SYN000001.1"))
+        db_session.expire_all()
+        
+        assert pending_analysis.status == "completed"
+        assert pending_analysis.progress == 100.0
+        types = {result.result_type for result in pending_analysis.results}
+        assert types == set(BaseAnalyzer.registered()) | {"charts"}
+        assert len(pending_analysis.genes) == 8
+        assert len(pending_analysis.validations) == 1
+        
+        # Charts are saved in the data directory
+        charts = next(result.data for result in pending_analysis.results if result.result_type == "charts")
+        assert charts and all(Path(path).parent == tmp_path / "results" for path in charts.values())
+        
+        # Every stage records its run time for the cost model
+        stages = {timing.stage for timing in db_session.query(StageTiming).filter_by(analysis_id=pending_analysis.id)}
+        assert stages == {"prepare", "validation", "charts"} | set(analyzer_stages(BaseAnalyzer.registered()))
+    
+    def test_stage_progress_not_committed(self, db_session, eager_tasks, pending_analysis, progress_channel):
+        """Test that stages report progress to the channel and leave the analysis row alone."""
+        analysis_tasks.prepare_genome_task.apply(args=(pending_analysis.id, pending_analysis.genome.file_path, 12.5))
+        db_session.expire_all()
+        
+        assert pending_analysis.progress == 0.0
+        assert progress_channel.get(pending_analysis.id) == {"progress": 12.5, "message": "Encoding genome..."}
+        
+        analysis_tasks.analyze_genome_task.apply(args=(pending_analysis.id, None, "SYN000001.1"))
+        state = progress_channel.get(pending_analysis.id)
+        assert state["status"] == "completed"
+        assert state["progress"] == 100.0
+        assert state["completed_at"] is not None
+    
+    def test_failed_stage_retried_alone(self, db_session, eager_tasks, pending_analysis, monkeypatch):
+        """Test that a late failure retries only the failed stage."""
+        runs = []
+        run_analyzers = analysis_tasks.RepliconRunner.run
+        
+        def count_runs(runner, *args, **kwargs):
+            runs.append(sorted(runner.analyzers))
+            return run_analyzers(runner, *args, **kwargs)
+        
+        attempts = []
+        generate_charts = analysis_tasks.generate_charts
+        
+        def flaky_charts(results):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise AnalysisException("chart renderer unavailable")
+            return generate_charts(results)
+        
+        monkeypatch.setattr(analysis_tasks.RepliconRunner, "run", count_runs)
+        monkeypatch.setattr(analysis_tasks, "generate_charts", flaky_charts)
+        monkeypatch.setattr(analysis_tasks.AnalysisTask, "retry_backoff", False)
+        
+        analysis_tasks.analyze_genome_task.apply(args=(pending_analysis.id, None, "SYN000001.1"))
+        db_session.expire_all()
+        
+        assert len(attempts) == 2
+        assert sorted(map(tuple, runs)) == sorted(
+            tuple(names) for names in analyzer_stages(BaseAnalyzer.registered()).values()
+        )
+        assert pending_analysis.status == "completed"
+        charts = db_session.query(Result).filter_by(analysis_id=pending_analysis.id, result_type="charts").count()
+        assert charts == 1
+    
+    def test_retried_stage_adds_progress_once(self, db_session, eager_tasks, pending_analysis, progress_channel,
+                                              monkeypatch):
+        """Test that a stage failing at its last step adds its progress only on the attempt that succeeds."""
+        attempts = []
+        record_timing = analysis_tasks._record_timing
+        
+        def flaky_timing(*args):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise AnalysisException("timing table locked")
+            return record_timing(*args)
+        
+        monkeypatch.setattr(analysis_tasks, "_record_timing", flaky_timing)
+        monkeypatch.setattr(analysis_tasks.AnalysisTask, "retry_backoff", False)
+        
+        analysis_tasks.prepare_genome_task.apply(args=(pending_analysis.id, pending_analysis.genome.file_path, 12.5))
+        
+        assert len(attempts) == 2
+        assert progress_channel.get(pending_analysis.id)["progress"] == 12.5
+    
+    def test_exhausted_retries_fail_analysis(self, db_session, eager_tasks, pending_analysis, progress_channel):
+        """Test that a stage failing for good marks the analysis failed."""
+        analysis_tasks.validate_results_task.apply(args=(pending_analysis.id, "SYN000001.1", 10.0))
+        db_session.expire_all()
+        
+        assert pending_analysis.status == "failed"
+        assert progress_channel.get(pending_analysis.id)["status"] == "failed"
+        assert "has no codon_analysis, gene_stats, genome_stats results" in pending_analysis.error_message
+    
+    def test_identical_genome_waited_for(self, db_session, eager_tasks, pending_analysis, monkeypatch):
+        """Test that an analysis waits while a genome of identical content is analyzed."""
+        file_path = pending_analysis.genome.file_path
+        twin = Genome(accession="SYN000002.1", organism_name="Synthetic twin", file_path=file_path,
+                      content_hash=content_hash(file_path))
+        running = Analysis(genome=twin, task_id="task-twin", status="running")
+        db_session.add(running)
+        db_session.commit()
+        monkeypatch.setattr(settings, "SINGLE_FLIGHT_TIMEOUT_SECONDS", 90)
+        
+        with patch.object(analysis_tasks.analyze_genome_task, "signature_from_request") as requeue:
+            analysis_tasks.analyze_genome_task.apply(args=(pending_analysis.id, None, "SYN000001.1"))
+        db_session.expire_all()
+        
+        # The wait is re-queued with its deadline, without counting as a retry
+        request, args, kwargs = requeue.call_args.args
+        assert args == (pending_analysis.id, None, "SYN000001.1")
+        assert kwargs["wait_until"] == pytest.approx(time.time() + 90, abs=5)
+        assert requeue.call_args.kwargs == {"countdown": settings.SINGLE_FLIGHT_WAIT_SECONDS, "retries": 0}
+        requeue.return_value.apply_async.assert_called_once_with()
+        assert pending_analysis.status == "pending"
+        
+        # Past its deadline, the analysis runs anyway
+        analysis_tasks.analyze_genome_task.apply(
+            args=(pending_analysis.id, None, "SYN000001.1"), kwargs={"wait_until": time.time() - 1}
+        )
+        db_session.expire_all()
+        
+        assert pending_analysis.status == "completed"
@@ -0,0 +1,45 @@
+import pytest
+from celery.exceptions import ChordError
+from sqlalchemy.orm import sessionmaker
+from app.models.analysis import Analysis
+from app.models.batch import Batch
+from app.services.batch_service import BatchService
+from app.tasks import batch_tasks
+from app.tasks.batch_tasks import batch_workflow
+from app.tasks.celery_app import celery_app
+
+
+@pytest.fixture
+def eager_tasks(db_session, monkeypatch):
+    """Run tasks in-process on the test database with an in-memory result backend."""
+    monkeypatch.setattr(batch_tasks, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setitem(celery_app.conf, "result_backend", "cache+memory://")
+    monkeypatch.delattr(celery_app._local, "backend", raising=False)
+    yield
+    celery_app._local.__dict__.pop("backend", None)
+
+
+class TestBatchTasks:
+    def test_summary_after_failed_job(self, db_session, eager_tasks):
+        """Test that a batch is summarized when one of its analyses failed."""
+        batch, jobs = BatchService(db_session).create(["SYN000001.1", "SYN000002.1"])
+        completed, failed = (db_session.get(Analysis, job["analysis_id"]) for job in jobs)
+        completed.status, failed.status = "completed", "failed"
+        db_session.commit()
+        
+        # Once every job finished and one failed, Celery fails the chord
+        # callback from the backend, calling its error callbacks instead
+        workflow = batch_workflow(batch.id, jobs)
+        workflow.freeze()
+        assert workflow.body.task == "summarize_batch"
+        try:
+            raise ChordError("Dependency raised AnalysisException()")
+        except ChordError as exc:
+            celery_app.backend.chord_error_from_stack(workflow.body, exc)
+        db_session.expire_all()
+        
+        batch = db_session.get(Batch, batch.id)
+        assert batch.status == "completed_with_errors"
+        assert batch.summary == {"completed": 1, "failed": 1}
+        assert batch.completed_at is not None
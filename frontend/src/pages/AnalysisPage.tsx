@@ -37,15 +37,34 @@ function AnalysisPage() {
         loadGenomeDetails()
     }, [accession])
 
+    const [streamFailed, setStreamFailed] = useState(false)
+
+    const analysisId = analysis?.analysis_id
+    const finished = analysis?.status === 'completed' || analysis?.status === 'failed'
+
+    useEffect(() => {
+        if (analysisId !== undefined && !finished && !streamFailed) {
+            return analysisService.subscribe(
+                analysisId,
+                (status) => {
+                    setAnalysis(status)
+                    dispatch(setCurrentAnalysis(status))
+                },
+                () => setStreamFailed(true)
+            )
+        }
+    }, [analysisId, finished, streamFailed])
+
     useEffect(() => {
-        if (analysis && analysis.status !== 'completed' && analysis.status !== 'failed') {
+        // Without a stream, fall back to polling
+        if (analysis && !finished && streamFailed) {
             const interval = setInterval(() => {
                 pollAnalysisStatus()
             }, 3000) // Poll every 3 seconds
 
             return () => clearInterval(interval)
         }
-    }, [analysis])
+    }, [analysis, streamFailed])
 
     const loadGenomeDetails = async () => {
         if (!accession) return
@@ -42,6 +42,36 @@ export const analysisService = {
         return response.data
     },
 
+    /**
+     * Follow analysis status through server-sent events until it completes or fails.
+     * Returns a function that closes the stream.
+     */
+    subscribe: (
+        analysisId: number,
+        onStatus: (status: AnalysisStatus) => void,
+        onError: () => void
+    ): (() => void) => {
+        const source = new EventSource(`${apiClient.defaults.baseURL}/analysis/${analysisId}/events`)
+        const handleEvent = (event: MessageEvent) => {
+            const status: AnalysisStatus = JSON.parse(event.data)
+            onStatus(status)
+            if (status.status === 'completed' || status.status === 'failed') {
+                source.close()
+            }
+        }
+        ;['status', 'stage', 'progress'].forEach((name) =>
+            source.addEventListener(name, handleEvent as EventListener)
+        )
+        source.onerror = () => {
+            // The stream ends after the final status; any other error falls back to polling
+            if (source.readyState !== EventSource.CLOSED) {
+                source.close()
+                onError()
+            }
+        }
+        return () => source.close()
+    },
+
     /**
      * List all analyses
      */